@@ -23,7 +23,9 @@
 # IN THE SOFTWARE.
 #
 # --------------------------------------------------------------------------
+import asyncio
 import collections.abc
+import inspect
 import logging
 from typing import (
     Iterable,
@@ -61,6 +63,16 @@ class AsyncList(AsyncIterator[ReturnType]):
             raise StopAsyncIteration() from err
 
 
+async def _resolve_continuation_token(page_iterator):
+    token = page_iterator.continuation_token
+    if callable(token):
+        token = token()
+        if inspect.isawaitable(token):
+            token = await token
+        page_iterator.continuation_token = token
+    return token
+
+
 class AsyncPageIterator(AsyncIterator[AsyncIterator[ReturnType]]):
     def __init__(
         self,
@@ -76,7 +88,9 @@ class AsyncPageIterator(AsyncIterator[AsyncIterator[ReturnType]]):
 
         :param get_next: Callable that take the continuation token and return a HTTP response
         :param extract_data: Callable that take an HTTP response and return a tuple continuation token,
-         list of ReturnType
+         list of ReturnType. For pages whose items are decoded lazily while the response streams in,
+         the continuation token can be a callable or coroutine function taking no argument, called once
+         the next page is needed.
         :param str continuation_token: The continuation token needed by get_next
         """
         self._get_next = get_next
@@ -87,6 +101,7 @@ class AsyncPageIterator(AsyncIterator[AsyncIterator[ReturnType]]):
         self._current_page = None
 
     async def __anext__(self):
+        await _resolve_continuation_token(self)
         if self.continuation_token is None and self._did_a_call_already:
             raise StopAsyncIteration("End of paging")
 
@@ -104,12 +119,76 @@ class AsyncPageIterator(AsyncIterator[AsyncIterator[ReturnType]]):
         return self._current_page
 
 
+_END_OF_PAGES = object()
+
+
+async def _fetch_pages(page_iterator, pages: asyncio.Queue) -> None:
+    """Read the pages of "page_iterator" into the "pages" queue."""
+    try:
+        async for page in page_iterator:
+            items = []
+            async for item in page:
+                items.append(item)
+            await pages.put((items, await _resolve_continuation_token(page_iterator), None))
+    except Exception as error:  # pylint: disable=broad-except
+        await pages.put((None, None, error))
+        return
+    await pages.put(_END_OF_PAGES)
+
+
+class _AsyncPrefetchPageIterator(AsyncIterator[AsyncIterator[ReturnType]]):
+    """Async iterator of pages fetching up to "read_ahead" pages ahead of the consumer in a task.
+
+    Each page is read in full by the fetching task, so at most "read_ahead" + 2 pages are held in memory,
+    and fetching stops when "read_ahead" pages are waiting to be consumed.
+
+    :param page_iterator: The async iterator of pages to read ahead.
+    :param int read_ahead: How many pages can be fetched ahead of the consumer.
+    """
+    def __init__(self, page_iterator: AsyncPageIterator, read_ahead: int) -> None:
+        self.continuation_token = page_iterator.continuation_token
+        self._page_iterator = page_iterator
+        self._pages = asyncio.Queue(maxsize=read_ahead)  # type: asyncio.Queue
+        self._worker = None  # type: Optional[asyncio.Future]
+        self._done = False
+
+    async def __anext__(self):
+        if self._done:
+            raise StopAsyncIteration("End of paging")
+        if self._worker is None:
+            self._worker = asyncio.ensure_future(_fetch_pages(self._page_iterator, self._pages))
+        entry = await self._pages.get()
+        if entry is _END_OF_PAGES:
+            self._done = True
+            raise StopAsyncIteration("End of paging")
+        page, self.continuation_token, error = entry
+        if error is not None:
+            self._done = True
+            raise error
+        return AsyncList(page)
+
+    def close(self) -> None:
+        """Stop fetching pages ahead."""
+        self._done = True
+        if self._worker is not None and not self._worker.done():
+            self._worker.cancel()
+
+    def __del__(self):
+        try:
+            self.close()
+        except RuntimeError:
+            pass  # The event loop is already closed
+
+
 class AsyncItemPaged(AsyncIterator[ReturnType]):
     def __init__(self, *args, **kwargs) -> None:
         """Return an async iterator of items.
 
         args and kwargs will be passed to the AsyncPageIterator constructor directly,
-        except page_iterator_class
+        except page_iterator_class and read_ahead
+
+        :keyword int read_ahead: How many pages to fetch ahead of the consumer, in a background
+         task, so that network round trips overlap with the processing of the items. Default is 0.
         """
         self._args = args
         self._kwargs = kwargs
@@ -120,10 +199,12 @@ class AsyncItemPaged(AsyncIterator[ReturnType]):
         self._page_iterator_class = self._kwargs.pop(
             "page_iterator_class", AsyncPageIterator
         )
+        self._read_ahead = self._kwargs.pop("read_ahead", 0)
 
     def by_page(
         self,
         continuation_token: Optional[str] = None,
+        read_ahead: Optional[int] = None,
     ) -> AsyncIterator[AsyncIterator[ReturnType]]:
         """Get an async iterator of pages of objects, instead of an async iterator of objects.
 
@@ -131,11 +212,21 @@ class AsyncItemPaged(AsyncIterator[ReturnType]):
             An opaque continuation token. This value can be retrieved from the
             continuation_token field of a previous generator object. If specified,
             this generator will begin returning results from this point.
+        :param int read_ahead:
+            How many pages to fetch ahead of the consumer, in a background task. Each
+            prefetched page is read in full, so memory is bounded by read_ahead pages.
+            Prefetching stops when the pages are not consumed, or when the iterator is closed.
+            Defaults to the value given to the constructor.
         :returns: An async iterator of pages (themselves async iterator of objects)
         """
-        return self._page_iterator_class(
+        page_iterator = self._page_iterator_class(
             *self._args, **self._kwargs, continuation_token=continuation_token
         )
+        if read_ahead is None:
+            read_ahead = self._read_ahead
+        if read_ahead > 0:
+            return _AsyncPrefetchPageIterator(page_iterator, read_ahead)
+        return page_iterator
 
     async def __anext__(self) -> ReturnType:
         if self._page_iterator is None:
@@ -94,6 +94,20 @@ class ServiceRequestError(AzureError):
     """
 
 
+class CircuitBreakerOpenError(ServiceRequestError):
+    """The request was not sent because the circuit breaker of its host is open,
+    after too many recent failures. No request was sent, and the retry policies
+    don't retry it.
+
+    :param str host: The host whose circuit is open.
+    """
+
+    def __init__(self, host, **kwargs):
+        self.host = host
+        message = "Circuit breaker open for host '{}', request not sent.".format(host)
+        super(CircuitBreakerOpenError, self).__init__(message, **kwargs)
+
+
 class ServiceResponseError(AzureError):
     """The request was sent, but the client failed to understand the response.
     The connection may have timed out. These errors can be retried for idempotent or
@@ -24,6 +24,7 @@
 #
 # --------------------------------------------------------------------------
 import itertools
+import threading
 from typing import (  # pylint: disable=unused-import
     Callable,
     Optional,
@@ -34,6 +35,11 @@ from typing import (  # pylint: disable=unused-import
 )
 import logging
 
+try:
+    import queue
+except ImportError:  # Python 2
+    import Queue as queue  # type: ignore
+
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -41,6 +47,13 @@ ReturnType = TypeVar("ReturnType")
 ResponseType = TypeVar("ResponseType")
 
 
+def _resolve_continuation_token(page_iterator):
+    token = page_iterator.continuation_token
+    if callable(token):
+        token = page_iterator.continuation_token = token()
+    return token
+
+
 class PageIterator(Iterator[Iterator[ReturnType]]):
     def __init__(
         self,
@@ -52,7 +65,8 @@ class PageIterator(Iterator[Iterator[ReturnType]]):
 
         :param get_next: Callable that take the continuation token and return a HTTP response
         :param extract_data: Callable that take an HTTP response and return a tuple continuation token,
-         list of ReturnType
+         list of ReturnType. For pages whose items are decoded lazily while the response streams in,
+         the continuation token can be a callable taking no argument, called once the next page is needed.
         :param str continuation_token: The continuation token needed by get_next
         """
         self._get_next = get_next
@@ -68,6 +82,7 @@ class PageIterator(Iterator[Iterator[ReturnType]]):
 
     def __next__(self):
         # type: () -> Iterator[ReturnType]
+        _resolve_continuation_token(self)
         if self.continuation_token is None and self._did_a_call_already:
             raise StopIteration("End of paging")
 
@@ -81,12 +96,92 @@ class PageIterator(Iterator[Iterator[ReturnType]]):
     next = __next__  # Python 2 compatibility.
 
 
+_END_OF_PAGES = object()
+
+
+def _fetch_pages(page_iterator, pages, closed):
+    """Read the pages of "page_iterator" into the "pages" queue, until done or closed."""
+    def put(entry):
+        while not closed.is_set():
+            try:
+                pages.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    try:
+        for page in page_iterator:
+            if not put((list(page), _resolve_continuation_token(page_iterator), None)):
+                return
+    except Exception as error:  # pylint: disable=broad-except
+        put((None, None, error))
+        return
+    put(_END_OF_PAGES)
+
+
+class _PrefetchPageIterator(Iterator[Iterator[ReturnType]]):
+    """Iterator of pages fetching up to "read_ahead" pages ahead of the consumer on a background thread.
+
+    Each page is read in full by the fetching thread, so at most "read_ahead" + 2 pages are held in memory,
+    and fetching stops when "read_ahead" pages are waiting to be consumed.
+
+    :param page_iterator: The iterator of pages to read ahead.
+    :param int read_ahead: How many pages can be fetched ahead of the consumer.
+    """
+    def __init__(self, page_iterator, read_ahead):
+        # type: (PageIterator, int) -> None
+        self.continuation_token = page_iterator.continuation_token
+        self._page_iterator = page_iterator
+        self._pages = queue.Queue(maxsize=read_ahead)  # type: queue.Queue
+        self._closed = threading.Event()
+        self._worker = None  # type: Optional[threading.Thread]
+
+    def __iter__(self):
+        """Return 'self'."""
+        return self
+
+    def __next__(self):
+        # type: () -> Iterator[ReturnType]
+        if self._worker is None:
+            # The worker doesn't reference self, so an abandoned iterator can be collected and closed.
+            self._worker = threading.Thread(
+                target=_fetch_pages, args=(self._page_iterator, self._pages, self._closed)
+            )
+            self._worker.daemon = True
+            self._worker.start()
+        if self._closed.is_set():
+            raise StopIteration("End of paging")
+        entry = self._pages.get()
+        if entry is _END_OF_PAGES:
+            self._closed.set()
+            raise StopIteration("End of paging")
+        page, self.continuation_token, error = entry
+        if error is not None:
+            self._closed.set()
+            raise error
+        return iter(page)
+
+    next = __next__  # Python 2 compatibility.
+
+    def close(self):
+        # type: () -> None
+        """Stop fetching pages ahead."""
+        self._closed.set()
+
+    def __del__(self):
+        self.close()
+
+
 class ItemPaged(Iterator[ReturnType]):
     def __init__(self, *args, **kwargs):
         """Return an iterator of items.
 
         args and kwargs will be passed to the PageIterator constructor directly,
-        except page_iterator_class
+        except page_iterator_class and read_ahead
+
+        :keyword int read_ahead: How many pages to fetch ahead of the consumer, on a background
+         thread, so that network round trips overlap with the processing of the items. Default is 0.
         """
         self._args = args
         self._kwargs = kwargs
@@ -94,20 +189,31 @@ class ItemPaged(Iterator[ReturnType]):
         self._page_iterator_class = self._kwargs.pop(
             "page_iterator_class", PageIterator
         )
+        self._read_ahead = self._kwargs.pop("read_ahead", 0)
 
-    def by_page(self, continuation_token=None):
-        # type: (Optional[str]) -> Iterator[Iterator[ReturnType]]
+    def by_page(self, continuation_token=None, read_ahead=None):
+        # type: (Optional[str], Optional[int]) -> Iterator[Iterator[ReturnType]]
         """Get an iterator of pages of objects, instead of an iterator of objects.
 
         :param str continuation_token:
             An opaque continuation token. This value can be retrieved from the
             continuation_token field of a previous generator object. If specified,
             this generator will begin returning results from this point.
+        :param int read_ahead:
+            How many pages to fetch ahead of the consumer, on a background thread. Each
+            prefetched page is read in full, so memory is bounded by read_ahead pages.
+            Prefetching stops when the pages are not consumed, or when the iterator is closed.
+            Defaults to the value given to the constructor.
         :returns: An iterator of pages (themselves iterator of objects)
         """
-        return self._page_iterator_class(
+        page_iterator = self._page_iterator_class(
             continuation_token=continuation_token, *self._args, **self._kwargs
         )
+        if read_ahead is None:
+            read_ahead = self._read_ahead
+        if read_ahead > 0:
+            return _PrefetchPageIterator(page_iterator, read_ahead)
+        return page_iterator
 
     def __iter__(self):
         """Return 'self'."""
@@ -25,10 +25,12 @@
 # --------------------------------------------------------------------------
 
 import logging
+from timeit import default_timer
 from typing import (TYPE_CHECKING, Generic, TypeVar, cast, IO, List, Union, Any, Mapping, Dict, Optional, # pylint: disable=unused-import
                     Tuple, Callable, Iterator)
 from azure.core.pipeline import AbstractContextManager, PipelineRequest, PipelineResponse, PipelineContext
 from azure.core.pipeline.policies import HTTPPolicy, SansIOHTTPPolicy
+from azure.core.pipeline.metrics import _build_instrumented_policies, _start_request, _finish_request
 HTTPResponseType = TypeVar("HTTPResponseType")
 HTTPRequestType = TypeVar("HTTPRequestType")
 HttpTransportType = TypeVar("HttpTransportType")
@@ -66,11 +68,106 @@ class _SansIOHTTPPolicyRunner(HTTPPolicy, Generic[HTTPRequestType, HTTPResponseT
         except Exception: #pylint: disable=broad-except
             if not self._policy.on_exception(request):
                 raise
-        else:
+            # The exception was handled: there is no response to process
+            return None
+        if response is not None:
             self._policy.on_response(request, response)
         return response
 
 
+class _FusedSansIOHTTPPolicyRunner(HTTPPolicy):
+    """Sync runner of consecutive SansIO policies, in a single stack frame.
+
+    Calls each "on_request" in order, then each "on_response" in reverse order, with
+    the same semantics as a chain of _SansIOHTTPPolicyRunner.
+
+    :param policies: The SansIO policies.
+    :type policies: list[~azure.core.pipeline.policies.SansIOHTTPPolicy]
+    """
+
+    def __init__(self, policies):
+        # type: (List[SansIOHTTPPolicy]) -> None
+        super(_FusedSansIOHTTPPolicyRunner, self).__init__()
+        self._policies = policies
+        self._reversed_policies = policies[::-1]
+        # The position of a failing policy is only looked up when it raises
+        self._positions = {id(policy): index for index, policy in enumerate(policies)}
+
+    def send(self, request):
+        # type: (PipelineRequest) -> PipelineResponse
+        """Modifies the request and sends to the next policy in the chain.
+
+        :param request: The PipelineRequest object.
+        :type request: ~azure.core.pipeline.PipelineRequest
+        :return: The PipelineResponse object.
+        :rtype: ~azure.core.pipeline.PipelineResponse
+        """
+        policies = self._policies
+        policy = None
+        try:
+            for policy in policies:
+                policy.on_request(request)
+        except Exception: #pylint: disable=broad-except
+            return _unwind_sansio_policies(policies, request, self._positions[id(policy)] - 1)
+        try:
+            response = self.next.send(request)
+        except Exception: #pylint: disable=broad-except
+            return _unwind_sansio_policies(policies, request, len(policies) - 1)
+        if response is None:
+            # An exception was handled further down the pipeline: there is no response to process
+            return None
+        try:
+            for policy in self._reversed_policies:
+                policy.on_response(request, response)
+        except Exception: #pylint: disable=broad-except
+            return _unwind_sansio_policies(policies, request, self._positions[id(policy)] - 1)
+        return response
+
+
+def _unwind_sansio_policies(policies, request, index):
+    # type: (List[SansIOHTTPPolicy], PipelineRequest, int) -> None
+    """Runs "on_exception" of the policies up to "index", innermost first.
+
+    Must be called from an except block. Like a chain of _SansIOHTTPPolicyRunner, the exception
+    goes through each policy until one handles it, and None is returned then; otherwise it is raised.
+    """
+    if index < 0:
+        raise  # pylint: disable=misplaced-bare-raise
+    try:
+        if not policies[index].on_exception(request):
+            raise  # pylint: disable=misplaced-bare-raise
+    except Exception: #pylint: disable=broad-except
+        return _unwind_sansio_policies(policies, request, index - 1)
+    return None
+
+
+def _build_impl_policies(policies, runner, fused_runner, fuse_sansio_policies):
+    # type: (Any, Callable, Callable, bool) -> List[Any]
+    """Wraps the SansIO policies in runners, grouping consecutive ones if "fuse_sansio_policies"."""
+    impl_policies = []  # type: List[Any]
+    group = []  # type: List[SansIOHTTPPolicy]
+    for policy in (policies or []):
+        if isinstance(policy, SansIOHTTPPolicy):
+            group.append(policy)
+            continue
+        if group:
+            impl_policies.extend(_wrap_sansio_group(group, runner, fused_runner, fuse_sansio_policies))
+            group = []
+        if policy:
+            impl_policies.append(policy)
+    if group:
+        impl_policies.extend(_wrap_sansio_group(group, runner, fused_runner, fuse_sansio_policies))
+    return impl_policies
+
+
+def _wrap_sansio_group(group, runner, fused_runner, fuse_sansio_policies):
+    # type: (List[SansIOHTTPPolicy], Callable, Callable, bool) -> List[Any]
+    # A policy added twice can't be told apart from its other position when it raises
+    if fuse_sansio_policies and len(group) > 1 and len(set(id(policy) for policy in group)) == len(group):
+        return [fused_runner(group)]
+    return [runner(policy) for policy in group]
+
+
 class _TransportRunner(HTTPPolicy):
     """Transport runner.
 
@@ -106,6 +203,12 @@ class Pipeline(AbstractContextManager, Generic[HTTPRequestType, HTTPResponseType
 
     :param transport: The Http Transport instance
     :param list policies: List of configured policies.
+    :param metrics_sink: If given, the time spent in each policy and in the transport, the retries
+     and the bytes sent and received are recorded for each request, and reported to this sink.
+    :type metrics_sink: ~azure.core.pipeline.metrics.MetricsSink
+    :param bool fuse_sansio_policies: If True, consecutive SansIO policies are run by a single
+     runner instead of a runner each, which makes the call stack of a request shallower.
+     The semantics are identical. A policy added more than once is not fused. Default value is False.
 
     Example:
         .. literalinclude:: ../examples/test_example_sync.py
@@ -115,19 +218,20 @@ class Pipeline(AbstractContextManager, Generic[HTTPRequestType, HTTPResponseType
             :dedent: 4
             :caption: Builds the pipeline for synchronous transport.
     """
-    def __init__(self, transport, policies=None):
-        # type: (HttpTransportType, PoliciesType) -> None
-        self._impl_policies = []  # type: List[HTTPPolicy]
+    def __init__(self, transport, policies=None, metrics_sink=None, fuse_sansio_policies=False):
+        # type: (HttpTransportType, PoliciesType, Any, bool) -> None
         self._transport = transport  # type: ignore
+        self._metrics_sink = metrics_sink
+        self._metrics_chain = None  # type: Optional[Tuple[HTTPPolicy, List[str]]]
 
-        for policy in (policies or []):
-            if isinstance(policy, SansIOHTTPPolicy):
-                self._impl_policies.append(_SansIOHTTPPolicyRunner(policy))
-            elif policy:
-                self._impl_policies.append(policy)
+        self._impl_policies = _build_impl_policies(
+            policies, _SansIOHTTPPolicyRunner, _FusedSansIOHTTPPolicyRunner, fuse_sansio_policies
+        )  # type: List[HTTPPolicy]
         for index in range(len(self._impl_policies)-1):
             self._impl_policies[index].next = self._impl_policies[index+1]
-        if self._impl_policies:
+        if metrics_sink is not None:
+            self._metrics_chain = _build_instrumented_policies(self._impl_policies, self._transport)
+        elif self._impl_policies:
             self._impl_policies[-1].next = _TransportRunner(self._transport)
 
     def __enter__(self):
@@ -149,5 +253,20 @@ class Pipeline(AbstractContextManager, Generic[HTTPRequestType, HTTPResponseType
         """
         context = PipelineContext(self._transport, **kwargs)
         pipeline_request = PipelineRequest(request, context) # type: PipelineRequest
+        if self._metrics_chain is not None:
+            return self._run_with_metrics(pipeline_request)
         first_node = self._impl_policies[0] if self._impl_policies else _TransportRunner(self._transport)
         return first_node.send(pipeline_request)  # type: ignore
+
+    def _run_with_metrics(self, pipeline_request):
+        # type: (PipelineRequest) -> PipelineResponse
+        first_node, policy_names = self._metrics_chain  # type: ignore
+        metrics = _start_request(pipeline_request, len(policy_names))
+        start = default_timer()
+        try:
+            response = first_node.send(pipeline_request)
+        except Exception as err:
+            _finish_request(self._metrics_sink, metrics, policy_names, start, err)
+            raise
+        _finish_request(self._metrics_sink, metrics, policy_names, start)
+        return response
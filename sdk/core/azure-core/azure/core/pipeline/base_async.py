@@ -24,11 +24,14 @@
 #
 # --------------------------------------------------------------------------
 import abc
-
+from timeit import default_timer
 from typing import Any, Union, List, Generic, TypeVar
 
 from azure.core.pipeline import PipelineRequest, PipelineResponse, PipelineContext
 from azure.core.pipeline.policies import AsyncHTTPPolicy, SansIOHTTPPolicy
+from azure.core.pipeline.metrics import _start_request, _finish_request
+from azure.core.pipeline.metrics_async import _build_async_instrumented_policies
+from azure.core.pipeline.base import _build_impl_policies, _unwind_sansio_policies
 
 AsyncHTTPResponseType = TypeVar("AsyncHTTPResponseType")
 HTTPRequestType = TypeVar("HTTPRequestType")
@@ -76,11 +79,60 @@ class _SansIOAsyncHTTPPolicyRunner(AsyncHTTPPolicy[HTTPRequestType, AsyncHTTPRes
         except Exception: #pylint: disable=broad-except
             if not self._policy.on_exception(request):
                 raise
-        else:
+            # The exception was handled: there is no response to process
+            return None
+        if response is not None:
             self._policy.on_response(request, response)
         return response
 
 
+class _FusedSansIOAsyncHTTPPolicyRunner(AsyncHTTPPolicy[HTTPRequestType, AsyncHTTPResponseType]): #pylint: disable=unsubscriptable-object
+    """Async runner of consecutive SansIO policies, in a single stack frame.
+
+    Calls each "on_request" in order, then each "on_response" in reverse order, with
+    the same semantics as a chain of _SansIOAsyncHTTPPolicyRunner.
+
+    :param policies: The SansIO policies.
+    :type policies: list[~azure.core.pipeline.policies.SansIOHTTPPolicy]
+    """
+
+    def __init__(self, policies: List[SansIOHTTPPolicy]) -> None:
+        super(_FusedSansIOAsyncHTTPPolicyRunner, self).__init__()
+        self._policies = policies
+        self._reversed_policies = policies[::-1]
+        # The position of a failing policy is only looked up when it raises
+        self._positions = {id(policy): index for index, policy in enumerate(policies)}
+
+    async def send(self, request: PipelineRequest):
+        """Modifies the request and sends to the next policy in the chain.
+
+        :param request: The PipelineRequest object.
+        :type request: ~azure.core.pipeline.PipelineRequest
+        :return: The PipelineResponse object.
+        :rtype: ~azure.core.pipeline.PipelineResponse
+        """
+        policies = self._policies
+        policy = None
+        try:
+            for policy in policies:
+                policy.on_request(request)
+        except Exception: #pylint: disable=broad-except
+            return _unwind_sansio_policies(policies, request, self._positions[id(policy)] - 1)
+        try:
+            response = await self.next.send(request)  # type: ignore
+        except Exception: #pylint: disable=broad-except
+            return _unwind_sansio_policies(policies, request, len(policies) - 1)
+        if response is None:
+            # An exception was handled further down the pipeline: there is no response to process
+            return None
+        try:
+            for policy in self._reversed_policies:
+                policy.on_response(request, response)
+        except Exception: #pylint: disable=broad-except
+            return _unwind_sansio_policies(policies, request, self._positions[id(policy)] - 1)
+        return response
+
+
 class _AsyncTransportRunner(AsyncHTTPPolicy[HTTPRequestType, AsyncHTTPResponseType]): #pylint: disable=unsubscriptable-object
     """Async Transport runner.
 
@@ -115,6 +167,12 @@ class AsyncPipeline(AbstractAsyncContextManager, Generic[HTTPRequestType, AsyncH
 
     :param transport: The async Http Transport instance.
     :param list policies: List of configured policies.
+    :param metrics_sink: If given, the time spent in each policy and in the transport, the retries
+     and the bytes sent and received are recorded for each request, and reported to this sink.
+    :type metrics_sink: ~azure.core.pipeline.metrics.MetricsSink
+    :param bool fuse_sansio_policies: If True, consecutive SansIO policies are run by a single
+     runner instead of a runner each, which makes the call stack of a request shallower.
+     The semantics are identical. A policy added more than once is not fused. Default value is False.
 
     Example:
         .. literalinclude:: ../examples/test_example_async.py
@@ -125,18 +183,22 @@ class AsyncPipeline(AbstractAsyncContextManager, Generic[HTTPRequestType, AsyncH
             :caption: Builds the async pipeline for asynchronous transport.
     """
 
-    def __init__(self, transport, policies: AsyncPoliciesType = None) -> None:
-        self._impl_policies = []  # type: ImplPoliciesType
+    def __init__(
+            self, transport, policies: AsyncPoliciesType = None, metrics_sink: Any = None,
+            fuse_sansio_policies: bool = False
+    ) -> None:
         self._transport = transport
+        self._metrics_sink = metrics_sink
+        self._metrics_chain = None
 
-        for policy in (policies or []):
-            if isinstance(policy, SansIOHTTPPolicy):
-                self._impl_policies.append(_SansIOAsyncHTTPPolicyRunner(policy))
-            elif policy:
-                self._impl_policies.append(policy)
+        self._impl_policies = _build_impl_policies(
+            policies, _SansIOAsyncHTTPPolicyRunner, _FusedSansIOAsyncHTTPPolicyRunner, fuse_sansio_policies
+        )  # type: ImplPoliciesType
         for index in range(len(self._impl_policies)-1):
             self._impl_policies[index].next = self._impl_policies[index+1]
-        if self._impl_policies:
+        if metrics_sink is not None:
+            self._metrics_chain = _build_async_instrumented_policies(self._impl_policies, self._transport)
+        elif self._impl_policies:
             self._impl_policies[-1].next = _AsyncTransportRunner(self._transport)
 
     def __enter__(self):
@@ -163,5 +225,19 @@ class AsyncPipeline(AbstractAsyncContextManager, Generic[HTTPRequestType, AsyncH
         """
         context = PipelineContext(self._transport, **kwargs)
         pipeline_request = PipelineRequest(request, context)
+        if self._metrics_chain is not None:
+            return await self._run_with_metrics(pipeline_request)
         first_node = self._impl_policies[0] if self._impl_policies else _AsyncTransportRunner(self._transport)
         return await first_node.send(pipeline_request)  # type: ignore
+
+    async def _run_with_metrics(self, pipeline_request: PipelineRequest):
+        first_node, policy_names = self._metrics_chain  # type: ignore
+        metrics = _start_request(pipeline_request, len(policy_names))
+        start = default_timer()
+        try:
+            response = await first_node.send(pipeline_request)
+        except Exception as err:
+            _finish_request(self._metrics_sink, metrics, policy_names, start, err)
+            raise
+        _finish_request(self._metrics_sink, metrics, policy_names, start)
+        return response
@@ -0,0 +1,365 @@
+# --------------------------------------------------------------------------
+#
+# Copyright (c) Microsoft Corporation. All rights reserved.
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the ""Software""), to
+# deal in the Software without restriction, including without limitation the
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+# sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED *AS IS*, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#
+# --------------------------------------------------------------------------
+"""
+This module records metrics of the requests sent through a pipeline, and reports them to a sink.
+
+Metrics are only recorded when a sink is given to the pipeline: otherwise the pipeline is built
+exactly as without this module, at no cost.
+"""
+from __future__ import absolute_import
+from collections import OrderedDict
+import logging
+import threading
+from timeit import default_timer
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple  # pylint: disable=unused-import
+
+from azure.core.pipeline import PipelineResponse
+from azure.core.pipeline.policies import HTTPPolicy
+
+try:
+    from urlparse import urlparse  # type: ignore
+except ImportError:
+    from urllib.parse import urlparse
+
+if TYPE_CHECKING:
+    # pylint:disable=unused-import
+    from azure.core.pipeline import PipelineRequest
+
+_LOGGER = logging.getLogger(__name__)
+
+#: Name of the RequestMetrics in the pipeline context.
+METRICS_CONTEXT_NAME = "metrics"
+
+
+class RequestMetrics(object):
+    """Metrics of one request run through a pipeline.
+
+    :ivar str method: The HTTP method.
+    :ivar str host: The host the request was sent to.
+    :ivar policy_durations: The time spent in each policy, excluding the time spent in the
+     next policies and the transport, in seconds, by policy name.
+    :vartype policy_durations: ~collections.OrderedDict[str, float]
+    :ivar float transport_duration: The time spent in the transport, for all attempts, in seconds.
+     This includes DNS resolution, connection, TLS handshake and server time.
+    :ivar float total_duration: The time spent running the pipeline, in seconds.
+    :ivar int transport_attempts: How many times the request was sent by the transport.
+    :ivar int bytes_sent: The size of the request bodies sent, for all attempts, when known.
+    :ivar int bytes_received: The size of the last response body, when known.
+    :ivar int new_connections: How many new connections were opened for the request, if the
+     transport reports it (connection pool misses). None otherwise.
+    :ivar int status_code: The status code of the last response, if any.
+    :ivar str error: The type name of the error raised by the pipeline, if any.
+    """
+
+    def __init__(self, method, url):
+        # type: (str, str) -> None
+        self.method = method
+        self.host = urlparse(url).netloc
+        self.policy_durations = OrderedDict()  # type: OrderedDict
+        self.transport_duration = 0.0
+        self.total_duration = 0.0
+        self.transport_attempts = 0
+        self.bytes_sent = 0
+        self.bytes_received = None  # type: Optional[int]
+        self.new_connections = None  # type: Optional[int]
+        self.status_code = None  # type: Optional[int]
+        self.error = None  # type: Optional[str]
+        self._inclusive_durations = []  # type: List[float]
+        # Guards the updates made by the attempts running on several threads, such as hedged requests
+        self._lock = threading.Lock()
+
+    @property
+    def retry_count(self):
+        # type: () -> int
+        """How many times the request was sent again, by retries or redirects."""
+        return max(self.transport_attempts - 1, 0)
+
+    def samples(self):
+        # type: () -> List[Tuple[str, float, Dict[str, Any]]]
+        """The metrics as a list of (name, value, attributes) samples, for metrics systems.
+
+        :rtype: list[tuple[str, float, dict]]
+        """
+        attributes = {
+            'http.method': self.method,
+            'net.peer.name': self.host,
+            'http.status_code': self.status_code,
+        }
+        samples = [
+            ('request.duration', self.total_duration, attributes),
+            ('transport.duration', self.transport_duration, attributes),
+            ('request.retries', self.retry_count, attributes),
+            ('request.bytes_sent', self.bytes_sent, attributes),
+        ]  # type: List[Tuple[str, float, Dict[str, Any]]]
+        if self.bytes_received is not None:
+            samples.append(('response.bytes_received', self.bytes_received, attributes))
+        if self.new_connections is not None:
+            samples.append(('transport.new_connections', self.new_connections, attributes))
+        for policy, duration in self.policy_durations.items():
+            samples.append(('policy.duration', duration, {'policy': policy}))
+        return samples
+
+
+class MetricsSink(object):
+    """Receives the metrics of the requests run through a pipeline.
+
+    Subclasses implement "record". It is called on the thread (or task) that ran the request,
+    once the pipeline returns or raises, so it should be fast and thread-safe.
+    """
+
+    def record(self, metrics):
+        # type: (RequestMetrics) -> None
+        """Record the metrics of a request.
+
+        :param metrics: The metrics of the request.
+        :type metrics: ~azure.core.pipeline.metrics.RequestMetrics
+        """
+        raise NotImplementedError()
+
+
+class CallbackMetricsSink(MetricsSink):
+    """A sink calling a function with each sample of the request metrics.
+
+    The function takes the name of the metric, its value, and a dict of attributes, which
+    maps to the histograms and counters of OpenTelemetry and similar metrics systems.
+
+    :param callback: Function taking (name, value, attributes).
+    """
+
+    def __init__(self, callback):
+        # type: (Callable[[str, float, Dict[str, Any]], None]) -> None
+        self._callback = callback
+
+    def record(self, metrics):
+        # type: (RequestMetrics) -> None
+        for name, value, attributes in metrics.samples():
+            self._callback(name, value, attributes)
+
+
+class PrometheusMetricsSink(MetricsSink):
+    """A sink exporting the request metrics as Prometheus histograms and counters.
+
+    Requires the "prometheus_client" package.
+
+    :param registry: The Prometheus registry. Defaults to the default registry.
+    :param str namespace: The namespace of the metric names. Default value is "azure_core".
+    """
+
+    def __init__(self, registry=None, namespace="azure_core"):
+        try:
+            from prometheus_client import REGISTRY, Counter, Histogram
+        except ImportError:
+            raise ImportError("The 'prometheus_client' package is required to use PrometheusMetricsSink.")
+        registry = registry or REGISTRY
+        labels = ['method', 'host', 'status_code']
+        self._request_duration = Histogram(
+            'request_duration_seconds', 'Time spent running the pipeline', labels,
+            namespace=namespace, registry=registry)
+        self._transport_duration = Histogram(
+            'transport_duration_seconds', 'Time spent in the transport', labels,
+            namespace=namespace, registry=registry)
+        self._policy_duration = Histogram(
+            'policy_duration_seconds', 'Time spent in each policy', ['policy'],
+            namespace=namespace, registry=registry)
+        self._retries = Counter(
+            'retries', 'Requests sent again', labels, namespace=namespace, registry=registry)
+        self._bytes_sent = Counter(
+            'bytes_sent', 'Request body bytes sent', labels, namespace=namespace, registry=registry)
+        self._bytes_received = Counter(
+            'bytes_received', 'Response body bytes received', labels, namespace=namespace, registry=registry)
+        self._new_connections = Counter(
+            'new_connections', 'Connections opened', labels, namespace=namespace, registry=registry)
+
+    def record(self, metrics):
+        # type: (RequestMetrics) -> None
+        labels = (metrics.method, metrics.host, str(metrics.status_code))
+        self._request_duration.labels(*labels).observe(metrics.total_duration)
+        self._transport_duration.labels(*labels).observe(metrics.transport_duration)
+        for policy, duration in metrics.policy_durations.items():
+            self._policy_duration.labels(policy).observe(duration)
+        if metrics.retry_count:
+            self._retries.labels(*labels).inc(metrics.retry_count)
+        self._bytes_sent.labels(*labels).inc(metrics.bytes_sent)
+        if metrics.bytes_received:
+            self._bytes_received.labels(*labels).inc(metrics.bytes_received)
+        if metrics.new_connections:
+            self._new_connections.labels(*labels).inc(metrics.new_connections)
+
+
+def _get_policy_name(policy):
+    # type: (Any) -> str
+    # SansIO policies are wrapped in a runner, or grouped in a fused runner
+    grouped = getattr(policy, '_policies', None)
+    if grouped is not None:
+        return "+".join(type(sansio_policy).__name__ for sansio_policy in grouped)
+    return type(getattr(policy, '_policy', policy)).__name__
+
+
+def _get_body_size(http_request):
+    # type: (Any) -> int
+    length = http_request.headers.get('Content-Length')
+    if length is not None:
+        try:
+            return int(length)
+        except ValueError:
+            pass
+    data = http_request.data
+    if isinstance(data, (bytes, bytearray)):
+        return len(data)
+    if isinstance(data, memoryview):
+        return data.nbytes
+    return 0
+
+
+def _start_request(request, policy_count):
+    # type: (PipelineRequest, int) -> RequestMetrics
+    metrics = RequestMetrics(request.http_request.method, request.http_request.url)
+    # One slot per policy, and one for the transport
+    metrics._inclusive_durations = [0.0] * (policy_count + 1)  # pylint: disable=protected-access
+    request.context[METRICS_CONTEXT_NAME] = metrics
+    return metrics
+
+
+def _finish_request(sink, metrics, policy_names, start, error=None):
+    # type: (MetricsSink, RequestMetrics, List[str], float, Optional[Exception]) -> None
+    metrics.total_duration = default_timer() - start
+    durations = metrics._inclusive_durations  # pylint: disable=protected-access
+    for index, name in enumerate(policy_names):
+        duration = durations[index] - durations[index + 1]
+        metrics.policy_durations[name] = metrics.policy_durations.get(name, 0.0) + duration
+    if error is not None:
+        metrics.error = type(error).__name__
+    try:
+        sink.record(metrics)
+    except Exception:  # pylint: disable=broad-except
+        _LOGGER.warning("Failed to record request metrics.", exc_info=True)
+
+
+def _record_response(metrics, request, response):
+    # type: (RequestMetrics, PipelineRequest, Any) -> None
+    metrics.bytes_sent += _get_body_size(request.http_request)
+    metrics.status_code = response.status_code
+    length = response.headers.get('Content-Length')
+    if length is not None:
+        try:
+            metrics.bytes_received = int(length)
+        except ValueError:
+            pass
+
+
+def _get_connection_counter(transport, request):
+    # type: (Any, PipelineRequest) -> Optional[Callable[[], Optional[int]]]
+    get_counter = getattr(transport, '_connection_counter', None)
+    if get_counter is None:
+        return None
+    try:
+        return get_counter(request.http_request.url)
+    except Exception:  # pylint: disable=broad-except
+        return None
+
+
+def _count_connections(counter):
+    # type: (Optional[Callable[[], Optional[int]]]) -> Optional[int]
+    if counter is None:
+        return None
+    try:
+        count = counter()
+    except Exception:  # pylint: disable=broad-except
+        return None
+    return count if isinstance(count, int) else None
+
+
+def _record_attempt(metrics, index, elapsed, connections, counter):
+    # type: (RequestMetrics, int, float, Optional[int], Optional[Callable[[], Optional[int]]]) -> None
+    new_connections = None
+    if connections is not None:
+        new_connections = _count_connections(counter)
+    with metrics._lock:  # pylint: disable=protected-access
+        metrics.transport_duration += elapsed
+        metrics._inclusive_durations[index] += elapsed  # pylint: disable=protected-access
+        if new_connections is not None:
+            metrics.new_connections = (metrics.new_connections or 0) + max(new_connections - connections, 0)
+
+
+class _TimedPolicy(HTTPPolicy):
+    """Records the time spent in a policy and the ones after it.
+
+    :param policy: The policy to time.
+    :param int index: The position of the policy in the pipeline.
+    """
+    def __init__(self, policy, index):
+        super(_TimedPolicy, self).__init__()
+        self._policy = policy
+        self._index = index
+
+    def send(self, request):
+        start = default_timer()
+        try:
+            return self._policy.send(request)
+        finally:
+            metrics = request.context[METRICS_CONTEXT_NAME]
+            with metrics._lock:  # pylint: disable=protected-access
+                metrics._inclusive_durations[self._index] += default_timer() - start  # pylint: disable=protected-access
+
+
+class _TimedTransportRunner(HTTPPolicy):
+    """Records the time spent in the transport, and what it sent and received.
+
+    :param sender: The Http Transport instance.
+    :param int index: The position of the transport in the pipeline.
+    """
+    def __init__(self, sender, index):
+        super(_TimedTransportRunner, self).__init__()
+        self._sender = sender
+        self._index = index
+
+    def send(self, request):
+        metrics = request.context[METRICS_CONTEXT_NAME]
+        with metrics._lock:  # pylint: disable=protected-access
+            metrics.transport_attempts += 1
+        counter = _get_connection_counter(self._sender, request)
+        connections = _count_connections(counter)
+        start = default_timer()
+        try:
+            response = self._sender.send(request.http_request, **request.context.options)
+        finally:
+            _record_attempt(metrics, self._index, default_timer() - start, connections, counter)
+        with metrics._lock:  # pylint: disable=protected-access
+            _record_response(metrics, request, response)
+        return PipelineResponse(request.http_request, response, context=request.context)
+
+
+def _build_instrumented_policies(impl_policies, transport):
+    # type: (List[HTTPPolicy], Any) -> Tuple[HTTPPolicy, List[str]]
+    """Chain the policies and the transport, wrapped to record their metrics.
+
+    :return: The first node of the chain, and the names of the policies.
+    """
+    nodes = [_TimedPolicy(policy, index) for index, policy in enumerate(impl_policies)]
+    runner = _TimedTransportRunner(transport, len(impl_policies))
+    for policy, node in zip(impl_policies, nodes[1:] + [runner]):
+        policy.next = node
+    return (nodes[0] if nodes else runner), [_get_policy_name(policy) for policy in impl_policies]
@@ -0,0 +1,98 @@
+# --------------------------------------------------------------------------
+#
+# Copyright (c) Microsoft Corporation. All rights reserved.
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the ""Software""), to
+# deal in the Software without restriction, including without limitation the
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+# sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED *AS IS*, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#
+# --------------------------------------------------------------------------
+"""
+This module records metrics of the requests sent through an async pipeline.
+"""
+from timeit import default_timer
+from typing import Any, List, Tuple
+
+from azure.core.pipeline import PipelineRequest, PipelineResponse
+from azure.core.pipeline.policies import AsyncHTTPPolicy
+from azure.core.pipeline.metrics import (
+    METRICS_CONTEXT_NAME,
+    _count_connections,
+    _get_connection_counter,
+    _get_policy_name,
+    _record_attempt,
+    _record_response,
+)
+
+
+class _AsyncTimedPolicy(AsyncHTTPPolicy):
+    """Records the time spent in an async policy and the ones after it.
+
+    :param policy: The policy to time.
+    :param int index: The position of the policy in the pipeline.
+    """
+    def __init__(self, policy, index: int) -> None:
+        super(_AsyncTimedPolicy, self).__init__()
+        self._policy = policy
+        self._index = index
+
+    async def send(self, request: PipelineRequest):
+        start = default_timer()
+        try:
+            return await self._policy.send(request)
+        finally:
+            metrics = request.context[METRICS_CONTEXT_NAME]
+            metrics._inclusive_durations[self._index] += default_timer() - start  # pylint: disable=protected-access
+
+
+class _AsyncTimedTransportRunner(AsyncHTTPPolicy):
+    """Records the time spent in the async transport, and what it sent and received.
+
+    :param sender: The async Http Transport instance.
+    :param int index: The position of the transport in the pipeline.
+    """
+    def __init__(self, sender, index: int) -> None:
+        super(_AsyncTimedTransportRunner, self).__init__()
+        self._sender = sender
+        self._index = index
+
+    async def send(self, request: PipelineRequest):
+        metrics = request.context[METRICS_CONTEXT_NAME]
+        metrics.transport_attempts += 1
+        counter = _get_connection_counter(self._sender, request)
+        connections = _count_connections(counter)
+        start = default_timer()
+        try:
+            response = await self._sender.send(request.http_request, **request.context.options)
+        finally:
+            _record_attempt(metrics, self._index, default_timer() - start, connections, counter)
+        _record_response(metrics, request, response)
+        return PipelineResponse(request.http_request, response, request.context)
+
+
+def _build_async_instrumented_policies(impl_policies: List[AsyncHTTPPolicy], transport: Any) -> Tuple[Any, List[str]]:
+    """Chain the async policies and the transport, wrapped to record their metrics.
+
+    :return: The first node of the chain, and the names of the policies.
+    """
+    nodes = [_AsyncTimedPolicy(policy, index) for index, policy in enumerate(impl_policies)]
+    runner = _AsyncTimedTransportRunner(transport, len(impl_policies))
+    for policy, node in zip(impl_policies, nodes[1:] + [runner]):
+        policy.next = node
+    return (nodes[0] if nodes else runner), [_get_policy_name(policy) for policy in impl_policies]
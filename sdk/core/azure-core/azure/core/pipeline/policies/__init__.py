@@ -28,8 +28,10 @@ from .base import HTTPPolicy, SansIOHTTPPolicy
 from .authentication import BearerTokenCredentialPolicy
 from .custom_hook import CustomHookPolicy
 from .redirect import RedirectPolicy
-from .retry import RetryPolicy
+from .retry import RetryPolicy, RetryBudget
 from .distributed_tracing import DistributedTracingPolicy
+from .circuit_breaker import CircuitBreakerPolicy
+from .hedging import HedgingPolicy
 from .universal import (
     HeadersPolicy,
     UserAgentPolicy,
@@ -47,10 +49,13 @@ __all__ = [
     'NetworkTraceLoggingPolicy',
     'ContentDecodePolicy',
     'RetryPolicy',
+    'RetryBudget',
     'RedirectPolicy',
     'ProxyPolicy',
     'CustomHookPolicy',
-    'DistributedTracingPolicy'
+    'DistributedTracingPolicy',
+    'CircuitBreakerPolicy',
+    'HedgingPolicy'
 ]
 
 #pylint: disable=unused-import
@@ -60,11 +65,15 @@ try:
     from .authentication_async import AsyncBearerTokenCredentialPolicy
     from .redirect_async import AsyncRedirectPolicy
     from .retry_async import AsyncRetryPolicy
+    from .circuit_breaker_async import AsyncCircuitBreakerPolicy
+    from .hedging_async import AsyncHedgingPolicy
     __all__.extend([
         'AsyncHTTPPolicy',
         'AsyncBearerTokenCredentialPolicy',
         'AsyncRedirectPolicy',
-        'AsyncRetryPolicy'
+        'AsyncRetryPolicy',
+        'AsyncCircuitBreakerPolicy',
+        'AsyncHedgingPolicy'
     ])
 except (ImportError, SyntaxError):
     pass  # Async not supported
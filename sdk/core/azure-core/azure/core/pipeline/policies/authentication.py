@@ -3,6 +3,8 @@
 # Licensed under the MIT License. See LICENSE.txt in the project root for
 # license information.
 # -------------------------------------------------------------------------
+import logging
+import threading
 import time
 
 from . import HTTPPolicy
@@ -18,6 +20,14 @@ if TYPE_CHECKING:
     from azure.core.credentials import AccessToken, TokenCredential
     from azure.core.pipeline import PipelineRequest, PipelineResponse
 
+_LOGGER = logging.getLogger(__name__)
+
+# a token is refreshed when it expires within this many seconds
+_REFRESH_WINDOW = 300
+# a token expiring within this many seconds is no longer sent while a refresh is pending
+_EXPIRY_MARGIN = 30
+# minimum delay, in seconds, between background refresh attempts after a failure
+_REFRESH_RETRY_DELAY = 30
 
 # pylint:disable=too-few-public-methods
 class _BearerTokenCredentialPolicyBase(object):
@@ -26,14 +36,17 @@ class _BearerTokenCredentialPolicyBase(object):
     :param credential: The credential.
     :type credential: ~azure.core.credentials.TokenCredential
     :param str scopes: Lets you specify the type of access needed.
+    :keyword bool background_refresh: Whether to refresh the token in the background ahead of its expiry.
     """
 
-    def __init__(self, credential, *scopes, **kwargs):  # pylint:disable=unused-argument
+    def __init__(self, credential, *scopes, **kwargs):
         # type: (TokenCredential, *str, Mapping[str, Any]) -> None
         super(_BearerTokenCredentialPolicyBase, self).__init__()
         self._scopes = scopes
         self._credential = credential
         self._token = None  # type: Optional[AccessToken]
+        self._background_refresh = kwargs.get("background_refresh", False)
+        self._next_refresh_attempt = 0.0
 
     @staticmethod
     def _update_headers(headers, token):
@@ -48,7 +61,18 @@ class _BearerTokenCredentialPolicyBase(object):
     @property
     def _need_new_token(self):
         # type: () -> bool
-        return not self._token or self._token.expires_on - time.time() < 300
+        return not self._token or self._token.expires_on - time.time() < _REFRESH_WINDOW
+
+    @property
+    def _token_is_usable(self):
+        # type: () -> bool
+        """Whether the cached token can still be sent while a new one is being acquired."""
+        return bool(self._token) and self._token.expires_on - time.time() > _EXPIRY_MARGIN  # type: ignore
+
+    @property
+    def _can_refresh_in_background(self):
+        # type: () -> bool
+        return self._token_is_usable and time.time() >= self._next_refresh_attempt
 
 
 class BearerTokenCredentialPolicy(_BearerTokenCredentialPolicyBase, HTTPPolicy):
@@ -57,8 +81,60 @@ class BearerTokenCredentialPolicy(_BearerTokenCredentialPolicyBase, HTTPPolicy):
     :param credential: The credential.
     :type credential: ~azure.core.TokenCredential
     :param str scopes: Lets you specify the type of access needed.
+    :keyword bool background_refresh: Whether to refresh the token in the background ahead of its expiry.
+     When enabled, a token nearing expiry keeps being sent while a single background thread acquires
+     its replacement; callers only wait when no usable token is cached, and then share one in-flight
+     refresh instead of each calling the credential. Default value is False.
     """
 
+    def __init__(self, credential, *scopes, **kwargs):
+        # type: (TokenCredential, *str, Mapping[str, Any]) -> None
+        super(BearerTokenCredentialPolicy, self).__init__(credential, *scopes, **kwargs)
+        self._lock = threading.Lock()
+        self._refresh_in_flight = None  # type: Optional[threading.Event]
+
+    def _refresh_token(self, done, raise_error):
+        # type: (threading.Event, bool) -> None
+        try:
+            self._token = self._credential.get_token(*self._scopes)
+        except Exception:  # pylint:disable=broad-except
+            self._next_refresh_attempt = time.time() + _REFRESH_RETRY_DELAY
+            if raise_error:
+                raise
+            _LOGGER.warning("Background token refresh failed, the cached token will be used until it expires.",
+                            exc_info=True)
+        finally:
+            with self._lock:
+                self._refresh_in_flight = None
+            done.set()
+
+    def _ensure_token(self):
+        # type: () -> None
+        """Makes sure a usable token is cached, refreshing it at most once at a time."""
+        with self._lock:
+            if not self._need_new_token:
+                return
+            done = self._refresh_in_flight
+            start_refresh = done is None and (self._can_refresh_in_background or not self._token_is_usable)
+            if start_refresh:
+                done = self._refresh_in_flight = threading.Event()
+
+        if start_refresh:
+            if self._token_is_usable:
+                # keep serving the cached token while its replacement is acquired
+                worker = threading.Thread(target=self._refresh_token, args=(done, False))
+                worker.daemon = True
+                worker.start()
+            else:
+                self._refresh_token(done, raise_error=True)
+            return
+
+        if done is not None and not self._token_is_usable:
+            done.wait()
+        if not self._token_is_usable:
+            # the refresh we waited on failed; try again on this thread so its error surfaces here
+            self._token = self._credential.get_token(*self._scopes)
+
     def send(self, request):
         # type: (PipelineRequest) -> PipelineResponse
         """Adds a bearer token Authorization header to request and sends request to next policy.
@@ -68,7 +144,9 @@ class BearerTokenCredentialPolicy(_BearerTokenCredentialPolicyBase, HTTPPolicy):
         :return: The pipeline response object
         :rtype: ~azure.core.pipeline.PipelineResponse
         """
-        if self._need_new_token:
+        if self._background_refresh:
+            self._ensure_token()
+        elif self._need_new_token:
             self._token = self._credential.get_token(*self._scopes)
         self._update_headers(request.http_request.headers, self._token.token)  # type: ignore
         return self.next.send(request)
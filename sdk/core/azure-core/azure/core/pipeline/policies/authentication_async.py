@@ -3,11 +3,18 @@
 # Licensed under the MIT License. See LICENSE.txt in the project root for
 # license information.
 # -------------------------------------------------------------------------
+import asyncio
 import threading
+import time
+from typing import Optional
 
 from azure.core.pipeline import PipelineRequest, PipelineResponse
 from azure.core.pipeline.policies import AsyncHTTPPolicy
-from azure.core.pipeline.policies.authentication import _BearerTokenCredentialPolicyBase
+from azure.core.pipeline.policies.authentication import (
+    _BearerTokenCredentialPolicyBase,
+    _LOGGER,
+    _REFRESH_RETRY_DELAY,
+)
 
 
 class AsyncBearerTokenCredentialPolicy(_BearerTokenCredentialPolicyBase, AsyncHTTPPolicy):
@@ -17,11 +24,52 @@ class AsyncBearerTokenCredentialPolicy(_BearerTokenCredentialPolicyBase, AsyncHT
     :param credential: The credential.
     :type credential: ~azure.core.credentials.TokenCredential
     :param str scopes: Lets you specify the type of access needed.
+    :keyword bool background_refresh: Whether to refresh the token in the background ahead of its expiry.
+     When enabled, a token nearing expiry keeps being sent while a single asyncio task acquires its
+     replacement; callers only wait when no usable token is cached, and then share one in-flight
+     refresh instead of each calling the credential. Requires an asyncio event loop. Default value is False.
     """
 
     def __init__(self, credential, *scopes, **kwargs):
         super().__init__(credential, *scopes, **kwargs)
         self._lock = threading.Lock()
+        self._refresh_in_flight = None  # type: Optional[asyncio.Future]
+
+    async def _refresh_token(self) -> None:
+        try:
+            self._token = await self._credential.get_token(*self._scopes)  # type: ignore
+        except Exception:
+            self._next_refresh_attempt = time.time() + _REFRESH_RETRY_DELAY
+            raise
+        finally:
+            self._refresh_in_flight = None
+
+    @staticmethod
+    def _log_background_failure(task: asyncio.Future) -> None:
+        if not task.cancelled() and task.exception():
+            _LOGGER.warning("Background token refresh failed, the cached token will be used until it expires.",
+                            exc_info=task.exception())
+
+    async def _ensure_token(self) -> None:
+        """Makes sure a usable token is cached, refreshing it at most once at a time."""
+        if not self._need_new_token:
+            return
+        refresh = self._refresh_in_flight
+        if refresh is None and (self._can_refresh_in_background or not self._token_is_usable):
+            refresh = self._refresh_in_flight = asyncio.ensure_future(self._refresh_token())
+            if self._token_is_usable:
+                # no caller waits on a background refresh, so its failure is only logged
+                refresh.add_done_callback(self._log_background_failure)
+        if refresh is None or self._token_is_usable:
+            # keep serving the cached token while its replacement is acquired
+            return
+        try:
+            await asyncio.shield(refresh)
+        except Exception:  # pylint:disable=broad-except
+            pass
+        if not self._token_is_usable:
+            # the refresh we waited on failed; try again here so its error surfaces to this caller
+            self._token = await self._credential.get_token(*self._scopes)  # type: ignore
 
     async def send(self, request: PipelineRequest) -> PipelineResponse:
         """Adds a bearer token Authorization header to request and sends request to next policy.
@@ -31,8 +79,11 @@ class AsyncBearerTokenCredentialPolicy(_BearerTokenCredentialPolicyBase, AsyncHT
         :return: The pipeline response object
         :rtype: ~azure.core.pipeline.PipelineResponse
         """
-        with self._lock:
-            if self._need_new_token:
-                self._token = await self._credential.get_token(*self._scopes)  # type: ignore
+        if self._background_refresh:
+            await self._ensure_token()
+        else:
+            with self._lock:
+                if self._need_new_token:
+                    self._token = await self._credential.get_token(*self._scopes)  # type: ignore
         self._update_headers(request.http_request.headers, self._token.token)  # type: ignore
         return await self.next.send(request)  # type: ignore
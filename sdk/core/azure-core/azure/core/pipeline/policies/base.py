@@ -99,6 +99,7 @@ class SansIOHTTPPolicy(Generic[HTTPRequestType, HTTPResponseType]):
 
         Developer can optionally implement this method to return True
         if the exception has been handled and should not be forwarded to the caller.
+        The pipeline then returns None, without calling "on_response" of the outer policies.
 
         This method is executed inside the exception handler.
 
@@ -0,0 +1,229 @@
+# --------------------------------------------------------------------------
+#
+# Copyright (c) Microsoft Corporation. All rights reserved.
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the ""Software""), to
+# deal in the Software without restriction, including without limitation the
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+# sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED *AS IS*, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#
+# --------------------------------------------------------------------------
+"""
+This module is the circuit breaker policy, failing fast on hosts that keep failing.
+"""
+from __future__ import absolute_import
+import collections
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Dict, Optional  # pylint: disable=unused-import
+
+from azure.core.exceptions import CircuitBreakerOpenError, ServiceRequestError, ServiceResponseError
+from .base import HTTPPolicy
+
+try:
+    from urlparse import urlparse  # type: ignore
+except ImportError:
+    from urllib.parse import urlparse
+
+if TYPE_CHECKING:
+    # pylint:disable=unused-import
+    from azure.core.pipeline import PipelineRequest, PipelineResponse
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class _HostCircuit(object):
+    """Failure statistics and state of the circuit of one host.
+
+    Outcomes are counted in one bucket per second, over a rolling window.
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self):
+        self.state = self.CLOSED
+        self.opened_at = 0.0
+        self.probing = False
+        self.buckets = collections.deque()  # type: collections.deque
+
+    def record(self, failed, now, window):
+        # type: (bool, float, float) -> None
+        second = int(now)
+        if self.buckets and self.buckets[-1][0] == second:
+            bucket = self.buckets[-1]
+        else:
+            bucket = [second, 0, 0]
+            self.buckets.append(bucket)
+        bucket[1] += 1
+        if failed:
+            bucket[2] += 1
+        while self.buckets and self.buckets[0][0] <= now - window:
+            self.buckets.popleft()
+
+    def counts(self):
+        total = sum(bucket[1] for bucket in self.buckets)
+        failures = sum(bucket[2] for bucket in self.buckets)
+        return total, failures
+
+
+class _CircuitBreakerPolicyBase(object):
+    """Per-host circuit breaker state, shared by the sync and async policies.
+
+    :keyword float circuit_failure_ratio: The ratio of failed requests, over the rolling window,
+     from which the circuit of a host opens. Default value is 0.5.
+    :keyword int circuit_minimum_requests: The minimum number of requests in the rolling window
+     before the failure ratio is considered. Default value is 10.
+    :keyword float circuit_window: The duration of the rolling window, in seconds. Default value is 30.
+    :keyword float circuit_open_duration: How long a circuit stays open before a probe request
+     is let through, in seconds. Default value is 30.
+    """
+
+    def __init__(self, **kwargs):
+        self.failure_ratio = kwargs.pop('circuit_failure_ratio', 0.5)
+        self.minimum_requests = kwargs.pop('circuit_minimum_requests', 10)
+        self.window = kwargs.pop('circuit_window', 30)
+        self.open_duration = kwargs.pop('circuit_open_duration', 30)
+        self._circuits = {}  # type: Dict[str, _HostCircuit]
+        self._lock = threading.Lock()
+        super(_CircuitBreakerPolicyBase, self).__init__()
+
+    @staticmethod
+    def _get_host(request):
+        # type: (PipelineRequest) -> str
+        return urlparse(request.http_request.url).netloc
+
+    def get_state(self, host):
+        # type: (str) -> str
+        """Get the state of the circuit of a host.
+
+        :param str host: The host, as "hostname[:port]".
+        :return: "closed", "open" or "half-open".
+        :rtype: str
+        """
+        with self._lock:
+            circuit = self._circuits.get(host)
+            return circuit.state if circuit else _HostCircuit.CLOSED
+
+    def _before_send(self, request):
+        # type: (PipelineRequest) -> bool
+        """Check the circuit of the request host, raising if the request must not be sent.
+
+        :return: Whether this request is the probe of a half-open circuit.
+        :rtype: bool
+        :raises: ~azure.core.exceptions.CircuitBreakerOpenError if the circuit is open.
+        """
+        host = self._get_host(request)
+        with self._lock:
+            circuit = self._circuits.get(host)
+            if circuit is None or circuit.state == _HostCircuit.CLOSED:
+                return False
+            if circuit.state == _HostCircuit.OPEN and time.time() - circuit.opened_at >= self.open_duration:
+                circuit.state = _HostCircuit.HALF_OPEN
+            if circuit.state == _HostCircuit.HALF_OPEN and not circuit.probing:
+                circuit.probing = True
+                return True
+        raise CircuitBreakerOpenError(host)
+
+    def _record(self, request, failed, probe):
+        # type: (PipelineRequest, bool, bool) -> None
+        host = self._get_host(request)
+        now = time.time()
+        with self._lock:
+            circuit = self._circuits.setdefault(host, _HostCircuit())
+            if probe:
+                circuit.probing = False
+                if failed:
+                    circuit.state = _HostCircuit.OPEN
+                    circuit.opened_at = now
+                else:
+                    circuit.state = _HostCircuit.CLOSED
+                    circuit.buckets.clear()
+                return
+            circuit.record(failed, now, self.window)
+            if circuit.state != _HostCircuit.CLOSED:
+                return
+            total, failures = circuit.counts()
+            if total >= self.minimum_requests and failures >= total * self.failure_ratio:
+                _LOGGER.warning("Opening the circuit of host '%s': %d of the last %d requests failed.",
+                                host, failures, total)
+                circuit.state = _HostCircuit.OPEN
+                circuit.opened_at = now
+
+    @staticmethod
+    def _is_failure(response):
+        # type: (PipelineResponse) -> bool
+        status_code = response.http_response.status_code
+        return status_code >= 500 or status_code == 429
+
+    @staticmethod
+    def _is_failure_error(error):
+        # type: (Exception) -> bool
+        return isinstance(error, (ServiceRequestError, ServiceResponseError)) and \
+            not isinstance(error, CircuitBreakerOpenError)
+
+
+class CircuitBreakerPolicy(_CircuitBreakerPolicyBase, HTTPPolicy):
+    """A circuit breaker policy.
+
+    Tracks the failure ratio of the requests to each host, over a rolling window. When it
+    exceeds "circuit_failure_ratio", the circuit of the host opens: requests to this host fail
+    fast with a CircuitBreakerOpenError, without being sent. After "circuit_open_duration",
+    one probe request is let through: the circuit closes if it succeeds, and opens again otherwise.
+
+    Server errors (5xx), throttling (429), and connection or read errors count as failures.
+    Placed after the retry policy, each attempt is counted, and the retries stop once the circuit
+    is open: a CircuitBreakerOpenError is never retried.
+
+    **Keyword arguments:**
+
+    *circuit_failure_ratio (float)* - The ratio of failed requests, over the rolling window,
+    from which the circuit of a host opens. Default value is 0.5.
+
+    *circuit_minimum_requests (int)* - The minimum number of requests in the rolling window
+    before the failure ratio is considered. Default value is 10.
+
+    *circuit_window (float)* - The duration of the rolling window, in seconds. Default value is 30.
+
+    *circuit_open_duration (float)* - How long a circuit stays open before a probe request
+    is let through, in seconds. Default value is 30.
+    """
+
+    def send(self, request):
+        # type: (PipelineRequest) -> PipelineResponse
+        """Sends the request to the next policy, unless the circuit of its host is open.
+
+        :param request: The PipelineRequest object
+        :type request: ~azure.core.pipeline.PipelineRequest
+        :return: The PipelineResponse object
+        :rtype: ~azure.core.pipeline.PipelineResponse
+        :raises: ~azure.core.exceptions.CircuitBreakerOpenError if the circuit of the host is open.
+        """
+        probe = self._before_send(request)
+        failed = True  # Also when interrupted, so a probe doesn't stay pending
+        try:
+            response = self.next.send(request)
+            failed = self._is_failure(response)
+            return response
+        except Exception as err:
+            failed = self._is_failure_error(err)
+            raise
+        finally:
+            self._record(request, failed, probe)
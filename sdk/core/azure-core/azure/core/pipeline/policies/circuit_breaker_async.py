@@ -0,0 +1,72 @@
+# --------------------------------------------------------------------------
+#
+# Copyright (c) Microsoft Corporation. All rights reserved.
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the ""Software""), to
+# deal in the Software without restriction, including without limitation the
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+# sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED *AS IS*, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#
+# --------------------------------------------------------------------------
+from azure.core.pipeline import PipelineRequest, PipelineResponse
+from .base_async import AsyncHTTPPolicy
+from .circuit_breaker import _CircuitBreakerPolicyBase
+
+
+class AsyncCircuitBreakerPolicy(_CircuitBreakerPolicyBase, AsyncHTTPPolicy):
+    """An async circuit breaker policy.
+
+    Tracks the failure ratio of the requests to each host, over a rolling window. When it
+    exceeds "circuit_failure_ratio", the circuit of the host opens: requests to this host fail
+    fast with a CircuitBreakerOpenError, without being sent. After "circuit_open_duration",
+    one probe request is let through: the circuit closes if it succeeds, and opens again otherwise.
+
+    **Keyword arguments:**
+
+    *circuit_failure_ratio (float)* - The ratio of failed requests, over the rolling window,
+    from which the circuit of a host opens. Default value is 0.5.
+
+    *circuit_minimum_requests (int)* - The minimum number of requests in the rolling window
+    before the failure ratio is considered. Default value is 10.
+
+    *circuit_window (float)* - The duration of the rolling window, in seconds. Default value is 30.
+
+    *circuit_open_duration (float)* - How long a circuit stays open before a probe request
+    is let through, in seconds. Default value is 30.
+    """
+
+    async def send(self, request: PipelineRequest) -> PipelineResponse:  # type: ignore
+        """Sends the request to the next policy, unless the circuit of its host is open.
+
+        :param request: The PipelineRequest object
+        :type request: ~azure.core.pipeline.PipelineRequest
+        :return: The PipelineResponse object
+        :rtype: ~azure.core.pipeline.PipelineResponse
+        :raises: ~azure.core.exceptions.CircuitBreakerOpenError if the circuit of the host is open.
+        """
+        probe = self._before_send(request)
+        failed = True  # Also when interrupted, so a probe doesn't stay pending
+        try:
+            response = await self.next.send(request)  # type: ignore
+            failed = self._is_failure(response)
+            return response
+        except Exception as err:
+            failed = self._is_failure_error(err)
+            raise
+        finally:
+            self._record(request, failed, probe)
@@ -25,6 +25,8 @@
 # --------------------------------------------------------------------------
 """Traces network calls using the implementation library from the settings."""
 
+import random
+
 from six.moves import urllib
 
 from azure.core.tracing.context import tracing_context
@@ -42,17 +44,33 @@ if TYPE_CHECKING:
     from azure.core.pipeline.transport import HttpRequest, HttpResponse  # pylint: disable=ungrouped-imports
     from azure.core.tracing.abstract_span import AbstractSpan  # pylint: disable=ungrouped-imports
     from azure.core.pipeline import PipelineRequest, PipelineResponse  # pylint: disable=ungrouped-imports
-    from typing import Any, Optional, Dict, List, Union
+    from typing import Any, Callable, Optional
 
 
 class DistributedTracingPolicy(SansIOHTTPPolicy):
-    """The policy to create spans for Azure Calls"""
+    """The policy to create spans for Azure Calls
+
+    The span of a request is kept in the context of the request, so nothing outlives an abandoned
+    request. Whether to trace a request is decided before its span is created: no span is created
+    for requests whose parent span is dropped by the tracer, or that are not sampled.
+
+    **Keyword arguments:**
+
+    *tracing_sampling_rate (float)* - The fraction of the requests to trace, between 0 and 1.
+    Default value is 1.
 
-    def __init__(self):
-        # type: () -> None
-        self.parent_span_dict = {}  # type: Dict[AbstractSpan, List[Union[AbstractSpan, Any]]]
+    *tracing_sampler (callable)* - A function taking the PipelineRequest and returning whether to
+    trace it. Overrides "tracing_sampling_rate".
+    """
+
+    _SPAN_CONTEXT_NAME = "tracing_span"
+
+    def __init__(self, **kwargs):
+        # type: (Any) -> None
         self._request_id = "x-ms-client-request-id"
         self._response_id = "x-ms-request-id"
+        self._sampling_rate = kwargs.get('tracing_sampling_rate', 1.0)
+        self._sampler = kwargs.get('tracing_sampler')  # type: Optional[Callable[[PipelineRequest], bool]]
 
     def set_header(self, request, span):  # pylint: disable=no-self-use
         # type: (PipelineRequest, Any) -> None
@@ -62,6 +80,12 @@ class DistributedTracingPolicy(SansIOHTTPPolicy):
         headers = span.to_header()
         request.http_request.headers.update(headers)  # type: ignore
 
+    def _should_sample(self, request):
+        # type: (PipelineRequest) -> bool
+        if self._sampler is not None:
+            return self._sampler(request)
+        return self._sampling_rate >= 1 or random.random() < self._sampling_rate
+
     def on_request(self, request):
         # type: (PipelineRequest) -> None
         parent_span = tracing_context.current_span.get()
@@ -75,6 +99,13 @@ class DistributedTracingPolicy(SansIOHTTPPolicy):
         if parent_span is None:
             return
 
+        if not getattr(parent_span, "sampled", True):
+            # The tracer drops the whole trace: only propagate the decision
+            self.set_header(request, parent_span)
+            return
+        if not self._should_sample(request):
+            return
+
         path = urllib.parse.urlparse(request.http_request.url).path  # type: ignore
         if not path:
             path = "/"
@@ -82,30 +113,40 @@ class DistributedTracingPolicy(SansIOHTTPPolicy):
         child.start()
 
         set_span_contexts(child)
-        self.parent_span_dict[child] = original_context
+        request.context[self._SPAN_CONTEXT_NAME] = (child, original_context)  # type: ignore
         self.set_header(request, child)
 
+    def _finish_span(self, span, request, response=None):
+        # type: (AbstractSpan, HttpRequest, Optional[HttpResponse]) -> None
+        span.set_http_attributes(request, response=response)
+        request_id = request.headers.get(self._request_id)
+        if request_id is not None:
+            span.add_attribute(self._request_id, request_id)
+        if response and self._response_id in response.headers:
+            span.add_attribute(self._response_id, response.headers[self._response_id])
+        span.finish()
+
     def end_span(self, request, response=None):
         # type: (HttpRequest, Optional[HttpResponse]) -> None
         """Ends the span that is tracing the network and updates its status."""
         span = tracing_context.current_span.get()  # type: AbstractSpan
         if span is not None:
-            span.set_http_attributes(request, response=response)
-            request_id = request.headers.get(self._request_id)
-            if request_id is not None:
-                span.add_attribute(self._request_id, request_id)
-            if response and self._response_id in response.headers:
-                span.add_attribute(self._response_id, response.headers[self._response_id])
-            span.finish()
-            original_context = self.parent_span_dict.pop(span, None)
-            if original_context:
-                set_span_contexts(original_context[0], original_context[1])
+            self._finish_span(span, request, response)
+
+    def _end_request_span(self, request, response=None):
+        # type: (PipelineRequest, Optional[HttpResponse]) -> None
+        traced = request.context.pop(self._SPAN_CONTEXT_NAME, None)  # type: ignore
+        if traced is None:
+            return
+        span, original_context = traced
+        self._finish_span(span, request.http_request, response)  # type: ignore
+        set_span_contexts(original_context[0], original_context[1])
 
     def on_response(self, request, response):
         # type: (PipelineRequest, PipelineResponse) -> None
-        self.end_span(request.http_request, response=response.http_response)  # type: ignore
+        self._end_request_span(request, response=response.http_response)  # type: ignore
 
     def on_exception(self, _request):  # pylint: disable=unused-argument
         # type: (PipelineRequest) -> bool
-        self.end_span(_request.http_request)  # type: ignore
+        self._end_request_span(_request)
         return False
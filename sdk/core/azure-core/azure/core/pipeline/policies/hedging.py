@@ -0,0 +1,259 @@
+# --------------------------------------------------------------------------
+#
+# Copyright (c) Microsoft Corporation. All rights reserved.
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the ""Software""), to
+# deal in the Software without restriction, including without limitation the
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+# sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED *AS IS*, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#
+# --------------------------------------------------------------------------
+"""
+This module is the hedging policy, sending a backup request when the first one is slow.
+"""
+from __future__ import absolute_import
+import collections
+import copy
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Dict, Optional  # pylint: disable=unused-import
+
+from azure.core.pipeline import PipelineContext, PipelineRequest
+from azure.core.tracing.context import tracing_context
+from .base import HTTPPolicy
+
+try:
+    from urlparse import urlparse  # type: ignore
+except ImportError:
+    from urllib.parse import urlparse
+
+if TYPE_CHECKING:
+    # pylint:disable=unused-import
+    from azure.core.pipeline import PipelineResponse
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class _HedgingPolicyBase(object):
+    """Latency statistics and hedging decisions, shared by the sync and async policies.
+
+    :keyword float hedging_percentile: The percentile of the latencies observed for a host after
+     which a hedged request is sent. Default value is 0.95.
+    :keyword float hedging_initial_delay: The delay, in seconds, after which a hedged request is sent
+     while too few latencies have been observed for a host. Default value is 1.
+    :keyword int hedging_min_samples: How many latencies must be observed for a host before the
+     percentile is used. Default value is 20.
+    :keyword int hedging_sample_size: How many of the most recent latencies are kept per host.
+     Default value is 100.
+    :keyword hedging_methods: The HTTP methods whose requests can be hedged. They must be idempotent.
+     Default value is GET and HEAD.
+    """
+
+    def __init__(self, **kwargs):
+        self.percentile = kwargs.pop('hedging_percentile', 0.95)
+        self.initial_delay = kwargs.pop('hedging_initial_delay', 1)
+        self.min_samples = kwargs.pop('hedging_min_samples', 20)
+        self.sample_size = kwargs.pop('hedging_sample_size', 100)
+        self.methods = frozenset(m.upper() for m in kwargs.pop('hedging_methods', ['GET', 'HEAD']))
+        self.hedges_sent = 0
+        self.hedges_won = 0
+        self._latencies = {}  # type: Dict[str, collections.deque]
+        self._lock = threading.Lock()
+        super(_HedgingPolicyBase, self).__init__()
+
+    @staticmethod
+    def _get_host(request):
+        # type: (PipelineRequest) -> str
+        return urlparse(request.http_request.url).netloc
+
+    def _should_hedge(self, request):
+        # type: (PipelineRequest) -> bool
+        return request.context.options.get('hedging_enable', True) and \
+            request.http_request.method.upper() in self.methods
+
+    def get_hedging_delay(self, host):
+        # type: (str) -> float
+        """Get how long to wait for a response before sending a hedged request to a host.
+
+        :param str host: The host, as "hostname[:port]".
+        :return: The delay in seconds.
+        :rtype: float
+        """
+        with self._lock:
+            samples = sorted(self._latencies.get(host, ()))
+        if len(samples) < self.min_samples:
+            return self.initial_delay
+        return samples[min(int(len(samples) * self.percentile), len(samples) - 1)]
+
+    def _record_latency(self, request, latency):
+        # type: (PipelineRequest, float) -> None
+        host = self._get_host(request)
+        with self._lock:
+            if host not in self._latencies:
+                self._latencies[host] = collections.deque(maxlen=self.sample_size)
+            self._latencies[host].append(latency)
+
+    def _record_hedge(self, won):
+        # type: (bool) -> None
+        with self._lock:
+            if won:
+                self.hedges_won += 1
+            else:
+                self.hedges_sent += 1
+
+    @staticmethod
+    def _copy_request(request):
+        # type: (PipelineRequest) -> PipelineRequest
+        """Copy a request, so the hedged request goes through the next policies independently."""
+        http_request = copy.copy(request.http_request)
+        # The copy of a CaseInsensitiveDict made by copy.copy would share its items
+        http_request.headers = request.http_request.headers.copy()
+        context = PipelineContext(request.context.transport, **request.context.options)
+        for key, value in request.context.items():
+            if key not in context:
+                dict.__setitem__(context, key, value)
+        return PipelineRequest(http_request, context)
+
+    @staticmethod
+    def _discard(response):
+        # type: (PipelineResponse) -> None
+        """Release the connection of the response that lost the race."""
+        close = getattr(response.http_response.internal_response, 'close', None)
+        if close is not None:
+            try:
+                close()
+            except Exception:  # pylint: disable=broad-except
+                pass
+
+
+class _HedgeRace(object):
+    """The outcome of a hedged request, shared by the calling thread and the threads sending the requests."""
+
+    def __init__(self):
+        self._condition = threading.Condition(threading.Lock())
+        self._running = 0
+        self.winner = None  # type: Optional[PipelineResponse]
+        self.hedge_won = False
+        self.error = None  # type: Optional[Exception]
+
+    def start(self, send, request, is_hedge):
+        # type: (Any, PipelineRequest, bool) -> None
+        """Sends a request on a new thread."""
+        with self._condition:
+            self._running += 1
+        thread = threading.Thread(target=tracing_context.with_current_context(send), args=(request, self, is_hedge))
+        thread.daemon = True
+        thread.start()
+
+    def finish(self, response=None, error=None, is_hedge=False):
+        # type: (Optional[PipelineResponse], Optional[Exception], bool) -> bool
+        """Records the outcome of a request. Returns False if its response lost the race."""
+        with self._condition:
+            self._running -= 1
+            self._condition.notify_all()
+            if error is not None:
+                self.error = self.error or error
+                return True
+            if self.winner is None:
+                self.winner, self.hedge_won = response, is_hedge
+                return True
+            return False
+
+    def wait(self, timeout=None):
+        # type: (Optional[float]) -> bool
+        """Waits until a request succeeds or all of them failed. Returns False on timeout."""
+        deadline = None if timeout is None else time.time() + timeout
+        with self._condition:
+            while self.winner is None and self._running:
+                remaining = None if deadline is None else deadline - time.time()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+            return True
+
+
+class HedgingPolicy(_HedgingPolicyBase, HTTPPolicy):
+    """A hedging policy, to cut the tail latency of idempotent requests.
+
+    When no response is received for a request after a delay, a second, identical request is
+    sent, and whichever responds first is returned; the other response is discarded. The delay
+    is the "hedging_percentile" of the latencies recently observed for the host, so only the
+    slowest requests are hedged. Only the methods in "hedging_methods" are hedged, and they must
+    be idempotent. Hedging can be disabled per operation with "hedging_enable=False".
+
+    The requests are sent on their own threads while the calling thread waits for the first
+    response. As a blocking request can't be interrupted, the one that lost the race runs to
+    completion in the background before its response is discarded. The policy should be placed
+    near the end of the pipeline, after the policies that shouldn't run twice (such as retries).
+
+    **Keyword arguments:**
+
+    *hedging_percentile (float)* - The percentile of the latencies observed for a host after which
+    a hedged request is sent. Default value is 0.95.
+
+    *hedging_initial_delay (float)* - The delay, in seconds, after which a hedged request is sent
+    while too few latencies have been observed for a host. Default value is 1.
+
+    *hedging_min_samples (int)* - How many latencies must be observed for a host before the percentile
+    is used. Default value is 20.
+
+    *hedging_sample_size (int)* - How many of the most recent latencies are kept per host. Default value is 100.
+
+    *hedging_methods (list[str])* - The HTTP methods whose requests can be hedged. Default value is GET and HEAD.
+    """
+
+    def _race(self, request, race, is_hedge):
+        # type: (PipelineRequest, _HedgeRace, bool) -> None
+        start = time.time()
+        try:
+            response = self.next.send(request)
+        except Exception as err:  # pylint: disable=broad-except
+            race.finish(error=err)
+            return
+        if not is_hedge:
+            self._record_latency(request, time.time() - start)
+        if not race.finish(response, is_hedge=is_hedge):
+            self._discard(response)
+
+    def send(self, request):
+        # type: (PipelineRequest) -> PipelineResponse
+        """Sends the request to the next policy, and a hedged request if it is slow to respond.
+
+        :param request: The PipelineRequest object
+        :type request: ~azure.core.pipeline.PipelineRequest
+        :return: The first PipelineResponse received
+        :rtype: ~azure.core.pipeline.PipelineResponse
+        """
+        if not self._should_hedge(request):
+            return self.next.send(request)
+
+        # The copy is made before the next policies update the request
+        hedge = self._copy_request(request)
+        race = _HedgeRace()
+        race.start(self._race, request, False)
+        if not race.wait(self.get_hedging_delay(self._get_host(request))):
+            self._record_hedge(won=False)
+            race.start(self._race, hedge, True)
+            race.wait()
+        if race.winner is None:
+            raise race.error  # pylint: disable=raising-bad-type
+        if race.hedge_won:
+            self._record_hedge(won=True)
+        return race.winner
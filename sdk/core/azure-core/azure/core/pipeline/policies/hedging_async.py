@@ -0,0 +1,117 @@
+# --------------------------------------------------------------------------
+#
+# Copyright (c) Microsoft Corporation. All rights reserved.
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the ""Software""), to
+# deal in the Software without restriction, including without limitation the
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+# sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED *AS IS*, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#
+# --------------------------------------------------------------------------
+import asyncio
+import time
+
+from azure.core.pipeline import PipelineRequest, PipelineResponse
+from .base_async import AsyncHTTPPolicy
+from .hedging import _HedgingPolicyBase
+
+
+class AsyncHedgingPolicy(_HedgingPolicyBase, AsyncHTTPPolicy):
+    """An async hedging policy, to cut the tail latency of idempotent requests.
+
+    When no response is received for a request after a delay, a second, identical request is
+    sent, and whichever responds first is returned; the other one is cancelled. The delay
+    is the "hedging_percentile" of the latencies recently observed for the host, so only the
+    slowest requests are hedged. Only the methods in "hedging_methods" are hedged, and they must
+    be idempotent. Hedging can be disabled per operation with "hedging_enable=False".
+
+    Requests are sent as asyncio tasks, so this policy requires an asyncio event loop.
+
+    **Keyword arguments:**
+
+    *hedging_percentile (float)* - The percentile of the latencies observed for a host after which
+    a hedged request is sent. Default value is 0.95.
+
+    *hedging_initial_delay (float)* - The delay, in seconds, after which a hedged request is sent
+    while too few latencies have been observed for a host. Default value is 1.
+
+    *hedging_min_samples (int)* - How many latencies must be observed for a host before the percentile
+    is used. Default value is 20.
+
+    *hedging_sample_size (int)* - How many of the most recent latencies are kept per host. Default value is 100.
+
+    *hedging_methods (list[str])* - The HTTP methods whose requests can be hedged. Default value is GET and HEAD.
+    """
+
+    async def _timed_send(self, request: PipelineRequest) -> PipelineResponse:
+        start = time.time()
+        response = await self.next.send(request)  # type: ignore
+        self._record_latency(request, time.time() - start)
+        return response
+
+    async def send(self, request: PipelineRequest) -> PipelineResponse:  # type: ignore
+        """Sends the request to the next policy, and a hedged request if it is slow to respond.
+
+        :param request: The PipelineRequest object
+        :type request: ~azure.core.pipeline.PipelineRequest
+        :return: The first PipelineResponse received
+        :rtype: ~azure.core.pipeline.PipelineResponse
+        """
+        if not self._should_hedge(request):
+            return await self.next.send(request)  # type: ignore
+
+        # The copy is made before the next policies update the request
+        hedge_request = self._copy_request(request)
+        primary = asyncio.ensure_future(self._timed_send(request))
+        delay = self.get_hedging_delay(self._get_host(request))
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+        except asyncio.CancelledError:
+            primary.cancel()
+            raise
+        if done:
+            return primary.result()
+
+        self._record_hedge(won=False)
+        hedge = asyncio.ensure_future(self.next.send(hedge_request))  # type: ignore
+        pending = {primary, hedge}
+        error = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                succeeded = [task for task in done if task.exception() is None]
+                if succeeded:
+                    winner = primary if primary in succeeded else hedge
+                    for task in succeeded:
+                        if task is not winner:
+                            # Both responded at once: release the connection of the other one
+                            self._discard(task.result())
+                    if winner is hedge:
+                        self._record_hedge(won=True)
+                    return winner.result()
+                error = error or next(iter(done)).exception()
+            raise error  # pylint: disable=raising-bad-type
+        finally:
+            for task in pending:
+                task.cancel()
+                task.add_done_callback(self._discard_task)
+
+    def _discard_task(self, task: asyncio.Future) -> None:
+        # The request that lost the race may still complete if it ignores the cancellation
+        if not task.cancelled() and task.exception() is None:
+            self._discard(task.result())
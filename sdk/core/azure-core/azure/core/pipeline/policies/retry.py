@@ -29,12 +29,15 @@ This module is the requests implementation of Pipeline ABC
 """
 from __future__ import absolute_import  # we have a "requests" module that conflicts with "requests" on Py2.7
 import logging
+import random
+import threading
 import time
 import email
 from typing import TYPE_CHECKING, List, Callable, Iterator, Any, Union, Dict, Optional  # pylint: disable=unused-import
 from azure.core.pipeline import PipelineResponse
 from azure.core.exceptions import (
     AzureError,
+    CircuitBreakerOpenError,
     ClientAuthenticationError,
     ServiceResponseError,
     ServiceRequestError
@@ -42,10 +45,100 @@ from azure.core.exceptions import (
 
 from .base import HTTPPolicy, RequestHistory
 
+try:
+    from urlparse import urlparse  # type: ignore
+except ImportError:
+    from urllib.parse import urlparse
+
 
 _LOGGER = logging.getLogger(__name__)
 
 
+class RetryBudget(object):
+    """A client-side retry budget, shared by retry policies to limit retries per host.
+
+    The budget is a token bucket per host: every request that succeeds without needing a
+    retry deposits "retry_ratio" tokens, up to "max_tokens", and every retry withdraws one.
+    When the bucket of a host is empty, retries to this host are denied and the last
+    response or error is returned to the caller. Retries are thus capped to a fraction of the
+    successful traffic, so that an overloaded service doesn't also get a storm of retries.
+
+    A budget is thread-safe, and is meant to be shared between all the retry policies
+    (sync and async) of the clients talking to the same services.
+
+    :param float retry_ratio: The number of retries allowed per successful request. Default value is 0.1.
+    :param int max_tokens: The maximum number of tokens in the bucket of a host. Default value is 100.
+    :param int initial_tokens: The tokens available for a host before any request succeeded,
+     so a new client can still retry. Default value is 10.
+    """
+
+    def __init__(self, retry_ratio=0.1, max_tokens=100, initial_tokens=10):
+        # type: (float, int, int) -> None
+        self.retry_ratio = retry_ratio
+        self.max_tokens = max_tokens
+        self.initial_tokens = initial_tokens
+        self._lock = threading.Lock()
+        self._tokens = {}  # type: Dict[str, float]
+        self._spent = {}  # type: Dict[str, int]
+        self._denied = {}  # type: Dict[str, int]
+
+    @property
+    def retries_spent(self):
+        # type: () -> int
+        """The number of retries allowed by this budget, for all hosts."""
+        with self._lock:
+            return sum(self._spent.values())
+
+    @property
+    def retries_denied(self):
+        # type: () -> int
+        """The number of retries denied by this budget, for all hosts."""
+        with self._lock:
+            return sum(self._denied.values())
+
+    def get_statistics(self, host):
+        # type: (str) -> Dict[str, Any]
+        """Get the state of the budget of a host.
+
+        :param str host: The host, as "hostname[:port]".
+        :return: A dict with the "tokens" available, and the "retries_spent" and "retries_denied".
+        :rtype: dict
+        """
+        with self._lock:
+            return {
+                'tokens': self._tokens.get(host, self.initial_tokens),
+                'retries_spent': self._spent.get(host, 0),
+                'retries_denied': self._denied.get(host, 0),
+            }
+
+    def record_success(self, host):
+        # type: (str) -> None
+        """Deposit tokens for a request that succeeded (2xx or 3xx) without a retry.
+
+        :param str host: The host the request was sent to.
+        """
+        with self._lock:
+            tokens = self._tokens.get(host, self.initial_tokens) + self.retry_ratio
+            self._tokens[host] = min(tokens, self.max_tokens)
+
+    def try_acquire(self, host):
+        # type: (str) -> bool
+        """Withdraw a token to retry a request, if the budget of the host allows it.
+
+        :param str host: The host the request is sent to.
+        :return: True if the retry is allowed, False if it is denied.
+        :rtype: bool
+        """
+        with self._lock:
+            tokens = self._tokens.get(host, self.initial_tokens)
+            if tokens < 1:
+                self._denied[host] = self._denied.get(host, 0) + 1
+                return False
+            self._tokens[host] = tokens - 1
+            self._spent[host] = self._spent.get(host, 0) + 1
+            return True
+
+
 class RetryPolicy(HTTPPolicy):
     """A retry policy.
 
@@ -74,6 +167,13 @@ class RetryPolicy(HTTPPolicy):
 
     *retry_backoff_max (int)* - The maximum back off time. Default value is 120 seconds (2 minutes).
 
+    *retry_jitter (bool)* - Use decorrelated jitter backoff instead of exponential backoff: each retry
+    sleeps a random time between `{backoff factor}` and three times the previous sleep, capped to the
+    maximum back off time, so that clients failing together don't retry together. Default value is False.
+
+    *retry_budget (~azure.core.pipeline.policies.RetryBudget)* - A retry budget, shared between policies,
+    capping retries to a fraction of the successful requests per host. Default value is None (no budget).
+
     Example:
         .. literalinclude:: ../examples/test_example_sync.py
             :start-after: [START retry_policy]
@@ -93,6 +193,8 @@ class RetryPolicy(HTTPPolicy):
         self.status_retries = kwargs.pop('retry_status', 3)
         self.backoff_factor = kwargs.pop('retry_backoff_factor', 0.8)
         self.backoff_max = kwargs.pop('retry_backoff_max', self.BACKOFF_MAX)
+        self.jitter = kwargs.pop('retry_jitter', False)
+        self.budget = kwargs.pop('retry_budget', None)
 
         safe_codes = [i for i in range(500) if i != 408] + [501, 505]
         retry_codes = [i for i in range(999) if i not in safe_codes]
@@ -121,8 +223,11 @@ class RetryPolicy(HTTPPolicy):
             'read': options.pop("retry_read", self.read_retries),
             'status': options.pop("retry_status", self.status_retries),
             'backoff': options.pop("retry_backoff_factor", self.backoff_factor),
-            'max_backoff': options.pop("retry_backoff_max", self.BACKOFF_MAX),
+            'max_backoff': options.pop("retry_backoff_max", self.backoff_max),
             'methods': options.pop("retry_on_methods", self._method_whitelist),
+            'jitter': options.pop("retry_jitter", self.jitter),
+            'budget': options.pop("retry_budget", self.budget),
+            'previous_backoff': 0,
             'history': []
         }
 
@@ -133,6 +238,13 @@ class RetryPolicy(HTTPPolicy):
         :return: The current backoff value.
         :rtype: float
         """
+        if settings.get('jitter'):
+            # Decorrelated jitter: random between the base and 3 times the previous sleep
+            previous = max(settings['previous_backoff'], settings['backoff'])
+            backoff_value = min(settings['max_backoff'], random.uniform(settings['backoff'], previous * 3))
+            settings['previous_backoff'] = backoff_value
+            return backoff_value
+
         # We want to consider only the last consecutive errors sequence (Ignore redirects).
         consecutive_errors_len = len(settings['history'])
         if consecutive_errors_len <= 1:
@@ -320,6 +432,43 @@ class RetryPolicy(HTTPPolicy):
 
         return not self.is_exhausted(settings)
 
+    @staticmethod
+    def _get_host(request):
+        return urlparse(request.http_request.url).netloc
+
+    def _budget_allows_retry(self, settings, request):
+        """Checks the retry budget, if any, to know if the request can be retried.
+
+        :param dict settings: The retry settings.
+        :param request: The PipelineRequest object.
+        :type request: ~azure.core.pipeline.PipelineRequest
+        :return: True if there is no budget or it allows the retry.
+        :rtype: bool
+        """
+        budget = settings.get('budget')
+        if budget is None:
+            return True
+        allowed = budget.try_acquire(self._get_host(request))
+        if not allowed:
+            _LOGGER.debug("Retry budget exhausted for %s, not retrying.", self._get_host(request))
+        return allowed
+
+    def _record_success(self, settings, request, response):
+        """Credits the retry budget, if any, for a request that succeeded without a retry.
+
+        Responses that failed without being retryable (e.g. most 4xx) don't credit the
+        budget, so that a storm of client errors can't refill it.
+
+        :param dict settings: The retry settings.
+        :param request: The PipelineRequest object.
+        :type request: ~azure.core.pipeline.PipelineRequest
+        :param response: The PipelineResponse object.
+        :type response: ~azure.core.pipeline.PipelineResponse
+        """
+        budget = settings.get('budget')
+        if budget is not None and not settings['history'] and response.http_response.status_code < 400:
+            budget.record_success(self._get_host(request))
+
     def update_context(self, context, retry_settings):
         """Updates retry history in pipeline context.
 
@@ -348,18 +497,25 @@ class RetryPolicy(HTTPPolicy):
             try:
                 response = self.next.send(request)
                 if self.is_retry(retry_settings, response):
-                    retry_active = self.increment(retry_settings, response=response)
+                    retry_active = self.increment(retry_settings, response=response) and \
+                        self._budget_allows_retry(retry_settings, request)
                     if retry_active:
                         self.sleep(retry_settings, request.context.transport, response=response)
                         continue
+                else:
+                    self._record_success(retry_settings, request, response)
                 break
             except ClientAuthenticationError:  # pylint:disable=try-except-raise
                 # the authentication policy failed such that the client's request can't
                 # succeed--we'll never have a response to it, so propagate the exception
                 raise
+            except CircuitBreakerOpenError:  # pylint:disable=try-except-raise
+                # the host failed too often to be sent requests for a while, retrying won't get through
+                raise
             except AzureError as err:
                 if self._is_method_retryable(retry_settings, request.http_request):
-                    retry_active = self.increment(retry_settings, response=request, error=err)
+                    retry_active = self.increment(retry_settings, response=request, error=err) and \
+                        self._budget_allows_retry(retry_settings, request)
                     if retry_active:
                         self.sleep(retry_settings, request.context.transport)
                         continue
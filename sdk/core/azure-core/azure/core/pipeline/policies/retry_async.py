@@ -30,7 +30,7 @@ from __future__ import absolute_import  # we have a "requests" module that confl
 import logging
 from typing import TYPE_CHECKING, List, Callable, Iterator, Any, Union, Dict, Optional  # pylint: disable=unused-import
 
-from azure.core.exceptions import AzureError, ClientAuthenticationError
+from azure.core.exceptions import AzureError, CircuitBreakerOpenError, ClientAuthenticationError
 from .base import HTTPPolicy
 from .base_async import AsyncHTTPPolicy
 from .retry import RetryPolicy
@@ -67,6 +67,13 @@ class AsyncRetryPolicy(RetryPolicy, AsyncHTTPPolicy):  # type: ignore
 
     *retry_backoff_max (int)* - The maximum back off time. Default value is 120 seconds (2 minutes).
 
+    *retry_jitter (bool)* - Use decorrelated jitter backoff instead of exponential backoff: each retry
+    sleeps a random time between `{backoff factor}` and three times the previous sleep, capped to the
+    maximum back off time, so that clients failing together don't retry together. Default value is False.
+
+    *retry_budget (~azure.core.pipeline.policies.RetryBudget)* - A retry budget, shared between policies,
+    capping retries to a fraction of the successful requests per host. Default value is None (no budget).
+
     Example:
         .. literalinclude:: ../examples/test_example_async.py
             :start-after: [START async_retry_policy]
@@ -136,18 +143,25 @@ class AsyncRetryPolicy(RetryPolicy, AsyncHTTPPolicy):  # type: ignore
             try:
                 response = await self.next.send(request)
                 if self.is_retry(retry_settings, response):
-                    retry_active = self.increment(retry_settings, response=response)
+                    retry_active = self.increment(retry_settings, response=response) and \
+                        self._budget_allows_retry(retry_settings, request)
                     if retry_active:
                         await self.sleep(retry_settings, request.context.transport, response=response)
                         continue
+                else:
+                    self._record_success(retry_settings, request, response)
                 break
             except ClientAuthenticationError:  # pylint:disable=try-except-raise
                 # the authentication policy failed such that the client's request can't
                 # succeed--we'll never have a response to it, so propagate the exception
                 raise
+            except CircuitBreakerOpenError:  # pylint:disable=try-except-raise
+                # the host failed too often to be sent requests for a while, retrying won't get through
+                raise
             except AzureError as err:
                 if self._is_method_retryable(retry_settings, request.http_request):
-                    retry_active = self.increment(retry_settings, response=request, error=err)
+                    retry_active = self.increment(retry_settings, response=request, error=err) and \
+                        self._budget_allows_retry(retry_settings, request)
                     if retry_active:
                         await self.sleep(retry_settings, request.context.transport)
                         continue
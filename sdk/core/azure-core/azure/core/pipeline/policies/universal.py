@@ -27,15 +27,19 @@
 This module is the requests implementation of Pipeline ABC
 """
 from __future__ import absolute_import  # we have a "requests" module that conflicts with "requests" on Py2.7
+import codecs
+import itertools
 import json
 import logging
 import os
 import platform
+import sys
+import time
 import xml.etree.ElementTree as ET
 import types
 import re
 from typing import (Mapping, IO, TypeVar, TYPE_CHECKING, Type, cast, List, Callable, Iterator, # pylint: disable=unused-import
-                    Any, Union, Dict, Optional)
+                    Iterable, Any, Union, Dict, Optional)
 
 from azure.core import __version__  as azcore_version
 from azure.core.exceptions import (
@@ -173,13 +177,75 @@ class UserAgentPolicy(SansIOHTTPPolicy):
             http_request.headers[self._USERAGENT] = self.user_agent # type: ignore
 
 
+class _LazyFormat(object):
+    """Defers building a log message argument until the record is actually formatted."""
+    __slots__ = ('_func', '_args')
+
+    def __init__(self, func, *args):
+        self._func = func
+        self._args = args
+
+    def __str__(self):
+        try:
+            return self._func(*self._args)
+        except Exception as err:  # pylint: disable=broad-except
+            return "<Failed to log: {!r}>".format(err)
+
+    def __repr__(self):
+        return repr(str(self))
+
+
+_ATTACHMENT_PATTERN = re.compile(r'attachment; ?filename=["\w.]+', re.IGNORECASE)
+
+
+def _describe_request_body(http_request):
+    # We don't want to log the binary data of a file upload.
+    if isinstance(http_request.body, types.GeneratorType):
+        return "File upload"
+    return str(http_request.body)
+
+
+def _describe_response_body(response):
+    # We don't want to log binary data if the response is a file.
+    http_response = response.http_response
+    header = http_response.headers.get('content-disposition')
+    if header and _ATTACHMENT_PATTERN.match(header):
+        return "File attachments: {}".format(header.partition('=')[2])
+    content_type = http_response.headers.get("content-type", "")
+    if content_type.endswith("octet-stream"):
+        return "Body contains binary data."
+    if content_type.startswith("image"):
+        return "Body contains image data."
+    if response.context.options.get('stream', False):
+        return "Body is streamable"
+    return http_response.text()
+
+
 class NetworkTraceLoggingPolicy(SansIOHTTPPolicy):
     """The logging policy in the pipeline is used to output HTTP network trace to the configured logger.
 
     This accepts both global configuration, and per-request level with "enable_http_logger"
 
+    Whether the logger is enabled for DEBUG is checked once per request, and nothing is formatted
+    unless a record is emitted. With sampling, only one request in "logging_sample_interval" is
+    logged, plus the failed requests and the ones slower than "logging_slow_threshold".
+
     :param bool logging_enable: Use to enable per operation. Defaults to False.
 
+    **Keyword arguments:**
+
+    *logging_sample_interval (int)* - Log one request in every N. Default value is 1 (every request).
+
+    *logging_log_failures (bool)* - Whether requests that are not sampled are logged anyway when they
+    fail (response status code 400 and above, or exception). Default value is True.
+
+    *logging_slow_threshold (float)* - If set, requests that are not sampled are logged anyway when
+    they take longer than this many seconds. Default value is None.
+
+    *logging_structured (bool)* - Whether to output one key=value record per request and response,
+    with the fields also set on the record as the "azure_http" attribute, instead of the
+    human readable trace. Default value is False.
+
     Example:
         .. literalinclude:: ../examples/test_example_sansio.py
             :start-after: [START network_trace_logging_policy]
@@ -188,8 +254,41 @@ class NetworkTraceLoggingPolicy(SansIOHTTPPolicy):
             :dedent: 4
             :caption: Configuring a network trace logging policy.
     """
-    def __init__(self, logging_enable=False, **kwargs): # pylint: disable=unused-argument
+    def __init__(self, logging_enable=False, **kwargs):
         self.enable_http_logger = logging_enable
+        self.sample_interval = max(int(kwargs.get('logging_sample_interval', 1)), 1)
+        self.log_failures = kwargs.get('logging_log_failures', True)
+        self.slow_threshold = kwargs.get('logging_slow_threshold')
+        self.structured = kwargs.get('logging_structured', False)
+        self._request_count = itertools.count()
+
+    @property
+    def _logger(self):
+        # type: () -> logging.Logger
+        return _LOGGER
+
+    def _redact_url(self, http_request):  # pylint: disable=no-self-use
+        # type: (Any) -> str
+        """Returns the URL of the request, as it may be logged."""
+        return http_request.url
+
+    def _redact_header(self, header, value):  # pylint: disable=no-self-use
+        # type: (str, str) -> str
+        """Returns the value of a request header, as it may be logged."""
+        if header.lower() == 'authorization':
+            return '*****'
+        return value
+
+    def _format_headers(self, headers, redact=None):
+        # type: (Mapping[str, str], Optional[Callable[[str, str], str]]) -> str
+        items = [(header, redact(header, value) if redact else value) for header, value in headers.items()]
+        if self.structured:
+            return " ".join("{}={!r}".format(header, value) for header, value in items)
+        return "".join("\n    {!r}: {!r}".format(header, value) for header, value in items)
+
+    def _is_sampled(self):
+        # type: () -> bool
+        return self.sample_interval == 1 or next(self._request_count) % self.sample_interval == 0
 
     def on_request(self, request):
         # type: (PipelineRequest) -> None
@@ -198,30 +297,18 @@ class NetworkTraceLoggingPolicy(SansIOHTTPPolicy):
         :param request: The PipelineRequest object.
         :type request: ~azure.core.pipeline.PipelineRequest
         """
-        http_request = request.http_request
         options = request.context.options # type: ignore
-        if options.pop("logging_enable", self.enable_http_logger):
-            request.context["logging_enable"] = True # type: ignore
-            if not _LOGGER.isEnabledFor(logging.DEBUG):
-                return
-
-            try:
-                _LOGGER.debug("Request URL: %r", http_request.url) # type: ignore
-                _LOGGER.debug("Request method: %r", http_request.method) # type: ignore
-                _LOGGER.debug("Request headers:")
-                for header, value in http_request.headers.items(): # type: ignore
-                    if header.lower() == 'authorization':
-                        value = '*****'
-                    _LOGGER.debug("    %r: %r", header, value)
-                _LOGGER.debug("Request body:")
-
-                # We don't want to log the binary data of a file upload.
-                if isinstance(http_request.body, types.GeneratorType): # type: ignore
-                    _LOGGER.debug("File upload")
-                else:
-                    _LOGGER.debug(str(http_request.body)) # type: ignore
-            except Exception as err:  # pylint: disable=broad-except
-                _LOGGER.debug("Failed to log request: %r", err)
+        # This is the only level check of the request: its result is kept in the context.
+        enabled = options.pop("logging_enable", self.enable_http_logger) and self._logger.isEnabledFor(logging.DEBUG)
+        request.context["logging_enable"] = bool(enabled) # type: ignore
+        if not enabled:
+            return
+        sampled = self._is_sampled()
+        request.context["logging_sampled"] = sampled # type: ignore
+        if self.slow_threshold is not None or self.structured:
+            request.context["logging_start"] = time.time() # type: ignore
+        if sampled:
+            self._log_request(request)
 
     def on_response(self, request, response):
         # type: (PipelineRequest, PipelineResponse) -> None
@@ -232,35 +319,286 @@ class NetworkTraceLoggingPolicy(SansIOHTTPPolicy):
         :param response: The PipelineResponse object.
         :type response: ~azure.core.pipeline.PipelineResponse
         """
-        if response.context.pop("logging_enable", self.enable_http_logger): # type: ignore
-            if not _LOGGER.isEnabledFor(logging.DEBUG):
+        context = response.context
+        if not context.pop("logging_enable", self.enable_http_logger): # type: ignore
+            return
+        sampled = context.pop("logging_sampled", None) # type: ignore
+        start = context.pop("logging_start", None) # type: ignore
+        duration = time.time() - start if start is not None else None
+        if sampled is None:
+            # on_request didn't run for this response
+            if not self._logger.isEnabledFor(logging.DEBUG):
+                return
+            sampled = True
+        if not sampled:
+            failed = self.log_failures and response.http_response.status_code >= 400 # type: ignore
+            slow = self.slow_threshold is not None and duration is not None and duration > self.slow_threshold
+            if not (failed or slow):
                 return
+            self._log_request(request)
+        self._log_response(request, response, duration)
+
+    def on_exception(self, request):
+        # type: (PipelineRequest) -> bool
+        """Logs the exception raised while sending the request to the DEBUG logger.
+
+        :param request: The PipelineRequest object.
+        :type request: ~azure.core.pipeline.PipelineRequest
+        :return: False, the exception is not handled.
+        :rtype: bool
+        """
+        context = request.context
+        if not context.pop("logging_enable", False): # type: ignore
+            return False
+        sampled = context.pop("logging_sampled", True) # type: ignore
+        context.pop("logging_start", None) # type: ignore
+        if not sampled:
+            if not self.log_failures:
+                return False
+            self._log_request(request)
+        error = sys.exc_info()[1]
+        if self.structured:
+            self._logger.debug(
+                "http_error method=%s url=%r error=%r", request.http_request.method, # type: ignore
+                _LazyFormat(self._redact_url, request.http_request), error,
+                extra={'azure_http': {'event': 'error', 'method': request.http_request.method, 'error': repr(error)}}
+            )
+        else:
+            self._logger.debug("Request failed: %r", error)
+        return False
+
+    def _log_request(self, request):
+        # type: (PipelineRequest) -> None
+        http_request = request.http_request
+        url = _LazyFormat(self._redact_url, http_request)
+        headers = _LazyFormat(self._format_headers, http_request.headers, self._redact_header)
+        body = _LazyFormat(_describe_request_body, http_request)
+        if self.structured:
+            self._logger.debug(
+                "http_request method=%s url=%r %s body=%r", http_request.method, url, headers, body, # type: ignore
+                extra={'azure_http': {'event': 'request', 'method': http_request.method}} # type: ignore
+            )
+        else:
+            self._logger.debug(
+                "Request URL: %r\nRequest method: %r\nRequest headers:%s\nRequest body:\n%s",
+                url, http_request.method, headers, body # type: ignore
+            )
+
+    def _log_response(self, request, response, duration=None):
+        # type: (PipelineRequest, PipelineResponse, Optional[float]) -> None
+        http_response = response.http_response
+        headers = _LazyFormat(self._format_headers, http_response.headers)
+        body = _LazyFormat(_describe_response_body, response)
+        if self.structured:
+            fields = {
+                'event': 'response',
+                'method': request.http_request.method, # type: ignore
+                'status_code': http_response.status_code, # type: ignore
+                'duration': duration
+            }
+            self._logger.debug(
+                "http_response status_code=%s duration=%s %s body=%r",
+                http_response.status_code, duration, headers, body, # type: ignore
+                extra={'azure_http': fields}
+            )
+        else:
+            self._logger.debug(
+                "Response status: %r\nResponse headers:%s\nResponse content:\n%s",
+                http_response.status_code, headers, body # type: ignore
+            )
+
+
+class _XmlItemTreeBuilder(ET.TreeBuilder):
+    """Tree builder that detaches the elements named "item_name" from the tree as soon as they are complete."""
+    def __init__(self, item_name):
+        ET.TreeBuilder.__init__(self)
+        self._item_name = item_name
+        self._stack = []  # type: List[ET.Element]
+        self.items = []  # type: List[ET.Element]
+
+    def start(self, tag, attrs):  # pylint: disable=arguments-differ
+        element = ET.TreeBuilder.start(self, tag, attrs)
+        self._stack.append(element)
+        return element
+
+    def end(self, tag):
+        element = ET.TreeBuilder.end(self, tag)
+        self._stack.pop()
+        if element.tag == self._item_name and self._stack:
+            self._stack[-1].remove(element)
+            self.items.append(element)
+        return element
+
 
+class _XmlItemDecoder(object):
+    """Incremental XML decoder, returning the elements named "item_name" as they are parsed.
+
+    :param str item_name: The tag of the elements to return.
+    """
+    def __init__(self, item_name):
+        self._builder = _XmlItemTreeBuilder(item_name)
+        self._parser = ET.XMLParser(target=self._builder)
+
+    def feed(self, data):
+        # type: (bytes) -> List[ET.Element]
+        self._parser.feed(data)
+        items, self._builder.items = self._builder.items, []
+        return items
+
+    def close(self):
+        # type: () -> ET.Element
+        return self._parser.close()
+
+
+class _JsonItemDecoder(object):
+    """Incremental JSON decoder, returning the items of one array as they are parsed.
+
+    Only the array is scanned and decoded item by item; the rest of the document is
+    kept as text and decoded by "close", with the array left empty.
+
+    :param str item_name: The key of the array in the top-level object, or None if the
+     document itself is the array.
+    """
+    _SPECIAL_CHARS = re.compile(r'["{}\[\],]')
+
+    def __init__(self, item_name):
+        self._item_name = item_name
+        self._text_decoder = codecs.getincrementaldecoder('utf-8-sig')()
+        self._text = u""
+        self._pos = 0
+        self._depth = 0
+        self._last_key = None  # type: Optional[str]
+        self._array_depth = None  # type: Optional[int]
+        self._array_found = False
+        self._item_start = 0
+        self._outside = []  # type: List[str]
+
+    def feed(self, data):
+        # type: (bytes) -> List[Any]
+        self._text += self._text_decoder.decode(data)
+        items = self._scan()
+        # Only keep what hasn't been consumed yet
+        keep_from = self._item_start if self._array_depth is not None else self._pos
+        if self._array_depth is None:
+            self._outside.append(self._text[:keep_from])
+        self._text = self._text[keep_from:]
+        self._pos -= keep_from
+        self._item_start -= keep_from
+        return items
+
+    def _scan(self):
+        # type: () -> List[Any]
+        items = []
+        text = self._text
+        while True:
+            match = self._SPECIAL_CHARS.search(text, self._pos)
+            if not match:
+                self._pos = len(text)
+                return items
+            index = match.start()
+            char = text[index]
+            if char == '"':
+                end = self._find_string_end(text, index)
+                if end is None:
+                    # Wait for the rest of the string
+                    self._pos = index
+                    return items
+                if self._depth == 1 and self._array_depth is None:
+                    self._last_key = json.loads(text[index:end])
+                self._pos = end
+                continue
+            self._pos = index + 1
+            if char in '{[':
+                self._depth += 1
+                if char == '[' and not self._array_found and (
+                        (self._item_name is None and self._depth == 1) or
+                        (self._depth == 2 and self._last_key == self._item_name)):
+                    self._array_found = True
+                    self._array_depth = self._depth
+                    self._outside.append(text[:self._pos])
+                    self._item_start = self._pos
+            elif char in '}]':
+                if self._depth == self._array_depth:
+                    items.extend(self._end_item(text, index))
+                    self._array_depth = None
+                    text = self._text = text[index:]
+                    self._pos = 1
+                    self._item_start = 0
+                self._depth -= 1
+            elif self._depth == self._array_depth:
+                items.extend(self._end_item(text, index))
+                self._item_start = self._pos
+
+    def _end_item(self, text, index):
+        # type: (str, int) -> List[Any]
+        item = text[self._item_start:index].strip()
+        return [json.loads(item)] if item else []
+
+    @staticmethod
+    def _find_string_end(text, start):
+        # type: (str, int) -> Optional[int]
+        search_from = start + 1
+        while True:
+            quote = text.find('"', search_from)
+            if quote == -1:
+                return None
+            backslashes = 0
+            while text[quote - 1 - backslashes] == '\\':
+                backslashes += 1
+            if backslashes % 2 == 0:
+                return quote + 1
+            search_from = quote + 1
+
+    def close(self):
+        # type: () -> Any
+        self._text += self._text_decoder.decode(b"", final=True)
+        if self._array_depth is not None:
+            raise ValueError("Unterminated JSON array")
+        return json.loads(u"".join(self._outside) + self._text)
+
+
+class _StreamedItems(Iterator[Any]):
+    """Iterator of the items of a list response, decoded while the body streams in.
+
+    :param chunks: The body, as an iterable of bytes.
+    :param decoder: The incremental decoder to feed the body to.
+    """
+    def __init__(self, chunks, decoder):
+        self._chunks = iter(chunks)
+        self._decoder = decoder
+        self._items = []  # type: List[Any]
+        self._remainder = None
+        self._done = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        while not self._items:
+            if self._done:
+                raise StopIteration()
             try:
-                _LOGGER.debug("Response status: %r", response.http_response.status_code) # type: ignore
-                _LOGGER.debug("Response headers:")
-                for res_header, value in response.http_response.headers.items(): # type: ignore
-                    _LOGGER.debug("    %r: %r", res_header, value)
-
-                # We don't want to log binary data if the response is a file.
-                _LOGGER.debug("Response content:")
-                pattern = re.compile(r'attachment; ?filename=["\w.]+', re.IGNORECASE)
-                header = response.http_response.headers.get('content-disposition') # type: ignore
-
-                if header and pattern.match(header):
-                    filename = header.partition('=')[2]
-                    _LOGGER.debug("File attachments: %s", filename)
-                elif response.http_response.headers.get("content-type", "").endswith("octet-stream"): # type: ignore
-                    _LOGGER.debug("Body contains binary data.")
-                elif response.http_response.headers.get("content-type", "").startswith("image"): # type: ignore
-                    _LOGGER.debug("Body contains image data.")
-                else:
-                    if response.context.options.get('stream', False): # type: ignore
-                        _LOGGER.debug("Body is streamable")
-                    else:
-                        _LOGGER.debug(response.http_response.text()) # type: ignore
-            except Exception as err:  # pylint: disable=broad-except
-                _LOGGER.debug("Failed to log response: %s", repr(err))
+                chunk = next(self._chunks)
+            except StopIteration:
+                self._remainder = self._decoder.close()
+                self._done = True
+                continue
+            self._items = self._decoder.feed(chunk)
+            self._items.reverse()
+        return self._items.pop()
+
+    next = __next__  # Python 2 compatibility.
+
+    def remainder(self):
+        """Return the rest of the document once its items are removed, reading any unconsumed item first.
+
+        This is typically where the continuation token of the page is found.
+
+        :returns: The XML root element, or the decoded JSON document.
+        """
+        for _ in self:
+            pass
+        return self._remainder
 
 
 class ContentDecodePolicy(SansIOHTTPPolicy):
@@ -279,10 +617,26 @@ class ContentDecodePolicy(SansIOHTTPPolicy):
         Accept a stream of data as well, but will be load at once in memory for now.
         If no content-type, will return the string version (not bytes, not stream)
 
+        JSON and XML are parsed from the body bytes when they are available, without
+        decoding the whole body to a string first.
+
         :param response: The HTTP response.
         :type response: ~azure.core.pipeline.transport.HttpResponse
         :param str content_type: The content type.
         """
+        if content_type is not None and (cls.JSON_REGEXP.match(content_type) or "xml" in content_type):
+            try:
+                body = response.body() # type: ignore
+            except AttributeError:
+                body = None
+            if isinstance(body, bytes):
+                if not body:
+                    return None
+                try:
+                    return cls._deserialize_bytes(body, content_type)
+                except (ValueError, ET.ParseError, TypeError):
+                    pass  # Let the text based decoding below report the error
+
         data = response.text() # type: ignore
         if not data:
             return None
@@ -335,6 +689,58 @@ class ContentDecodePolicy(SansIOHTTPPolicy):
                 raise_with_traceback(DecodeError, message="XML is invalid", response=response)
         raise DecodeError("Cannot deserialize content-type: {}".format(content_type))
 
+    @classmethod
+    def _deserialize_bytes(cls, body, content_type):
+        # type: (bytes, str) -> Any
+        if cls.JSON_REGEXP.match(content_type):
+            # json detects UTF-8/16/32 (with BOM or not) from bytes on Python 3.6+
+            return json.loads(body)
+        return ET.fromstring(body)
+
+    @classmethod
+    def create_item_decoder(cls, content_type, item_name=None):
+        # type: (str, Optional[str]) -> Any
+        """Create an incremental decoder for the items of a list response.
+
+        The decoder has a "feed(data)" method, taking the next bytes of the body and
+        returning the list of items completely decoded so far, and a "close()" method
+        returning the rest of the document (the XML root element or JSON document) with
+        the items removed. It can be fed from sync or async streams.
+
+        :param str content_type: The content type of the body.
+        :param str item_name: For XML, the tag of the elements to return. For JSON, the key
+         of the array in the top-level object, or None if the body is the array itself.
+        :raises ~azure.core.exceptions.DecodeError: If the content type is neither JSON nor XML.
+        """
+        content_type = content_type.split(";")[0].strip().lower()
+        if cls.JSON_REGEXP.match(content_type):
+            return _JsonItemDecoder(item_name)
+        if "xml" in content_type:
+            if item_name is None:
+                raise ValueError("The tag of the XML elements to decode is required.")
+            return _XmlItemDecoder(item_name)
+        raise DecodeError("Cannot stream deserialize content-type: {}".format(content_type))
+
+    @classmethod
+    def deserialize_from_stream(cls, chunks, content_type, item_name=None):
+        # type: (Iterable[bytes], str, Optional[str]) -> Iterator[Any]
+        """Lazily decode the items of a list response while the body streams in.
+
+        The body is parsed directly from its bytes, and each item is returned as soon as it
+        is complete, so items can be processed before the page finishes downloading and the
+        page is never buffered as a whole. Once the items have been consumed, the
+        "remainder()" method of the returned iterator gives the rest of the document, where
+        the continuation token is typically found.
+
+        :param chunks: The body, for instance from "stream_download" on the HTTP response.
+        :type chunks: iterable[bytes]
+        :param str content_type: The content type of the body.
+        :param str item_name: For XML, the tag of the elements to return. For JSON, the key
+         of the array in the top-level object, or None if the body is the array itself.
+        :returns: An iterator of the decoded items (XML elements or JSON values).
+        """
+        return _StreamedItems(chunks, cls.create_item_decoder(content_type, item_name))
+
     @classmethod
     def deserialize_from_http_generics(cls, response):
         # type: (Type[ContentDecodePolicyType], PipelineResponse) -> Any
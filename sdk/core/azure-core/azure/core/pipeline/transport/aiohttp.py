@@ -128,7 +128,12 @@ class AioHttpTransport(AsyncHttpTransport):
                 except IndexError:
                     raise ValueError("Invalid formdata formatting: {}".format(data))
             return form_data
-        return request.data
+        data = request.data
+        if hasattr(data, '__iter__') and not hasattr(data, 'read') and \
+                not isinstance(data, (bytes, bytearray, memoryview, str, dict)):
+            # aiohttp only streams async iterables, so sync iterables of bytes are wrapped
+            return _AsyncIterableBody(data)
+        return data
 
     async def send(self, request: HttpRequest, **config: Any) -> Optional[AsyncHttpResponse]:
         """Send the request using this HTTP sender.
@@ -189,6 +194,21 @@ class AioHttpTransport(AsyncHttpTransport):
         return response
 
 
+class _AsyncIterableBody(AsyncIterator):
+    """Exposes a sync iterable of bytes as an async iterator, so aiohttp streams it with chunked encoding.
+
+    :param iterable: The iterable of bytes to send.
+    """
+    def __init__(self, iterable) -> None:
+        self._iterator = iter(iterable)
+
+    async def __anext__(self):
+        try:
+            return next(self._iterator)
+        except StopIteration:
+            raise StopAsyncIteration()
+
+
 class AioHttpStreamDownloadGenerator(AsyncIterator):
     """Streams the response body data.
 
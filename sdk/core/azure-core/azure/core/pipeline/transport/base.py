@@ -27,6 +27,7 @@ from __future__ import absolute_import
 import abc
 import json
 import logging
+import mmap
 import os
 import time
 try:
@@ -81,6 +82,42 @@ def _urljoin(base_url, stub_url):
     return parsed.geturl()
 
 
+def _as_byte_view(data):
+    # type: (Union[bytearray, memoryview, mmap.mmap]) -> Union[bytes, memoryview]
+    """Expose an in-memory buffer as a flat view of bytes, without copying it when possible.
+
+    :param data: A bytearray, memoryview or mmap.
+    :returns: A memoryview of unsigned bytes, or bytes if the buffer is not contiguous.
+    """
+    view = memoryview(data)
+    try:
+        return view.cast('B')
+    except AttributeError:  # Python 2 memoryview have no cast, and are already byte oriented
+        return view
+    except TypeError:  # Non-contiguous buffers can't be sent as is
+        return view.tobytes()
+
+
+def _get_stream_length(data):
+    # type: (Any) -> Optional[int]
+    """Find how many bytes are left in a streamable body, if it can be known without reading it.
+
+    :param data: The request body.
+    :returns: The remaining length in bytes, or None if unknown.
+    :rtype: int or None
+    """
+    if isinstance(data, memoryview):
+        return data.nbytes if hasattr(data, 'nbytes') else len(data)
+    if isinstance(data, (binary_type, bytearray)):
+        return len(data)
+    try:
+        remaining = os.fstat(data.fileno()).st_size - data.tell()
+    except (AttributeError, OSError, IOError, ValueError):
+        # Not a regular file, or a file-like object that doesn't expose a file descriptor
+        return None
+    return max(remaining, 0)
+
+
 class HttpTransport(AbstractContextManager, ABC, Generic[HTTPRequestType, HTTPResponseType]): # type: ignore
     """An http sender ABC.
     """
@@ -186,11 +223,22 @@ class HttpRequest(object):
     def set_streamed_data_body(self, data):
         """Set a streamable data body.
 
+        In-memory buffers (bytearray, memoryview, mmap) are sent without being copied,
+        and files are read by the transport chunk by chunk. When the length of the body
+        can be known without reading it (buffers, regular files), the Content-Length header
+        is set; otherwise the transport uses chunked transfer encoding.
+
         :param data: The request field data.
+        :type data: bytes, bytearray, memoryview, mmap, file-like object or iterable of bytes.
         """
-        if not isinstance(data, binary_type) and \
+        if isinstance(data, (bytearray, memoryview, mmap.mmap)):
+            data = _as_byte_view(data)
+        elif not isinstance(data, binary_type) and \
                 not any(hasattr(data, attr) for attr in ["read", "__iter__", "__aiter__"]):
             raise TypeError("A streamable data source must be an open file-like object or iterable.")
+        length = _get_stream_length(data)
+        if length is not None and 'Content-Length' not in self.headers:
+            self.headers['Content-Length'] = str(length)
         self.data = data
         self.files = None
 
@@ -238,10 +286,15 @@ class HttpRequest(object):
     def set_bytes_body(self, data):
         """Set generic bytes as the body of the request.
 
+        A bytearray, memoryview or mmap is used as is, without copying it to bytes.
+
         :param data: The request field data.
         """
+        if isinstance(data, (bytearray, memoryview, mmap.mmap)):
+            data = _as_byte_view(data)
         if data:
-            self.headers['Content-Length'] = str(len(data))
+            length = data.nbytes if isinstance(data, memoryview) and hasattr(data, 'nbytes') else len(data)
+            self.headers['Content-Length'] = str(length)
         self.data = data
         self.files = None
 
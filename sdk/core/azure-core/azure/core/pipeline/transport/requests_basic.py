@@ -25,8 +25,10 @@
 # --------------------------------------------------------------------------
 from __future__ import absolute_import
 import logging
-from typing import Iterator, Optional, Any, Union, TypeVar
+import threading
+from typing import Callable, Iterator, Optional, Any, Union, TypeVar, List  # pylint: disable=unused-import
 import time
+import weakref
 import urllib3 # type: ignore
 from urllib3.util.retry import Retry # type: ignore
 import requests
@@ -153,17 +155,28 @@ class RequestsTransport(HttpTransport):
 
     Since requests team recommends to use one session per requests, you should
     not consider this class as thread-safe, since it will use one Session
-    per instance.
+    per instance, unless "session_per_thread" is enabled.
 
     In this simple implementation:
     - You provide the configured session if you want to, or a basic session is created.
     - All kwargs received by "send" are sent to session.request directly
 
+    When "session_per_thread" is enabled, each thread sending through the transport gets
+    its own Session. All of these sessions are mounted on one shared HTTPAdapter, so the
+    underlying urllib3 connection pools (which are thread-safe) are shared and bounded by
+    "pool_maxsize" connections per host, whatever the number of threads.
+
     **Keyword argument:**
 
     *session (requests.Session)* - Request session to use instead of the default one.
     *session_owner (bool)* - Decide if the session provided by user is owned by this transport. Default to True.
     *use_env_settings (bool)* - Uses proxy settings from environment. Defaults to True.
+    *session_per_thread (bool)* - Use one session per thread over a shared connection pool, making the
+    transport safe to share between threads. Cannot be combined with "session". Defaults to False.
+    *pool_connections (int)* - Number of per-host connection pools to keep. Defaults to 10.
+    *pool_maxsize (int)* - Maximum number of connections kept alive per host. Defaults to 10.
+    *pool_block (bool)* - Whether to wait for a free connection when "pool_maxsize" connections are
+    already in use for a host, instead of opening a connection that is discarded after use. Defaults to False.
 
     Example:
         .. literalinclude:: ../examples/test_example_sync.py
@@ -182,6 +195,17 @@ class RequestsTransport(HttpTransport):
         self._session_owner = kwargs.get('session_owner', True)
         self.connection_config = ConnectionConfiguration(**kwargs)
         self._use_env_settings = kwargs.pop('use_env_settings', True)
+        self._session_per_thread = kwargs.get('session_per_thread', False)
+        if self._session_per_thread and self.session:
+            raise ValueError("'session' cannot be used with 'session_per_thread'.")
+        self._pool_connections = kwargs.get('pool_connections', requests.adapters.DEFAULT_POOLSIZE)
+        self._pool_maxsize = kwargs.get('pool_maxsize', requests.adapters.DEFAULT_POOLSIZE)
+        self._pool_block = kwargs.get('pool_block', requests.adapters.DEFAULT_POOLBLOCK)
+        self._adapter = None  # type: Optional[requests.adapters.HTTPAdapter]
+        self._thread_sessions = threading.local()
+        # The session of a thread is dropped with the thread, so the transport only keeps weak references
+        self._sessions = weakref.WeakSet()  # type: weakref.WeakSet
+        self._sessions_lock = threading.Lock()
 
     def __enter__(self):
         # type: () -> RequestsTransport
@@ -191,6 +215,55 @@ class RequestsTransport(HttpTransport):
     def __exit__(self, *args):  # pylint: disable=arguments-differ
         self.close()
 
+    def _get_adapter(self):
+        # type: () -> requests.adapters.HTTPAdapter
+        if self._adapter is None:
+            disable_retries = Retry(total=False, redirect=False, raise_on_status=False)
+            self._adapter = requests.adapters.HTTPAdapter(
+                pool_connections=self._pool_connections,
+                pool_maxsize=self._pool_maxsize,
+                pool_block=self._pool_block,
+                max_retries=disable_retries
+            )
+        return self._adapter
+
+    def _connection_counter(self, url):
+        # type: (str) -> Optional[Callable[[], Optional[int]]]
+        """Returns a function counting the connections the pools of this host have opened so far.
+
+        Used by the pipeline metrics to count the new connections of an attempt, by calling it
+        before and after sending the request. Returns None if this transport doesn't own the
+        adapter, or if the requests may go through a proxy, as the connections are then made by
+        the proxy managers; the function returns None too once a proxy was used. The pools are
+        only read: none is created for a host the transport hasn't connected to yet.
+        """
+        # The adapter is created when the transport opens, before the first request is sent
+        self.open()
+        if self._adapter is None:
+            return None
+        if self._use_env_settings and requests.utils.get_environ_proxies(url):
+            return None
+        parsed = urllib3.util.parse_url(url)
+        scheme = (parsed.scheme or 'http').lower()
+        host = (parsed.host or '').lower()
+        port = parsed.port or urllib3.connectionpool.port_by_scheme.get(scheme, 80)
+
+        def count_connections():
+            # type: () -> Optional[int]
+            adapter = self._adapter
+            if adapter is None or adapter.proxy_manager:
+                return None
+            pools = adapter.poolmanager.pools
+            count = 0
+            # requests adds the TLS settings to the pool keys, so every pool of the host is counted
+            for key in pools.keys():
+                if (key.key_scheme, key.key_host, key.key_port) == (scheme, host, port):
+                    pool = pools.get(key)
+                    if pool is not None:
+                        count += pool.num_connections
+            return count
+        return count_connections
+
     def _init_session(self, session):
         # type: (requests.Session) -> None
         """Init session level configuration of requests.
@@ -198,18 +271,52 @@ class RequestsTransport(HttpTransport):
         This is initialization I want to do once only on a session.
         """
         session.trust_env = self._use_env_settings
-        disable_retries = Retry(total=False, redirect=False, raise_on_status=False)
-        adapter = requests.adapters.HTTPAdapter(max_retries=disable_retries)
+        adapter = self._get_adapter()
         for p in self._protocols:
             session.mount(p, adapter)
 
+    def _get_session(self):
+        # type: () -> requests.Session
+        """Returns the session to use on the current thread."""
+        if not self._session_per_thread:
+            return self.session
+        session = getattr(self._thread_sessions, 'session', None)
+        if session is None:
+            session = requests.Session()
+            with self._sessions_lock:
+                # The adapter is shared by every thread, so it must only be built once.
+                self._init_session(session)
+                self._sessions.add(session)
+            self._thread_sessions.session = session
+        return session
+
+    def _request(self, *args, **kwargs):
+        # type: (Any, Any) -> requests.Response
+        """Sends the request with the session of the thread this runs on.
+
+        The async transports run this on their worker threads, so that each worker
+        uses its own session when the sessions are per thread.
+        """
+        return self._get_session().request(*args, **kwargs)
+
     def open(self):
-        if not self.session and self._session_owner:
+        if self._session_per_thread:
+            self._get_session()
+        elif not self.session and self._session_owner:
             self.session = requests.Session()
             self._init_session(self.session)
 
     def close(self):
-        if self._session_owner:
+        if self._session_per_thread:
+            with self._sessions_lock:
+                sessions, self._sessions = list(self._sessions), weakref.WeakSet()
+                self._thread_sessions = threading.local()
+            for session in sessions:
+                session.close()
+            if self._adapter is not None:
+                self._adapter.close()
+                self._adapter = None
+        elif self._session_owner:
             self.session.close()
             self._session_owner = False
             self.session = None
@@ -234,7 +341,7 @@ class RequestsTransport(HttpTransport):
         error = None # type: Optional[Union[ServiceRequestError, ServiceResponseError]]
 
         try:
-            response = self.session.request(  # type: ignore
+            response = self._request(  # type: ignore
                 request.method,
                 request.url,
                 headers=request.headers,
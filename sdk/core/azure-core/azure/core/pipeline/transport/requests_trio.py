@@ -177,7 +177,7 @@ class TrioRequestsTransport(RequestsTransport, AsyncHttpTransport):  # type: ign
             try:
                 response = await trio.to_thread.run_sync(
                     functools.partial(
-                        self.session.request, # type: ignore
+                        self._request, # type: ignore
                         request.method,
                         request.url,
                         headers=request.headers,
@@ -192,7 +192,7 @@ class TrioRequestsTransport(RequestsTransport, AsyncHttpTransport):  # type: ign
             except AttributeError:  # trio < 0.12.1
                 response = await trio.run_sync_in_worker_thread(  # pylint: disable=no-member
                     functools.partial(
-                        self.session.request, # type: ignore
+                        self._request, # type: ignore
                         request.method,
                         request.url,
                         headers=request.headers,
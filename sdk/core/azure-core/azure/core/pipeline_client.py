@@ -70,6 +70,8 @@ class PipelineClient(PipelineClientBase):
     *pipeline* - A Pipeline object. If omitted, a Pipeline object is created and returned.
     *policies* - A list of policies object. If omitted, the standard policies of the configuration object is used.
     *transport* - The HTTP Transport instance. If omitted, RequestsTransport is used for synchronous transport.
+    *metrics_sink* - A MetricsSink receiving the metrics of each request. If omitted, no metrics are recorded.
+    *fuse_sansio_policies* - Whether consecutive SansIO policies are run by a single runner. Defaults to False.
 
     Example:
         .. literalinclude:: ../examples/test_example_sync.py
@@ -121,4 +123,9 @@ class PipelineClient(PipelineClientBase):
         if not transport:
             transport = RequestsTransport(**kwargs)
 
-        return Pipeline(transport, policies)
+        return Pipeline(
+            transport,
+            policies,
+            metrics_sink=kwargs.get("metrics_sink"),
+            fuse_sansio_policies=kwargs.get("fuse_sansio_policies", False)
+        )
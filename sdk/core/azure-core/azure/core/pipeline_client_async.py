@@ -69,6 +69,8 @@ class AsyncPipelineClient(PipelineClientBase):
     *pipeline* - A Pipeline object. If omitted, an AsyncPipeline is created and returned.
     *policies* - A list of policies object. If omitted, the standard policies of the configuration object is used.
     *transport* - The HTTP Transport instance. If omitted, AioHttpTransport is use for asynchronous transport.
+    *metrics_sink* - A MetricsSink receiving the metrics of each request. If omitted, no metrics are recorded.
+    *fuse_sansio_policies* - Whether consecutive SansIO policies are run by a single runner. Defaults to False.
 
     Example:
         .. literalinclude:: ../examples/test_example_async.py
@@ -121,4 +123,9 @@ class AsyncPipelineClient(PipelineClientBase):
             from .pipeline.transport import AioHttpTransport
             transport = AioHttpTransport(**kwargs)
 
-        return AsyncPipeline(transport, policies)
+        return AsyncPipeline(
+            transport,
+            policies,
+            metrics_sink=kwargs.get("metrics_sink"),
+            fuse_sansio_policies=kwargs.get("fuse_sansio_policies", False)
+        )
@@ -25,11 +25,14 @@
 # --------------------------------------------------------------------------
 import sys
 
-from .poller import LROPoller, NoPolling, PollingMethod
-__all__ = ['LROPoller', 'NoPolling', 'PollingMethod']
+from .poller import LROPoller, NoPolling, PollingMethod, LROPollerManager, ManagedLROPoller
+__all__ = ['LROPoller', 'NoPolling', 'PollingMethod', 'LROPollerManager', 'ManagedLROPoller']
 
 #pylint: disable=unused-import
 if sys.version_info >= (3, 5, 2):
     # Not executed on old Python, no syntax error
-    from .async_poller import AsyncNoPolling, AsyncPollingMethod, async_poller
-    __all__ += ['AsyncNoPolling', 'AsyncPollingMethod', 'async_poller']
+    from .async_poller import (
+        AsyncNoPolling, AsyncPollingMethod, async_poller, AsyncLROPollerManager, AsyncManagedLROPoller
+    )
+    __all__ += ['AsyncNoPolling', 'AsyncPollingMethod', 'async_poller', 'AsyncLROPollerManager',
+                'AsyncManagedLROPoller']
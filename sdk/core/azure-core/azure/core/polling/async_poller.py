@@ -23,7 +23,17 @@
 # IN THE SOFTWARE.
 #
 # --------------------------------------------------------------------------
-from .poller import NoPolling as _NoPolling
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from typing import Any, AsyncIterator, Callable, Iterable, List, Optional  # pylint: disable=unused-import
+
+from .poller import NoPolling as _NoPolling, _get_polling_interval, _implements_update_status, _prepare_polling_method
+
+
+_LOGGER = logging.getLogger(__name__)
 
 class AsyncPollingMethod(object):
     """ABC class for polling method.
@@ -43,6 +53,22 @@ class AsyncPollingMethod(object):
     def resource(self):
         raise NotImplementedError("This method needs to be implemented")
 
+    async def update_status(self):
+        """Poll the status of the operation once.
+
+        Optional: polling methods implementing it can be multiplexed by an AsyncLROPollerManager,
+        instead of awaiting "run" in a task of their own.
+        """
+        raise NotImplementedError("This method needs to be implemented")
+
+    def get_polling_interval(self):
+        """The time to wait before the next call to "update_status", in seconds.
+
+        Optional: should respect the Retry-After header of the last status response.
+        If None, the default polling interval of the AsyncLROPollerManager is used.
+        """
+        raise NotImplementedError("This method needs to be implemented")
+
 
 class AsyncNoPolling(_NoPolling):
     """An empty async poller that returns the deserialized initial response.
@@ -67,14 +93,275 @@ async def async_poller(client, initial_response, deserialization_callback, polli
     :type polling_method: ~msrest.polling.PollingMethod
     """
 
-    # This implicit test avoids bringing in an explicit dependency on Model directly
-    try:
-        deserialization_callback = deserialization_callback.deserialize
-    except AttributeError:
-        pass
-
     # Might raise a CloudError
-    polling_method.initialize(client, initial_response, deserialization_callback)
+    _prepare_polling_method(client, initial_response, deserialization_callback, polling_method)
 
     await polling_method.run()
     return polling_method.resource()
+
+
+class AsyncManagedLROPoller(object):
+    """Poller for a long running operation polled by an AsyncLROPollerManager.
+
+    Awaiting it returns the result of the operation.
+    Do not instantiate directly, use AsyncLROPollerManager.add.
+    """
+
+    def __init__(self, polling_method: AsyncPollingMethod) -> None:
+        self._polling_method = polling_method
+        self._future = asyncio.get_event_loop().create_future()
+        self._callbacks = []  # type: List[Callable]
+
+    def _finish(self, exception: Optional[Exception] = None) -> None:
+        if self._future.done():
+            return
+        if exception is not None:
+            self._future.set_exception(exception)
+        else:
+            self._future.set_result(None)
+        callbacks, self._callbacks = self._callbacks, []
+        for call in callbacks:
+            try:
+                call(self._polling_method)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.warning("Done callback of a long running operation failed.", exc_info=True)
+
+    def __await__(self):
+        return self.result().__await__()
+
+    def status(self) -> str:
+        """Returns the current status string.
+
+        :returns: The current status string
+        :rtype: str
+        """
+        if self._future.cancelled():
+            return "cancelled"
+        return self._polling_method.status()
+
+    async def result(self) -> Any:
+        """Wait for the long running operation to complete, and return its result.
+
+        :returns: The deserialized resource of the long running operation,
+         if one is available.
+        :raises CloudError: Server problem with the query.
+        :raises ~asyncio.CancelledError: If the poller was cancelled.
+        """
+        await self.wait()
+        return self._polling_method.resource()
+
+    async def wait(self) -> None:
+        """Wait for the long running operation to complete.
+
+        :raises CloudError: Server problem with the query.
+        """
+        await asyncio.shield(self._future)
+
+    def done(self) -> bool:
+        """Check status of the long running operation.
+
+        :returns: 'True' if the process has completed or was cancelled, else 'False'.
+        """
+        return self._future.done()
+
+    def cancel(self) -> bool:
+        """Stop polling the long running operation. This doesn't cancel the operation on the service.
+
+        :returns: 'True' if polling was stopped, 'False' if the operation had already completed.
+        """
+        if not self._future.cancel():
+            return False
+        callbacks, self._callbacks = self._callbacks, []
+        for call in callbacks:
+            call(self._polling_method)
+        return True
+
+    def cancelled(self) -> bool:
+        """Whether polling was stopped by "cancel".
+
+        :rtype: bool
+        """
+        return self._future.cancelled()
+
+    def add_done_callback(self, func: Callable) -> None:
+        """Add callback function to be run once the long running operation
+        has completed or was cancelled.
+
+        :param callable func: Callback function that takes at least one
+         argument, a completed LongRunningOperation.
+        """
+        if self._future.done():
+            func(self._polling_method)
+        else:
+            self._callbacks.append(func)
+
+    def remove_done_callback(self, func: Callable) -> None:
+        """Remove a callback from the long running operation.
+
+        :param callable func: The function to be removed from the callbacks.
+        :raises: ValueError if the long running operation has already
+         completed.
+        """
+        if self._future.done():
+            raise ValueError("Process is complete.")
+        self._callbacks = [c for c in self._callbacks if c != func]
+
+
+class _AsCompleted(AsyncIterator[AsyncManagedLROPoller]):  # pylint: disable=unsubscriptable-object
+    """Async iterator over pollers, in the order their long running operations complete."""
+
+    def __init__(self, pollers: Iterable[AsyncManagedLROPoller]) -> None:
+        self._remaining = 0
+        self._completed = asyncio.Queue()  # type: asyncio.Queue
+        for poller in pollers:
+            self._remaining += 1
+            poller.add_done_callback(lambda _, poller=poller: self._completed.put_nowait(poller))
+
+    async def __anext__(self) -> AsyncManagedLROPoller:
+        if not self._remaining:
+            raise StopAsyncIteration()
+        self._remaining -= 1
+        return await self._completed.get()
+
+
+class AsyncLROPollerManager(object):
+    """Polls many long running operations from a single task of the event loop.
+
+    The operations wait on a shared schedule, and each operation is polled again after the interval
+    its polling method asks for, which should respect the Retry-After header of the service. Polling
+    methods that don't implement "update_status" are awaited in a task of their own.
+
+    :param int max_concurrent_polls: How many status requests can be sent at once. Default value is 10.
+    :param float polling_interval: Polling interval, in seconds, when the polling method
+     doesn't give one. Default value is 30.
+    """
+
+    def __init__(self, max_concurrent_polls: int = 10, polling_interval: float = 30) -> None:
+        self.polling_interval = polling_interval
+        self._max_concurrent_polls = max_concurrent_polls
+        self._semaphore = None  # type: Optional[asyncio.Semaphore]
+        self._schedule = []  # type: List[Any]
+        self._sequence = itertools.count()
+        self._wakeup = None  # type: Optional[asyncio.Event]
+        self._scheduler = None  # type: Optional[asyncio.Future]
+        self._tasks = set()  # type: set
+        self._pollers = set()  # type: set
+        self._closed = False
+
+    async def __aenter__(self) -> "AsyncLROPollerManager":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+    def _reschedule(self, poller: AsyncManagedLROPoller, delay: float) -> None:
+        heapq.heappush(self._schedule, (time.time() + delay, next(self._sequence), poller))
+        self._wakeup.set()
+
+    async def _run_schedule(self) -> None:
+        while True:
+            self._wakeup.clear()
+            now = time.time()
+            while self._schedule and (self._schedule[0][0] <= now or self._schedule[0][2].done()):
+                _, _, poller = heapq.heappop(self._schedule)
+                if not poller.done():
+                    self._start_task(self._poll(poller))
+            timeout = self._schedule[0][0] - now if self._schedule else None
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def _start_task(self, coroutine) -> None:
+        task = asyncio.ensure_future(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _poll(self, poller: AsyncManagedLROPoller) -> None:
+        method = poller._polling_method  # pylint: disable=protected-access
+        try:
+            async with self._semaphore:
+                if poller.done():
+                    return
+                await method.update_status()
+        except NotImplementedError:
+            await self._run(poller)
+            return
+        except Exception as err:  # pylint: disable=broad-except
+            poller._finish(err)  # pylint: disable=protected-access
+            return
+        if method.finished():
+            poller._finish()  # pylint: disable=protected-access
+        elif not poller.done():
+            self._reschedule(poller, _get_polling_interval(method, self.polling_interval))
+
+    @staticmethod
+    async def _run(poller: AsyncManagedLROPoller) -> None:
+        try:
+            await poller._polling_method.run()  # pylint: disable=protected-access
+        except Exception as err:  # pylint: disable=broad-except
+            poller._finish(err)  # pylint: disable=protected-access
+        else:
+            poller._finish()  # pylint: disable=protected-access
+
+    def add(self, client, initial_response, deserialization_callback, polling_method) -> AsyncManagedLROPoller:
+        """Start polling a long running operation.
+
+        Takes the same parameters as async_poller. Must be called from the event loop.
+
+        :param client: A pipeline service client.
+        :type client: ~azure.core.pipeline.PipelineClient
+        :param initial_response: The initial call response
+        :type initial_response: ~azure.core.pipeline.HttpResponse
+        :param deserialization_callback: A callback that takes a Response and return a deserialized object.
+                                         If a subclass of Model is given, this passes "deserialize" as callback.
+        :type deserialization_callback: callable or msrest.serialization.Model
+        :param polling_method: The polling strategy to adopt
+        :type polling_method: ~azure.core.polling.AsyncPollingMethod
+        :rtype: ~azure.core.polling.AsyncManagedLROPoller
+        :raises ValueError: If the manager is closed.
+        """
+        if self._closed:
+            raise ValueError("The poller manager is closed.")
+        _prepare_polling_method(client, initial_response, deserialization_callback, polling_method)
+        poller = AsyncManagedLROPoller(polling_method)
+        if polling_method.finished():
+            poller._finish()  # pylint: disable=protected-access
+            return poller
+        self._pollers.add(poller)
+        poller.add_done_callback(lambda _: self._pollers.discard(poller))
+        if not _implements_update_status(polling_method, AsyncPollingMethod):
+            self._start_task(self._run(poller))
+            return poller
+        if self._scheduler is None:
+            self._semaphore = asyncio.Semaphore(self._max_concurrent_polls)
+            self._wakeup = asyncio.Event()
+            self._scheduler = asyncio.ensure_future(self._run_schedule())
+        self._reschedule(poller, _get_polling_interval(polling_method, self.polling_interval))
+        return poller
+
+    @staticmethod
+    def as_completed(pollers: Iterable[AsyncManagedLROPoller]) -> AsyncIterator[AsyncManagedLROPoller]:
+        """Iterate over the pollers as their long running operations complete.
+
+        :param pollers: The pollers to wait on.
+        :rtype: async iterator[~azure.core.polling.AsyncManagedLROPoller]
+        """
+        return _AsCompleted(pollers)
+
+    async def close(self) -> None:
+        """Stop the scheduler, and cancel the pollers of the operations still running."""
+        if self._closed:
+            return
+        self._closed = True
+        pending = list(self._pollers)
+        self._schedule = []
+        tasks = list(self._tasks)
+        if self._scheduler is not None:
+            tasks.append(self._scheduler)
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        for poller in pending:
+            poller.cancel()
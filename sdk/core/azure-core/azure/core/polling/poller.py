@@ -23,14 +23,22 @@
 # IN THE SOFTWARE.
 #
 # --------------------------------------------------------------------------
+import heapq
+import itertools
+import logging
 import threading
+import time
 import uuid
 try:
     from urlparse import urlparse # type: ignore # pylint: disable=unused-import
 except ImportError:
     from urllib.parse import urlparse
+try:
+    import queue
+except ImportError:
+    import Queue as queue # type: ignore
 
-from typing import Any, Callable, Union, List, Optional, TYPE_CHECKING
+from typing import Any, Callable, Union, List, Optional, Iterable, Iterator, TYPE_CHECKING
 from azure.core.pipeline.transport.base import HttpResponse  # type: ignore
 from azure.core.tracing.context import tracing_context
 from azure.core.tracing.decorator import distributed_trace
@@ -40,6 +48,8 @@ if TYPE_CHECKING:
     from msrest.serialization import Model # type: ignore # pylint: disable=unused-import
     DeserializationCallbackType = Union[Model, Callable[[requests.Response], Model]]
 
+_LOGGER = logging.getLogger(__name__)
+
 
 class PollingMethod(object):
     """ABC class for polling method.
@@ -64,6 +74,24 @@ class PollingMethod(object):
         # type: () -> Any
         raise NotImplementedError("This method needs to be implemented")
 
+    def update_status(self):
+        # type: () -> None
+        """Poll the status of the operation once.
+
+        Optional: polling methods implementing it can be multiplexed by a LROPollerManager,
+        instead of running "run" on a dedicated thread.
+        """
+        raise NotImplementedError("This method needs to be implemented")
+
+    def get_polling_interval(self):
+        # type: () -> Optional[float]
+        """The time to wait before the next call to "update_status", in seconds.
+
+        Optional: should respect the Retry-After header of the last status response.
+        If None, the default polling interval of the LROPollerManager is used.
+        """
+        raise NotImplementedError("This method needs to be implemented")
+
 class NoPolling(PollingMethod):
     """An empty poller that returns the deserialized initial response.
     """
@@ -102,6 +130,33 @@ class NoPolling(PollingMethod):
         return self._deserialization_callback(self._initial_response)
 
 
+def _get_polling_interval(polling_method, default):
+    # type: (Any, float) -> float
+    try:
+        interval = polling_method.get_polling_interval()
+    except (AttributeError, NotImplementedError):
+        interval = None
+    return default if interval is None else interval
+
+
+def _implements_update_status(polling_method, base):
+    # type: (Any, type) -> bool
+    update = getattr(type(polling_method), 'update_status', None)
+    base_update = base.update_status
+    return update is not None and getattr(update, '__func__', update) is not getattr(base_update, '__func__', base_update)
+
+
+def _prepare_polling_method(client, initial_response, deserialization_callback, polling_method):
+    # This implicit test avoids bringing in an explicit dependency on Model directly
+    try:
+        deserialization_callback = deserialization_callback.deserialize
+    except AttributeError:
+        pass
+
+    # Might raise a CloudError
+    polling_method.initialize(client, initial_response, deserialization_callback)
+
+
 class LROPoller(object):
     """Poller for long running operations.
 
@@ -123,14 +178,8 @@ class LROPoller(object):
         self._callbacks = []  # type: List[Callable]
         self._polling_method = polling_method
 
-        # This implicit test avoids bringing in an explicit dependency on Model directly
-        try:
-            deserialization_callback = deserialization_callback.deserialize # type: ignore
-        except AttributeError:
-            pass
-
         # Might raise a CloudError
-        self._polling_method.initialize(self._client, self._response, deserialization_callback)
+        _prepare_polling_method(self._client, self._response, deserialization_callback, self._polling_method)
 
         # Prepare thread execution
         self._thread = None
@@ -239,3 +288,316 @@ class LROPoller(object):
         if self._done is None or self._done.is_set():
             raise ValueError("Process is complete.")
         self._callbacks = [c for c in self._callbacks if c != func]
+
+
+class ManagedLROPoller(object):
+    """Poller for a long running operation polled by a LROPollerManager.
+
+    It has the same interface as LROPoller, and can be cancelled.
+    Do not instantiate directly, use LROPollerManager.add.
+    """
+
+    def __init__(self, polling_method):
+        # type: (PollingMethod) -> None
+        self._polling_method = polling_method
+        self._callbacks = []  # type: List[Callable]
+        self._callbacks_lock = threading.Lock()
+        self._done = threading.Event()
+        self._exception = None  # type: Optional[Exception]
+        self._cancelled = False
+        self._update_status = tracing_context.with_current_context(
+            getattr(polling_method, 'update_status', PollingMethod().update_status))
+        self._run = tracing_context.with_current_context(polling_method.run)
+
+    def _finish(self, exception=None, cancelled=False):
+        # type: (Optional[Exception], bool) -> bool
+        with self._callbacks_lock:
+            if self._done.is_set():
+                return False
+            # An operation that reached a terminal state while it was being cancelled isn't cancelled
+            self._cancelled = cancelled and not self._polling_method.finished()
+            self._exception = exception
+            self._done.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for call in callbacks:
+            try:
+                call(self._polling_method)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.warning("Done callback of a long running operation failed.", exc_info=True)
+        return True
+
+    def status(self):
+        # type: () -> str
+        """Returns the current status string.
+
+        :returns: The current status string
+        :rtype: str
+        """
+        if self._cancelled:
+            return "cancelled"
+        return self._polling_method.status()
+
+    def result(self, timeout=None):
+        # type: (Optional[float]) -> Model
+        """Return the result of the long running operation, or
+        the result available after the specified timeout.
+
+        :returns: The deserialized resource of the long running operation,
+         if one is available.
+        :raises CloudError: Server problem with the query.
+        :raises ValueError: If the poller was cancelled.
+        """
+        self.wait(timeout)
+        if self._cancelled:
+            raise ValueError("The long running operation poller was cancelled.")
+        return self._polling_method.resource()
+
+    def wait(self, timeout=None):
+        # type: (Optional[float]) -> None
+        """Wait on the long running operation for a specified length
+        of time. You can check if this call as ended with timeout with the
+        "done()" method.
+
+        :param float timeout: Period of time to wait for the long running
+         operation to complete (in seconds).
+        :raises CloudError: Server problem with the query.
+        """
+        self._done.wait(timeout)
+        if self._exception is not None:
+            raise self._exception  # pylint: disable=raising-bad-type
+
+    def done(self):
+        # type: () -> bool
+        """Check status of the long running operation.
+
+        :returns: 'True' if the process has completed or was cancelled, else 'False'.
+        """
+        return self._done.is_set()
+
+    def cancel(self):
+        # type: () -> bool
+        """Stop polling the long running operation. This doesn't cancel the operation on the service.
+
+        :returns: 'True' if polling was stopped, 'False' if the operation had already completed.
+        """
+        if not self._finish(cancelled=True):
+            return False
+        return self._cancelled
+
+    def cancelled(self):
+        # type: () -> bool
+        """Whether polling was stopped by "cancel".
+
+        :rtype: bool
+        """
+        return self._cancelled
+
+    def add_done_callback(self, func):
+        # type: (Callable) -> None
+        """Add callback function to be run once the long running operation
+        has completed or was cancelled.
+
+        :param callable func: Callback function that takes at least one
+         argument, a completed LongRunningOperation.
+        """
+        with self._callbacks_lock:
+            if not self._done.is_set():
+                self._callbacks.append(func)
+                return
+        func(self._polling_method)
+
+    def remove_done_callback(self, func):
+        # type: (Callable) -> None
+        """Remove a callback from the long running operation.
+
+        :param callable func: The function to be removed from the callbacks.
+        :raises: ValueError if the long running operation has already
+         completed.
+        """
+        with self._callbacks_lock:
+            if self._done.is_set():
+                raise ValueError("Process is complete.")
+            self._callbacks = [c for c in self._callbacks if c != func]
+
+
+class LROPollerManager(object):
+    """Polls many long running operations from one scheduler thread and a small pool of worker threads.
+
+    Instead of a sleeping thread per operation, the operations wait on a shared schedule. Each
+    operation is polled again after the interval its polling method asks for, which should respect
+    the Retry-After header of the service. Polling methods that don't implement "update_status"
+    are run on a dedicated thread, like LROPoller does.
+
+    :param int max_workers: The number of threads polling the operations. Default value is 4.
+    :param float polling_interval: Polling interval, in seconds, when the polling method
+     doesn't give one. Default value is 30.
+    """
+
+    def __init__(self, max_workers=4, polling_interval=30):
+        # type: (int, float) -> None
+        self._max_workers = max_workers
+        self.polling_interval = polling_interval
+        self._schedule = []  # type: List[Any]
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._work = queue.Queue()  # type: queue.Queue
+        self._threads = []  # type: List[threading.Thread]
+        self._pollers = set()  # type: set
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _start_threads(self):
+        # Called with the condition held
+        if self._threads:
+            return
+        scheduler = threading.Thread(target=self._run_schedule, name="LROPollerManager-scheduler")
+        self._threads.append(scheduler)
+        for index in range(self._max_workers):
+            self._threads.append(threading.Thread(
+                target=self._run_worker, name="LROPollerManager-worker-{}".format(index)))
+        for thread in self._threads:
+            thread.daemon = True
+            thread.start()
+
+    def _reschedule(self, poller, delay):
+        # type: (ManagedLROPoller, float) -> None
+        with self._condition:
+            closed = self._closed
+            if not closed:
+                heapq.heappush(self._schedule, (time.time() + delay, next(self._sequence), poller))
+                self._condition.notify()
+        if closed:
+            poller.cancel()
+
+    def _run_schedule(self):
+        with self._condition:
+            while not self._closed:
+                if not self._schedule:
+                    self._condition.wait()
+                    continue
+                due, _, poller = self._schedule[0]
+                if poller.done():
+                    heapq.heappop(self._schedule)
+                    continue
+                delay = due - time.time()
+                if delay > 0:
+                    self._condition.wait(delay)
+                    continue
+                heapq.heappop(self._schedule)
+                self._work.put(poller)
+
+    def _run_worker(self):
+        while True:
+            poller = self._work.get()
+            if poller is None:
+                return
+            if not poller.done():
+                self._poll(poller)
+
+    def _poll(self, poller):
+        # type: (ManagedLROPoller) -> None
+        method = poller._polling_method  # pylint: disable=protected-access
+        try:
+            poller._update_status()  # pylint: disable=protected-access
+        except NotImplementedError:
+            self._run_in_thread(poller)
+            return
+        except Exception as err:  # pylint: disable=broad-except
+            poller._finish(err)  # pylint: disable=protected-access
+            return
+        if method.finished():
+            poller._finish()  # pylint: disable=protected-access
+        else:
+            self._reschedule(poller, _get_polling_interval(method, self.polling_interval))
+
+    def _discard(self, poller):
+        # type: (ManagedLROPoller) -> None
+        with self._condition:
+            self._pollers.discard(poller)
+
+    @staticmethod
+    def _run_in_thread(poller):
+        # type: (ManagedLROPoller) -> None
+        def run():
+            try:
+                poller._run()  # pylint: disable=protected-access
+            except Exception as err:  # pylint: disable=broad-except
+                poller._finish(err)  # pylint: disable=protected-access
+            else:
+                poller._finish()  # pylint: disable=protected-access
+        thread = threading.Thread(target=run, name="LROPoller({})".format(uuid.uuid4()))
+        thread.daemon = True
+        thread.start()
+
+    def add(self, client, initial_response, deserialization_callback, polling_method):
+        # type: (Any, HttpResponse, DeserializationCallbackType, PollingMethod) -> ManagedLROPoller
+        """Start polling a long running operation.
+
+        Takes the same parameters as LROPoller.
+
+        :param client: A pipeline service client
+        :type client: ~azure.core.pipeline.PipelineClient
+        :param initial_response: The initial call response
+        :type initial_response: ~azure.core.pipeline.HttpResponse
+        :param deserialization_callback: A callback that takes a Response and return a deserialized object.
+                                         If a subclass of Model is given, this passes "deserialize" as callback.
+        :type deserialization_callback: callable or msrest.serialization.Model
+        :param polling_method: The polling strategy to adopt
+        :type polling_method: ~azure.core.polling.PollingMethod
+        :rtype: ~azure.core.polling.ManagedLROPoller
+        :raises ValueError: If the manager is closed.
+        """
+        if self._closed:
+            raise ValueError("The poller manager is closed.")
+        _prepare_polling_method(client, initial_response, deserialization_callback, polling_method)
+        poller = ManagedLROPoller(polling_method)
+        if polling_method.finished():
+            poller._finish()  # pylint: disable=protected-access
+            return poller
+        if not _implements_update_status(polling_method, PollingMethod):
+            self._run_in_thread(poller)
+            return poller
+        with self._condition:
+            self._pollers.add(poller)
+            self._start_threads()
+        poller.add_done_callback(lambda _: self._discard(poller))
+        self._reschedule(poller, _get_polling_interval(polling_method, self.polling_interval))
+        return poller
+
+    @staticmethod
+    def as_completed(pollers):
+        # type: (Iterable[ManagedLROPoller]) -> Iterator[ManagedLROPoller]
+        """Iterate over the pollers as their long running operations complete.
+
+        :param pollers: The pollers to wait on.
+        :rtype: iterator[~azure.core.polling.ManagedLROPoller]
+        """
+        pollers = list(pollers)
+        completed = queue.Queue()  # type: queue.Queue
+        for poller in pollers:
+            poller.add_done_callback(lambda _, poller=poller: completed.put(poller))
+        for _ in pollers:
+            yield completed.get()
+
+    def close(self):
+        # type: () -> None
+        """Stop the threads, and cancel the pollers of the operations still running.
+
+        Polling methods run on a dedicated thread can't be interrupted: they stop when "run" returns.
+        """
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            pending = list(self._pollers)
+            self._schedule = []
+            self._condition.notify_all()
+        for _ in range(self._max_workers):
+            self._work.put(None)
+        for poller in pending:
+            poller.cancel()
@@ -207,6 +207,13 @@ class PrioritizedSetting(object):
     returned. For instance to concert log levels in environment variables
     to ``logging`` module values.
 
+    The resolved and converted value is cached, so reading a setting on a hot path
+    doesn't look up the environment or convert the value again. The cache is
+    invalidated by ``set_value``, ``unset_value`` and ``reload``: changes to the
+    environment variable are only seen after one of them (or ``settings.config()``)
+    is called. A resolved value of None is not cached, since it means the setting
+    isn't available yet.
+
     """
 
     def __init__(self, name, env_var=None, system_hook=None, default=_Unset, convert=None):
@@ -217,6 +224,7 @@ class PrioritizedSetting(object):
         self._default = default
         self._convert = convert if convert else lambda x: x
         self._user_value = _Unset
+        self._cached_value = _Unset
 
     def __repr__(self):
         # type () -> str
@@ -238,6 +246,17 @@ class PrioritizedSetting(object):
         if value is not None:
             return self._convert(value)
 
+        cached_value = self._cached_value
+        if cached_value is not _Unset:
+            return cached_value
+
+        resolved = self._resolve()
+        if resolved is not None:
+            self._cached_value = resolved
+        return resolved
+
+    def _resolve(self):
+        # type: () -> Any
         # 3. previously user-set value
         if self._user_value is not _Unset:
             return self._convert(self._user_value)
@@ -275,11 +294,18 @@ class PrioritizedSetting(object):
 
         """
         self._user_value = value
+        self._cached_value = _Unset
 
     def unset_value(self):
         # () -> None
         """Unset the previous user value such that the priority is reset."""
         self._user_value = _Unset
+        self._cached_value = _Unset
+
+    def reload(self):
+        # type: () -> None
+        """Discard the cached value, so the environment and system settings are looked up again."""
+        self._cached_value = _Unset
 
     @property
     def env_var(self):
@@ -342,6 +368,9 @@ class Settings(object):
         # return current settings with log level overridden
         settings.config(log_level=logging.DEBUG)
 
+    Resolved values are cached. After changing environment variables, call
+    ``settings.reload()`` (``settings.config`` also reloads) for the change to be seen.
+
     :Attributes:
 
     :ivar defaults_only: whether to ignore environment and system settings and return only base default values
@@ -400,10 +429,19 @@ class Settings(object):
         settings.config(log_level=logging.DEBUG)
 
         """
+        self.reload()
         props = {k: v() for (k, v) in self.__class__.__dict__.items() if isinstance(v, PrioritizedSetting)}
         props.update(kwargs)
         return self._config(props)
 
+    def reload(self):
+        """ Discard the cached values of all settings, e.g. after the environment changed.
+
+        """
+        for setting in self.__class__.__dict__.values():
+            if isinstance(setting, PrioritizedSetting):
+                setting.reload()
+
     def _config(self, props):  # pylint: disable=no-self-use
         Config = namedtuple("Config", list(props.keys()))
         return Config(**props)
@@ -5,6 +5,7 @@
 """Implements azure.core.tracing.AbstractSpan to wrap opencensus spans."""
 
 from opencensus.trace import Span, execution_context
+from opencensus.trace.blank_span import BlankSpan
 from opencensus.trace.tracer import Tracer
 from opencensus.trace.span import SpanKind
 from opencensus.trace.link import Link
@@ -51,6 +52,14 @@ class OpenCensusSpan(object):
         """
         return self._span_instance
 
+    @property
+    def sampled(self):
+        # type: () -> bool
+        """
+        :return: Whether the span is recorded, False if the tracer drops it.
+        """
+        return not isinstance(self.span_instance, BlankSpan)
+
     def span(self, name="span"):
         # type: (Optional[str]) -> OpenCensusSpan
         """
@@ -4,6 +4,7 @@
 # license information.
 # -------------------------------------------------------------------------
 import asyncio
+import logging
 import time
 from unittest.mock import Mock
 
@@ -86,3 +87,88 @@ async def test_bearer_policy_token_caching():
 
     await pipeline.run(HttpRequest("GET", "https://spam.eggs"))
     assert get_token_calls == 2  # token expired -> policy should call get_token
+
+
+@pytest.mark.asyncio
+async def test_bearer_policy_background_refresh():
+    """A token nearing expiry should be refreshed once, in the background, while it is still being sent"""
+    expiring_token = AccessToken("expiring", time.time() + 120)
+    fresh_token = AccessToken("fresh", time.time() + 3600)
+    release_refresh = asyncio.Event()
+    get_token_calls = 0
+
+    async def get_token(_):
+        nonlocal get_token_calls
+        get_token_calls += 1
+        await release_refresh.wait()
+        return fresh_token
+
+    sent_tokens = []
+
+    async def send(request):
+        sent_tokens.append(request.http_request.headers["Authorization"])
+        return Mock()
+
+    policy = AsyncBearerTokenCredentialPolicy(Mock(get_token=get_token), "scope", background_refresh=True)
+    policy._token = expiring_token
+    pipeline = AsyncPipeline(transport=Mock(), policies=[policy, Mock(send=send)])
+
+    await asyncio.gather(*[pipeline.run(HttpRequest("GET", "https://spam.eggs")) for _ in range(3)])
+    assert sent_tokens == ["Bearer expiring"] * 3  # requests were not blocked by the refresh
+    assert get_token_calls == 1  # concurrent callers share one refresh
+
+    release_refresh.set()
+    await asyncio.sleep(0)
+    await pipeline.run(HttpRequest("GET", "https://spam.eggs"))
+    assert sent_tokens[-1] == "Bearer fresh"
+    assert get_token_calls == 1
+
+
+@pytest.mark.asyncio
+async def test_bearer_policy_background_refresh_waits_without_usable_token():
+    """Without a usable token, concurrent requests should wait on a single refresh"""
+    fresh_token = AccessToken("fresh", time.time() + 3600)
+    get_token_calls = 0
+
+    async def get_token(_):
+        nonlocal get_token_calls
+        get_token_calls += 1
+        await asyncio.sleep(0.01)
+        return fresh_token
+
+    async def send(request):
+        assert request.http_request.headers["Authorization"] == "Bearer fresh"
+        return Mock()
+
+    policy = AsyncBearerTokenCredentialPolicy(Mock(get_token=get_token), "scope", background_refresh=True)
+    pipeline = AsyncPipeline(transport=Mock(), policies=[policy, Mock(send=send)])
+
+    await asyncio.gather(*[pipeline.run(HttpRequest("GET", "https://spam.eggs")) for _ in range(4)])
+    assert get_token_calls == 1
+
+
+@pytest.mark.asyncio
+async def test_bearer_policy_background_refresh_logs_only_background_failures(caplog):
+    """A failed refresh should be logged as a background failure only when no caller waits on it"""
+    async def get_token(_):
+        await asyncio.sleep(0)
+        raise ValueError("refresh failed")
+
+    async def send(request):
+        return Mock()
+
+    policy = AsyncBearerTokenCredentialPolicy(Mock(get_token=get_token), "scope", background_refresh=True)
+    pipeline = AsyncPipeline(transport=Mock(), policies=[policy, Mock(send=send)])
+
+    with caplog.at_level(logging.WARNING):
+        with pytest.raises(ValueError):
+            await pipeline.run(HttpRequest("GET", "https://spam.eggs"))
+        await asyncio.sleep(0)
+    assert "Background token refresh failed" not in caplog.text
+
+    policy._token = AccessToken("expiring", time.time() + 120)
+    policy._next_refresh_attempt = 0
+    with caplog.at_level(logging.WARNING):
+        await pipeline.run(HttpRequest("GET", "https://spam.eggs"))
+        await asyncio.sleep(0.01)
+    assert "Background token refresh failed" in caplog.text
@@ -24,9 +24,11 @@
 #
 #--------------------------------------------------------------------------
 
+import asyncio
 from typing import AsyncIterator, TypeVar, List
 
 from azure.core.async_paging import AsyncItemPaged, AsyncList
+from azure.core.pipeline.policies import ContentDecodePolicy
 
 import pytest
 
@@ -120,3 +122,53 @@ class TestPaging:
         result_iterated = await _as_list(pager)
 
         assert len(result_iterated) == 0
+
+    @pytest.mark.asyncio
+    async def test_lazy_continuation_token(self):
+        pages = {
+            None: [b'<R><Items><I>1</I><I>', b'2</I></Items><Next>page2</Next></R>'],
+            "page2": [b'<R><Items><I>3</I></Items><Next /></R>'],
+        }
+
+        async def get_next(continuation_token=None):
+            return pages[continuation_token]
+
+        async def extract_data(response):
+            decoder = ContentDecodePolicy.create_item_decoder("application/xml", "I")
+            items = []
+            for chunk in response:
+                items.extend(i.text for i in decoder.feed(chunk))
+
+            async def continuation_token():
+                return decoder.close().find("Next").text
+
+            return continuation_token, AsyncList(items)
+
+        pager = AsyncItemPaged(get_next, extract_data)
+        assert ['1', '2', '3'] == await _as_list(pager)
+
+    @pytest.mark.asyncio
+    async def test_read_ahead_paging(self):
+        fetched = []
+
+        async def get_next(continuation_token=None):
+            page = int(continuation_token or 0)
+            fetched.append(page)
+            return page
+
+        async def extract_data(page):
+            return (str(page + 1) if page < 9 else None), AsyncList(['value{}.{}'.format(page, i) for i in range(2)])
+
+        pager = AsyncItemPaged(get_next, extract_data).by_page(read_ahead=2)
+        assert await _as_list(await pager.__anext__()) == ['value0.0', 'value0.1']
+        for _ in range(5):
+            await asyncio.sleep(0)
+        # Read-ahead is bounded: 2 pages waiting in the queue, 1 being handed over
+        assert fetched == [0, 1, 2, 3]
+
+        pages = await _as_list(pager)
+        assert len(pages) == 9
+        assert fetched == list(range(10))
+
+        pager = AsyncItemPaged(get_next, extract_data, read_ahead=3)
+        assert ['value{}.{}'.format(p, i) for p in range(10) for i in range(2)] == await _as_list(pager)
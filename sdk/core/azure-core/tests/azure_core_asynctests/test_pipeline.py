@@ -41,6 +41,77 @@ import trio
 import pytest
 
 
+class RecordingPolicy(SansIOHTTPPolicy):
+    """Records its calls, and fails or handles exceptions where it's told to."""
+    def __init__(self, name, calls, fail_on=None, handle=False):
+        self.name = name
+        self.calls = calls
+        self.fail_on = fail_on
+        self.handle = handle
+
+    def _call(self, step):
+        self.calls.append((self.name, step))
+        if self.fail_on == step:
+            raise ValueError(self.name)
+
+    def on_request(self, request):
+        self._call("request")
+
+    def on_response(self, request, response):
+        self._call("response")
+
+    def on_exception(self, request):
+        self.calls.append((self.name, "exception", type(sys.exc_info()[1]).__name__))
+        return self.handle
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("fail_on,handle", [
+    (None, None),
+    ("request", None),
+    ("response", None),
+    ("send", "p1"),
+    ("response", "p0"),
+])
+async def test_fused_sansio_policies(fail_on, handle):
+    class Transport(AsyncHttpTransport):
+        async def send(self, request, **config):
+            if fail_on == "send":
+                raise ValueError("send")
+            return None
+
+        async def open(self):
+            pass
+
+        async def close(self):
+            pass
+
+        async def __aexit__(self, *args):
+            pass
+
+    async def run(fuse):
+        calls = []
+        policies = [
+            RecordingPolicy("p{}".format(index), calls,
+                            fail_on=fail_on if index == 1 else None,
+                            handle=handle == "p{}".format(index))
+            for index in range(3)
+        ]
+        pipeline = AsyncPipeline(Transport(), policies=policies, fuse_sansio_policies=fuse)
+        try:
+            response = await pipeline.run(HttpRequest("GET", "http://127.0.0.1/"))
+            calls.append(("returned", response is None))
+        except Exception as err:  # pylint: disable=broad-except
+            calls.append(("raised", type(err).__name__, str(err)))
+        return calls
+
+    fused_calls = await run(True)
+    assert fused_calls == await run(False)
+    if handle:
+        # the pipeline returns None once a policy handled the exception
+        assert fused_calls[-1] == ("returned", True)
+
+
 @pytest.mark.asyncio
 async def test_sans_io_exception():
     class BrokenSender(AsyncHttpTransport):
@@ -161,4 +232,47 @@ def test_conf_async_trio_requests():
             return await pipeline.run(request)
 
     response = trio.run(do)
-    assert response.http_response.status_code == 200
\ No newline at end of file
+    assert response.http_response.status_code == 200
+@pytest.mark.asyncio
+async def test_async_requests_session_per_thread(monkeypatch):
+    import threading
+    import requests
+    calls = []
+
+    def request(session, *args, **kwargs):
+        calls.append((threading.current_thread(), session))
+        response = requests.Response()
+        response.status_code = 200
+        return response
+
+    monkeypatch.setattr(requests.Session, "request", request)
+    async with AsyncioRequestsTransport(session_per_thread=True) as transport:
+        loop_session = transport._get_session()
+        await transport.send(HttpRequest("GET", "https://bing.com/"))
+
+    thread, session = calls[0]
+    assert thread is not threading.current_thread()
+    assert session is not loop_session
+
+def test_trio_requests_session_per_thread(monkeypatch):
+    import threading
+    import requests
+    calls = []
+
+    def request(session, *args, **kwargs):
+        calls.append((threading.current_thread(), session))
+        response = requests.Response()
+        response.status_code = 200
+        return response
+
+    async def do():
+        async with TrioRequestsTransport(session_per_thread=True) as transport:
+            loop_session = transport._get_session()
+            await transport.send(HttpRequest("GET", "https://bing.com/"))
+            return loop_session
+
+    monkeypatch.setattr(requests.Session, "request", request)
+    loop_session = trio.run(do)
+    thread, session = calls[0]
+    assert thread is not threading.current_thread()
+    assert session is not loop_session
@@ -0,0 +1,56 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See LICENSE.txt in the project root for
+# license information.
+# -------------------------------------------------------------------------
+from unittest.mock import Mock
+
+import pytest
+
+from azure.core.exceptions import ServiceRequestError
+from azure.core.pipeline import AsyncPipeline
+from azure.core.pipeline.metrics import MetricsSink
+from azure.core.pipeline.policies import AsyncRetryPolicy, HeadersPolicy
+from azure.core.pipeline.transport import HttpRequest
+
+
+class ListSink(MetricsSink):
+    def __init__(self):
+        self.metrics = []
+
+    def record(self, metrics):
+        self.metrics.append(metrics)
+
+
+@pytest.mark.asyncio
+async def test_async_pipeline_records_metrics():
+    responses = iter([503, 200])
+
+    async def send(request, **kwargs):
+        return Mock(status_code=next(responses), headers={'Content-Length': '7'})
+
+    sink = ListSink()
+    transport = Mock(spec=['send'], send=send)
+    retry = AsyncRetryPolicy(retry_backoff_factor=0)
+    pipeline = AsyncPipeline(transport, policies=[HeadersPolicy(), retry], metrics_sink=sink)
+
+    response = await pipeline.run(HttpRequest("GET", "https://spam.eggs/"))
+
+    metrics = sink.metrics[0]
+    assert response.context['metrics'] is metrics
+    assert metrics.status_code == 200
+    assert metrics.retry_count == 1
+    assert metrics.bytes_received == 7
+    assert list(metrics.policy_durations) == ['HeadersPolicy', 'AsyncRetryPolicy']
+
+
+@pytest.mark.asyncio
+async def test_async_pipeline_records_metrics_on_error():
+    async def send(request, **kwargs):
+        raise ServiceRequestError("boom")
+
+    sink = ListSink()
+    pipeline = AsyncPipeline(Mock(spec=['send'], send=send), metrics_sink=sink)
+    with pytest.raises(ServiceRequestError):
+        await pipeline.run(HttpRequest("GET", "https://spam.eggs/"))
+    assert sink.metrics[0].error == "ServiceRequestError"
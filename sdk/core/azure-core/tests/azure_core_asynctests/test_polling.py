@@ -0,0 +1,102 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See LICENSE.txt in the project root for
+# license information.
+# -------------------------------------------------------------------------
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from azure.core.polling import (
+    AsyncLROPollerManager,
+    AsyncNoPolling,
+    AsyncPollingMethod,
+)
+
+
+class AsyncPollingSteps(AsyncPollingMethod):
+    """A polling method finishing after a number of status updates."""
+    def __init__(self, steps, interval=0.01):
+        self._steps = steps
+        self._interval = interval
+        self.updates = 0
+        self._initial_response = None
+        self._deserialization_callback = None
+
+    def initialize(self, _, initial_response, deserialization_callback):
+        self._initial_response = initial_response
+        self._deserialization_callback = deserialization_callback
+
+    async def update_status(self):
+        self.updates += 1
+        if self._steps < 0 and self.updates == -self._steps:
+            raise ValueError("Something bad happened")
+
+    def get_polling_interval(self):
+        return self._interval
+
+    def status(self):
+        return "succeeded" if self.finished() else "running"
+
+    def finished(self):
+        return self.updates >= abs(self._steps)
+
+    def resource(self):
+        return self._deserialization_callback(self._initial_response)
+
+
+class AsyncPollingRun(AsyncPollingSteps):
+    """A polling method without update_status."""
+    async def update_status(self):
+        raise NotImplementedError()
+
+    async def run(self):
+        await asyncio.sleep(0.01)
+        self.updates = self._steps
+
+
+def deserialization_callback(response):
+    return "Treated: "+response
+
+
+@pytest.mark.asyncio
+async def test_async_poller_manager():
+    async with AsyncLROPollerManager(max_concurrent_polls=2) as manager:
+        methods = [AsyncPollingSteps(steps) for steps in (5, 1, 3)]
+        pollers = [manager.add(None, str(index), deserialization_callback, method)
+                   for index, method in enumerate(methods)]
+        done_cb = MagicMock()
+        pollers[0].add_done_callback(done_cb)
+
+        completed = [poller async for poller in manager.as_completed(pollers)]
+        assert completed == [pollers[1], pollers[2], pollers[0]]
+        assert [await poller for poller in pollers] == ["Treated: 0", "Treated: 1", "Treated: 2"]
+        assert [method.updates for method in methods] == [5, 1, 3]
+        done_cb.assert_called_once_with(methods[0])
+
+        broken = manager.add(None, "", deserialization_callback, AsyncPollingSteps(-2))
+        with pytest.raises(ValueError):
+            await broken.result()
+        assert await manager.add(None, "spam", deserialization_callback, AsyncPollingRun(1)) == "Treated: spam"
+        assert manager.add(None, "eggs", deserialization_callback, AsyncNoPolling()).done()
+
+
+@pytest.mark.asyncio
+async def test_async_poller_manager_cancel():
+    manager = AsyncLROPollerManager(polling_interval=60)
+    method = AsyncPollingSteps(2, interval=None)
+    poller = manager.add(None, "", deserialization_callback, method)
+    other = manager.add(None, "", deserialization_callback, AsyncPollingSteps(2, interval=None))
+
+    assert poller.cancel()
+    assert poller.cancelled()
+    assert poller.status() == "cancelled"
+    with pytest.raises(asyncio.CancelledError):
+        await poller.result()
+    assert method.updates == 0
+
+    await manager.close()
+    assert other.cancelled()
+    with pytest.raises(ValueError):
+        manager.add(None, "", deserialization_callback, AsyncPollingSteps(1))
@@ -0,0 +1,108 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See LICENSE.txt in the project root for
+# license information.
+# -------------------------------------------------------------------------
+import asyncio
+from unittest.mock import Mock
+
+import pytest
+
+from azure.core.exceptions import CircuitBreakerOpenError
+from azure.core.pipeline import AsyncPipeline
+from azure.core.pipeline.policies import AsyncCircuitBreakerPolicy, AsyncHedgingPolicy
+from azure.core.pipeline.transport import HttpRequest
+
+
+@pytest.mark.asyncio
+async def test_async_circuit_breaker():
+    calls = 0
+
+    async def send(request):
+        nonlocal calls
+        calls += 1
+        return Mock(http_response=Mock(status_code=500))
+
+    policy = AsyncCircuitBreakerPolicy(circuit_minimum_requests=2)
+    pipeline = AsyncPipeline(transport=Mock(), policies=[policy, Mock(send=send)])
+    for _ in range(2):
+        await pipeline.run(HttpRequest("GET", "https://spam.eggs/"))
+
+    with pytest.raises(CircuitBreakerOpenError):
+        await pipeline.run(HttpRequest("GET", "https://spam.eggs/"))
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_async_hedged_request_wins():
+    sent = []
+    slow_cancelled = asyncio.Event()
+
+    async def send(request):
+        sent.append(request)
+        if len(sent) == 1:
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                slow_cancelled.set()
+                raise
+        return Mock(first=len(sent) == 1)
+
+    policy = AsyncHedgingPolicy(hedging_initial_delay=0.01)
+    pipeline = AsyncPipeline(transport=Mock(), policies=[policy, Mock(send=send)])
+
+    response = await asyncio.wait_for(pipeline.run(HttpRequest("GET", "https://spam.eggs/")), 1)
+    assert not response.first
+    assert len(sent) == 2
+    await asyncio.wait_for(slow_cancelled.wait(), 1)
+    assert policy.hedges_won == 1
+
+
+@pytest.mark.asyncio
+async def test_async_hedging_discards_losing_response():
+    sent = []
+    responses = []
+
+    async def respond(first):
+        await asyncio.sleep(0.05 if first else 0)
+        response = Mock(first=first)
+        responses.append(response)
+        return response
+
+    async def send(request):
+        sent.append(request)
+        inner = asyncio.ensure_future(respond(len(sent) == 1))
+        try:
+            return await asyncio.shield(inner)
+        except asyncio.CancelledError:
+            # The slow request ignores its cancellation
+            return await inner
+
+    policy = AsyncHedgingPolicy(hedging_initial_delay=0.01)
+    pipeline = AsyncPipeline(transport=Mock(), policies=[policy, Mock(send=send)])
+
+    response = await pipeline.run(HttpRequest("GET", "https://spam.eggs/"))
+    assert not response.first
+    await asyncio.sleep(0.1)
+    loser = next(r for r in responses if r.first)
+    assert loser.http_response.internal_response.close.called
+    assert not response.http_response.internal_response.close.called
+
+
+@pytest.mark.asyncio
+async def test_async_hedged_request_copied_before_sending():
+    seen = []
+
+    async def send(request):
+        # The next policies update the request they send
+        seen.append(dict(request.http_request.headers))
+        request.http_request.headers['x-sent'] = 'true'
+        await asyncio.sleep(10 if len(seen) == 1 else 0)
+        return Mock()
+
+    policy = AsyncHedgingPolicy(hedging_initial_delay=0.01)
+    pipeline = AsyncPipeline(transport=Mock(), policies=[policy, Mock(send=send)])
+
+    await asyncio.wait_for(pipeline.run(HttpRequest("GET", "https://spam.eggs/")), 1)
+    assert len(seen) == 2
+    assert 'x-sent' not in seen[1]
@@ -57,6 +57,17 @@ async def test_aiohttp_auto_headers():
         auto_headers = response.internal_response.request_info.headers
         assert 'Content-Type' not in auto_headers
 
+@pytest.mark.asyncio
+async def test_aiohttp_streamed_iterable_body():
+
+    request = HttpRequest("PUT", "https://www.bing.com/")
+    request.set_streamed_data_body(iter([b"Lots ", b"of ", b"data"]))
+    data = AioHttpTransport()._get_request_data(request)
+    assert [chunk async for chunk in data] == [b"Lots ", b"of ", b"data"]
+
+    request.set_streamed_data_body(bytearray(b"Lots of data"))
+    assert isinstance(AioHttpTransport()._get_request_data(request), memoryview)
+
 @pytest.mark.asyncio
 async def test_basic_async_requests():
 
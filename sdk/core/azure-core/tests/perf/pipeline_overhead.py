@@ -0,0 +1,137 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See LICENSE.txt in the project root for
+# license information.
+# -------------------------------------------------------------------------
+"""Micro-benchmark of the per-request overhead of the pipeline policies.
+
+Runs requests through a pipeline of SansIO policies and a transport returning a canned
+response, with the chained runners and with the fused runner:
+
+    pip install -e .
+    python tests/perf/pipeline_overhead.py [--policies 10] [--requests 20000] [--repeat 10]
+"""
+import argparse
+import asyncio
+import sys
+import timeit
+
+from azure.core.pipeline import AsyncPipeline, Pipeline
+from azure.core.pipeline.policies import HeadersPolicy, RetryPolicy, SansIOHTTPPolicy, AsyncRetryPolicy
+from azure.core.pipeline.transport import AsyncHttpTransport, HttpRequest, HttpTransport
+
+
+def _stack_depth():
+    frame, depth = sys._getframe(1), 0  # pylint: disable=protected-access
+    while frame is not None:
+        frame, depth = frame.f_back, depth + 1
+    return depth
+
+
+class _Response(object):
+    status_code = 200
+    headers = {}
+
+
+class _Transport(HttpTransport):
+    depth = None
+
+    def send(self, request, **kwargs):
+        if self.depth is None:
+            self.depth = _stack_depth()
+        return _Response()
+
+    def open(self):
+        pass
+
+    def close(self):
+        pass
+
+    def __exit__(self, *args):
+        pass
+
+
+class _AsyncTransport(AsyncHttpTransport):
+    async def send(self, request, **kwargs):
+        return _Response()
+
+    async def open(self):
+        pass
+
+    async def close(self):
+        pass
+
+    async def __aexit__(self, *args):
+        pass
+
+
+def _policies(count, retry_policy):
+    # A retry policy between SansIO policies, like the client pipelines
+    policies = [HeadersPolicy({'x-ms-version': '2019-02-02'})] + [SansIOHTTPPolicy() for _ in range(count - 1)]
+    return policies[:count // 2] + [retry_policy] + policies[count // 2:]
+
+
+def sync_runner(policy_count, requests, fuse):
+    pipeline = Pipeline(_Transport(), _policies(policy_count, RetryPolicy()), fuse_sansio_policies=fuse)
+    request = HttpRequest("GET", "https://account.blob.core.windows.net/container/blob")
+
+    def run():
+        for _ in range(requests):
+            pipeline.run(request)
+    return run
+
+
+def async_runner(policy_count, requests, fuse):
+    pipeline = AsyncPipeline(
+        _AsyncTransport(), _policies(policy_count, AsyncRetryPolicy()), fuse_sansio_policies=fuse)
+    request = HttpRequest("GET", "https://account.blob.core.windows.net/container/blob")
+    loop = asyncio.new_event_loop()
+
+    async def run_requests():
+        for _ in range(requests):
+            await pipeline.run(request)
+
+    def run():
+        loop.run_until_complete(run_requests())
+    return run
+
+
+def stack_depths(policy_count):
+    """Depth of the call stack in the transport, with the chained and the fused runners."""
+    depths = []
+    for fuse in (False, True):
+        transport = _Transport()
+        Pipeline(transport, _policies(policy_count, RetryPolicy()), fuse_sansio_policies=fuse).run(
+            HttpRequest("GET", "https://account.blob.core.windows.net/container/blob"))
+        depths.append(transport.depth)
+    return depths
+
+
+def compare(make_runner, policy_count, requests, repeat):
+    """Best time per request of the chained and the fused runners, timed alternately to share the noise."""
+    chained = make_runner(policy_count, requests, False)
+    fused = make_runner(policy_count, requests, True)
+    best = [float("inf"), float("inf")]
+    for _ in range(repeat):
+        for index, run in enumerate((chained, fused)):
+            best[index] = min(best[index], timeit.timeit(run, number=1) / requests)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--policies", type=int, default=10, help="Number of SansIO policies.")
+    parser.add_argument("--requests", type=int, default=20000, help="Number of requests per run.")
+    parser.add_argument("--repeat", type=int, default=10, help="Number of runs, the best is kept.")
+    args = parser.parse_args()
+
+    chained_depth, fused_depth = stack_depths(args.policies)
+    print("stack depth in the transport: chained {}, fused {}".format(chained_depth, fused_depth))
+    for name, make_runner in (("sync", sync_runner), ("async", async_runner)):
+        chained, fused = compare(make_runner, args.policies, args.requests, args.repeat)
+        print("{:5} chained: {:6.2f} us/request  fused: {:6.2f} us/request  ({:+.0%})".format(
+            name, chained * 1e6, fused * 1e6, fused / chained - 1))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,7 @@
 # Licensed under the MIT License. See LICENSE.txt in the project root for
 # license information.
 # -------------------------------------------------------------------------
+import threading
 import time
 
 from azure.core.credentials import AccessToken
@@ -69,3 +70,64 @@ def test_bearer_policy_token_caching():
 
     pipeline.run(HttpRequest("GET", "https://spam.eggs"))
     assert credential.get_token.call_count == 2  # token expired -> policy should call get_token
+
+
+def test_bearer_policy_background_refresh():
+    """A token nearing expiry should be refreshed once, on another thread, while it is still being sent"""
+    expiring_token = AccessToken("expiring", time.time() + 120)
+    fresh_token = AccessToken("fresh", time.time() + 3600)
+    refresh_started = threading.Event()
+    release_refresh = threading.Event()
+
+    def get_token(*_):
+        refresh_started.set()
+        release_refresh.wait(5)
+        return fresh_token
+
+    credential = Mock(get_token=Mock(side_effect=get_token))
+    policy = BearerTokenCredentialPolicy(credential, "scope", background_refresh=True)
+    policy._token = expiring_token
+    sent_tokens = []
+    transport = Mock(send=lambda request, **_: sent_tokens.append(request.headers["Authorization"]))
+    pipeline = Pipeline(transport=transport, policies=[policy])
+
+    for _ in range(3):
+        pipeline.run(HttpRequest("GET", "https://spam.eggs"))
+    assert refresh_started.wait(5)
+    assert sent_tokens == ["Bearer expiring"] * 3  # requests were not blocked by the refresh
+    assert credential.get_token.call_count == 1  # concurrent callers share one refresh
+
+    release_refresh.set()
+    for _ in range(10):
+        if policy._token is fresh_token:
+            break
+        time.sleep(0.1)
+    pipeline.run(HttpRequest("GET", "https://spam.eggs"))
+    assert sent_tokens[-1] == "Bearer fresh"
+    assert credential.get_token.call_count == 1
+
+
+def test_bearer_policy_background_refresh_waits_without_usable_token():
+    """Without a usable token, concurrent requests should wait on a single refresh"""
+    fresh_token = AccessToken("fresh", time.time() + 3600)
+    release_refresh = threading.Event()
+
+    def get_token(*_):
+        release_refresh.wait(5)
+        return fresh_token
+
+    credential = Mock(get_token=Mock(side_effect=get_token))
+    policy = BearerTokenCredentialPolicy(credential, "scope", background_refresh=True)
+    pipeline = Pipeline(transport=Mock(), policies=[policy])
+
+    threads = [threading.Thread(target=pipeline.run, args=(HttpRequest("GET", "https://spam.eggs"),))
+               for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.1)
+    release_refresh.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert credential.get_token.call_count == 1
+    assert policy._token is fresh_token
@@ -0,0 +1,83 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See LICENSE.txt in the project root for
+# license information.
+# -------------------------------------------------------------------------
+import time
+
+import pytest
+
+from azure.core.exceptions import CircuitBreakerOpenError, ServiceRequestError
+from azure.core.pipeline import Pipeline
+from azure.core.pipeline.policies import CircuitBreakerPolicy, RetryPolicy
+from azure.core.pipeline.transport import HttpRequest
+
+try:
+    from unittest.mock import Mock
+except ImportError:
+    # python < 3.3
+    from mock import Mock
+
+
+def _response(status_code):
+    return Mock(status_code=status_code)
+
+
+def test_circuit_opens_and_fails_fast():
+    transport = Mock(send=Mock(return_value=_response(503)))
+    policy = CircuitBreakerPolicy(circuit_minimum_requests=4, circuit_failure_ratio=0.5, circuit_open_duration=60)
+    pipeline = Pipeline(transport, policies=[policy])
+
+    for _ in range(4):
+        assert pipeline.run(HttpRequest("GET", "https://spam.eggs/")).http_response.status_code == 503
+    assert policy.get_state("spam.eggs") == "open"
+
+    with pytest.raises(CircuitBreakerOpenError):
+        pipeline.run(HttpRequest("GET", "https://spam.eggs/"))
+    assert transport.send.call_count == 4
+
+    # Other hosts are not affected
+    transport.send.return_value = _response(200)
+    pipeline.run(HttpRequest("GET", "https://other.host/"))
+    assert policy.get_state("other.host") == "closed"
+
+
+def test_circuit_half_open_probe():
+    transport = Mock(send=Mock(side_effect=ServiceRequestError("Connection refused")))
+    policy = CircuitBreakerPolicy(circuit_minimum_requests=2, circuit_open_duration=0.1)
+    pipeline = Pipeline(transport, policies=[policy])
+
+    for _ in range(2):
+        with pytest.raises(ServiceRequestError):
+            pipeline.run(HttpRequest("GET", "https://spam.eggs/"))
+    assert policy.get_state("spam.eggs") == "open"
+
+    # A failed probe opens the circuit again
+    time.sleep(0.1)
+    with pytest.raises(ServiceRequestError) as err:
+        pipeline.run(HttpRequest("GET", "https://spam.eggs/"))
+    assert not isinstance(err.value, CircuitBreakerOpenError)
+    assert policy.get_state("spam.eggs") == "open"
+
+    # A successful probe closes it
+    time.sleep(0.1)
+    transport.send.side_effect = None
+    transport.send.return_value = _response(200)
+    pipeline.run(HttpRequest("GET", "https://spam.eggs/"))
+    assert policy.get_state("spam.eggs") == "closed"
+    assert transport.send.call_count == 4
+
+
+def test_retries_stop_once_circuit_opens():
+    transport = Mock(send=Mock(return_value=_response(503)))
+    transport.send.return_value.headers = {}
+    policy = CircuitBreakerPolicy(circuit_minimum_requests=2, circuit_open_duration=60)
+    retry_policy = RetryPolicy(retry_total=5, retry_backoff_factor=0)
+    retry_policy.sleep = Mock()
+    pipeline = Pipeline(transport, policies=[retry_policy, policy])
+
+    with pytest.raises(CircuitBreakerOpenError):
+        pipeline.run(HttpRequest("GET", "https://spam.eggs/"))
+    # The request that found the circuit open wasn't retried
+    assert transport.send.call_count == 2
+    assert retry_policy.sleep.call_count == 2
@@ -0,0 +1,128 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See LICENSE.txt in the project root for
+# license information.
+# -------------------------------------------------------------------------
+import threading
+import time
+
+from azure.core.pipeline import Pipeline
+from azure.core.pipeline.policies import HedgingPolicy
+from azure.core.pipeline.transport import HttpRequest
+
+try:
+    from unittest.mock import Mock
+except ImportError:
+    # python < 3.3
+    from mock import Mock
+
+
+class SlowFirstTransport(Mock):
+    """Transport whose first request is slow."""
+    def __init__(self, delay):
+        super(SlowFirstTransport, self).__init__()
+        self.delay = delay
+        self.sent = []
+        self.send_returned = []
+        self._lock = threading.Lock()
+
+    def send(self, request, **kwargs):
+        with self._lock:
+            self.sent.append(request)
+            first = len(self.sent) == 1
+        if first:
+            time.sleep(self.delay)
+        response = Mock(status_code=200, internal_response=Mock(), first=first)
+        self.send_returned.append(response)
+        return response
+
+
+def test_hedged_request_wins():
+    transport = SlowFirstTransport(delay=0.5)
+    policy = HedgingPolicy(hedging_initial_delay=0.05)
+    pipeline = Pipeline(transport, policies=[policy])
+
+    caller = threading.current_thread()
+    threads = []
+    seen = []
+    send = transport.send
+    def record_thread(request, **kwargs):
+        threads.append(threading.current_thread())
+        # The transport updates the request it sends
+        seen.append(dict(request.headers))
+        request.headers['x-sent'] = 'true'
+        return send(request, **kwargs)
+    transport.send = record_thread
+
+    start = time.time()
+    response = pipeline.run(HttpRequest("GET", "https://spam.eggs/"))
+    # The hedge responded first, and is returned without waiting for the slow request
+    assert time.time() - start < 0.4
+    assert not response.http_response.first
+    assert len(transport.sent) == 2
+    assert transport.sent[0] is not transport.sent[1]
+    assert 'x-sent' not in seen[1]
+    assert caller not in threads
+    assert policy.hedges_sent == 1 and policy.hedges_won == 1
+
+    # The slow response is discarded once it arrives
+    time.sleep(0.5)
+    assert not response.http_response.internal_response.close.called
+    assert next(r for r in transport.send_returned if r.first).internal_response.close.called
+
+
+def test_hedged_request_replaces_failed_request():
+    class FailingFirstTransport(SlowFirstTransport):
+        def send(self, request, **kwargs):
+            response = super(FailingFirstTransport, self).send(request, **kwargs)
+            if response.first:
+                raise ValueError("timed out")
+            return response
+
+    transport = FailingFirstTransport(delay=0.2)
+    policy = HedgingPolicy(hedging_initial_delay=0.05)
+    pipeline = Pipeline(transport, policies=[policy])
+
+    response = pipeline.run(HttpRequest("GET", "https://spam.eggs/"))
+    assert not response.http_response.first
+    assert policy.hedges_won == 1
+
+
+def test_hedge_not_started_for_fast_request():
+    started = threading.active_count()
+    transport = SlowFirstTransport(delay=0)
+    policy = HedgingPolicy(hedging_initial_delay=0.05)
+    pipeline = Pipeline(transport, policies=[policy])
+
+    for _ in range(5):
+        pipeline.run(HttpRequest("GET", "https://spam.eggs/"))
+    time.sleep(0.1)
+    assert len(transport.sent) == 5
+    assert policy.hedges_sent == 0
+    # The threads of the requests are done
+    assert threading.active_count() <= started
+
+
+def test_no_hedge_for_fast_or_unsafe_requests():
+    transport = SlowFirstTransport(delay=0.2)
+    policy = HedgingPolicy(hedging_initial_delay=0.05)
+    pipeline = Pipeline(transport, policies=[policy])
+
+    response = pipeline.run(HttpRequest("POST", "https://spam.eggs/"))
+    assert response.http_response.first
+    assert len(transport.sent) == 1
+
+    transport.delay = 0
+    pipeline.run(HttpRequest("GET", "https://spam.eggs/"))
+    pipeline.run(HttpRequest("GET", "https://spam.eggs/"), hedging_enable=False)
+    assert len(transport.sent) == 3
+    assert policy.hedges_sent == 0
+
+
+def test_hedging_delay_percentile():
+    policy = HedgingPolicy(hedging_min_samples=10, hedging_percentile=0.9, hedging_initial_delay=2)
+    request = Mock(http_request=HttpRequest("GET", "https://spam.eggs/"))
+    assert policy.get_hedging_delay("spam.eggs") == 2
+    for latency in range(1, 11):
+        policy._record_latency(request, latency / 10.0)
+    assert policy.get_hedging_delay("spam.eggs") == 1.0
@@ -24,7 +24,11 @@
 #
 #--------------------------------------------------------------------------
 
+import itertools
+import time
+
 from azure.core.paging import ItemPaged
+from azure.core.pipeline.policies import ContentDecodePolicy
 
 import pytest
 
@@ -129,3 +133,73 @@ class TestPaging(object):
         pager = ItemPaged(get_next, extract_data)
         result_iterated = list(pager)
         assert len(result_iterated) == 0
+
+    def test_lazy_continuation_token(self):
+        pages = {
+            None: b'{"value": ["value1.0", "value1.1"], "nextLink": "page2"}',
+            "page2": b'{"value": ["value2.0"], "nextLink": null}',
+        }
+
+        def get_next(continuation_token=None):
+            body = pages[continuation_token]
+            # Stream the page in small chunks, as a download would
+            return [body[i:i + 7] for i in range(0, len(body), 7)]
+
+        def extract_data(response):
+            items = ContentDecodePolicy.deserialize_from_stream(response, "application/json", "value")
+            return lambda: items.remainder()["nextLink"], items
+
+        pager = ItemPaged(get_next, extract_data)
+        assert ['value1.0', 'value1.1', 'value2.0'] == list(pager)
+
+        # Pages not fully read still resolve their continuation token
+        pager = ItemPaged(get_next, extract_data).by_page()
+        assert next(next(pager)) == 'value1.0'
+        assert list(next(pager)) == ['value2.0']
+        with pytest.raises(StopIteration):
+            next(pager)
+        assert pager.continuation_token is None
+
+    def test_read_ahead_paging(self):
+        fetched = []
+
+        def get_next(continuation_token=None):
+            page = int(continuation_token or 0)
+            fetched.append(page)
+            return page
+
+        def extract_data(page):
+            return (str(page + 1) if page < 9 else None), ['value{}.{}'.format(page, i) for i in range(2)]
+
+        pager = ItemPaged(get_next, extract_data).by_page(read_ahead=2)
+        first_page = list(next(pager))
+        assert first_page == ['value0.0', 'value0.1']
+        for _ in range(50):
+            if len(fetched) >= 4:
+                break
+            time.sleep(0.01)
+        time.sleep(0.05)
+        # Read-ahead is bounded: 2 pages waiting in the queue, 1 being handed over
+        assert fetched == [0, 1, 2, 3]
+        assert pager.continuation_token == '1'
+
+        assert len(list(itertools.chain.from_iterable(pager))) == 18
+        assert fetched == list(range(10))
+        assert pager.continuation_token is None
+
+        pager = ItemPaged(get_next, extract_data, read_ahead=3)
+        assert ['value{}.{}'.format(p, i) for p in range(10) for i in range(2)] == list(pager)
+
+    def test_read_ahead_paging_error(self):
+        def get_next(continuation_token=None):
+            if continuation_token:
+                raise ValueError("Page fetch failed")
+            return {'nextLink': 'page2', 'value': ['value1.0']}
+
+        def extract_data(response):
+            return response['nextLink'], iter(response['value'])
+
+        pager = ItemPaged(get_next, extract_data, read_ahead=1)
+        assert next(pager) == 'value1.0'
+        with pytest.raises(ValueError):
+            next(pager)
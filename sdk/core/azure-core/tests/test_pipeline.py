@@ -24,7 +24,12 @@
 #
 # --------------------------------------------------------------------------
 
+import array
+import gc
 import json
+import mmap
+import tempfile
+import threading
 import requests
 import datetime
 from enum import Enum
@@ -47,6 +52,7 @@ import pytest
 from azure.core import Configuration
 from azure.core.pipeline import Pipeline
 from azure.core.pipeline.policies import (
+    HeadersPolicy,
     SansIOHTTPPolicy,
     UserAgentPolicy,
     RedirectPolicy
@@ -91,6 +97,93 @@ def test_sans_io_exception():
     with pytest.raises(NotImplementedError):
         pipeline.run(req)
 
+class RecordingPolicy(SansIOHTTPPolicy):
+    """Records its calls, and fails or handles exceptions where it's told to."""
+    def __init__(self, name, calls, fail_on=None, handle=False):
+        self.name = name
+        self.calls = calls
+        self.fail_on = fail_on
+        self.handle = handle
+
+    def _call(self, step):
+        self.calls.append((self.name, step))
+        if self.fail_on == step:
+            raise ValueError(self.name)
+
+    def on_request(self, request):
+        self._call("request")
+
+    def on_response(self, request, response):
+        self._call("response")
+
+    def on_exception(self, request):
+        self.calls.append((self.name, "exception", type(sys.exc_info()[1]).__name__))
+        return self.handle
+
+
+@pytest.mark.parametrize("fail_on,handle", [
+    (None, None),
+    ("request", None),
+    ("response", None),
+    ("send", None),
+    ("send", "p1"),
+    ("response", "p0"),
+])
+def test_fused_sansio_policies(fail_on, handle):
+    def run(fuse):
+        calls = []
+        policies = [
+            RecordingPolicy("p{}".format(index), calls,
+                            fail_on=fail_on if index == 1 else None,
+                            handle=handle == "p{}".format(index))
+            for index in range(3)
+        ]
+        transport = mock.Mock(spec=['send'])
+        if fail_on == "send":
+            transport.send.side_effect = ValueError("send")
+        pipeline = Pipeline(transport, policies=policies, fuse_sansio_policies=fuse)
+        try:
+            pipeline.run(HttpRequest("GET", "http://127.0.0.1/"))
+        except Exception as err:  # pylint: disable=broad-except
+            calls.append(("raised", type(err).__name__, str(err)))
+        return calls, pipeline
+
+    chained_calls, chained = run(False)
+    fused_calls, fused = run(True)
+    assert len(chained._impl_policies) == 3
+    assert len(fused._impl_policies) == 1
+    assert fused_calls == chained_calls
+
+
+@pytest.mark.parametrize("fuse", [False, True])
+@pytest.mark.parametrize("fail_on,handle", [
+    ("send", "p1"),
+    ("response", "p0"),
+])
+def test_sansio_policy_handling_exception_returns_none(fuse, fail_on, handle):
+    calls = []
+    policies = [
+        RecordingPolicy("p{}".format(index), calls,
+                        fail_on=fail_on if index == 1 else None,
+                        handle=handle == "p{}".format(index))
+        for index in range(3)
+    ]
+    transport = mock.Mock(spec=['send'])
+    if fail_on == "send":
+        transport.send.side_effect = ValueError("send")
+    pipeline = Pipeline(transport, policies=policies, fuse_sansio_policies=fuse)
+
+    assert pipeline.run(HttpRequest("GET", "http://127.0.0.1/")) is None
+    # the policies outside of the one which handled the exception don't get a response
+    assert calls[-1] == (handle, "exception", "ValueError")
+
+
+def test_fused_sansio_policies_not_fused_with_duplicates():
+    policy = SansIOHTTPPolicy()
+    pipeline = Pipeline(mock.Mock(spec=['send']), policies=[policy, HeadersPolicy(), policy],
+                        fuse_sansio_policies=True)
+    assert len(pipeline._impl_policies) == 3
+
 class TestRequestsTransport(unittest.TestCase):
 
     def test_basic_requests(self):
@@ -125,6 +218,46 @@ class TestRequestsTransport(unittest.TestCase):
         assert transport.session
         transport.session.close()
 
+    def test_session_per_thread(self):
+        transport = RequestsTransport(session_per_thread=True, pool_maxsize=64, pool_block=True)
+        sessions = []
+
+        def open_session():
+            transport.open()
+            sessions.append(transport._get_session())
+
+        threads = [threading.Thread(target=open_session) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(set(id(s) for s in sessions)) == 4
+        adapters = set(id(s.get_adapter("https://bing.com")) for s in sessions)
+        assert adapters == {id(transport._adapter)}
+        assert transport._adapter._pool_maxsize == 64
+        assert transport._adapter._pool_block
+
+        transport.close()
+        assert transport._adapter is None
+        assert not transport._sessions
+
+    def test_session_per_thread_released_with_thread(self):
+        transport = RequestsTransport(session_per_thread=True)
+        thread = threading.Thread(target=transport.open)
+        thread.start()
+        thread.join()
+        transport.open()
+
+        # Only the session of the thread still running is kept
+        gc.collect()
+        assert list(transport._sessions) == [transport._get_session()]
+        transport.close()
+
+    def test_session_per_thread_rejects_session(self):
+        with pytest.raises(ValueError):
+            RequestsTransport(session=requests.Session(), session_per_thread=True)
+
 
 class TestClientPipelineURLFormatting(unittest.TestCase):
 
@@ -216,6 +349,42 @@ class TestClientRequest(unittest.TestCase):
         request.set_streamed_data_body(data)
         self.assertEqual(request.data, data)
 
+    def test_request_stream_buffers(self):
+        payload = bytearray(b"Lots of dataaaa")
+
+        request = HttpRequest("PUT", "/")
+        request.set_streamed_data_body(payload)
+        self.assertIsInstance(request.data, memoryview)
+        self.assertEqual(request.headers.get("Content-Length"), "15")
+        payload[0:4] = b"LOTS"
+        self.assertEqual(request.data.tobytes(), bytes(payload))  # no copy was made
+
+        request = HttpRequest("PUT", "/")
+        request.set_streamed_data_body(memoryview(array.array('i', [1, 2, 3])))
+        self.assertEqual(request.headers.get("Content-Length"), str(3 * array.array('i').itemsize))
+
+        request = HttpRequest("PUT", "/")
+        request.set_bytes_body(memoryview(b"Lots of dataaaa")[5:])
+        self.assertEqual(request.headers.get("Content-Length"), "10")
+
+    def test_request_stream_file(self):
+        with tempfile.TemporaryFile() as stream:
+            stream.write(b"Lots of dataaaa")
+            stream.seek(5)
+            request = HttpRequest("PUT", "/")
+            request.set_streamed_data_body(stream)
+            self.assertIs(request.data, stream)
+            self.assertEqual(request.headers.get("Content-Length"), "10")
+
+            stream.seek(0)
+            mapped = mmap.mmap(stream.fileno(), 0)
+            request = HttpRequest("PUT", "/", headers={"Content-Length": "4"})
+            request.set_streamed_data_body(mapped)
+            self.assertIsInstance(request.data, memoryview)
+            self.assertEqual(request.headers.get("Content-Length"), "4")
+            request.data.release()
+            mapped.close()
+
 
     def test_request_xml(self):
         request = HttpRequest("GET", "/")
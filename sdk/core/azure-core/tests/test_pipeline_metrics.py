@@ -0,0 +1,180 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See LICENSE.txt in the project root for
+# license information.
+# -------------------------------------------------------------------------
+import threading
+import time
+
+import pytest
+
+from azure.core.exceptions import ServiceRequestError
+from azure.core.pipeline import Pipeline
+from azure.core.pipeline.metrics import CallbackMetricsSink, MetricsSink, PrometheusMetricsSink
+from azure.core.pipeline.policies import HeadersPolicy, HTTPPolicy, RetryPolicy
+from azure.core.pipeline.transport import HttpRequest
+
+try:
+    from unittest.mock import Mock
+except ImportError:
+    # python < 3.3
+    from mock import Mock
+
+
+class ListSink(MetricsSink):
+    def __init__(self):
+        self.metrics = []
+
+    def record(self, metrics):
+        self.metrics.append(metrics)
+
+
+def _response(status_code, headers=None):
+    return Mock(status_code=status_code, headers=headers or {})
+
+
+def test_pipeline_records_metrics():
+    sink = ListSink()
+    transport = Mock(spec=['send'])
+    transport.send.side_effect = [_response(503), _response(200, {'Content-Length': '42'})]
+    retry = RetryPolicy(retry_backoff_factor=0)
+    pipeline = Pipeline(transport, policies=[HeadersPolicy(), retry], metrics_sink=sink)
+
+    request = HttpRequest("PUT", "https://spam.eggs/path")
+    request.set_bytes_body(b"12345")
+    response = pipeline.run(request)
+
+    assert response.http_response.status_code == 200
+    assert len(sink.metrics) == 1
+    metrics = sink.metrics[0]
+    assert response.context['metrics'] is metrics
+    assert metrics.method == "PUT"
+    assert metrics.host == "spam.eggs"
+    assert metrics.status_code == 200
+    assert metrics.transport_attempts == 2
+    assert metrics.retry_count == 1
+    assert metrics.bytes_sent == 10
+    assert metrics.bytes_received == 42
+    assert metrics.new_connections is None
+    assert metrics.error is None
+    assert list(metrics.policy_durations) == ['HeadersPolicy', 'RetryPolicy']
+    assert all(duration >= 0 for duration in metrics.policy_durations.values())
+    accounted = sum(metrics.policy_durations.values()) + metrics.transport_duration
+    assert accounted <= metrics.total_duration + 1e-6
+
+
+def test_pipeline_records_metrics_on_error():
+    sink = ListSink()
+    transport = Mock(spec=['send'])
+    transport.send.side_effect = ServiceRequestError("boom")
+    pipeline = Pipeline(transport, metrics_sink=sink)
+
+    with pytest.raises(ServiceRequestError):
+        pipeline.run(HttpRequest("GET", "https://spam.eggs/"))
+    assert sink.metrics[0].error == "ServiceRequestError"
+    assert sink.metrics[0].transport_attempts == 1
+    assert sink.metrics[0].status_code is None
+
+
+def test_pipeline_sink_failure_does_not_fail_request():
+    sink = Mock(record=Mock(side_effect=ValueError()))
+    transport = Mock(spec=['send'], send=Mock(return_value=_response(200)))
+    pipeline = Pipeline(transport, metrics_sink=sink)
+    assert pipeline.run(HttpRequest("GET", "https://spam.eggs/")).http_response.status_code == 200
+
+
+def test_pipeline_without_sink_is_not_instrumented():
+    class NextPolicy(HTTPPolicy):
+        def send(self, request):
+            return self.next.send(request)
+
+    policy = NextPolicy()
+    transport = Mock(spec=['send'], send=Mock(return_value=_response(200)))
+    response = Pipeline(transport, policies=[policy]).run(HttpRequest("GET", "https://spam.eggs/"))
+    assert 'metrics' not in response.context
+    assert type(policy.next).__name__ == '_TransportRunner'
+
+
+def test_pipeline_counts_new_connections():
+    sink = ListSink()
+    counts = iter([3, 4])
+    transport = Mock(spec=['send', '_connection_counter'])
+    transport.send.return_value = _response(200)
+    transport._connection_counter.return_value = lambda: next(counts)
+    Pipeline(transport, metrics_sink=sink).run(HttpRequest("GET", "https://spam.eggs/"))
+    assert sink.metrics[0].new_connections == 1
+    # the counter, which looks up the proxies, is only created once per attempt
+    assert transport._connection_counter.call_count == 1
+
+
+def test_requests_transport_counts_connections_without_creating_pools(monkeypatch):
+    from azure.core.pipeline.transport import RequestsTransport
+    monkeypatch.delenv("HTTPS_PROXY", raising=False)
+    monkeypatch.delenv("https_proxy", raising=False)
+    transport = RequestsTransport()
+    try:
+        # the first request is counted: the adapter is created before it is sent
+        count_connections = transport._connection_counter("https://spam.eggs/path")
+        poolmanager = transport._adapter.poolmanager
+        assert count_connections() == 0
+        assert len(poolmanager.pools) == 0
+
+        pool = poolmanager.connection_from_url("https://SPAM.eggs:443/")
+        pool.num_connections = 2
+        assert count_connections() == 2
+        assert transport._connection_counter("http://spam.eggs/")() == 0
+        assert len(poolmanager.pools) == 1
+
+        monkeypatch.setenv("HTTPS_PROXY", "http://proxy.eggs:3128")
+        assert transport._connection_counter("https://spam.eggs/") is None
+    finally:
+        transport.close()
+
+
+def test_hedged_attempts_recorded():
+    from azure.core.pipeline.policies import HedgingPolicy
+    sink = ListSink()
+    released = threading.Event()
+    sent = []
+
+    def send(request, **kwargs):
+        sent.append(request)
+        if len(sent) == 1:
+            released.wait(5)
+        return _response(200)
+    transport = Mock(spec=['send'], send=Mock(side_effect=send))
+    pipeline = Pipeline(transport, policies=[HedgingPolicy(hedging_initial_delay=0.01)], metrics_sink=sink)
+    pipeline.run(HttpRequest("GET", "https://spam.eggs/"))
+    released.set()
+
+    # both attempts update the metrics of the request, each from its own thread
+    deadline = time.time() + 5
+    while sink.metrics[0].transport_attempts < 2 or sink.metrics[0].transport_duration < 0.01:
+        assert time.time() < deadline
+        time.sleep(0.01)
+    assert len(sent) == 2
+
+
+def test_callback_sink():
+    samples = []
+    transport = Mock(spec=['send'], send=Mock(return_value=_response(200)))
+    sink = CallbackMetricsSink(lambda name, value, attributes: samples.append((name, value, attributes)))
+    Pipeline(transport, policies=[HeadersPolicy()], metrics_sink=sink).run(HttpRequest("GET", "https://spam.eggs/"))
+
+    names = [sample[0] for sample in samples]
+    assert 'request.duration' in names
+    assert 'transport.duration' in names
+    assert ('policy.duration', {'policy': 'HeadersPolicy'}) in [(s[0], s[2]) for s in samples]
+    duration = [s for s in samples if s[0] == 'request.duration'][0]
+    assert duration[2]['net.peer.name'] == 'spam.eggs'
+    assert duration[2]['http.status_code'] == 200
+
+
+def test_prometheus_sink():
+    prometheus_client = pytest.importorskip("prometheus_client")
+    registry = prometheus_client.CollectorRegistry()
+    transport = Mock(spec=['send'], send=Mock(return_value=_response(200)))
+    sink = PrometheusMetricsSink(registry=registry)
+    Pipeline(transport, metrics_sink=sink).run(HttpRequest("GET", "https://spam.eggs/"))
+    labels = {'method': 'GET', 'host': 'spam.eggs', 'status_code': '200'}
+    assert registry.get_sample_value('azure_core_request_duration_seconds_count', labels) == 1
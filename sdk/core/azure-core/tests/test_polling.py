@@ -172,3 +172,94 @@ def test_broken_poller(client):
     with pytest.raises(ValueError) as excinfo:
         poller.result()
     assert "Something bad happened" in str(excinfo.value)
+
+
+class PollingSteps(PollingMethod):
+    """A polling method finishing after a number of status updates."""
+    def __init__(self, steps, interval=0.01):
+        self._steps = steps
+        self._interval = interval
+        self.updates = 0
+        self._initial_response = None
+        self._deserialization_callback = None
+
+    def initialize(self, _, initial_response, deserialization_callback):
+        self._initial_response = initial_response
+        self._deserialization_callback = deserialization_callback
+
+    def update_status(self):
+        self.updates += 1
+        if self._steps < 0 and self.updates == -self._steps:
+            raise ValueError("Something bad happened")
+
+    def get_polling_interval(self):
+        return self._interval
+
+    def status(self):
+        return "succeeded" if self.finished() else "running"
+
+    def finished(self):
+        return self.updates >= abs(self._steps)
+
+    def resource(self):
+        return self._deserialization_callback(self._initial_response)
+
+
+def test_poller_manager(client):
+    def deserialization_callback(response):
+        return "Treated: "+response
+
+    with LROPollerManager(max_workers=2) as manager:
+        methods = [PollingSteps(steps) for steps in (5, 1, 3)]
+        pollers = [manager.add(client, str(index), deserialization_callback, method)
+                   for index, method in enumerate(methods)]
+        done_cb = mock.MagicMock()
+        pollers[0].add_done_callback(done_cb)
+
+        completed = list(manager.as_completed(pollers))
+        assert completed == [pollers[1], pollers[2], pollers[0]]
+        assert [poller.result() for poller in pollers] == ["Treated: 0", "Treated: 1", "Treated: 2"]
+        assert [method.updates for method in methods] == [5, 1, 3]
+        assert all(poller.status() == "succeeded" for poller in pollers)
+        done_cb.assert_called_once_with(methods[0])
+
+        # Errors are raised by result, methods without update_status are run on their own thread
+        broken = manager.add(client, "", deserialization_callback, PollingSteps(-2))
+        with pytest.raises(ValueError):
+            broken.result()
+        run_poller = manager.add(client, "spam", deserialization_callback, PollingTwoSteps())
+        assert run_poller.result(timeout=5) == "Treated: spam"
+        assert run_poller.done()
+        assert manager.add(client, "eggs", deserialization_callback, NoPolling()).done()
+
+
+def test_poller_manager_cancel(client):
+    manager = LROPollerManager(polling_interval=60)
+    method = PollingSteps(2, interval=None)
+    poller = manager.add(client, "", lambda response: response, method)
+    other = manager.add(client, "", lambda response: response, PollingSteps(2, interval=None))
+
+    assert poller.cancel()
+    assert poller.done() and poller.cancelled()
+    assert poller.status() == "cancelled"
+    with pytest.raises(ValueError):
+        poller.result()
+    assert method.updates == 0
+
+    manager.close()
+    assert other.cancelled()
+    with pytest.raises(ValueError):
+        manager.add(client, "", lambda response: response, PollingSteps(1))
+
+
+def test_poller_manager_cancel_after_operation_finished(client):
+    with LROPollerManager(polling_interval=60) as manager:
+        method = PollingSteps(2, interval=None)
+        poller = manager.add(client, "spam", lambda response: response, method)
+
+        # The operation completes before the worker reports it: cancelling doesn't hide the result
+        method.updates = 2
+        assert not poller.cancel()
+        assert poller.done() and not poller.cancelled()
+        assert poller.status() == "succeeded"
+        assert poller.result() == "spam"
@@ -0,0 +1,95 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See LICENSE.txt in the project root for
+# license information.
+# -------------------------------------------------------------------------
+from azure.core.pipeline import Pipeline
+from azure.core.pipeline.policies import RetryPolicy, RetryBudget
+from azure.core.pipeline.transport import HttpRequest, HttpResponse, HttpTransport
+
+try:
+    from unittest.mock import Mock
+except ImportError:
+    # python < 3.3
+    from mock import Mock
+
+
+class MockTransport(HttpTransport):
+    def __init__(self, status_codes):
+        self._status_codes = list(status_codes)
+        self.sleeps = []
+        self.requests = 0
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+    def close(self):
+        pass
+
+    def open(self):
+        pass
+
+    def sleep(self, duration):
+        self.sleeps.append(duration)
+
+    def send(self, request, **kwargs):
+        self.requests += 1
+        response = HttpResponse(request, None)
+        response.status_code = self._status_codes.pop(0)
+        return response
+
+
+def test_retry_budget_denies_retries():
+    budget = RetryBudget(retry_ratio=0.5, initial_tokens=1)
+    transport = MockTransport([503, 503, 503])
+    pipeline = Pipeline(transport, policies=[RetryPolicy(retry_budget=budget, retry_backoff_factor=0)])
+
+    response = pipeline.run(HttpRequest("GET", "https://spam.eggs/"))
+
+    assert response.http_response.status_code == 503
+    assert transport.requests == 2  # one retry was allowed by the budget
+    assert budget.retries_spent == 1
+    assert budget.retries_denied == 1
+    assert budget.get_statistics("spam.eggs") == {'tokens': 0, 'retries_spent': 1, 'retries_denied': 1}
+
+
+def test_retry_budget_refilled_by_successes():
+    budget = RetryBudget(retry_ratio=0.5, max_tokens=2, initial_tokens=0)
+    transport = MockTransport([200] * 10 + [503, 503, 503, 200])
+    pipeline = Pipeline(transport, policies=[RetryPolicy(retry_budget=budget, retry_backoff_factor=0)])
+
+    for _ in range(10):
+        pipeline.run(HttpRequest("GET", "https://spam.eggs/"))
+    assert budget.get_statistics("spam.eggs")['tokens'] == 2  # capped to max_tokens
+    assert budget.get_statistics("other.host")['tokens'] == 0  # budgets are per host
+
+    response = pipeline.run(HttpRequest("GET", "https://spam.eggs/"))
+    assert response.http_response.status_code == 503
+    assert budget.retries_spent == 2
+    assert budget.retries_denied == 1
+
+
+def test_retry_budget_not_refilled_by_client_errors():
+    budget = RetryBudget(retry_ratio=0.5, initial_tokens=0)
+    transport = MockTransport([404] * 10 + [304])
+    pipeline = Pipeline(transport, policies=[RetryPolicy(retry_budget=budget, retry_backoff_factor=0)])
+
+    for _ in range(10):
+        pipeline.run(HttpRequest("GET", "https://spam.eggs/"))
+    assert budget.get_statistics("spam.eggs")['tokens'] == 0
+
+    pipeline.run(HttpRequest("GET", "https://spam.eggs/"))
+    assert budget.get_statistics("spam.eggs")['tokens'] == 0.5
+
+
+def test_retry_decorrelated_jitter():
+    transport = MockTransport([503] * 5 + [200])
+    policy = RetryPolicy(retry_jitter=True, retry_backoff_factor=1, retry_backoff_max=5, retry_status=10)
+    response = Pipeline(transport, policies=[policy]).run(HttpRequest("GET", "https://spam.eggs/"))
+
+    assert response.http_response.status_code == 200
+    assert len(transport.sleeps) == 5
+    previous = 1
+    for sleep in transport.sleeps:
+        assert 1 <= sleep <= min(5, previous * 3)
+        previous = max(sleep, 1)
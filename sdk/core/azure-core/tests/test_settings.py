@@ -27,6 +27,10 @@ import logging
 import os
 import sys
 import pytest
+try:
+    from unittest import mock
+except ImportError:
+    import mock
 
 # module under test
 import azure.core.settings as m
@@ -106,6 +110,7 @@ class TestPrioritizedSetting(object):
 
         # 2. environment variable
         os.environ["AZURE_FOO"] = "30"
+        ps.reload()
         assert ps() == 30
 
         # 3. previously user-set value
@@ -117,6 +122,35 @@ class TestPrioritizedSetting(object):
 
         del os.environ["AZURE_FOO"]
 
+    def test_cached(self):
+        convert = mock.Mock(side_effect=int)
+        ps = m.PrioritizedSetting("foo", env_var="AZURE_FOO", convert=convert, default=10)
+        assert ps() == 10
+        assert ps() == 10
+        assert convert.call_count == 1
+
+        # The environment is snapshotted until reload
+        os.environ["AZURE_FOO"] = "30"
+        try:
+            assert ps() == 10
+            ps.reload()
+            assert ps() == 30
+            ps.set_value(40)
+            assert ps() == 40
+            ps.unset_value()
+            assert ps() == 30
+        finally:
+            del os.environ["AZURE_FOO"]
+        ps.reload()
+        assert ps() == 10
+
+    def test_none_not_cached(self):
+        values = iter([None, 20])
+        ps = m.PrioritizedSetting("foo", system_hook=lambda: next(values))
+        assert ps() is None
+        assert ps() == 20
+        assert ps() == 20
+
     def test___str__(self):
         ps = m.PrioritizedSetting("foo")
         assert str(ps) == "PrioritizedSetting(%r)" % "foo"
@@ -212,6 +246,7 @@ class TestStandardSettings(object):
         assert val.tracing_enabled == False
         assert val.log_level == 30
         del os.environ["AZURE_LOG_LEVEL"]
+        m.settings.reload()
 
     def test_defaults(self):
         val = m.settings.defaults
@@ -230,6 +265,7 @@ class TestStandardSettings(object):
         assert val.tracing_enabled == defaults.tracing_enabled
         assert val.tracing_implementation == defaults.tracing_implementation
         del os.environ["AZURE_LOG_LEVEL"]
+        m.settings.reload()
 
     def test_current(self):
         os.environ["AZURE_LOG_LEVEL"] = "debug"
@@ -237,3 +273,4 @@ class TestStandardSettings(object):
         assert isinstance(val, tuple)
         assert val.log_level == 10
         del os.environ["AZURE_LOG_LEVEL"]
+        m.settings.reload()
@@ -132,3 +132,49 @@ def test_distributed_tracing_policy_with_user_agent(should_set_sdk_context):
         assert network_span.span_data.attributes.get("x-ms-client-request-id") == "some client request id"
         assert network_span.span_data.attributes.get("x-ms-request-id") is None
         assert network_span.span_data.attributes.get("http.status_code") == 504
+
+
+def test_distributed_tracing_policy_sampling():
+    """Requests that are not sampled get no span, and the span doesn't outlive the request context."""
+    with ContextHelper():
+        exporter = MockExporter()
+        trace = tracer_module.Tracer(sampler=AlwaysOnSampler(), exporter=exporter)
+        with trace.span("parent"):
+            sampled = iter([True, False])
+            policy = DistributedTracingPolicy(tracing_sampler=lambda request: next(sampled))
+
+            for _ in range(2):
+                request = HttpRequest("GET", "http://127.0.0.1/temp")
+                pipeline_request = PipelineRequest(request, PipelineContext(None))
+                policy.on_request(pipeline_request)
+                response = HttpResponse(request, None)
+                response.status_code = 200
+                response.headers = {}
+                policy.on_response(pipeline_request, PipelineResponse(request, response, pipeline_request.context))
+                assert "tracing_span" not in pipeline_request.context
+            assert "traceparent" not in request.headers
+
+        trace.finish()
+        exporter.build_tree()
+        assert len(exporter.root.children) == 1
+
+        policy = DistributedTracingPolicy(tracing_sampling_rate=0)
+        with trace.span("parent"):
+            pipeline_request = PipelineRequest(HttpRequest("GET", "http://127.0.0.1/"), PipelineContext(None))
+            policy.on_request(pipeline_request)
+            assert "tracing_span" not in pipeline_request.context
+
+
+def test_distributed_tracing_policy_unsampled_trace():
+    """No span is created when the tracer drops the trace, but the decision is propagated."""
+    from opencensus.trace.samplers import AlwaysOffSampler
+
+    with ContextHelper():
+        trace = tracer_module.Tracer(sampler=AlwaysOffSampler(), exporter=MockExporter())
+        with trace.span("parent"):
+            policy = DistributedTracingPolicy()
+            request = HttpRequest("GET", "http://127.0.0.1/")
+            pipeline_request = PipelineRequest(request, PipelineContext(None))
+            policy.on_request(pipeline_request)
+            assert "tracing_span" not in pipeline_request.context
+            assert request.headers["traceparent"].endswith("-00")
@@ -28,6 +28,7 @@ try:
     from unittest import mock
 except ImportError:
     import mock
+import logging
 
 import requests
 
@@ -36,6 +37,7 @@ import pytest
 from azure.core.exceptions import DecodeError
 from azure.core.configuration import Configuration
 from azure.core.pipeline import (
+    Pipeline,
     PipelineResponse,
     PipelineRequest,
     PipelineContext
@@ -189,3 +191,113 @@ def test_raw_deserializer():
     raw_deserializer.on_response(None, response)
     result = response.context["deserialized_data"]
     assert result["success"] is True
+
+
+def test_deserialize_from_stream_xml():
+    body = (b'<?xml version="1.0" encoding="utf-8"?><EnumerationResults><Blobs>'
+            b'<Blob><Name>a</Name></Blob><Blob><Name>b</Name></Blob><Blob><Name>c</Name></Blob>'
+            b'</Blobs><NextMarker>marker</NextMarker></EnumerationResults>')
+    chunks = [body[i:i + 10] for i in range(0, len(body), 10)]
+
+    items = ContentDecodePolicy.deserialize_from_stream(iter(chunks), "application/xml", "Blob")
+    assert next(items).find("Name").text == "a"
+    assert [i.find("Name").text for i in items] == ["b", "c"]
+    remainder = items.remainder()
+    assert remainder.find("NextMarker").text == "marker"
+    assert len(remainder.find("Blobs")) == 0  # items are not kept in the tree
+
+    with pytest.raises(ValueError):
+        ContentDecodePolicy.deserialize_from_stream(iter(chunks), "application/xml")
+
+
+def test_deserialize_from_stream_json():
+    body = (u'﻿{"odata": {"v": [1]}, "value": [{"name": "a,]\\"}"}, [1, [2]], "c", 4.5, null],'
+            u' "nextLink": "next"}').encode('utf-8')
+    for chunk_size in (1, 3, len(body)):
+        chunks = [body[i:i + chunk_size] for i in range(0, len(body), chunk_size)]
+        items = ContentDecodePolicy.deserialize_from_stream(chunks, "application/json; charset=utf-8", "value")
+        assert list(items) == [{"name": 'a,]"}'}, [1, [2]], "c", 4.5, None]
+        assert items.remainder() == {"odata": {"v": [1]}, "value": [], "nextLink": "next"}
+
+    items = ContentDecodePolicy.deserialize_from_stream([b'[{"a": 1},', b' {"b": [2]}]'], "application/json")
+    assert list(items) == [{"a": 1}, {"b": [2]}]
+    assert items.remainder() == []
+
+    with pytest.raises(DecodeError):
+        ContentDecodePolicy.deserialize_from_stream([b"data"], "text/plain")
+
+
+def _logged_pipeline(policy, status_code=200):
+    transport = mock.Mock(spec=['send'])
+    transport.send.return_value = mock.Mock(status_code=status_code, headers={}, text=lambda: "body")
+    return Pipeline(transport, policies=[policy])
+
+
+def test_logging_no_formatting_when_disabled(caplog):
+    headers = mock.MagicMock()
+    request = HttpRequest('GET', 'http://127.0.0.1/')
+    request.headers = headers
+    with caplog.at_level(logging.INFO, logger="azure.core.pipeline.policies.universal"):
+        _logged_pipeline(NetworkTraceLoggingPolicy(logging_enable=True)).run(request)
+    assert not caplog.records
+    headers.items.assert_not_called()
+
+
+def test_logging_sampling():
+    policy = NetworkTraceLoggingPolicy(logging_enable=True, logging_sample_interval=3, logging_slow_threshold=60)
+    with mock.patch('azure.core.pipeline.policies.universal._LOGGER') as logger:
+        pipeline = _logged_pipeline(policy)
+        for _ in range(6):
+            pipeline.run(HttpRequest('GET', 'http://127.0.0.1/'))
+        # 2 sampled requests, one record for the request and one for the response
+        assert logger.debug.call_count == 4
+        logger.reset_mock()
+
+        # Failures are always logged
+        pipeline = _logged_pipeline(policy, status_code=500)
+        for _ in range(3):
+            pipeline.run(HttpRequest('GET', 'http://127.0.0.1/'))
+        assert logger.debug.call_count == 6
+        logger.reset_mock()
+
+        # Slow requests are always logged
+        policy.slow_threshold = -1
+        pipeline = _logged_pipeline(policy)
+        for _ in range(3):
+            pipeline.run(HttpRequest('GET', 'http://127.0.0.1/'))
+        assert logger.debug.call_count == 6
+
+
+def test_logging_exception():
+    transport = mock.Mock(spec=['send'], send=mock.Mock(side_effect=ValueError("boom")))
+    policy = NetworkTraceLoggingPolicy(logging_enable=True, logging_sample_interval=2)
+    with mock.patch('azure.core.pipeline.policies.universal._LOGGER') as logger:
+        pipeline = Pipeline(transport, policies=[policy])
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                pipeline.run(HttpRequest('GET', 'http://127.0.0.1/'))
+        # Both are logged with the exception
+        assert logger.debug.call_count == 4
+
+
+def test_logging_structured(caplog):
+    policy = NetworkTraceLoggingPolicy(logging_enable=True, logging_structured=True)
+    request = HttpRequest('GET', 'http://127.0.0.1/', headers={'Authorization': 'secret', 'x-custom': 'value'})
+    with caplog.at_level(logging.DEBUG, logger="azure.core.pipeline.policies.universal"):
+        _logged_pipeline(policy).run(request)
+    request_record, response_record = caplog.records
+    assert request_record.azure_http == {'event': 'request', 'method': 'GET'}
+    assert "x-custom='value'" in request_record.getMessage()
+    assert "secret" not in request_record.getMessage()
+    assert response_record.azure_http['status_code'] == 200
+    assert response_record.azure_http['duration'] >= 0
+    assert "body='body'" in response_record.getMessage()
+
+
+def test_logging_structured_sampling_without_slow_threshold():
+    policy = NetworkTraceLoggingPolicy(logging_enable=True, logging_structured=True, logging_sample_interval=3)
+    with mock.patch('azure.core.pipeline.policies.universal._LOGGER') as logger:
+        pipeline = _logged_pipeline(policy)
+        for _ in range(6):
+            pipeline.run(HttpRequest('GET', 'http://127.0.0.1/'))
+        assert logger.debug.call_count == 4
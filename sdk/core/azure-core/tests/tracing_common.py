@@ -38,6 +38,7 @@ class ContextHelper(object):
         if self.tracer_to_use is not None:
             settings.tracing_implementation.set_value(self.tracer_to_use)
         self.os_env.start()
+        settings.tracing_implementation.reload()
         execution_context.clear()
         tracing_context.current_span.clear()
         return self
@@ -46,8 +47,8 @@ class ContextHelper(object):
         OpenCensusSpan.set_current_tracer(self.orig_tracer)
         OpenCensusSpan.set_current_span(self.orig_current_span)
         tracing_context.current_span.set(self.orig_sdk_context_span)
-        settings.tracing_implementation.unset_value()
         self.os_env.stop()
+        settings.tracing_implementation.unset_value()
 
 
 class Node:
@@ -26,6 +26,14 @@ class CreateCertificatePoller(PollingMethod):
         if not self._certificate_id:
             self._certificate_id = parse_vault_id(pending_certificate.id)
 
+    def update_status(self):
+        # type: () -> None
+        self._update_status()
+
+    def get_polling_interval(self):
+        # type: () -> float
+        return self.polling_interval
+
     def initialize(self, client, initial_response, _):
         # type: (Any, Any, Callable) -> None
         self._command = client
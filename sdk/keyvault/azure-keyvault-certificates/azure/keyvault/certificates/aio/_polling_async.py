@@ -28,6 +28,12 @@ class CreateCertificatePollerAsync(AsyncPollingMethod):
         if not self._certificate_id:
             self._certificate_id = parse_vault_id(pending_certificate.id)
 
+    async def update_status(self) -> None:
+        await self._update_status()
+
+    def get_polling_interval(self) -> float:
+        return self.polling_interval
+
     def initialize(self, client: Any, initial_response: Any, _: Callable) -> None:
         self._command = client
         self._status = initial_response
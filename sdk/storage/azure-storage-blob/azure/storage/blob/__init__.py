@@ -14,6 +14,7 @@ from .blob_service_client import BlobServiceClient
 from .lease import LeaseClient
 from ._shared.policies import ExponentialRetry, LinearRetry, NoRetry
 from ._shared.downloads import StorageStreamDownloader
+from ._shared.tuning import TransferTuner
 from ._shared.models import(
     LocationMode,
     ResourceTypes,
@@ -45,6 +46,8 @@ from .models import (
     AccessPolicy,
     ContainerPermissions,
     BlobPermissions,
+    BulkTransferResult,
+    BlobBatchResult,
 )
 
 __version__ = VERSION
@@ -84,9 +87,12 @@ __all__ = [
     'AccessPolicy',
     'ContainerPermissions',
     'BlobPermissions',
+    'BulkTransferResult',
+    'BlobBatchResult',
     'ResourceTypes',
     'AccountPermissions',
     'StorageStreamDownloader',
+    'TransferTuner',
 ]
 
 
@@ -170,5 +176,4 @@ def download_blob_from_url(
         else:
             if not overwrite and os.path.isfile(output):
                 raise ValueError("The file '{}' already exists.".format(output))
-            with open(output, 'wb') as file_handle:
-                _download_to_stream(client, file_handle, max_connections, **kwargs)
+            client.download_to_file(output, max_connections=max_connections, **kwargs)
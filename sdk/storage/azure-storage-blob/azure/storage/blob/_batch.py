@@ -0,0 +1,265 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import uuid
+from time import time
+from concurrent import futures
+from wsgiref.handlers import format_date_time
+
+try:
+    from urllib.parse import urlparse, quote
+except ImportError:
+    from urlparse import urlparse  # type: ignore
+    from urllib2 import quote  # type: ignore
+
+import six
+
+from azure.core.exceptions import HttpResponseError
+from azure.core.pipeline import PipelineRequest, PipelineContext
+from azure.core.pipeline.transport import HttpRequest
+from azure.core.tracing.context import tracing_context
+
+from ._shared.authentication import SharedKeyCredentialPolicy
+from ._shared.constants import STORAGE_OAUTH_SCOPE
+from ._shared.models import get_enum_value
+from ._shared.response_handlers import process_storage_error
+from ._generated import AzureBlobStorage
+from ._generated.models import StorageErrorException
+from .models import BlobBatchResult, BlobProperties
+
+#: The largest number of sub-requests the service accepts in one batch.
+MAX_BATCH_SIZE = 256
+
+_CRLF = b'\r\n'
+
+
+def return_response_and_deserialized(response, deserialized, response_headers):  # pylint: disable=unused-argument
+    return response, deserialized
+
+
+def get_account_url(client):
+    """Returns the URL of the account of a client, where batches are submitted."""
+    return "{}://{}/{}".format(
+        client.scheme,
+        client._hosts[client._location_mode],  # pylint: disable=protected-access
+        client._query_str)  # pylint: disable=protected-access
+
+
+def get_blob_reference(blob, container=None):
+    """Returns the container, name and snapshot of a blob.
+
+    :param blob: A BlobProperties, the name of a blob in `container`, or
+        a path 'container/blob' if no container is given.
+    """
+    if isinstance(blob, BlobProperties):
+        return blob.container or container, blob.name, blob.snapshot
+    if container is None:
+        container, _, blob = blob.partition('/')
+        if not blob:
+            raise ValueError("The blob '{}' must be given as 'container/blob'.".format(container))
+    return container, blob, None
+
+
+class BatchOperation(object):
+    """Builds and signs the sub-requests of a batch, and collects their results.
+
+    :param client: The ContainerClient or BlobServiceClient running the batch.
+    :param str method: The HTTP method of every sub-request.
+    :param dict query: The query parameters of every sub-request.
+    :param dict headers: The headers of every sub-request.
+    """
+
+    def __init__(self, client, method, query=None, headers=None):
+        self.scheme = client.scheme
+        self.hostname = client._hosts[client._location_mode]  # pylint: disable=protected-access
+        self.query_str = client._query_str.lstrip('?')  # pylint: disable=protected-access
+        self.credential = client.credential
+        self.method = method
+        self.query = dict((k, v) for k, v in (query or {}).items() if v is not None)
+        self.headers = dict((k, v) for k, v in (headers or {}).items() if v is not None)
+        self.blobs = []
+
+    def add(self, container, name, snapshot=None):
+        self.blobs.append((container, name, snapshot))
+
+    def batches(self):
+        """Splits the blobs into batches the service accepts."""
+        return [self.blobs[i:i + MAX_BATCH_SIZE] for i in range(0, len(self.blobs), MAX_BATCH_SIZE)]
+
+    def build_request(self, container, name, snapshot=None):
+        if isinstance(name, six.text_type):
+            name = name.encode('UTF-8')
+        url = "{}://{}/{}/{}".format(self.scheme, self.hostname, quote(container), quote(name, safe='~'))
+        query = dict(self.query)
+        if snapshot:
+            query['snapshot'] = quote(snapshot)
+        query_str = '&'.join(["{}={}".format(k, v) for k, v in query.items()] + [self.query_str])
+        if query_str.strip('&'):
+            url += '?' + query_str.strip('&')
+        request = HttpRequest(self.method, url, headers=self.headers)
+        request.headers['Content-Length'] = '0'
+        return request
+
+    def sign(self, requests, token=None):
+        """Authorizes every sub-request the way the client pipeline authorizes a request.
+
+        With a shared key, each sub-request is signed by the credential policy. With a
+        token credential, each one carries the token. With a SAS, the sub-request URLs
+        already hold the signature.
+
+        :param str token: The access token, if the client has a token credential.
+        """
+        for request in requests:
+            request.headers['x-ms-date'] = format_date_time(time())
+            if isinstance(self.credential, SharedKeyCredentialPolicy):
+                self.credential.on_request(PipelineRequest(request, PipelineContext(None)))
+            elif token:
+                request.headers['Authorization'] = "Bearer {}".format(token)
+
+    def prepare(self, blobs, token=None):
+        """Returns the body and content type of the batch request for the blobs."""
+        requests = [self.build_request(*blob) for blob in blobs]
+        self.sign(requests, token=token)
+        boundary = "batch_{}".format(uuid.uuid4())
+        return serialize_batch(requests, boundary), "multipart/mixed; boundary={}".format(boundary)
+
+    @staticmethod
+    def get_results(blobs, body, content_type):
+        """Pairs the sub-responses of a batch with its blobs."""
+        responses = parse_batch_response(body, content_type)
+        results = []
+        for index, (container, name, snapshot) in enumerate(blobs):
+            if index not in responses:
+                # The service answers with a single error when it can't process the batch as a whole
+                status_code, reason, _headers = next(iter(responses.values()), (None, None, None))
+                raise HttpResponseError(
+                    message="The batch request failed: {} {}".format(status_code, reason))
+            status_code, reason, headers = responses[index]
+            results.append(BlobBatchResult(container, name, snapshot, status_code, reason, headers))
+        return results
+
+
+def delete_blobs_operation(client, blobs, container=None, delete_snapshots=None):
+    operation = BatchOperation(
+        client, 'DELETE', headers={'x-ms-delete-snapshots': get_enum_value(delete_snapshots)})
+    for blob in blobs:
+        container_name, name, snapshot = get_blob_reference(blob, container)
+        if snapshot and delete_snapshots:
+            raise ValueError("The delete_snapshots option cannot be used with a specific snapshot.")
+        operation.add(container_name, name, snapshot)
+    return operation
+
+
+def set_tier_operation(client, standard_blob_tier, blobs, container=None):
+    if standard_blob_tier is None:
+        raise ValueError("A StandardBlobTier must be specified")
+    operation = BatchOperation(
+        client, 'PUT', query={'comp': 'tier'}, headers={'x-ms-access-tier': get_enum_value(standard_blob_tier)})
+    for blob in blobs:
+        container_name, name, _ = get_blob_reference(blob, container)
+        operation.add(container_name, name)
+    return operation
+
+
+def serialize_batch(requests, boundary):
+    """Serializes the sub-requests into a multipart/mixed batch body."""
+    delimiter = b'--' + boundary.encode('utf-8')
+    body = []
+    for index, request in enumerate(requests):
+        parsed = urlparse(request.url)
+        target = parsed.path + ('?' + parsed.query if parsed.query else '')
+        lines = [
+            delimiter,
+            b'Content-Type: application/http',
+            b'Content-Transfer-Encoding: binary',
+            "Content-ID: {}".format(index).encode('utf-8'),
+            b'',
+            "{} {} HTTP/1.1".format(request.method, target).encode('utf-8')]
+        lines.extend("{}: {}".format(k, v).encode('utf-8') for k, v in request.headers.items())
+        lines.extend([b'', b''])
+        body.append(_CRLF.join(lines))
+    body.append(delimiter + b'--' + _CRLF)
+    return b''.join(body)
+
+
+def _split_headers(data, start_line=True):
+    head, _, rest = data.partition(_CRLF + _CRLF)
+    lines = head.decode('utf-8').split('\r\n')
+    if not start_line:
+        lines.insert(0, '')
+    headers = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(':')
+        if name:
+            headers[name.strip().lower()] = value.strip()
+    return lines[0], headers, rest
+
+
+def parse_batch_response(body, content_type):
+    """Parses a multipart/mixed batch response.
+
+    :returns: The status code, reason and headers of every sub-response, by Content-ID.
+    :rtype: dict(int, tuple(int, str, dict))
+    """
+    boundary = None
+    for param in content_type.split(';')[1:]:
+        name, _, value = param.strip().partition('=')
+        if name.lower() == 'boundary':
+            boundary = value.strip('"')
+    if not boundary:
+        raise HttpResponseError(message="The batch response has no multipart boundary.")
+    responses = {}
+    parts = body.split(b'--' + boundary.encode('utf-8'))
+    for position, part in enumerate(parts[1:]):
+        if part.startswith(b'--'):
+            break
+        _, part_headers, http_response = _split_headers(part.lstrip(_CRLF), start_line=False)
+        status_line, headers, _ = _split_headers(http_response)
+        _version, status_code, reason = (status_line.split(' ', 2) + [''])[:3]
+        index = int(part_headers['content-id']) if 'content-id' in part_headers else position
+        responses[index] = (int(status_code), reason, headers)
+    return responses
+
+
+def run_batches(client, operation, timeout=None, max_connections=1, **kwargs):
+    """Sends the batches of an operation, `max_connections` at a time, and returns the
+    result of every blob in order.
+
+    :param client: The ContainerClient or BlobServiceClient running the batch.
+    :param operation: The BatchOperation to run.
+    :param int max_connections: The number of batch requests to send in parallel.
+    """
+    service = AzureBlobStorage(get_account_url(client), pipeline=client._pipeline).service  # pylint: disable=protected-access
+    token = None
+    if hasattr(operation.credential, 'get_token'):
+        token = operation.credential.get_token(STORAGE_OAUTH_SCOPE).token
+
+    def send_batch(blobs):
+        body, content_type = operation.prepare(blobs, token=token)
+        try:
+            response, stream = service.submit_batch(
+                body,
+                len(body),
+                content_type,
+                timeout=timeout,
+                cls=return_response_and_deserialized,
+                **kwargs)
+        except StorageErrorException as error:
+            process_storage_error(error)
+        return operation.get_results(blobs, b''.join(stream), response.headers['Content-Type'])
+
+    batches = operation.batches()
+    if max_connections <= 1 or len(batches) <= 1:
+        return [result for blobs in batches for result in send_batch(blobs)]
+    executor = futures.ThreadPoolExecutor(max_connections)
+    running = []
+    try:
+        running = [executor.submit(tracing_context.with_current_context(send_batch), blobs) for blobs in batches]
+        return [result for future in running for result in future.result()]
+    finally:
+        for future in running:
+            future.cancel()
+        executor.shutdown(wait=True)
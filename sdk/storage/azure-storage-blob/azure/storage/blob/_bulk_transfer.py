@@ -0,0 +1,235 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import os
+import time
+import hashlib
+import calendar
+import threading
+from concurrent import futures
+
+from azure.core.tracing.context import tracing_context
+
+from .models import BulkTransferResult, ContentSettings
+
+_MD5_READ_SIZE = 4 * 1024 * 1024
+
+
+def normalize_prefix(prefix):
+    if prefix and not prefix.endswith('/'):
+        return prefix + '/'
+    return prefix or ''
+
+
+def walk_local_files(source):
+    """Yields the path of every file under the directory, and its path relative to it with '/' separators."""
+    for root, _dirs, files in os.walk(source):
+        for name in files:
+            path = os.path.join(root, name)
+            yield path, os.path.relpath(path, source).replace(os.sep, '/')
+
+
+def _is_path_segment(part):
+    # A name that is joined to a path as a single file or directory under it, on this platform
+    if part in ('', '.', '..') or os.sep in part or (os.altsep and os.altsep in part):
+        return False
+    return not os.path.splitdrive(part)[0] and not os.path.isabs(part)
+
+
+def local_path_for_blob(destination, prefix, blob_name):
+    """Returns the path to download a blob to, or None if the blob doesn't map to a file."""
+    relative = blob_name[len(prefix):].lstrip('/')
+    parts = relative.split('/')
+    if not relative or relative.endswith('/'):
+        return None
+    path = os.path.join(destination, *parts)
+    root = os.path.join(os.path.abspath(destination), '')
+    if not all(_is_path_segment(part) for part in parts) or not os.path.abspath(path).startswith(root):
+        raise ValueError("Blob name '{}' can't be mapped to a path under the destination.".format(blob_name))
+    return path
+
+
+def compute_md5(path):
+    md5 = hashlib.md5()
+    with open(path, 'rb') as data:
+        for block in iter(lambda: data.read(_MD5_READ_SIZE), b''):
+            md5.update(block)
+    return bytearray(md5.digest())
+
+
+def is_unchanged(blob, size, modified, md5=None):
+    """Whether a local file and a blob hold the same content.
+
+    The sizes must match. Then, if the MD5 of the local file is given, it must match
+    the one of the blob; otherwise the copy being compared to must not be older
+    than the other one, i.e. the blob must have been written since the file changed
+    for an upload, and the file since the blob changed for a download.
+
+    :param blob: The properties of the blob, or None if it doesn't exist.
+    :param int size: The size of the local file.
+    :param modified: A callable taking the blob's last modified timestamp, and
+        returning whether the side that is the source changed since.
+    :param bytearray md5: The MD5 of the local file, to compare content hashes.
+    """
+    if blob is None or blob.size != size:
+        return False
+    if md5 is not None:
+        blob_md5 = blob.content_settings.content_md5 if blob.content_settings else None
+        return blob_md5 is not None and bytearray(blob_md5) == md5
+    return not modified(calendar.timegm(blob.last_modified.utctimetuple()))
+
+
+class BulkTransfer(object):
+    """Shared state of a bulk transfer: the aggregate result and the slots of large transfers.
+
+    Small files are transferred in a single request on one of the workers. Large
+    files are chunked over `max_connections` connections, and only
+    `max_concurrency // max_connections` of them run at once, so that they can't
+    starve the small files of workers.
+    """
+
+    def __init__(self, max_concurrency, max_connections, large_threshold):
+        self.max_concurrency = max(max_concurrency, 1)
+        self.max_connections = max(max_connections, 1)
+        self.large_threshold = large_threshold
+        self.result = BulkTransferResult()
+        self.large_slots = max(self.max_concurrency // self.max_connections, 1)
+        self._lock = threading.Lock()
+        self._started = time.time()
+
+    def connections_for(self, size):
+        return self.max_connections if size > self.large_threshold else 1
+
+    def add_transferred(self, size):
+        with self._lock:
+            self.result.transferred += 1
+            self.result.bytes_transferred += size
+
+    def add_skipped(self):
+        with self._lock:
+            self.result.skipped += 1
+
+    def add_failure(self, key, error):
+        with self._lock:
+            self.result.failures[key] = error
+
+    def finish(self):
+        self.result.elapsed = time.time() - self._started
+        return self.result
+
+
+def _run_bounded(executor, task, items, limit):
+    """Runs the task on every item, without queuing more than `limit` items at once."""
+    task = tracing_context.with_current_context(task)
+    running = set()
+    for item in items:
+        if len(running) >= limit:
+            _done, running = futures.wait(running, return_when=futures.FIRST_COMPLETED)
+        running.add(executor.submit(task, *item))
+    futures.wait(running)
+
+
+def upload_directory(
+        container,
+        source,
+        name_prefix=None,
+        sync=False,
+        compare_md5=False,
+        overwrite=False,
+        max_concurrency=16,
+        max_connections=4,
+        **kwargs):
+    if not os.path.isdir(source):
+        raise ValueError("The source '{}' is not a directory.".format(source))
+    prefix = normalize_prefix(name_prefix)
+    transfer = BulkTransfer(max_concurrency, max_connections, container._config.max_single_put_size)  # pylint: disable=protected-access
+    large_slots = threading.BoundedSemaphore(transfer.large_slots)
+    existing = {}
+    if sync:
+        existing = dict((b.name, b) for b in container.list_blobs(name_starts_with=prefix or None))
+
+    def upload_file(path, relative):
+        name = prefix + relative
+        try:
+            stat = os.stat(path)
+            md5 = compute_md5(path) if compare_md5 else None
+            if sync and is_unchanged(existing.get(name), stat.st_size, lambda t: stat.st_mtime > t, md5):
+                transfer.add_skipped()
+                return
+            connections = transfer.connections_for(stat.st_size)
+            if connections > 1:
+                large_slots.acquire()
+            try:
+                with open(path, 'rb') as data:
+                    container.get_blob_client(name).upload_blob(
+                        data,
+                        length=stat.st_size,
+                        overwrite=overwrite or sync,
+                        content_settings=ContentSettings(content_md5=md5) if md5 else None,
+                        max_connections=connections,
+                        **kwargs)
+            finally:
+                if connections > 1:
+                    large_slots.release()
+            transfer.add_transferred(stat.st_size)
+        except Exception as error:  # pylint: disable=broad-except
+            transfer.add_failure(path, error)
+
+    executor = futures.ThreadPoolExecutor(transfer.max_concurrency)
+    try:
+        _run_bounded(executor, upload_file, walk_local_files(source), 2 * transfer.max_concurrency)
+    finally:
+        executor.shutdown(wait=True)
+    return transfer.finish()
+
+
+def download_directory(
+        container,
+        destination,
+        name_starts_with=None,
+        sync=False,
+        compare_md5=False,
+        max_concurrency=16,
+        max_connections=4,
+        **kwargs):
+    prefix = name_starts_with or ''
+    transfer = BulkTransfer(max_concurrency, max_connections, container._config.max_single_get_size)  # pylint: disable=protected-access
+    large_slots = threading.BoundedSemaphore(transfer.large_slots)
+    dir_lock = threading.Lock()
+
+    def download_blob(blob):
+        try:
+            path = local_path_for_blob(destination, prefix, blob.name)
+            if path is None:
+                return
+            if sync and os.path.isfile(path):
+                stat = os.stat(path)
+                md5 = compute_md5(path) if compare_md5 else None
+                if is_unchanged(blob, stat.st_size, lambda t: t > stat.st_mtime, md5):
+                    transfer.add_skipped()
+                    return
+            with dir_lock:
+                if not os.path.isdir(os.path.dirname(path)):
+                    os.makedirs(os.path.dirname(path))
+            connections = transfer.connections_for(blob.size)
+            if connections > 1:
+                large_slots.acquire()
+            try:
+                container.get_blob_client(blob.name).download_to_file(path, max_connections=connections, **kwargs)
+            finally:
+                if connections > 1:
+                    large_slots.release()
+            transfer.add_transferred(blob.size)
+        except Exception as error:  # pylint: disable=broad-except
+            transfer.add_failure(blob.name, error)
+
+    blobs = ((b,) for b in container.list_blobs(name_starts_with=name_starts_with))
+    executor = futures.ThreadPoolExecutor(transfer.max_concurrency)
+    try:
+        _run_bounded(executor, download_blob, blobs, 2 * transfer.max_concurrency)
+    finally:
+        executor.shutdown(wait=True)
+    return transfer.finish()
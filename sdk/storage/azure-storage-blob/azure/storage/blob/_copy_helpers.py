@@ -0,0 +1,169 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import time
+from concurrent import futures
+
+from azure.core.exceptions import HttpResponseError
+from azure.core.tracing.context import tracing_context
+
+from ._generated.models import SourceModifiedAccessConditions
+from .models import BlobType, BlobBlock
+
+_MAX_COPY_BLOCK_SIZE = 100 * 1024 * 1024
+_DEFAULT_COPY_BLOCK_SIZE = 32 * 1024 * 1024
+_MAX_BLOCKS = 50000
+_MIN_POLL_INTERVAL = 1.0
+_MAX_POLL_INTERVAL = 30.0
+
+# The statuses of a failed anonymous read, for which the service can still copy the source itself
+_SOURCE_NOT_READABLE = (401, 403, 404, 409)
+
+
+def get_source_client(client, source_url):
+    """Returns a client reading the source the way the service will, with the SAS of the URL if any."""
+    return type(client)(source_url, transport=client._config.transport)  # pylint: disable=protected-access
+
+
+def can_stage_from(source_properties):
+    """Whether the source can be copied by staging its ranges: Put Block From URL can read it, and
+    the destination keeps its blob type."""
+    return source_properties is not None and source_properties.blob_type == BlobType.BlockBlob
+
+
+def get_copy_blocks(size, block_size=None):
+    """Splits a source of the given size into the ranges to stage, returning (block_id, offset, length)."""
+    if size > _MAX_COPY_BLOCK_SIZE * _MAX_BLOCKS:
+        raise ValueError("The source is too large to be copied in blocks.")
+    block_size = min(max(block_size or _DEFAULT_COPY_BLOCK_SIZE, -(-size // _MAX_BLOCKS)), _MAX_COPY_BLOCK_SIZE)
+    return [('{0:032d}'.format(offset), offset, min(block_size, size - offset)) for offset in range(0, size, block_size)]
+
+
+def get_stage_options(source_properties, timeout=None):
+    """Pins the staged ranges to the version of the source that was measured."""
+    return {
+        'source_modified_access_conditions': SourceModifiedAccessConditions(source_if_match=source_properties.etag),
+        'timeout': timeout}
+
+
+def check_copy_status(properties):
+    """Returns whether a copy is still pending, raising if it failed or was aborted."""
+    copy = properties.copy
+    if copy.status == 'pending':
+        return True
+    if copy.status != 'success':
+        raise HttpResponseError(
+            message="The copy {} ended with status '{}': {}".format(copy.id, copy.status, copy.status_description))
+    return False
+
+
+def get_copy_result(properties):
+    return {
+        'etag': properties.etag,
+        'last_modified': properties.last_modified,
+        'copy_id': properties.copy.id,
+        'copy_status': properties.copy.status}
+
+
+class CopyPoller(object):
+    """Picks the delay before the next status check of a pending service copy.
+
+    While the copy reports progress, the delay is the time it should still take at
+    the rate observed since the previous check, so that a copy finishing soon is
+    noticed soon and a long one isn't checked needlessly. Without progress, the delay
+    doubles. It always stays between 1 and `max_interval` seconds.
+    """
+
+    def __init__(self, max_interval=_MAX_POLL_INTERVAL):
+        self.max_interval = max_interval
+        self.interval = None
+        self._last = None
+
+    @staticmethod
+    def _parse_progress(progress):
+        try:
+            copied, total = progress.split('/')
+            return int(copied), int(total)
+        except (AttributeError, ValueError):
+            return None
+
+    def next_interval(self, progress):
+        now = time.time()
+        parsed = self._parse_progress(progress)
+        if self.interval is None:
+            self.interval = _MIN_POLL_INTERVAL
+        elif parsed and self._last and parsed[0] > self._last[1]:
+            rate = (parsed[0] - self._last[1]) / (now - self._last[0])
+            self.interval = (parsed[1] - parsed[0]) / rate
+        else:
+            self.interval *= 2
+        self.interval = min(max(self.interval, _MIN_POLL_INTERVAL), self.max_interval)
+        if parsed:
+            self._last = (now, parsed[0])
+        return self.interval
+
+
+def get_source_properties(client, source_url, **kwargs):
+    """Returns the properties of the source, or None if it can't be read from its URL."""
+    try:
+        return get_source_client(client, source_url).get_blob_properties(timeout=kwargs.get('timeout'))
+    except HttpResponseError as error:
+        if error.status_code in _SOURCE_NOT_READABLE:
+            return None
+        raise
+
+
+def copy_staged(
+        client, source_url, source_properties,
+        metadata=None, content_settings=None, block_size=None, max_connections=1, timeout=None):
+    blocks = get_copy_blocks(source_properties.size, block_size)
+    stage_options = get_stage_options(source_properties, timeout=timeout)
+
+    def stage(block):
+        block_id, offset, length = block
+        # The range is sent as bytes=<source_offset>-<source_length>, an inclusive end
+        client.stage_block_from_url(
+            block_id, source_url, source_offset=offset, source_length=offset + length - 1, **stage_options)
+
+    if max_connections > 1 and len(blocks) > 1:
+        executor = futures.ThreadPoolExecutor(max_connections)
+        running = []
+        try:
+            running = [executor.submit(tracing_context.with_current_context(stage), block) for block in blocks]
+            for future in running:
+                future.result()
+        finally:
+            for future in running:
+                future.cancel()
+            executor.shutdown(wait=True)
+    else:
+        for block in blocks:
+            stage(block)
+    # A service copy carries the properties of the source over to the destination
+    return client.commit_block_list(
+        [BlobBlock(block_id=block[0]) for block in blocks],
+        metadata=metadata if metadata is not None else source_properties.metadata,
+        content_settings=content_settings or source_properties.content_settings,
+        timeout=timeout)
+
+
+def copy_from_url(
+        client, source_url, metadata=None, content_settings=None, max_poll_interval=_MAX_POLL_INTERVAL, timeout=None):
+    copy = client.start_copy_from_url(source_url, metadata=metadata, timeout=timeout)
+    poller = CopyPoller(max_poll_interval)
+    result = dict((key, copy.get(key)) for key in ('etag', 'last_modified', 'copy_id', 'copy_status'))
+    progress = None
+    while result['copy_status'] == 'pending':
+        time.sleep(poller.next_interval(progress))
+        properties = client.get_blob_properties(timeout=timeout)
+        if properties.copy.id != copy['copy_id']:
+            raise HttpResponseError(message="The copy {} was replaced by another copy.".format(copy['copy_id']))
+        check_copy_status(properties)
+        progress = properties.copy.progress
+        result = get_copy_result(properties)
+    if content_settings:
+        result.update(client.set_http_headers(content_settings, timeout=timeout))
+    return result
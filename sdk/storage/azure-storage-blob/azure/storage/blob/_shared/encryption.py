@@ -14,6 +14,7 @@ from collections import OrderedDict
 
 from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives.ciphers import Cipher
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from cryptography.hazmat.primitives.ciphers.algorithms import AES
 from cryptography.hazmat.primitives.ciphers.modes import CBC
 from cryptography.hazmat.primitives.padding import PKCS7
@@ -25,6 +26,10 @@ from . import encode_base64, decode_base64_to_bytes
 
 
 _ENCRYPTION_PROTOCOL_V1 = '1.0'
+_ENCRYPTION_PROTOCOL_V2 = '2.0'
+_GCM_REGION_DATA_LENGTH = 4 * 1024 * 1024
+_GCM_NONCE_LENGTH = 12
+_GCM_TAG_LENGTH = 16
 _ERROR_OBJECT_INVALID = \
     '{0} does not define a complete interface. Value of {1} is either missing or invalid.'
 
@@ -34,6 +39,11 @@ def _validate_not_none(param_name, param):
         raise ValueError('{0} should not be None.'.format(param_name))
 
 
+def _validate_encryption_version(version):
+    if version not in (_ENCRYPTION_PROTOCOL_V1, _ENCRYPTION_PROTOCOL_V2):
+        raise ValueError('Encryption version {0} is not supported.'.format(version))
+
+
 def _validate_key_encryption_key_wrap(kek):
     # Note that None is not callable and so will fail the second clause of each check.
     if not hasattr(kek, 'wrap_key') or not callable(kek.wrap_key):
@@ -49,6 +59,7 @@ class _EncryptionAlgorithm(object):
     Specifies which client encryption algorithm is used.
     '''
     AES_CBC_256 = 'AES_CBC_256'
+    AES_GCM_256 = 'AES_GCM_256'
 
 
 class _WrappedContentKey:
@@ -96,16 +107,64 @@ class _EncryptionAgent:
         self.protocol = protocol
 
 
+class _EncryptedRegionInfo:
+    '''
+    Represents the layout of the regions of data encrypted with protocol 2.0.
+
+    The plaintext is split into regions of data_length bytes, the last one possibly
+    shorter. Each region is encrypted on its own with AES-GCM, and is stored as its
+    nonce, followed by its ciphertext and authentication tag.
+    '''
+
+    def __init__(self, data_length, nonce_length, tag_length=_GCM_TAG_LENGTH):
+        '''
+        :param int data_length:
+            The length of the plaintext of a region.
+        :param int nonce_length:
+            The length of the nonce of a region.
+        :param int tag_length:
+            The length of the authentication tag of a region.
+        '''
+
+        _validate_not_none('data_length', data_length)
+        _validate_not_none('nonce_length', nonce_length)
+
+        self.data_length = data_length
+        self.nonce_length = nonce_length
+        self.tag_length = tag_length
+
+    @property
+    def region_length(self):
+        '''The length of an encrypted region holding a full region of plaintext.'''
+        return self.nonce_length + self.data_length + self.tag_length
+
+    def get_encrypted_length(self, length):
+        '''Returns the length of the encrypted regions of a plaintext of the given length.'''
+        regions = -(-length // self.data_length)
+        return length + regions * (self.nonce_length + self.tag_length)
+
+    def align(self, chunk_size):
+        '''Returns the smallest length of whole regions of plaintext that is at least the given length.'''
+        return max(-(-chunk_size // self.data_length), 1) * self.data_length
+
+    def get_plaintext_length(self, encrypted_length):
+        '''Returns the length of the plaintext held by encrypted regions of the given length.'''
+        regions, remainder = divmod(encrypted_length, self.region_length)
+        last = max(remainder - self.nonce_length - self.tag_length, 0)
+        return regions * self.data_length + last
+
+
 class _EncryptionData:
     '''
     Represents the encryption data that is stored on the service.
     '''
 
     def __init__(self, content_encryption_IV, encryption_agent, wrapped_content_key,
-                 key_wrapping_metadata):
+                 key_wrapping_metadata, encrypted_region_info=None):
         '''
         :param bytes content_encryption_IV:
-            The content encryption initialization vector.
+            The content encryption initialization vector. Not used by protocol 2.0,
+            where each region has its own nonce.
         :param _EncryptionAgent encryption_agent:
             The encryption agent.
         :param _WrappedContentKey wrapped_content_key:
@@ -113,9 +172,14 @@ class _EncryptionData:
             and the encrypted key bytes.
         :param dict key_wrapping_metadata:
             A dict containing metadata related to the key wrapping.
+        :param _EncryptedRegionInfo encrypted_region_info:
+            The layout of the encrypted regions, for protocol 2.0.
         '''
 
-        _validate_not_none('content_encryption_IV', content_encryption_IV)
+        if encryption_agent is not None and encryption_agent.protocol == _ENCRYPTION_PROTOCOL_V2:
+            _validate_not_none('encrypted_region_info', encrypted_region_info)
+        else:
+            _validate_not_none('content_encryption_IV', content_encryption_IV)
         _validate_not_none('encryption_agent', encryption_agent)
         _validate_not_none('wrapped_content_key', wrapped_content_key)
 
@@ -123,15 +187,17 @@ class _EncryptionData:
         self.encryption_agent = encryption_agent
         self.wrapped_content_key = wrapped_content_key
         self.key_wrapping_metadata = key_wrapping_metadata
+        self.encrypted_region_info = encrypted_region_info
 
 
-def _generate_encryption_data_dict(kek, cek, iv):
+def _generate_encryption_data_dict(kek, cek, iv, version=_ENCRYPTION_PROTOCOL_V1):
     '''
     Generates and returns the encryption metadata as a dict.
 
     :param object kek: The key encryption key. See calling functions for more information.
     :param bytes cek: The content encryption key.
-    :param bytes iv: The initialization vector.
+    :param bytes iv: The initialization vector. None for protocol 2.0.
+    :param str version: The encryption protocol version.
     :return: A dict containing all the encryption metadata.
     :rtype: dict
     '''
@@ -146,13 +212,22 @@ def _generate_encryption_data_dict(kek, cek, iv):
     wrapped_content_key['Algorithm'] = kek.get_key_wrap_algorithm()
 
     encryption_agent = OrderedDict()
-    encryption_agent['Protocol'] = _ENCRYPTION_PROTOCOL_V1
-    encryption_agent['EncryptionAlgorithm'] = _EncryptionAlgorithm.AES_CBC_256
+    encryption_agent['Protocol'] = version
+    if version == _ENCRYPTION_PROTOCOL_V2:
+        encryption_agent['EncryptionAlgorithm'] = _EncryptionAlgorithm.AES_GCM_256
+    else:
+        encryption_agent['EncryptionAlgorithm'] = _EncryptionAlgorithm.AES_CBC_256
 
     encryption_data_dict = OrderedDict()
     encryption_data_dict['WrappedContentKey'] = wrapped_content_key
     encryption_data_dict['EncryptionAgent'] = encryption_agent
-    encryption_data_dict['ContentEncryptionIV'] = encode_base64(iv)
+    if version == _ENCRYPTION_PROTOCOL_V2:
+        encrypted_region_info = OrderedDict()
+        encrypted_region_info['DataLength'] = _GCM_REGION_DATA_LENGTH
+        encrypted_region_info['NonceLength'] = _GCM_NONCE_LENGTH
+        encryption_data_dict['EncryptedRegionInfo'] = encrypted_region_info
+    else:
+        encryption_data_dict['ContentEncryptionIV'] = encode_base64(iv)
     encryption_data_dict['KeyWrappingMetadata'] = {'EncryptionLibrary': 'Python ' + VERSION}
 
     return encryption_data_dict
@@ -169,7 +244,8 @@ def _dict_to_encryption_data(encryption_data_dict):
     :rtype: _EncryptionData
     '''
     try:
-        if encryption_data_dict['EncryptionAgent']['Protocol'] != _ENCRYPTION_PROTOCOL_V1:
+        protocol = encryption_data_dict['EncryptionAgent']['Protocol']
+        if protocol not in (_ENCRYPTION_PROTOCOL_V1, _ENCRYPTION_PROTOCOL_V2):
             raise ValueError("Unsupported encryption version.")
     except KeyError:
         raise ValueError("Unsupported encryption version.")
@@ -187,10 +263,19 @@ def _dict_to_encryption_data(encryption_data_dict):
     else:
         key_wrapping_metadata = None
 
-    encryption_data = _EncryptionData(decode_base64_to_bytes(encryption_data_dict['ContentEncryptionIV']),
+    content_encryption_IV = None
+    encrypted_region_info = None
+    if protocol == _ENCRYPTION_PROTOCOL_V2:
+        region_info = encryption_data_dict['EncryptedRegionInfo']
+        encrypted_region_info = _EncryptedRegionInfo(region_info['DataLength'], region_info['NonceLength'])
+    else:
+        content_encryption_IV = decode_base64_to_bytes(encryption_data_dict['ContentEncryptionIV'])
+
+    encryption_data = _EncryptionData(content_encryption_IV,
                                       encryption_agent,
                                       wrapped_content_key,
-                                      key_wrapping_metadata)
+                                      key_wrapping_metadata,
+                                      encrypted_region_info)
 
     return encryption_data
 
@@ -211,6 +296,43 @@ def _generate_AES_CBC_cipher(cek, iv):
     return Cipher(algorithm, mode, backend)
 
 
+def _encrypt_regions(cek, data, region_info):
+    '''
+    Encrypts the data in regions, each with AES256 in GCM mode and its own random nonce.
+
+    :param bytes cek: The content encryption key.
+    :param bytes data: The plaintext, which must start at the beginning of a region.
+    :param _EncryptedRegionInfo region_info: The layout of the regions.
+    :return: The encrypted regions.
+    :rtype: bytes
+    '''
+    aesgcm = AESGCM(cek)
+    regions = []
+    for start in range(0, len(data), region_info.data_length):
+        nonce = urandom(region_info.nonce_length)
+        regions.append(nonce + aesgcm.encrypt(nonce, data[start:start + region_info.data_length], None))
+    return b''.join(regions)
+
+
+def _decrypt_regions(cek, content, region_info):
+    '''
+    Decrypts and authenticates encrypted regions.
+
+    :param bytes cek: The content encryption key.
+    :param bytes content: Whole encrypted regions, the last one possibly holding a shorter region of plaintext.
+    :param _EncryptedRegionInfo region_info: The layout of the regions.
+    :return: The plaintext of the regions.
+    :rtype: bytes
+    '''
+    aesgcm = AESGCM(cek)
+    regions = []
+    for start in range(0, len(content), region_info.region_length):
+        region = content[start:start + region_info.region_length]
+        nonce = region[:region_info.nonce_length]
+        regions.append(aesgcm.decrypt(nonce, region[region_info.nonce_length:], None))
+    return b''.join(regions)
+
+
 def _validate_and_unwrap_cek(encryption_data, key_encryption_key=None, key_resolver=None):
     '''
     Extracts and returns the content_encryption_key stored in the encryption_data object
@@ -227,11 +349,13 @@ def _validate_and_unwrap_cek(encryption_data, key_encryption_key=None, key_resol
     :rtype: bytes[]
     '''
 
-    _validate_not_none('content_encryption_IV', encryption_data.content_encryption_IV)
-    _validate_not_none('encrypted_key', encryption_data.wrapped_content_key.encrypted_key)
-
-    if _ENCRYPTION_PROTOCOL_V1 != encryption_data.encryption_agent.protocol:
+    if _ENCRYPTION_PROTOCOL_V2 == encryption_data.encryption_agent.protocol:
+        _validate_not_none('encrypted_region_info', encryption_data.encrypted_region_info)
+    elif _ENCRYPTION_PROTOCOL_V1 == encryption_data.encryption_agent.protocol:
+        _validate_not_none('content_encryption_IV', encryption_data.content_encryption_IV)
+    else:
         raise ValueError('Encryption version is not supported.')
+    _validate_not_none('encrypted_key', encryption_data.wrapped_content_key.encrypted_key)
 
     content_encryption_key = None
 
@@ -296,9 +420,10 @@ def _decrypt_message(message, encryption_data, key_encryption_key=None, resolver
     return decrypted_data
 
 
-def encrypt_blob(blob, key_encryption_key):
+def encrypt_blob(blob, key_encryption_key, version=_ENCRYPTION_PROTOCOL_V1):
     '''
-    Encrypts the given blob using AES256 in CBC mode with 128 bit padding.
+    Encrypts the given blob using AES256 in CBC mode with 128 bit padding, or with
+    protocol 2.0 in regions of AES256 in GCM mode.
     Wraps the generated content-encryption-key using the user-provided key-encryption-key (kek).
     Returns a json-formatted string containing the encryption metadata. This method should
     only be used when a blob is small enough for single shot upload. Encrypting larger blobs
@@ -311,6 +436,8 @@ def encrypt_blob(blob, key_encryption_key):
         wrap_key(key)--wraps the specified key using an algorithm of the user's choice.
         get_key_wrap_algorithm()--returns the algorithm used to wrap the specified symmetric key.
         get_kid()--returns a string key id for this key-encryption-key.
+    :param str version:
+        The encryption protocol version.
     :return: A tuple of json-formatted string containing the encryption metadata and the encrypted blob data.
     :rtype: (str, bytes)
     '''
@@ -318,9 +445,17 @@ def encrypt_blob(blob, key_encryption_key):
     _validate_not_none('blob', blob)
     _validate_not_none('key_encryption_key', key_encryption_key)
     _validate_key_encryption_key_wrap(key_encryption_key)
+    _validate_encryption_version(version)
 
     # AES256 uses 256 bit (32 byte) keys and always with 16 byte blocks
     content_encryption_key = urandom(32)
+    if version == _ENCRYPTION_PROTOCOL_V2:
+        encrypted_data = _encrypt_regions(content_encryption_key, blob, get_blob_region_info(version))
+        encryption_data = _generate_encryption_data_dict(key_encryption_key, content_encryption_key, None,
+                                                         version=version)
+        encryption_data['EncryptionMode'] = 'FullBlob'
+        return dumps(encryption_data), encrypted_data
+
     initialization_vector = urandom(16)
 
     cipher = _generate_AES_CBC_cipher(content_encryption_key, initialization_vector)
@@ -339,14 +474,16 @@ def encrypt_blob(blob, key_encryption_key):
     return dumps(encryption_data), encrypted_data
 
 
-def generate_blob_encryption_data(key_encryption_key):
+def generate_blob_encryption_data(key_encryption_key, version=_ENCRYPTION_PROTOCOL_V1):
     '''
     Generates the encryption_metadata for the blob.
 
     :param bytes key_encryption_key:
         The key-encryption-key used to wrap the cek associate with this blob.
+    :param str version:
+        The encryption protocol version.
     :return: A tuple containing the cek and iv for this blob as well as the
-        serialized encryption metadata for the blob.
+        serialized encryption metadata for the blob. The iv is None for protocol 2.0.
     :rtype: (bytes, bytes, str)
     '''
     encryption_data = None
@@ -354,11 +491,14 @@ def generate_blob_encryption_data(key_encryption_key):
     initialization_vector = None
     if key_encryption_key:
         _validate_key_encryption_key_wrap(key_encryption_key)
+        _validate_encryption_version(version)
         content_encryption_key = urandom(32)
-        initialization_vector = urandom(16)
+        if version != _ENCRYPTION_PROTOCOL_V2:
+            initialization_vector = urandom(16)
         encryption_data = _generate_encryption_data_dict(key_encryption_key,
                                                          content_encryption_key,
-                                                         initialization_vector)
+                                                         initialization_vector,
+                                                         version=version)
         encryption_data['EncryptionMode'] = 'FullBlob'
         encryption_data = dumps(encryption_data)
 
@@ -380,6 +520,12 @@ def decrypt_blob(require_encryption, key_encryption_key, key_resolver,
     :param key_resolver(kid):
         The user-provided key resolver. Uses the kid string to return a key-encryption-key
         implementing the interface defined above.
+    :param int start_offset:
+        The number of bytes to drop from the start of the decrypted content. With protocol 2.0,
+        the offset in the blob of the first byte to return.
+    :param int end_offset:
+        The number of bytes to drop from the end of the decrypted content. With protocol 2.0,
+        the offset in the blob of the last byte to return.
     :return: The decrypted blob content.
     :rtype: bytes
     '''
@@ -393,6 +539,10 @@ def decrypt_blob(require_encryption, key_encryption_key, key_resolver,
 
         return content
 
+    if encryption_data.encryption_agent.protocol == _ENCRYPTION_PROTOCOL_V2:
+        return _decrypt_blob_regions(encryption_data, key_encryption_key, key_resolver,
+                                     content, start_offset, end_offset, response_headers)
+
     if encryption_data.encryption_agent.encryption_algorithm != _EncryptionAlgorithm.AES_CBC_256:
         raise ValueError('Specified encryption algorithm is not supported.')
 
@@ -433,11 +583,70 @@ def decrypt_blob(require_encryption, key_encryption_key, key_resolver,
     decryptor = cipher.decryptor()
 
     content = decryptor.update(content) + decryptor.finalize()
+    # The end offset counts from the end of the aligned range, which the padding is part of
+    end = len(content) - end_offset
     if unpad:
         unpadder = PKCS7(128).unpadder()
         content = unpadder.update(content) + unpadder.finalize()
 
-    return content[start_offset: len(content) - end_offset]
+    return content[start_offset: end]
+
+
+def _decrypt_blob_regions(encryption_data, key_encryption_key, key_resolver,
+                          content, start, end, response_headers):
+    if encryption_data.encryption_agent.encryption_algorithm != _EncryptionAlgorithm.AES_GCM_256:
+        raise ValueError('Specified encryption algorithm is not supported.')
+    region_info = encryption_data.encrypted_region_info
+
+    content_start = 0
+    blob_size = len(content)
+    if 'content-range' in response_headers:
+        # Format: 'bytes x-y/size'
+        content_range = response_headers['content-range'].split(' ')[1]
+        content_start = int(content_range.split('-')[0])
+        blob_size = int(content_range.split('/')[1])
+    if content_start % region_info.region_length:
+        raise ValueError('The downloaded range does not start at an encrypted region.')
+
+    # Only the last region of the blob can be shorter, so a cut region past the range is dropped
+    length = len(content)
+    if content_start + length < blob_size:
+        length -= length % region_info.region_length
+
+    content_encryption_key = _validate_and_unwrap_cek(encryption_data, key_encryption_key, key_resolver)
+    content = _decrypt_regions(content_encryption_key, content[:length], region_info)
+
+    plaintext_start = content_start // region_info.region_length * region_info.data_length
+    if start < plaintext_start or end - plaintext_start >= len(content) and \
+            content_start + length < blob_size:
+        raise ValueError('The downloaded regions do not hold the requested range.')
+    return content[start - plaintext_start: end - plaintext_start + 1]
+
+
+def get_blob_region_info(version):
+    '''
+    Returns the layout of the regions the blobs are encrypted in with the given protocol
+    version, or None if the protocol doesn't encrypt in regions.
+
+    :rtype: _EncryptedRegionInfo
+    '''
+    if version == _ENCRYPTION_PROTOCOL_V2:
+        return _EncryptedRegionInfo(_GCM_REGION_DATA_LENGTH, _GCM_NONCE_LENGTH)
+    return None
+
+
+def get_encrypted_region_info(response_headers):
+    '''
+    Returns the layout of the encrypted regions of a blob encrypted with protocol 2.0,
+    from the headers of a response, or None if the blob isn't encrypted in regions.
+
+    :rtype: _EncryptedRegionInfo
+    '''
+    try:
+        encryption_data = _dict_to_encryption_data(loads(response_headers['x-ms-meta-encryptiondata']))
+    except (KeyError, TypeError, ValueError):
+        return None
+    return encryption_data.encrypted_region_info
 
 
 def get_blob_encryptor_and_padder(cek, iv, should_pad):
@@ -452,6 +661,34 @@ def get_blob_encryptor_and_padder(cek, iv, should_pad):
     return encryptor, padder
 
 
+class BlobRegionEncryptor(object):
+    '''
+    Encrypts chunks of a blob with protocol 2.0, independently of each other.
+
+    Chunks must start at the beginning of a region, so that each of them holds whole
+    regions but maybe the last one of the blob. They can then be encrypted on any
+    thread, in any order.
+
+    :param bytes cek: The content encryption key.
+    :param _EncryptedRegionInfo region_info: The layout of the regions.
+    '''
+
+    def __init__(self, cek, region_info):
+        self.cek = cek
+        self.region_info = region_info
+
+    def encrypt(self, data):
+        return _encrypt_regions(self.cek, data, self.region_info)
+
+
+def get_blob_region_encryptor(cek, version):
+    '''Returns the encryptor of the regions of a blob, or None if the protocol doesn't encrypt in regions.'''
+    region_info = get_blob_region_info(version)
+    if cek is None or region_info is None:
+        return None
+    return BlobRegionEncryptor(cek, region_info)
+
+
 def encrypt_queue_message(message, key_encryption_key):
     '''
     Encrypts the given plain text message using AES256 in CBC mode with 128 bit padding.
@@ -5,11 +5,14 @@
 # --------------------------------------------------------------------------
 # pylint: disable=no-self-use
 
+import os
+import json
+import stat
 from concurrent import futures
-from io import (BytesIO, IOBase, SEEK_CUR, SEEK_END, SEEK_SET, UnsupportedOperation)
+from io import (
+    BufferedRandom, BufferedReader, BytesIO, FileIO, IOBase, SEEK_CUR, SEEK_END, SEEK_SET, UnsupportedOperation)
 from threading import Lock
 from itertools import islice
-from math import ceil
 
 import six
 
@@ -18,24 +21,26 @@ from azure.core.tracing.context import tracing_context
 from . import encode_base64, url_quote
 from .request_handlers import get_length
 from .response_handlers import return_response_headers
-from .encryption import get_blob_encryptor_and_padder
+from .encryption import get_blob_encryptor_and_padder, get_blob_region_encryptor
+from .validation import MD5, get_transfer_checksum, new_hash
 
 
 _LARGE_BLOB_UPLOAD_MAX_READ_BUFFER_SIZE = 4 * 1024 * 1024
 _ERROR_VALUE_SHOULD_BE_SEEKABLE_STREAM = "{0} should be a seekable file-like/io.IOBase type stream object."
 
 
-def _parallel_uploads(executor, uploader, pending, running):
+def _parallel_uploads(executor, uploader, pending, running, tuner=None):
     range_ids = []
     while True:
         # Wait for some download to finish before adding a new one
         done, running = futures.wait(running, return_when=futures.FIRST_COMPLETED)
         range_ids.extend([chunk.result() for chunk in done])
-        try:
-            next_chunk = next(pending)
-        except StopIteration:
+        # A tuned upload keeps as many chunks in flight as the tuner chose
+        count = max(tuner.concurrency - len(running), 0) if tuner else 1
+        next_chunks = list(islice(pending, count))
+        if not next_chunks and (count or not running):
             break
-        else:
+        for next_chunk in next_chunks:
             running.add(executor.submit(tracing_context.with_current_context(uploader), next_chunk))
 
     # Wait for the remaining uploads to finish
@@ -53,6 +58,8 @@ def upload_data_chunks(
         stream=None,
         validate_content=None,
         encryption_options=None,
+        tuner=None,
+        checksum=None,
         **kwargs):
 
     if encryption_options:
@@ -62,6 +69,12 @@ def upload_data_chunks(
             uploader_class is not PageBlobChunkUploader)
         kwargs['encryptor'] = encryptor
         kwargs['padder'] = padder
+        if uploader_class is not PageBlobChunkUploader:
+            # Regions don't chain the chunks, which are then encrypted by the workers in parallel.
+            # Pages are encrypted with protocol 1.0, as they can't hold the tags of the regions.
+            kwargs['region_encryptor'] = get_blob_region_encryptor(
+                encryption_options.get('cek'),
+                encryption_options.get('version'))
 
     parallel = max_connections > 1
     if parallel and 'modified_access_conditions' in kwargs:
@@ -75,17 +88,21 @@ def upload_data_chunks(
         stream=stream,
         parallel=parallel,
         validate_content=validate_content,
+        tuner=tuner,
+        checksum=checksum or get_transfer_checksum(validate_content),
         **kwargs)
     if parallel:
         executor = futures.ThreadPoolExecutor(max_connections)
         upload_tasks = uploader.get_chunk_streams()
         running_futures = [
             executor.submit(tracing_context.with_current_context(uploader.process_chunk), u)
-            for u in islice(upload_tasks, 0, max_connections)
+            for u in islice(upload_tasks, 0, tuner.concurrency if tuner else max_connections)
         ]
-        range_ids = _parallel_uploads(executor, uploader.process_chunk, upload_tasks, running_futures)
+        range_ids = _parallel_uploads(executor, uploader.process_chunk, upload_tasks, running_futures, tuner)
     else:
         range_ids = [uploader.process_chunk(result) for result in uploader.get_chunk_streams()]
+    if tuner:
+        tuner.finish()
     if any(range_ids):
         return [r[1] for r in sorted(range_ids, key=lambda r: r[0])]
     return uploader.response_headers
@@ -98,6 +115,8 @@ def upload_substream_blocks(
         chunk_size=None,
         max_connections=None,
         stream=None,
+        journal=None,
+        tuner=None,
         **kwargs):
     parallel = max_connections > 1
     if parallel and 'modified_access_conditions' in kwargs:
@@ -109,6 +128,8 @@ def upload_substream_blocks(
         chunk_size=chunk_size,
         stream=stream,
         parallel=parallel,
+        journal=journal,
+        tuner=tuner,
         **kwargs)
 
     if parallel:
@@ -116,17 +137,118 @@ def upload_substream_blocks(
         upload_tasks = uploader.get_substream_blocks()
         running_futures = [
             executor.submit(tracing_context.with_current_context(uploader.process_substream_block), u)
-            for u in islice(upload_tasks, 0, max_connections)
+            for u in islice(upload_tasks, 0, tuner.concurrency if tuner else max_connections)
         ]
-        range_ids = _parallel_uploads(executor, uploader.process_substream_block, upload_tasks, running_futures)
+        range_ids = _parallel_uploads(
+            executor, uploader.process_substream_block, upload_tasks, running_futures, tuner)
     else:
         range_ids = [uploader.process_substream_block(b) for b in uploader.get_substream_blocks()]
+    if tuner:
+        tuner.finish()
+    if journal:
+        # The blocks staged before an interruption are committed along with the new ones
+        range_ids.extend(journal.staged)
     return sorted(range_ids)
 
 
+class UploadJournal(object):
+    """A local journal of the blocks staged by a block blob upload.
+
+    The first line describes the upload, each following line records a staged block
+    as "<block id> <offset> <length> <MD5 of the content>". Lines are appended with single
+    writes to a file opened in append mode, so the workers don't need a lock to record
+    their blocks.
+
+    :param str path: The path of the journal.
+    :param dict state: The upload the journal belongs to.
+    """
+
+    def __init__(self, path, state):
+        self.path = path
+        self.state = state
+        self.staged = set()
+        self._fd = None
+
+    def read(self):
+        """Returns the offset, length and digest of each staged block by id, or None if there is no
+        journal for this upload."""
+        try:
+            with open(self.path, "r") as journal:
+                lines = journal.read().splitlines()
+        except (IOError, OSError):
+            return None
+        try:
+            if not lines or json.loads(lines[0]) != self.state:
+                return None
+        except ValueError:
+            return None
+        blocks = {}
+        for line in lines[1:]:
+            fields = line.split()
+            # The last line may have been cut short by an interruption
+            if len(fields) == 4 and fields[1].isdigit() and fields[2].isdigit() and len(fields[3]) == 32:
+                blocks[fields[0]] = (int(fields[1]), int(fields[2]), fields[3])
+        return blocks
+
+    def open(self, staged=None):
+        """Opens the journal for writing, keeping the given staged blocks."""
+        flags = os.O_WRONLY | os.O_APPEND | os.O_CREAT
+        if staged is None:
+            flags |= os.O_TRUNC
+        self.staged = set(staged or ())
+        self._fd = os.open(self.path, flags, 0o644)
+        if staged is None:
+            self._write(json.dumps(self.state, sort_keys=True))
+
+    def _write(self, line):
+        os.write(self._fd, (line + "\n").encode("utf-8"))
+
+    def add(self, block_id, offset, length, digest):
+        self._write("{} {} {} {}".format(block_id, offset, length, digest))
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def remove(self):
+        self.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+def get_block_digest(stream, length):
+    """Returns the hex MD5 of the next length bytes of the stream, which a journal records for each block."""
+    digest = new_hash(MD5)
+    remaining = length
+    while remaining > 0:
+        data = stream.read(min(remaining, _LARGE_BLOB_UPLOAD_MAX_READ_BUFFER_SIZE))
+        if not data:
+            break
+        digest.update(data)
+        remaining -= len(data)
+    return digest.hexdigest()
+
+
+def reads_at_offset(stream):
+    """Whether the substreams of the stream read their range without moving its position."""
+    if _get_pread_fileno(stream) is not None:
+        return True
+    try:
+        stream.getbuffer().release()
+        return True
+    except (AttributeError, ValueError, UnsupportedOperation):
+        return False
+
+
 class _ChunkUploader(object):  # pylint: disable=too-many-instance-attributes
 
-    def __init__(self, service, total_size, chunk_size, stream, parallel, encryptor=None, padder=None, **kwargs):
+    def __init__(
+            self, service, total_size, chunk_size, stream, parallel,
+            encryptor=None, padder=None, region_encryptor=None, journal=None, tuner=None, checksum=None,
+            **kwargs):
         self.service = service
         self.total_size = total_size
         self.chunk_size = chunk_size
@@ -144,6 +266,16 @@ class _ChunkUploader(object):  # pylint: disable=too-many-instance-attributes
         # Encryption
         self.encryptor = encryptor
         self.padder = padder
+        self.region_encryptor = region_encryptor
+
+        # Record of the staged blocks, for resumable uploads
+        self.journal = journal
+
+        # Chunk size and concurrency tuning, if enabled
+        self.tuner = tuner
+
+        # Checksums of the chunks, if content is validated
+        self.checksum = checksum
         self.response_headers = None
         self.etag = None
         self.last_modified = None
@@ -153,12 +285,15 @@ class _ChunkUploader(object):  # pylint: disable=too-many-instance-attributes
         index = 0
         while True:
             data = b""
-            read_size = self.chunk_size
+            chunk_size = self.tuner.chunk_size if self.tuner else self.chunk_size
+            if self.region_encryptor:
+                chunk_size = self.region_encryptor.region_info.align(chunk_size)
+            read_size = chunk_size
 
             # Buffer until we either reach the end of the stream or get a whole chunk.
             while True:
                 if self.total_size:
-                    read_size = min(self.chunk_size - len(data), self.total_size - (index + len(data)))
+                    read_size = min(chunk_size - len(data), self.total_size - (index + len(data)))
                 temp = self.stream.read(read_size)
                 if not isinstance(temp, six.binary_type):
                     raise TypeError("Blob data should be of type bytes.")
@@ -166,10 +301,10 @@ class _ChunkUploader(object):  # pylint: disable=too-many-instance-attributes
 
                 # We have read an empty string and so are at the end
                 # of the buffer or we have read a full chunk.
-                if temp == b"" or len(data) == self.chunk_size:
+                if temp == b"" or len(data) == chunk_size:
                     break
 
-            if len(data) == self.chunk_size:
+            if len(data) == chunk_size:
                 if self.padder:
                     data = self.padder.update(data)
                 if self.encryptor:
@@ -197,11 +332,21 @@ class _ChunkUploader(object):  # pylint: disable=too-many-instance-attributes
         else:
             self.progress_total += length
 
-    def _upload_chunk(self, chunk_offset, chunk_data):
+    def _upload_chunk(self, chunk_offset, chunk_data, digest=None):
         raise NotImplementedError("Must be implemented by child class.")
 
+    def _get_checksum_options(self, digest):
+        return self.checksum.get_request_options(digest) if digest else {}
+
     def _upload_chunk_with_progress(self, chunk_offset, chunk_data):
-        range_id = self._upload_chunk(chunk_offset, chunk_data)
+        started = self.tuner.start() if self.tuner else None
+        if self.region_encryptor:
+            chunk_data = self.region_encryptor.encrypt(chunk_data)
+        # The chunk is checksummed once, from the bytes in hand, rather than by the pipeline on every request
+        digest = self.checksum.add(chunk_offset, chunk_data) if self.checksum else None
+        range_id = self._upload_chunk(chunk_offset, chunk_data, digest)
+        if self.tuner:
+            self.tuner.record(len(chunk_data), started)
         self._update_progress(len(chunk_data))
         return range_id
 
@@ -215,13 +360,37 @@ class _ChunkUploader(object):  # pylint: disable=too-many-instance-attributes
             if blob_length is None:
                 raise ValueError("Unable to determine content length of upload data.")
 
-        blocks = int(ceil(blob_length / (self.chunk_size * 1.0)))
-        last_block_size = self.chunk_size if blob_length % self.chunk_size == 0 else blob_length % self.chunk_size
+        # Substreams read one after the other through their buffer read on from where the stream is,
+        # so it is moved past the blocks staged before an interruption
+        seek_past_staged = lock is None and self.journal is not None and not reads_at_offset(self.stream)
 
-        for i in range(blocks):
-            index = i * self.chunk_size
-            length = last_block_size if i == blocks - 1 else self.chunk_size
-            yield ('BlockId{}'.format("%05d" % i), SubStream(self.stream, index, length, lock))
+        index = 0
+        block_count = 0
+        while index < blob_length:
+            # The size of a tuned block is only decided once the blocks before it are scheduled
+            chunk_size = self.tuner.chunk_size if self.tuner else self.chunk_size
+            length = min(chunk_size, blob_length - index)
+            block_id = 'BlockId{}'.format("%05d" % block_count)
+            if not self.journal or block_id not in self.journal.staged:
+                yield (block_id, SubStream(self.stream, index, length, lock))
+            elif seek_past_staged:
+                self.stream.seek(length, SEEK_CUR)
+            index += length
+            block_count += 1
+
+    def _digest_substream_block(self, block_stream):
+        offset, length = block_stream._stream_begin_index, len(block_stream)  # pylint: disable=protected-access
+        if self.stream_lock is not None:
+            digest = get_block_digest(block_stream, length)
+            block_stream.seek(0)
+            return digest, block_stream
+        # Substreams read one after the other read on from where the stream is,
+        # so the block is read again from a new substream
+        position = self.stream.tell()
+        digest = get_block_digest(block_stream, length)
+        block_stream.close()
+        self.stream.seek(position)
+        return digest, SubStream(self.stream, offset, length, None)
 
     def process_substream_block(self, block_data):
         return self._upload_substream_block_with_progress(block_data[0], block_data[1])
@@ -230,8 +399,18 @@ class _ChunkUploader(object):  # pylint: disable=too-many-instance-attributes
         raise NotImplementedError("Must be implemented by child class.")
 
     def _upload_substream_block_with_progress(self, block_id, block_stream):
+        offset, length = block_stream._stream_begin_index, len(block_stream)  # pylint: disable=protected-access
+        digest = None
+        if self.journal:
+            # A resumed upload only skips the blocks whose content is unchanged
+            digest, block_stream = self._digest_substream_block(block_stream)
+        started = self.tuner.start() if self.tuner else None
         range_id = self._upload_substream_block(block_id, block_stream)
-        self._update_progress(len(block_stream))
+        if self.tuner:
+            self.tuner.record(length, started)
+        if self.journal:
+            self.journal.add(block_id, offset, length, digest)
+        self._update_progress(length)
         return range_id
 
     def set_response_properties(self, resp):
@@ -246,7 +425,7 @@ class BlockBlobChunkUploader(_ChunkUploader):
         super(BlockBlobChunkUploader, self).__init__(*args, **kwargs)
         self.current_length = None
 
-    def _upload_chunk(self, chunk_offset, chunk_data):
+    def _upload_chunk(self, chunk_offset, chunk_data, digest=None):
         # TODO: This is incorrect, but works with recording.
         index = '{0:032d}'.format(chunk_offset)
         block_id = encode_base64(url_quote(encode_base64(index)))
@@ -256,7 +435,7 @@ class BlockBlobChunkUploader(_ChunkUploader):
             chunk_data,
             data_stream_total=self.total_size,
             upload_stream_current=self.progress_total,
-            **self.request_options
+            **dict(self.request_options, **self._get_checksum_options(digest))
         )
         return index, block_id
 
@@ -285,21 +464,19 @@ class PageBlobChunkUploader(_ChunkUploader):  # pylint: disable=abstract-method
                 return False
         return True
 
-    def _upload_chunk(self, chunk_offset, chunk_data):
+    def _upload_chunk(self, chunk_offset, chunk_data, digest=None):
         # avoid uploading the empty pages
         if not self._is_chunk_empty(chunk_data):
             chunk_end = chunk_offset + len(chunk_data) - 1
             content_range = "bytes={0}-{1}".format(chunk_offset, chunk_end)
-            computed_md5 = None
             self.response_headers = self.service.upload_pages(
                 chunk_data,
                 content_length=len(chunk_data),
-                transactional_content_md5=computed_md5,
                 range=content_range,
                 cls=return_response_headers,
                 data_stream_total=self.total_size,
                 upload_stream_current=self.progress_total,
-                **self.request_options
+                **dict(self.request_options, **self._get_checksum_options(digest))
             )
 
             if not self.parallel and self.request_options.get('modified_access_conditions'):
@@ -312,7 +489,7 @@ class AppendBlobChunkUploader(_ChunkUploader):  # pylint: disable=abstract-metho
         super(AppendBlobChunkUploader, self).__init__(*args, **kwargs)
         self.current_length = None
 
-    def _upload_chunk(self, chunk_offset, chunk_data):
+    def _upload_chunk(self, chunk_offset, chunk_data, digest=None):
         if self.current_length is None:
             self.response_headers = self.service.append_block(
                 chunk_data,
@@ -320,7 +497,7 @@ class AppendBlobChunkUploader(_ChunkUploader):  # pylint: disable=abstract-metho
                 cls=return_response_headers,
                 data_stream_total=self.total_size,
                 upload_stream_current=self.progress_total,
-                **self.request_options
+                **dict(self.request_options, **self._get_checksum_options(digest))
             )
             self.current_length = int(self.response_headers["blob_append_offset"])
         else:
@@ -332,13 +509,19 @@ class AppendBlobChunkUploader(_ChunkUploader):  # pylint: disable=abstract-metho
                 cls=return_response_headers,
                 data_stream_total=self.total_size,
                 upload_stream_current=self.progress_total,
-                **self.request_options
+                **dict(self.request_options, **self._get_checksum_options(digest))
             )
 
 
 class FileChunkUploader(_ChunkUploader):  # pylint: disable=abstract-method
 
-    def _upload_chunk(self, chunk_offset, chunk_data):
+    def _get_checksum_options(self, digest):
+        # The ranges of a file only carry an MD5
+        if digest and self.checksum.mode == MD5:
+            return {'content_md5': bytearray(digest)}
+        return {}
+
+    def _upload_chunk(self, chunk_offset, chunk_data, digest=None):
         chunk_end = chunk_offset + len(chunk_data) - 1
         response = self.service.upload_range(
             chunk_data,
@@ -346,11 +529,45 @@ class FileChunkUploader(_ChunkUploader):  # pylint: disable=abstract-method
             chunk_end,
             data_stream_total=self.total_size,
             upload_stream_current=self.progress_total,
-            **self.request_options
+            **dict(self.request_options, **self._get_checksum_options(digest))
         )
         return 'bytes={0}-{1}'.format(chunk_offset, chunk_end), response
 
 
+def _get_pread_fileno(stream):
+    # The descriptor of a regular file that can be read at any offset, or None.
+    # Only plain file objects are read through their descriptor: wrappers such as
+    # GzipFile expose the descriptor of the file they transform the content of.
+    if not hasattr(os, 'pread'):
+        return None
+    raw = getattr(stream, 'raw', None) if type(stream) in (BufferedReader, BufferedRandom) else stream
+    if type(raw) is not FileIO:  # pylint: disable=unidiomatic-typecheck
+        return None
+    try:
+        fileno = stream.fileno()
+        if stat.S_ISREG(os.fstat(fileno).st_mode):
+            return fileno
+    except (AttributeError, OSError, ValueError, UnsupportedOperation):
+        pass
+    return None
+
+
+def _pread(fileno, n, offset):
+    # A positional read may return less than asked for, without being at the end of the file
+    data = os.pread(fileno, n, offset)
+    if len(data) == n or not data:
+        return data
+    chunks = [data]
+    read = len(data)
+    while read < n:
+        data = os.pread(fileno, n - read, offset + read)
+        if not data:
+            break
+        chunks.append(data)
+        read += len(data)
+    return b"".join(chunks)
+
+
 class SubStream(IOBase):
 
     def __init__(self, wrapped_stream, stream_begin_index, length, lockObj):
@@ -377,6 +594,23 @@ class SubStream(IOBase):
         )
         self._current_buffer_start = 0
         self._current_buffer_size = 0
+
+        # Substreams of a regular file read their range with positional reads, and substreams of an
+        # in-memory stream hand out slices of its buffer. Neither moves the position of the wrapped
+        # stream, so they need neither the lock nor the read buffer. Other streams are read through
+        # the buffer, seeking the wrapped stream under the lock shared by the substreams.
+        # As the wrapped stream stays where the data starts, its position is added to the offsets.
+        self._fileno = _get_pread_fileno(wrapped_stream)
+        self._view = None
+        self._pread_offset = None
+        if self._fileno is not None:
+            self._pread_offset = wrapped_stream.tell() + stream_begin_index
+        elif hasattr(wrapped_stream, 'getbuffer'):
+            try:
+                begin = wrapped_stream.tell() + stream_begin_index
+                self._view = wrapped_stream.getbuffer()[begin:begin + length]
+            except (ValueError, UnsupportedOperation):
+                pass
         super(SubStream, self).__init__()
 
     def __len__(self):
@@ -385,6 +619,10 @@ class SubStream(IOBase):
     def close(self):
         if self._buffer:
             self._buffer.close()
+        if self._view is not None:
+            self._view.release()
+            self._view = None
+        self._fileno = None
         self._wrapped_stream = None
         IOBase.close(self)
 
@@ -403,9 +641,18 @@ class SubStream(IOBase):
             n = self._length - self._position
 
         # return fast
-        if n == 0 or self._buffer.closed:
+        if n <= 0 or self._buffer.closed:
             return b""
 
+        if self._view is not None:
+            data = self._view[self._position:self._position + n]
+            self._position += len(data)
+            return data
+        if self._fileno is not None:
+            data = _pread(self._fileno, n, self._pread_offset + self._position)
+            self._position += len(data)
+            return data
+
         # attempt first read from the read buffer and update position
         read_buffer = self._buffer.read(n)
         bytes_read = len(read_buffer)
@@ -451,7 +698,11 @@ class SubStream(IOBase):
         return True
 
     def readinto(self, b):
-        raise UnsupportedOperation
+        if self._view is None and self._fileno is None:
+            raise UnsupportedOperation
+        data = self.read(len(b))
+        b[:len(data)] = data
+        return len(data)
 
     def seek(self, offset, whence=0):
         if whence is SEEK_SET:
@@ -34,6 +34,8 @@ from ..models import (
     AccessPolicy,
     ContainerPermissions,
     BlobPermissions,
+    BulkTransferResult,
+    BlobBatchResult,
 )
 from .models import (
     ContainerPropertiesPaged,
@@ -80,6 +82,8 @@ __all__ = [
     'AccessPolicy',
     'ContainerPermissions',
     'BlobPermissions',
+    'BulkTransferResult',
+    'BlobBatchResult',
     'ResourceTypes',
     'AccountPermissions',
     'StorageStreamDownloader',
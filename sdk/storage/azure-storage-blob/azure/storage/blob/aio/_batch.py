@@ -0,0 +1,57 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import asyncio
+
+from .._shared.constants import STORAGE_OAUTH_SCOPE
+from .._shared.response_handlers import process_storage_error
+from .._generated.aio import AzureBlobStorage
+from .._generated.models import StorageErrorException
+from .._batch import get_account_url, return_response_and_deserialized
+
+
+async def run_batches(client, operation, timeout=None, max_connections=1, **kwargs):
+    """Sends the batches of an operation, `max_connections` at a time, and returns the
+    result of every blob in order.
+
+    :param client: The ContainerClient or BlobServiceClient running the batch.
+    :param operation: The BatchOperation to run.
+    :param int max_connections: The number of batch requests to send in parallel.
+    """
+    service = AzureBlobStorage(get_account_url(client), pipeline=client._pipeline).service  # pylint: disable=protected-access
+    token = None
+    if hasattr(operation.credential, 'get_token'):
+        token = (await operation.credential.get_token(STORAGE_OAUTH_SCOPE)).token
+    semaphore = asyncio.Semaphore(max(max_connections, 1))
+
+    async def send_batch(blobs):
+        async with semaphore:
+            body, content_type = operation.prepare(blobs, token=token)
+            try:
+                response, stream = await service.submit_batch(
+                    body,
+                    len(body),
+                    content_type,
+                    timeout=timeout,
+                    cls=return_response_and_deserialized,
+                    **kwargs)
+            except StorageErrorException as error:
+                process_storage_error(error)
+            chunks = []
+            async for chunk in stream:
+                chunks.append(chunk)
+            content = b''.join(chunks)
+        return operation.get_results(blobs, content, response.headers['Content-Type'])
+
+    running = [asyncio.ensure_future(send_batch(blobs)) for blobs in operation.batches()]
+    try:
+        batch_results = await asyncio.gather(*running)
+    except Exception:
+        for task in running:
+            task.cancel()
+        await asyncio.gather(*running, return_exceptions=True)
+        raise
+    return [result for results in batch_results for result in results]
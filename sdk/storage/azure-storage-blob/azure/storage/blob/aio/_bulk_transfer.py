@@ -0,0 +1,140 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import os
+import asyncio
+
+from azure.core.async_paging import AsyncList
+
+from .._bulk_transfer import (
+    BulkTransfer,
+    normalize_prefix,
+    walk_local_files,
+    local_path_for_blob,
+    compute_md5,
+    is_unchanged)
+from ..models import ContentSettings
+
+
+class _TaskArguments(object):
+    """Iterates over the items of an async iterator as the argument tuples of a task."""
+
+    def __init__(self, items):
+        self._items = items
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        return (await self._items.__anext__(),)
+
+
+async def _run_bounded(task, items, limit):
+    """Runs the task on every item of an async iterable, without scheduling more than `limit` items at once."""
+    running = set()
+    async for item in items:
+        if len(running) >= limit:
+            _done, running = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+        running.add(asyncio.ensure_future(task(*item)))
+    if running:
+        await asyncio.wait(running)
+
+
+async def upload_directory(
+        container,
+        source,
+        name_prefix=None,
+        sync=False,
+        compare_md5=False,
+        overwrite=False,
+        max_concurrency=16,
+        max_connections=4,
+        **kwargs):
+    if not os.path.isdir(source):
+        raise ValueError("The source '{}' is not a directory.".format(source))
+    loop = asyncio.get_event_loop()
+    prefix = normalize_prefix(name_prefix)
+    transfer = BulkTransfer(max_concurrency, max_connections, container._config.max_single_put_size)  # pylint: disable=protected-access
+    large_slots = asyncio.BoundedSemaphore(transfer.large_slots)
+    existing = {}
+    if sync:
+        async for blob in container.list_blobs(name_starts_with=prefix or None):
+            existing[blob.name] = blob
+
+    async def upload_file(path, relative):
+        name = prefix + relative
+        try:
+            stat = os.stat(path)
+            md5 = await loop.run_in_executor(None, compute_md5, path) if compare_md5 else None
+            if sync and is_unchanged(existing.get(name), stat.st_size, lambda t: stat.st_mtime > t, md5):
+                transfer.add_skipped()
+                return
+            connections = transfer.connections_for(stat.st_size)
+            if connections > 1:
+                await large_slots.acquire()
+            try:
+                with open(path, 'rb') as data:
+                    await container.get_blob_client(name).upload_blob(
+                        data,
+                        length=stat.st_size,
+                        overwrite=overwrite or sync,
+                        content_settings=ContentSettings(content_md5=md5) if md5 else None,
+                        max_connections=connections,
+                        **kwargs)
+            finally:
+                if connections > 1:
+                    large_slots.release()
+            transfer.add_transferred(stat.st_size)
+        except Exception as error:  # pylint: disable=broad-except
+            transfer.add_failure(path, error)
+
+    await _run_bounded(upload_file, AsyncList(walk_local_files(source)), transfer.max_concurrency)
+    return transfer.finish()
+
+
+async def download_directory(
+        container,
+        destination,
+        name_starts_with=None,
+        sync=False,
+        compare_md5=False,
+        max_concurrency=16,
+        max_connections=4,
+        **kwargs):
+    loop = asyncio.get_event_loop()
+    prefix = name_starts_with or ''
+    transfer = BulkTransfer(max_concurrency, max_connections, container._config.max_single_get_size)  # pylint: disable=protected-access
+    large_slots = asyncio.BoundedSemaphore(transfer.large_slots)
+
+    async def download_blob(blob):
+        try:
+            path = local_path_for_blob(destination, prefix, blob.name)
+            if path is None:
+                return
+            if sync and os.path.isfile(path):
+                stat = os.stat(path)
+                md5 = await loop.run_in_executor(None, compute_md5, path) if compare_md5 else None
+                if is_unchanged(blob, stat.st_size, lambda t: t > stat.st_mtime, md5):
+                    transfer.add_skipped()
+                    return
+            if not os.path.isdir(os.path.dirname(path)):
+                os.makedirs(os.path.dirname(path))
+            connections = transfer.connections_for(blob.size)
+            if connections > 1:
+                await large_slots.acquire()
+            try:
+                await container.get_blob_client(blob.name).download_to_file(
+                    path, max_connections=connections, **kwargs)
+            finally:
+                if connections > 1:
+                    large_slots.release()
+            transfer.add_transferred(blob.size)
+        except Exception as error:  # pylint: disable=broad-except
+            transfer.add_failure(blob.name, error)
+
+    blobs = container.list_blobs(name_starts_with=name_starts_with)
+    await _run_bounded(download_blob, _TaskArguments(blobs), transfer.max_concurrency)
+    return transfer.finish()
@@ -0,0 +1,79 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import asyncio
+
+from azure.core.exceptions import HttpResponseError
+
+from .._copy_helpers import (
+    _MAX_POLL_INTERVAL,
+    _SOURCE_NOT_READABLE,
+    CopyPoller,
+    get_source_client,
+    get_copy_blocks,
+    get_stage_options,
+    get_copy_result,
+    check_copy_status)
+from ..models import BlobBlock
+
+
+async def get_source_properties(client, source_url, **kwargs):
+    """Returns the properties of the source, or None if it can't be read from its URL."""
+    try:
+        return await get_source_client(client, source_url).get_blob_properties(timeout=kwargs.get('timeout'))
+    except HttpResponseError as error:
+        if error.status_code in _SOURCE_NOT_READABLE:
+            return None
+        raise
+
+
+async def copy_staged(
+        client, source_url, source_properties,
+        metadata=None, content_settings=None, block_size=None, max_connections=1, timeout=None):
+    blocks = get_copy_blocks(source_properties.size, block_size)
+    stage_options = get_stage_options(source_properties, timeout=timeout)
+    semaphore = asyncio.Semaphore(max(max_connections, 1))
+
+    async def stage(block):
+        block_id, offset, length = block
+        async with semaphore:
+            # The range is sent as bytes=<source_offset>-<source_length>, an inclusive end
+            await client.stage_block_from_url(
+                block_id, source_url, source_offset=offset, source_length=offset + length - 1, **stage_options)
+
+    running = [asyncio.ensure_future(stage(block)) for block in blocks]
+    try:
+        await asyncio.gather(*running)
+    except Exception:
+        for task in running:
+            task.cancel()
+        await asyncio.gather(*running, return_exceptions=True)
+        raise
+    # A service copy carries the properties of the source over to the destination
+    return await client.commit_block_list(
+        [BlobBlock(block_id=block[0]) for block in blocks],
+        metadata=metadata if metadata is not None else source_properties.metadata,
+        content_settings=content_settings or source_properties.content_settings,
+        timeout=timeout)
+
+
+async def copy_from_url(
+        client, source_url, metadata=None, content_settings=None, max_poll_interval=_MAX_POLL_INTERVAL, timeout=None):
+    copy = await client.start_copy_from_url(source_url, metadata=metadata, timeout=timeout)
+    poller = CopyPoller(max_poll_interval)
+    result = dict((key, copy.get(key)) for key in ('etag', 'last_modified', 'copy_id', 'copy_status'))
+    progress = None
+    while result['copy_status'] == 'pending':
+        await asyncio.sleep(poller.next_interval(progress))
+        properties = await client.get_blob_properties(timeout=timeout)
+        if properties.copy.id != copy['copy_id']:
+            raise HttpResponseError(message="The copy {} was replaced by another copy.".format(copy['copy_id']))
+        check_copy_status(properties)
+        progress = properties.copy.progress
+        result = get_copy_result(properties)
+    if content_settings:
+        result.update(await client.set_http_headers(content_settings, timeout=timeout))
+    return result
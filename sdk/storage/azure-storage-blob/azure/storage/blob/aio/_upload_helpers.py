@@ -5,6 +5,7 @@
 # --------------------------------------------------------------------------
 # pylint: disable=no-self-use
 
+import os
 from io import SEEK_SET, UnsupportedOperation
 from typing import Optional, Union, Any, TypeVar, TYPE_CHECKING # pylint: disable=unused-import
 
@@ -19,21 +20,38 @@ from .._shared.uploads_async import (
     upload_substream_blocks,
     BlockBlobChunkUploader,
     PageBlobChunkUploader,
-    AppendBlobChunkUploader)
-from .._shared.encryption import generate_blob_encryption_data, encrypt_blob
+    AppendBlobChunkUploader,
+    UploadJournal)
+from .._shared import encode_base64
+from .._shared.tuning import get_tuner
+from .._shared.validation import get_transfer_checksum, get_checksum_header
+from .._shared.encryption import generate_blob_encryption_data, encrypt_blob, get_blob_region_info
 from .._generated.models import (
     StorageErrorException,
     BlockLookupList,
     AppendPositionAccessConditions,
     ModifiedAccessConditions,
 )
-from .._upload_helpers import _convert_mod_error, _any_conditions
+from .._upload_helpers import (
+    _convert_mod_error, _any_conditions, _journal_state, _get_staged_blocks, _MAX_BLOCKS)
 
 if TYPE_CHECKING:
     from datetime import datetime # pylint: disable=unused-import
     LeaseClient = TypeVar("LeaseClient")
 
 
+async def _get_uncommitted_blocks(client, **kwargs):
+    try:
+        return await client.get_block_list(
+            list_type='uncommitted',
+            lease_access_conditions=kwargs.get('lease_access_conditions'))
+    except StorageErrorException as error:
+        # Nothing was staged yet
+        if error.response.status_code == 404:
+            return None
+        raise
+
+
 async def upload_block_blob(  # pylint: disable=too-many-locals
         client=None,
         data=None,
@@ -50,9 +68,17 @@ async def upload_block_blob(  # pylint: disable=too-many-locals
         if not overwrite and not _any_conditions(**kwargs):
             kwargs['modified_access_conditions'].if_none_match = '*'
         adjusted_count = length
+        region_info = get_blob_region_info(encryption_options.get('version'))
         if (encryption_options.get('key') is not None) and (adjusted_count is not None):
-            adjusted_count += (16 - (length % 16))
+            if region_info:
+                adjusted_count = region_info.get_encrypted_length(length)
+            else:
+                adjusted_count += (16 - (length % 16))
         blob_headers = kwargs.pop('blob_headers', None)
+        journal_path = kwargs.pop('journal_path', None)
+        journal = None
+        autotune = kwargs.pop('autotune', False)
+        checksum = get_transfer_checksum(validate_content)
 
         # Do single put if the size is smaller than config.max_single_put_size
         if adjusted_count is not None and (adjusted_count < blob_settings.max_single_put_size):
@@ -63,9 +89,12 @@ async def upload_block_blob(  # pylint: disable=too-many-locals
             except AttributeError:
                 pass
             if encryption_options.get('key'):
-                encryption_data, data = encrypt_blob(data, encryption_options['key'])
+                encryption_data, data = encrypt_blob(
+                    data, encryption_options['key'], version=encryption_options.get('version'))
                 headers['x-ms-meta-encryptiondata'] = encryption_data
-            return await client.upload(
+            if checksum and isinstance(data, six.binary_type):
+                headers[get_checksum_header(checksum.mode)] = encode_base64(checksum.add(0, data))
+            response = await client.upload(
                 data,
                 content_length=adjusted_count,
                 blob_http_headers=blob_headers,
@@ -75,16 +104,33 @@ async def upload_block_blob(  # pylint: disable=too-many-locals
                 data_stream_total=adjusted_count,
                 upload_stream_current=0,
                 **kwargs)
+            if checksum:
+                response['composite_checksum'] = checksum.value
+            return response
 
         use_original_upload_path = blob_settings.use_byte_buffer or \
-            validate_content or encryption_options.get('required') or \
+            validate_content or encryption_options.get('required') or encryption_options.get('key') or \
             blob_settings.max_block_size < blob_settings.min_large_block_upload_threshold or \
             hasattr(stream, 'seekable') and not stream.seekable() or \
             not hasattr(stream, 'seek') or not hasattr(stream, 'tell')
 
+        if journal_path and use_original_upload_path:
+            raise ValueError("Resumable uploads need a seekable stream and a max_block_size of at least "
+                             "min_large_block_upload_threshold, and can't be used with validate_content, "
+                             "encryption or byte buffering.")
+
+        tuner = get_tuner(
+            autotune,
+            blob_settings.max_block_size,
+            max_connections,
+            min_chunk_size=-(-length // _MAX_BLOCKS) if length else None,
+            # The journal of a resumable upload records blocks of a fixed size
+            fixed_chunk_size=bool(journal_path))
+
         if use_original_upload_path:
             if encryption_options.get('key'):
-                cek, iv, encryption_data = generate_blob_encryption_data(encryption_options['key'])
+                cek, iv, encryption_data = generate_blob_encryption_data(
+                    encryption_options['key'], version=encryption_options.get('version'))
                 headers['x-ms-meta-encryptiondata'] = encryption_data
                 encryption_options['cek'] = cek
                 encryption_options['vector'] = iv
@@ -97,29 +143,48 @@ async def upload_block_blob(  # pylint: disable=too-many-locals
                 stream=stream,
                 validate_content=validate_content,
                 encryption_options=encryption_options,
+                tuner=tuner,
+                checksum=checksum,
                 **kwargs
             )
         else:
-            block_ids = await upload_substream_blocks(
-                service=client,
-                uploader_class=BlockBlobChunkUploader,
-                total_size=length,
-                chunk_size=blob_settings.max_block_size,
-                max_connections=max_connections,
-                stream=stream,
-                validate_content=validate_content,
-                **kwargs
-            )
+            if journal_path:
+                journal = UploadJournal(journal_path, _journal_state(stream, length, blob_settings))
+                staged = None
+                if os.path.isfile(journal_path):
+                    staged = _get_staged_blocks(journal, await _get_uncommitted_blocks(client, **kwargs), stream)
+                journal.open(staged)
+            try:
+                block_ids = await upload_substream_blocks(
+                    service=client,
+                    uploader_class=BlockBlobChunkUploader,
+                    total_size=length,
+                    chunk_size=blob_settings.max_block_size,
+                    max_connections=max_connections,
+                    stream=stream,
+                    validate_content=validate_content,
+                    journal=journal,
+                    tuner=tuner,
+                    **kwargs
+                )
+            finally:
+                if journal:
+                    journal.close()
 
         block_lookup = BlockLookupList(committed=[], uncommitted=[], latest=[])
         block_lookup.latest = block_ids
-        return await client.commit_block_list(
+        response = await client.commit_block_list(
             block_lookup,
             blob_http_headers=blob_headers,
             cls=return_response_headers,
             validate_content=validate_content,
             headers=headers,
             **kwargs)
+        if journal:
+            journal.remove()
+        if checksum:
+            response['composite_checksum'] = checksum.value
+        return response
     except StorageErrorException as error:
         try:
             process_storage_error(error)
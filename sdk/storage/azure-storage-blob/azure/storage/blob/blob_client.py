@@ -46,6 +46,7 @@ from ._upload_helpers import (
     upload_block_blob,
     upload_append_blob,
     upload_page_blob)
+from ._copy_helpers import can_stage_from, get_source_properties, copy_staged, copy_from_url
 from .models import BlobType, BlobBlock
 from .lease import LeaseClient, get_access_conditions
 from ._shared_access_signature import BlobSharedAccessSignature
@@ -366,6 +367,7 @@ class BlobClient(StorageAccountHostsMixin):  # pylint: disable=too-many-public-m
             'required': self.require_encryption,
             'key': self.key_encryption_key,
             'resolver': self.key_resolver_function,
+            'version': self.encryption_version,
         }
         if self.key_encryption_key is not None:
             cek, iv, encryption_data = generate_blob_encryption_data(self.key_encryption_key)
@@ -427,6 +429,10 @@ class BlobClient(StorageAccountHostsMixin):  # pylint: disable=too-many-public-m
         if blob_type == BlobType.BlockBlob:
             kwargs['client'] = self._client.block_blob
             kwargs['data'] = data
+        elif kwargs.get('journal_path'):
+            raise ValueError("Resumable uploads are only supported for block blobs.")
+        elif kwargs.get('autotune'):
+            raise ValueError("Upload tuning is only supported for block blobs.")
         elif blob_type == BlobType.PageBlob:
             kwargs['client'] = self._client.page_blob
         elif blob_type == BlobType.AppendBlob:
@@ -445,7 +451,7 @@ class BlobClient(StorageAccountHostsMixin):  # pylint: disable=too-many-public-m
             length=None,  # type: Optional[int]
             metadata=None,  # type: Optional[Dict[str, str]]
             content_settings=None,  # type: Optional[ContentSettings]
-            validate_content=False,  # type: Optional[bool]
+            validate_content=False,  # type: Optional[Union[bool, str]]
             max_connections=1,  # type: int
             **kwargs
         ):
@@ -469,8 +475,9 @@ class BlobClient(StorageAccountHostsMixin):  # pylint: disable=too-many-public-m
         :type metadata: dict(str, str)
         :param ~azure.storage.blob.models.ContentSettings content_settings:
             ContentSettings object used to set blob properties.
-        :param bool validate_content:
-            If true, calculates an MD5 hash for each chunk of the blob. The storage
+        :param validate_content:
+            If true or 'md5', calculates an MD5 hash for each chunk of the blob, or
+            a CRC64 with 'crc64'. The storage
             service checks the hash of the content that has arrived with the hash
             that was sent. This is primarily valuable for detecting bitflips on
             the wire if using http instead of https as https (the default) will
@@ -478,6 +485,13 @@ class BlobClient(StorageAccountHostsMixin):  # pylint: disable=too-many-public-m
             blob. Also note that if enabled, the memory-efficient upload algorithm
             will not be used, because computing the MD5 hash requires buffering
             entire blocks, and doing so defeats the purpose of the memory-efficient algorithm.
+            The hash of each chunk is computed once, from the chunk being sent. For a
+            block blob, the returned dict holds the hash composed from the hashes of
+            the chunks under 'composite_checksum': with CRC64 it is the CRC64 of the
+            whole blob, with MD5 the MD5 of the chunk MD5s laid end to end.
+            CRC64 is slow to compute in pure Python: install the 'crc64' extra,
+            `pip install azure-storage-blob[crc64]`, to compute it with crcmod.
+        :type validate_content: bool or str
         :param ~azure.storage.blob.lease.LeaseClient lease:
             If specified, upload_blob only succeeds if the
             blob's lease is active and matches this ID.
@@ -516,6 +530,18 @@ class BlobClient(StorageAccountHostsMixin):  # pylint: disable=too-many-public-m
         :param int max_connections:
             Maximum number of parallel connections to use when the blob size exceeds
             64MB.
+        :param str journal_path:
+            Path of a local journal recording the blocks staged by a block blob upload from
+            a seekable stream. If the journal of an interrupted upload of the same data exists,
+            the blocks it records that are still uncommitted on the service, and whose content
+            in the stream is unchanged, are not uploaded again. The journal is removed once the
+            block list is committed.
+        :param autotune:
+            Whether to tune the block size and the number of connections of a block blob upload
+            while it runs, within the configured `max_block_size` and `max_connections`.
+            A TransferTuner can be passed to configure the tuning, or to reuse the parameters
+            chosen for a previous transfer.
+        :type autotune: bool or ~azure.storage.blob.TransferTuner
         :param ~azure.storage.blob.models.CustomerProvidedEncryptionKey cpk:
             Encrypts the data on the service-side with the given key.
             Use of customer-provided keys must be done over HTTPS.
@@ -585,7 +611,8 @@ class BlobClient(StorageAccountHostsMixin):  # pylint: disable=too-many-public-m
             'encryption_options': {
                 'required': self.require_encryption,
                 'key': self.key_encryption_key,
-                'resolver': self.key_resolver_function},
+                'resolver': self.key_resolver_function,
+                'version': self.encryption_version},
             'lease_access_conditions': access_conditions,
             'modified_access_conditions': mod_conditions,
             'cpk_info': cpk_info,
@@ -596,7 +623,7 @@ class BlobClient(StorageAccountHostsMixin):  # pylint: disable=too-many-public-m
 
     @distributed_trace
     def download_blob(self, offset=None, length=None, validate_content=False, **kwargs):
-        # type: (Optional[int], Optional[int], bool, **Any) -> Iterable[bytes]
+        # type: (Optional[int], Optional[int], Union[bool, str], **Any) -> Iterable[bytes]
         """Downloads a blob to a stream with automatic chunking.
 
         :param int offset:
@@ -605,15 +632,18 @@ class BlobClient(StorageAccountHostsMixin):  # pylint: disable=too-many-public-m
         :param int length:
             Number of bytes to read from the stream. This is optional, but
             should be supplied for optimal performance.
-        :param bool validate_content:
-            If true, calculates an MD5 hash for each chunk of the blob. The storage
-            service checks the hash of the content that has arrived with the hash
-            that was sent. This is primarily valuable for detecting bitflips on
-            the wire if using http instead of https as https (the default) will
-            already validate. Note that this MD5 hash is not stored with the
-            blob. Also note that if enabled, the memory-efficient upload algorithm
-            will not be used, because computing the MD5 hash requires buffering
-            entire blocks, and doing so defeats the purpose of the memory-efficient algorithm.
+        :param validate_content:
+            If true or 'md5', checks each chunk of the blob against the MD5 hash the
+            service returns for it, or against its CRC64 with 'crc64'. The hash is
+            computed as the chunk is received. This is primarily valuable for detecting
+            bitflips on the wire if using http instead of https as https (the default)
+            will already validate. Chunks are limited to 4MB when content is validated.
+            Once the blob is downloaded, the `composite_checksum` of the properties of
+            the downloader is the hash composed from the hashes of the chunks: with
+            CRC64 it is the CRC64 of the whole blob.
+            CRC64 is slow to compute in pure Python: install the 'crc64' extra,
+            `pip install azure-storage-blob[crc64]`, to compute it with crcmod.
+        :type validate_content: bool or str
         :param lease:
             If specified, download_blob only succeeds if the blob's lease is active
             and matches this ID. Required if the blob has an active lease.
@@ -670,6 +700,51 @@ class BlobClient(StorageAccountHostsMixin):  # pylint: disable=too-many-public-m
         }
         return StorageStreamDownloader(extra_properties=extra_properties, **options)
 
+    @distributed_trace
+    def download_to_file(
+            self, file_path,  # type: str
+            max_connections=1,  # type: int
+            resume=False,  # type: bool
+            offset=None,  # type: Optional[int]
+            length=None,  # type: Optional[int]
+            validate_content=False,  # type: bool
+            **kwargs
+        ):
+        # type: (...) -> BlobProperties
+        """Downloads the blob to a local file, with each connection writing its own ranges.
+
+        The file is allocated up front and the chunks are written at their position in
+        the file without locking, which is faster than :func:`~download_blob` followed
+        by `download_to_stream` when downloading large blobs over many connections.
+        The chunks written so far are recorded in a `<file_path>.download` manifest, so
+        an interrupted download can be resumed.
+
+        :param str file_path:
+            The path of the file to download to.
+        :param int max_connections:
+            The number of parallel connections with which to download.
+        :param bool resume:
+            Whether to only download the ranges missing from a previous, interrupted download
+            of the same blob to the same file. The download starts over if the blob changed
+            since. Default value is False.
+        :param int offset:
+            Start of byte range to use for downloading a section of the blob.
+            Must be set if length is provided.
+        :param int length:
+            Number of bytes to read from the stream. This is optional, but
+            should be supplied for optimal performance.
+        :param bool validate_content:
+            If true, calculates an MD5 hash for each chunk of the blob.
+        :returns: The properties of the downloaded blob.
+        :rtype: ~azure.storage.blob.models.BlobProperties
+        """
+        downloader = self.download_blob(
+            offset=offset,
+            length=length,
+            validate_content=validate_content,
+            **kwargs)
+        return downloader.download_to_file(file_path, max_connections=max_connections, resume=resume)
+
     def _delete_blob_options(self, delete_snapshots=False, **kwargs):
         # type: (bool, **Any) -> Dict[str, Any]
         access_conditions = get_access_conditions(kwargs.pop('lease', None))
@@ -1569,6 +1644,73 @@ class BlobClient(StorageAccountHostsMixin):  # pylint: disable=too-many-public-m
         except StorageErrorException as error:
             process_storage_error(error)
 
+    @distributed_trace
+    def copy_blob_parallel(
+            self, source_url,  # type: str
+            metadata=None,  # type: Optional[Dict[str, str]]
+            content_settings=None,  # type: Optional[ContentSettings]
+            max_connections=4,  # type: int
+            block_size=None,  # type: Optional[int]
+            **kwargs
+        ):
+        # type: (...) -> Dict[str, Union[str, datetime]]
+        """Copies a blob to this block blob, returning when the copy is complete.
+
+        If the source is a block blob that can be read from its URL, that is a public
+        blob or a URL with a shared access signature, it is split into ranges that are
+        staged in parallel with :func:`stage_block_from_url` and committed with
+        :func:`commit_block_list`, along with the properties and metadata of the source.
+        The ranges are staged from the version of the source measured at the start,
+        so the copy fails rather than mixing versions if the source changes meanwhile.
+
+        Otherwise, for example for a blob of the same account authorized by the
+        credential of this client, or a page or append blob, the copy is started with
+        :func:`start_copy_from_url` and its status is polled until it completes. The
+        status is checked again after the time the copy should still take at the rate
+        it progressed since the previous check.
+
+        :param str source_url:
+            A URL of up to 2 KB in length that specifies a blob. The value should be
+            URL-encoded as it would appear in a request URI.
+        :param metadata:
+            Name-value pairs associated with the blob as metadata. Defaults to the
+            metadata of the source.
+        :type metadata: dict(str, str)
+        :param ~azure.storage.blob.models.ContentSettings content_settings:
+            ContentSettings object used to set blob properties. Defaults to the
+            properties of the source.
+        :param int max_connections:
+            The maximum number of ranges staged in parallel. Default value is 4.
+        :param int block_size:
+            The size of the staged ranges, up to 100MB. Defaults to 32MB, or more
+            if needed to copy the source in 50,000 blocks.
+        :param float max_poll_interval:
+            The longest time, in seconds, between two checks of the status of a
+            copy started with :func:`start_copy_from_url`. Default value is 30.
+        :param int timeout:
+            The timeout parameter is expressed in seconds. This method may make
+            multiple calls to the Azure service and the timeout will apply to
+            each call individually.
+        :returns: Blob-updated property dict (Etag and last modified).
+        :rtype: dict(str, Any)
+        """
+        timeout = kwargs.pop('timeout', None)
+        source_properties = get_source_properties(self, source_url, timeout=timeout)
+        if can_stage_from(source_properties):
+            return copy_staged(
+                self, source_url, source_properties,
+                metadata=metadata,
+                content_settings=content_settings,
+                block_size=block_size,
+                max_connections=max_connections,
+                timeout=timeout)
+        return copy_from_url(
+            self, source_url,
+            metadata=metadata,
+            content_settings=content_settings,
+            timeout=timeout,
+            **kwargs)
+
     @distributed_trace
     def acquire_lease(self, lease_duration=-1, lease_id=None, **kwargs):
         # type: (int, Optional[str], **Any) -> LeaseClient
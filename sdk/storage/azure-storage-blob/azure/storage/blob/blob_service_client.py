@@ -27,6 +27,8 @@ from ._shared.response_handlers import return_response_headers, process_storage_
 from ._generated import AzureBlobStorage
 from ._generated.models import StorageErrorException, StorageServiceProperties, KeyInfo
 from .container_client import ContainerClient
+from . import _batch
+from ._batch import run_batches
 from .blob_client import BlobClient
 from .models import ContainerProperties, ContainerPropertiesPaged
 
@@ -37,13 +39,15 @@ if TYPE_CHECKING:
     from ._shared.models import AccountPermissions, ResourceTypes
     from .lease import LeaseClient
     from .models import (
+        BlobBatchResult,
         BlobProperties,
         Logging,
         Metrics,
         RetentionPolicy,
         StaticWebsite,
         CorsRule,
-        PublicAccess
+        PublicAccess,
+        StandardBlobTier
     )
 
 
@@ -570,6 +574,64 @@ class BlobServiceClient(StorageAccountHostsMixin):
             timeout=timeout,
             **kwargs)
 
+    @distributed_trace
+    def delete_blobs(self, *blobs, **kwargs):
+        # type: (*Union[str, BlobProperties], **Any) -> List[BlobBatchResult]
+        """Marks the specified blobs or snapshots for deletion, in batch requests.
+
+        The blobs are sent in batches of up to 256 sub-requests, each signed with the
+        credential of the client. The deletion of each blob succeeds or fails on its
+        own: the failures are reported in the results rather than raised. An error is
+        only raised if a batch request as a whole fails.
+
+        :param blobs:
+            The blobs to delete, as BlobProperties listed from a container, or as
+            'container/blob' paths. A BlobProperties with a snapshot
+            deletes only that snapshot.
+        :type blobs: str or ~azure.storage.blob.models.BlobProperties
+        :param str delete_snapshots:
+            Required if the blobs have associated snapshots. Values include:
+             - "only": Deletes only the blobs snapshots.
+             - "include": Deletes the blobs along with all snapshots.
+        :param int max_connections:
+            The number of batch requests to send in parallel. Default value is 1.
+        :param int timeout:
+            The timeout parameter is expressed in seconds. It applies to each batch request.
+        :returns: The result of the deletion of each blob, in the order of the blobs.
+        :rtype: list[~azure.storage.blob.models.BlobBatchResult]
+        """
+        operation = _batch.delete_blobs_operation(
+            self, blobs, delete_snapshots=kwargs.pop('delete_snapshots', None))
+        return run_batches(self, operation, **kwargs)
+
+    @distributed_trace
+    def set_standard_blob_tier_blobs(self, standard_blob_tier, *blobs, **kwargs):
+        # type: (Union[str, StandardBlobTier], *Union[str, BlobProperties], **Any) -> List[BlobBatchResult]
+        """Sets the tier of the specified block blobs, in batch requests.
+
+        The blobs are sent in batches of up to 256 sub-requests, each signed with the
+        credential of the client. The operation on each blob succeeds or fails on its
+        own: the failures are reported in the results rather than raised. An error is
+        only raised if a batch request as a whole fails.
+
+        :param standard_blob_tier:
+            Indicates the tier to be set on the blobs. Options include 'Hot', 'Cool',
+            'Archive'.
+        :type standard_blob_tier: str or ~azure.storage.blob.models.StandardBlobTier
+        :param blobs:
+            The blobs to set the tier of, as BlobProperties listed from a container, or as
+            'container/blob' paths.
+        :type blobs: str or ~azure.storage.blob.models.BlobProperties
+        :param int max_connections:
+            The number of batch requests to send in parallel. Default value is 1.
+        :param int timeout:
+            The timeout parameter is expressed in seconds. It applies to each batch request.
+        :returns: The result of the operation on each blob, in the order of the blobs.
+        :rtype: list[~azure.storage.blob.models.BlobBatchResult]
+        """
+        operation = _batch.set_tier_operation(self, standard_blob_tier, blobs)
+        return run_batches(self, operation, **kwargs)
+
     def get_container_client(self, container):
         # type: (Union[ContainerProperties, str]) -> ContainerClient
         """Get a client to interact with the specified container.
@@ -596,7 +658,8 @@ class BlobServiceClient(StorageAccountHostsMixin):
             credential=self.credential, _configuration=self._config,
             _pipeline=self._pipeline, _location_mode=self._location_mode, _hosts=self._hosts,
             require_encryption=self.require_encryption, key_encryption_key=self.key_encryption_key,
-            key_resolver_function=self.key_resolver_function)
+            key_resolver_function=self.key_resolver_function,
+            encryption_version=self.encryption_version)
 
     def get_blob_client(
             self, container,  # type: Union[ContainerProperties, str]
@@ -636,4 +699,5 @@ class BlobServiceClient(StorageAccountHostsMixin):
             credential=self.credential, _configuration=self._config,
             _pipeline=self._pipeline, _location_mode=self._location_mode, _hosts=self._hosts,
             require_encryption=self.require_encryption, key_encryption_key=self.key_encryption_key,
-            key_resolver_function=self.key_resolver_function)
+            key_resolver_function=self.key_resolver_function,
+            encryption_version=self.encryption_version)
@@ -41,6 +41,8 @@ from .models import ( # pylint: disable=unused-import
     BlobPrefix)
 from .lease import LeaseClient, get_access_conditions
 from .blob_client import BlobClient
+from . import _bulk_transfer, _batch
+from ._batch import run_batches
 from ._shared_access_signature import BlobSharedAccessSignature
 
 if TYPE_CHECKING:
@@ -50,8 +52,11 @@ if TYPE_CHECKING:
     from datetime import datetime
     from .models import ( # pylint: disable=unused-import
         AccessPolicy,
+        BlobBatchResult,
+        BulkTransferResult,
         ContentSettings,
-        PremiumPageBlobTier)
+        PremiumPageBlobTier,
+        StandardBlobTier)
 
 
 class ContainerClient(StorageAccountHostsMixin):
@@ -940,6 +945,171 @@ class ContainerClient(StorageAccountHostsMixin):
             timeout=timeout,
             **kwargs)
 
+    @distributed_trace
+    def delete_blobs(self, *blobs, **kwargs):
+        # type: (*Union[str, BlobProperties], **Any) -> List[BlobBatchResult]
+        """Marks the specified blobs or snapshots for deletion, in batch requests.
+
+        The blobs are sent in batches of up to 256 sub-requests, each signed with the
+        credential of the client. The deletion of each blob succeeds or fails on its
+        own: the failures are reported in the results rather than raised. An error is
+        only raised if a batch request as a whole fails.
+
+        :param blobs:
+            The blobs to delete, by name or as BlobProperties, for example as listed by
+            :func:`list_blobs`. A BlobProperties with a snapshot
+            deletes only that snapshot.
+        :type blobs: str or ~azure.storage.blob.models.BlobProperties
+        :param str delete_snapshots:
+            Required if the blobs have associated snapshots. Values include:
+             - "only": Deletes only the blobs snapshots.
+             - "include": Deletes the blobs along with all snapshots.
+        :param int max_connections:
+            The number of batch requests to send in parallel. Default value is 1.
+        :param int timeout:
+            The timeout parameter is expressed in seconds. It applies to each batch request.
+        :returns: The result of the deletion of each blob, in the order of the blobs.
+        :rtype: list[~azure.storage.blob.models.BlobBatchResult]
+        """
+        operation = _batch.delete_blobs_operation(
+            self, blobs, container=self.container_name, delete_snapshots=kwargs.pop('delete_snapshots', None))
+        return run_batches(self, operation, **kwargs)
+
+    @distributed_trace
+    def set_standard_blob_tier_blobs(self, standard_blob_tier, *blobs, **kwargs):
+        # type: (Union[str, StandardBlobTier], *Union[str, BlobProperties], **Any) -> List[BlobBatchResult]
+        """Sets the tier of the specified block blobs, in batch requests.
+
+        The blobs are sent in batches of up to 256 sub-requests, each signed with the
+        credential of the client. The operation on each blob succeeds or fails on its
+        own: the failures are reported in the results rather than raised. An error is
+        only raised if a batch request as a whole fails.
+
+        :param standard_blob_tier:
+            Indicates the tier to be set on the blobs. Options include 'Hot', 'Cool',
+            'Archive'.
+        :type standard_blob_tier: str or ~azure.storage.blob.models.StandardBlobTier
+        :param blobs:
+            The blobs to set the tier of, by name or as BlobProperties, for example as listed by
+            :func:`list_blobs`.
+        :type blobs: str or ~azure.storage.blob.models.BlobProperties
+        :param int max_connections:
+            The number of batch requests to send in parallel. Default value is 1.
+        :param int timeout:
+            The timeout parameter is expressed in seconds. It applies to each batch request.
+        :returns: The result of the operation on each blob, in the order of the blobs.
+        :rtype: list[~azure.storage.blob.models.BlobBatchResult]
+        """
+        operation = _batch.set_tier_operation(self, standard_blob_tier, blobs, container=self.container_name)
+        return run_batches(self, operation, **kwargs)
+
+    @distributed_trace
+    def upload_directory(
+            self, source,  # type: str
+            name_prefix=None,  # type: Optional[str]
+            sync=False,  # type: bool
+            compare_md5=False,  # type: bool
+            overwrite=False,  # type: bool
+            max_concurrency=16,  # type: int
+            max_connections=4,  # type: int
+            **kwargs
+        ):
+        # type: (...) -> BulkTransferResult
+        """Uploads every file under a local directory to a block blob in the container.
+
+        The blobs are named after the paths of the files relative to the directory,
+        with '/' separators, under the given prefix. Up to `max_concurrency` files are
+        uploaded at once; files larger than the single put size of the client are
+        uploaded in chunks over `max_connections` connections each, so only
+        `max_concurrency // max_connections` of them run at once. A file that fails
+        to upload doesn't stop the others: its error is reported in the result.
+
+        :param str source: The path of the local directory to upload.
+        :param str name_prefix:
+            A virtual directory to upload the files into. Defaults to the root of the container.
+        :param bool sync:
+            If True, files whose blob already exists with the same size, and was modified
+            after the file, are skipped. Other blobs are overwritten.
+        :param bool compare_md5:
+            With `sync`, compare the MD5 of the files with the Content-MD5 of the blobs
+            rather than their last modified times. The MD5 is set on the uploaded blobs.
+        :param bool overwrite:
+            Whether to overwrite blobs that already exist. Otherwise, they are reported as
+            failures. Default value is False.
+        :param int max_concurrency:
+            The maximum number of parallel connections used for the whole transfer.
+            Default value is 16.
+        :param int max_connections:
+            The maximum number of parallel connections used for a single large file.
+            Default value is 4.
+        :param int timeout:
+            The timeout parameter is expressed in seconds. This method may make
+            multiple calls to the Azure service and the timeout will apply to
+            each call individually.
+        :returns: The number of files and bytes uploaded, and the errors by file path.
+        :rtype: ~azure.storage.blob.models.BulkTransferResult
+        """
+        return _bulk_transfer.upload_directory(
+            self, source,
+            name_prefix=name_prefix,
+            sync=sync,
+            compare_md5=compare_md5,
+            overwrite=overwrite,
+            max_concurrency=max_concurrency,
+            max_connections=max_connections,
+            **kwargs)
+
+    @distributed_trace
+    def download_directory(
+            self, destination,  # type: str
+            name_starts_with=None,  # type: Optional[str]
+            sync=False,  # type: bool
+            compare_md5=False,  # type: bool
+            max_concurrency=16,  # type: int
+            max_connections=4,  # type: int
+            **kwargs
+        ):
+        # type: (...) -> BulkTransferResult
+        """Downloads the blobs of the container to files under a local directory.
+
+        The files are named after the blob names, with the prefix removed and the '/'
+        separators mapped to subdirectories, which are created as needed. Blobs whose
+        names would resolve outside of the directory are reported as failures. Up to
+        `max_concurrency` blobs are downloaded at once; blobs larger than the single
+        get size of the client are downloaded in chunks over `max_connections`
+        connections each, so only `max_concurrency // max_connections` of them run at once.
+
+        :param str destination: The path of the local directory to download into.
+        :param str name_starts_with:
+            Only download the blobs whose names begin with this prefix.
+        :param bool sync:
+            If True, blobs whose file already exists with the same size, and was modified
+            after the blob, are skipped. Other files are overwritten.
+        :param bool compare_md5:
+            With `sync`, compare the Content-MD5 of the blobs with the MD5 of the files
+            rather than their last modified times.
+        :param int max_concurrency:
+            The maximum number of parallel connections used for the whole transfer.
+            Default value is 16.
+        :param int max_connections:
+            The maximum number of parallel connections used for a single large blob.
+            Default value is 4.
+        :param int timeout:
+            The timeout parameter is expressed in seconds. This method may make
+            multiple calls to the Azure service and the timeout will apply to
+            each call individually.
+        :returns: The number of blobs and bytes downloaded, and the errors by blob name.
+        :rtype: ~azure.storage.blob.models.BulkTransferResult
+        """
+        return _bulk_transfer.download_directory(
+            self, destination,
+            name_starts_with=name_starts_with,
+            sync=sync,
+            compare_md5=compare_md5,
+            max_concurrency=max_concurrency,
+            max_connections=max_connections,
+            **kwargs)
+
     def get_blob_client(
             self, blob,  # type: Union[str, BlobProperties]
             snapshot=None  # type: str
@@ -971,4 +1141,5 @@ class ContainerClient(StorageAccountHostsMixin):
             credential=self.credential, _configuration=self._config,
             _pipeline=self._pipeline, _location_mode=self._location_mode, _hosts=self._hosts,
             require_encryption=self.require_encryption, key_encryption_key=self.key_encryption_key,
-            key_resolver_function=self.key_resolver_function)
+            key_resolver_function=self.key_resolver_function,
+            encryption_version=self.encryption_version)
@@ -1012,3 +1012,68 @@ class CustomerProvidedEncryptionKey(object):
         self.key_value = key_value
         self.key_hash = key_hash
         self.algorithm = 'AES256'
+
+
+class BulkTransferResult(DictMixin):
+    """The outcome of a bulk transfer between a local directory and a container.
+
+    :ivar int transferred:
+        The number of files transferred.
+    :ivar int skipped:
+        The number of files a sync skipped because they were unchanged.
+    :ivar int bytes_transferred:
+        The number of bytes transferred.
+    :ivar float elapsed:
+        The duration of the transfer, in seconds.
+    :ivar dict failures:
+        The error of each file that failed to transfer, by local path for uploads
+        and by blob name for downloads.
+    """
+
+    def __init__(self):
+        self.transferred = 0
+        self.skipped = 0
+        self.bytes_transferred = 0
+        self.elapsed = 0.0
+        self.failures = {}
+
+    @property
+    def throughput(self):
+        """The aggregate throughput of the transfer, in bytes per second.
+
+        :rtype: float
+        """
+        return self.bytes_transferred / self.elapsed if self.elapsed else 0.0
+
+
+class BlobBatchResult(DictMixin):
+    """The outcome of the operation on one blob of a batch.
+
+    :ivar str container: The name of the container of the blob.
+    :ivar str name: The name of the blob.
+    :ivar str snapshot: The snapshot of the blob the operation applied to, if any.
+    :ivar int status_code: The HTTP status code of the operation.
+    :ivar str reason: The HTTP reason phrase, which describes the error of a failed operation.
+    :ivar str error_code:
+        The storage error code of a failed operation, for example 'BlobNotFound'.
+    :ivar str request_id: The ID of the operation within the batch.
+    :ivar dict headers: The response headers of the operation.
+    """
+
+    def __init__(self, container, name, snapshot=None, status_code=None, reason=None, headers=None):
+        self.container = container
+        self.name = name
+        self.snapshot = snapshot
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = headers or {}
+        self.error_code = self.headers.get('x-ms-error-code')
+        self.request_id = self.headers.get('x-ms-request-id')
+
+    @property
+    def succeeded(self):
+        """Whether the operation succeeded.
+
+        :rtype: bool
+        """
+        return self.status_code is not None and 200 <= self.status_code < 300
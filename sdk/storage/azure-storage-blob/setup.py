@@ -91,13 +91,14 @@ setup(
         'tests.common'
     ]),
     install_requires=[
-        "azure-core<2.0.0,>=1.0.0b3",
+        "azure-core<2.0.0,>=1.0.0b4",
         "msrest>=0.5.0",
         "cryptography>=2.1.4"
     ],
     extras_require={
         ":python_version<'3.0'": ['futures', 'azure-storage-nspkg<4.0.0,>=3.0.0'],
         ":python_version<'3.4'": ['enum34>=1.0.4'],
-        ":python_version<'3.5'": ["typing"]
+        ":python_version<'3.5'": ["typing"],
+        "crc64": ["crcmod>=1.7"]
     },
 )
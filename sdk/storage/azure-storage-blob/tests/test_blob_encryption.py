@@ -336,6 +336,54 @@ class StorageBlobEncryptionTest(StorageTestCase):
         # Assert
         self.assertEqual(content, blob_content)
 
+    def test_put_blob_chunking_encryption_v2(self):
+        # parallel tests introduce random order of requests, can only run live
+        if TestMode.need_recording_file(self.test_mode):
+            return
+
+        # Arrange
+        self.bsc.key_encryption_key = KeyWrapper('key1')
+        self.bsc.require_encryption = True
+        self.bsc.encryption_version = '2.0'
+        content = urandom(2 * 4 * 1024 * 1024 + 100)
+        blob_name = self._get_blob_reference(BlobType.BlockBlob)
+        blob = self.bsc.get_blob_client(self.container_name, blob_name)
+
+        # Act
+        blob.upload_blob(content, max_connections=3)
+        blob_content = blob.download_blob().content_as_bytes(max_connections=3)
+        range_content = blob.download_blob(
+            offset=4 * 1024 * 1024 - 50, length=4 * 1024 * 1024 + 49).content_as_bytes()
+        encryption_data = loads(blob.get_blob_properties().metadata['encryptiondata'])
+
+        # Assert
+        self.assertEqual(content, blob_content)
+        self.assertEqual(content[4 * 1024 * 1024 - 50:4 * 1024 * 1024 + 50], range_content)
+        self.assertEqual(encryption_data['EncryptionAgent']['Protocol'], '2.0')
+
+    def test_get_blob_encryption_v2_with_v1_client(self):
+        # parallel tests introduce random order of requests, can only run live
+        if TestMode.need_recording_file(self.test_mode):
+            return
+
+        # Arrange
+        self.bsc.key_encryption_key = KeyWrapper('key1')
+        self.bsc.require_encryption = True
+        self.bsc.encryption_version = '2.0'
+        content = urandom(self.config.max_single_put_size + 1)
+        blob_name = self._get_blob_reference(BlobType.BlockBlob)
+        self.bsc.get_blob_client(self.container_name, blob_name).upload_blob(content)
+
+        # Act
+        self.bsc.encryption_version = '1.0'
+        blob = self.bsc.get_blob_client(self.container_name, blob_name)
+        blob_content = blob.download_blob().content_as_bytes()
+        range_content = blob.download_blob(offset=50, length=93).content_as_bytes()
+
+        # Assert
+        self.assertEqual(content, blob_content)
+        self.assertEqual(content[50:94], range_content)
+
     def test_put_blob_chunking_required_range_specified(self):
         # parallel tests introduce random order of requests, can only run live
         if TestMode.need_recording_file(self.test_mode):
@@ -526,6 +574,34 @@ class StorageBlobEncryptionTest(StorageTestCase):
         # Assert
         self.assertEqual(content[22:43], blob_content)
 
+    def test_get_blob_range_unaligned_multiple_chunks(self):
+        # parallel tests introduce random order of requests, can only run live
+        if TestMode.need_recording_file(self.test_mode):
+            return
+
+        # Arrange
+        self.bsc.key_encryption_key = KeyWrapper('key1')
+        self.bsc.require_encryption = True
+        self.config.max_single_get_size = 32 * 1024
+        self.config.max_chunk_get_size = 4 * 1024
+        content = self.get_random_bytes(3 * 32 * 1024)
+        blob_name = self._get_blob_reference(BlobType.BlockBlob)
+        blob = self.bsc.get_blob_client(self.container_name, blob_name)
+        blob.upload_blob(content)
+
+        for offset, length in ((5, 2 * 32 * 1024), (5, len(content) - 1)):
+            # Act
+            blob_content = blob.download_blob(offset=offset, length=length).content_as_bytes(max_connections=2)
+            chunks = list(blob.download_blob(offset=offset, length=length).chunks(max_connections=2))
+            blob.download_blob(offset=offset, length=length).download_to_file(FILE_PATH, max_connections=2)
+            with open(FILE_PATH, 'rb') as stream:
+                file_content = stream.read()
+
+            # Assert
+            self.assertEqual(content[offset:length + 1], blob_content)
+            self.assertEqual(content[offset:length + 1], b"".join(chunks))
+            self.assertEqual(content[offset:length + 1], file_content)
+
     @record
     def test_put_blob_strict_mode(self):
         # Arrange
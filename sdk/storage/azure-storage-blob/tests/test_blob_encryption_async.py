@@ -419,6 +419,34 @@ class StorageBlobEncryptionTestAsync(StorageTestCase):
         loop = asyncio.get_event_loop()
         loop.run_until_complete(self._test_put_blob_chunking_required_non_mult_of_block_size_async())
 
+    async def _test_put_blob_chunking_encryption_v2_async(self):
+        # parallel tests introduce random order of requests, can only run live
+        if TestMode.need_recording_file(self.test_mode):
+            return
+
+        # Arrange
+        await self._setup()
+        self.bsc.key_encryption_key = KeyWrapper('key1')
+        self.bsc.require_encryption = True
+        self.bsc.encryption_version = '2.0'
+        content = urandom(2 * 4 * 1024 * 1024 + 100)
+        blob_name = self._get_blob_reference(BlobType.BlockBlob)
+        blob = self.bsc.get_blob_client(self.container_name, blob_name)
+
+        # Act
+        await blob.upload_blob(content, max_connections=3)
+        blob_content = await (await blob.download_blob()).content_as_bytes(max_connections=3)
+        range_content = await (await blob.download_blob(
+            offset=4 * 1024 * 1024 - 50, length=4 * 1024 * 1024 + 49)).content_as_bytes()
+
+        # Assert
+        self.assertEqual(content, blob_content)
+        self.assertEqual(content[4 * 1024 * 1024 - 50:4 * 1024 * 1024 + 50], range_content)
+
+    def test_put_blob_chunking_encryption_v2_async(self):
+        loop = asyncio.get_event_loop()
+        loop.run_until_complete(self._test_put_blob_chunking_encryption_v2_async())
+
     async def _test_put_blob_chunking_required_range_specified_async(self):
         # parallel tests introduce random order of requests, can only run live
         if TestMode.need_recording_file(self.test_mode):
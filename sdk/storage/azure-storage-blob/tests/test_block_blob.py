@@ -6,8 +6,13 @@
 # license information.
 # --------------------------------------------------------------------------
 import os
+import struct
 import unittest
 import pytest
+try:
+    from unittest import mock
+except ImportError:
+    import mock
 
 from azure.core.exceptions import HttpResponseError, ResourceExistsError
 from azure.storage.blob import (
@@ -19,6 +24,7 @@ from azure.storage.blob import (
     BlobBlock,
     StandardBlobTier
 )
+from azure.storage.blob._shared.validation import crc64
 from testcase import (
     StorageTestCase,
     TestMode,
@@ -898,6 +904,38 @@ class StorageBlockBlobTest(StorageTestCase):
 
         # Assert
 
+    def test_create_blob_with_crc64_chunked(self):
+        # parallel tests introduce random order of requests, can only run live
+        if TestMode.need_recording_file(self.test_mode):
+            return
+
+        # Arrange
+        blob_name = self._get_blob_reference()
+        blob = self.bsc.get_blob_client(self.container_name, blob_name)
+        data = self.get_random_bytes(LARGE_BLOB_SIZE)
+
+        # Act
+        response = blob.upload_blob(data, validate_content='crc64', max_connections=2)
+
+        # Assert
+        self.assertEqual(response['composite_checksum'], bytearray(struct.pack('<Q', crc64(data))))
+        self.assertBlobEqual(self.container_name, blob_name, data)
+
+    def test_crc64_in_pure_python_warns_once(self):
+        # Arrange
+        from azure.storage.blob._shared import validation
+        warning = mock.Mock()
+
+        # Act
+        with mock.patch.object(validation, '_crc64_ext', None), \
+                mock.patch.object(validation, '_warn_crc64_in_python', True), \
+                mock.patch.object(validation._LOGGER, 'warning', warning):
+            checksums = [crc64(b'123456789'), crc64(b'123456789')]
+
+        # Assert
+        self.assertEqual(checksums, [0xAE8B14860A799888] * 2)
+        self.assertEqual(warning.call_count, 1)
+
 #------------------------------------------------------------------------------
 if __name__ == '__main__':
     unittest.main()
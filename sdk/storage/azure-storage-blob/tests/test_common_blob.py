@@ -10,6 +10,10 @@ import requests
 import time
 import unittest
 import os
+try:
+    from unittest import mock
+except ImportError:
+    import mock
 from datetime import datetime, timedelta
 
 from azure.core.exceptions import (
@@ -34,6 +38,7 @@ from azure.storage.blob import (
     ResourceTypes,
     AccountPermissions,
 )
+from azure.storage.blob._copy_helpers import copy_staged
 from testcase import (
     StorageTestCase,
     TestMode,
@@ -917,6 +922,75 @@ class StorageCommonBlobTest(StorageTestCase):
         actual_data = target_blob.download_blob()
         self.assertEqual(b"".join(list(actual_data)), data)
 
+    def test_copy_blob_parallel_private_blob_with_sas(self):
+        # parallel tests introduce random order of requests, can only run live
+        if TestMode.need_recording_file(self.test_mode):
+            return
+
+        # Arrange
+        data = b'12345678' * 1024 * 1024
+        self._create_remote_container()
+        source_blob = self._create_remote_block_blob(blob_data=data)
+        source_blob.set_http_headers(ContentSettings(content_type='application/test'))
+        sas_token = source_blob.generate_shared_access_signature(
+            permission=BlobPermissions.READ,
+            expiry=datetime.utcnow() + timedelta(hours=1),
+        )
+        blob = BlobClient(source_blob.url, credential=sas_token)
+
+        # Act
+        target_blob = self.bsc.get_blob_client(self.container_name, 'targetblob')
+        copy_resp = target_blob.copy_blob_parallel(blob.url, block_size=4 * 1024 * 1024, max_connections=4)
+
+        # Assert
+        self.assertIsNotNone(copy_resp['etag'])
+        committed, _ = target_blob.get_block_list()
+        self.assertEqual(len(committed), 16)
+        self.assertEqual(target_blob.get_blob_properties().content_settings.content_type, 'application/test')
+        self.assertEqual(target_blob.download_blob().content_as_bytes(), data)
+
+    def test_copy_blob_parallel_same_account_no_sas(self):
+        # the source is probed with a separate client, so this test runs live only
+        if TestMode.need_recording_file(self.test_mode):
+            return
+
+        # Arrange
+        blob_name = self._create_block_blob()
+        source_blob = self.bsc.get_blob_client(self.container_name, blob_name)
+
+        # Act
+        target_blob = self.bsc.get_blob_client(self.container_name, 'blob1copy')
+        copy_resp = target_blob.copy_blob_parallel(source_blob.url)
+
+        # Assert
+        self.assertEqual(copy_resp['copy_status'], 'success')
+        self.assertIsNotNone(copy_resp['copy_id'])
+        self.assertEqual(target_blob.download_blob().content_as_bytes(), self.byte_data)
+
+    def test_copy_blob_parallel_source_ranges(self):
+        # Arrange
+        target_blob = self.bsc.get_blob_client(self.container_name, 'targetblob')
+        source_properties = BlobProperties()
+        source_properties.size = 10 * 1024 * 1024 + 5
+        source_properties.blob_type = BlobType.BlockBlob
+        source_properties.etag = '"source"'
+        source_properties.metadata = {}
+        source_properties.content_settings = ContentSettings()
+        stage = mock.Mock(return_value={})
+
+        # Act
+        with mock.patch.object(target_blob._client.block_blob, 'stage_block_from_url', stage), \
+                mock.patch.object(target_blob, 'commit_block_list', mock.Mock(return_value={})):
+            copy_staged(target_blob, 'https://account.blob.core.windows.net/c/source', source_properties,
+                        block_size=4 * 1024 * 1024)
+
+        # Assert the ranges are contiguous, with inclusive ends
+        ranges = [call[1]['source_range'] for call in stage.call_args_list]
+        self.assertEqual(ranges, [
+            'bytes=0-4194303',
+            'bytes=4194304-8388607',
+            'bytes=8388608-10485764'])
+
     @record
     def test_abort_copy_blob(self):
         # Arrange
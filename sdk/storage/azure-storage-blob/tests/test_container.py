@@ -5,6 +5,9 @@
 # Licensed under the MIT License. See License.txt in the project root for
 # license information.
 # --------------------------------------------------------------------------
+import os
+import shutil
+import tempfile
 import pytest
 import unittest
 from dateutil.tz import tzutc
@@ -21,8 +24,11 @@ from azure.storage.blob import (
     ContainerPermissions,
     PublicAccess,
     ContainerPermissions,
-    AccessPolicy
+    AccessPolicy,
+    StandardBlobTier,
+    StorageErrorCode
 )
+from azure.storage.blob._bulk_transfer import local_path_for_blob
 
 from azure.identity import ClientSecretCredential
 from testcase import StorageTestCase, TestMode, record, LogCaptured
@@ -1108,6 +1114,105 @@ class StorageContainerTest(StorageTestCase):
         # Assert
         self.assertEqual(blob_content, b"".join(list(content)).decode('utf-8'))
 
+    def test_delete_blobs_batch(self):
+        # batch sub-requests are signed with the current time, so this test runs live only
+        if TestMode.need_recording_file(self.test_mode):
+            return
+
+        # Arrange
+        container = self._create_container()
+        names = ['blob{}'.format(i) for i in range(300)]
+        for name in names:
+            container.upload_blob(name, b'hello world')
+
+        # Act
+        results = container.delete_blobs(*(names + ['missing']), max_connections=2)
+
+        # Assert
+        self.assertEqual([r.name for r in results], names + ['missing'])
+        self.assertTrue(all(r.succeeded for r in results[:-1]))
+        self.assertFalse(results[-1].succeeded)
+        self.assertEqual(results[-1].status_code, 404)
+        self.assertEqual(results[-1].error_code, StorageErrorCode.blob_not_found)
+        self.assertEqual(list(container.list_blobs()), [])
+
+    def test_set_standard_blob_tier_blobs_batch(self):
+        # batch sub-requests are signed with the current time, so this test runs live only
+        if TestMode.need_recording_file(self.test_mode):
+            return
+
+        # Arrange
+        container = self._create_container()
+        for name in ('blob1', 'blob2'):
+            container.upload_blob(name, b'hello world')
+        blobs = list(container.list_blobs())
+
+        # Act
+        results = self.bsc.set_standard_blob_tier_blobs(StandardBlobTier.Cool, *blobs)
+
+        # Assert
+        self.assertTrue(all(r.succeeded for r in results))
+        for blob in container.list_blobs():
+            self.assertEqual(blob.blob_tier, StandardBlobTier.Cool)
+
+    def test_upload_and_download_directory(self):
+        # parallel tests introduce random order of requests, can only run live
+        if TestMode.need_recording_file(self.test_mode):
+            return
+
+        # Arrange
+        container = self._create_container()
+        source = tempfile.mkdtemp()
+        destination = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, source)
+        self.addCleanup(shutil.rmtree, destination)
+        os.makedirs(os.path.join(source, 'sub', 'dir'))
+        files = {'a.txt': b'small', 'sub/b.bin': self.get_random_bytes(16 * 1024), 'sub/dir/c': b''}
+        for relative, data in files.items():
+            with open(os.path.join(source, *relative.split('/')), 'wb') as stream:
+                stream.write(data)
+
+        # Act
+        uploaded = container.upload_directory(source, name_prefix='backup', compare_md5=True)
+        synced = container.upload_directory(source, name_prefix='backup', sync=True, compare_md5=True)
+        downloaded = container.download_directory(destination, name_starts_with='backup/')
+        unchanged = container.download_directory(destination, name_starts_with='backup/', sync=True)
+
+        # Assert
+        self.assertEqual(uploaded.failures, {})
+        self.assertEqual(uploaded.transferred, 3)
+        self.assertEqual(uploaded.bytes_transferred, sum(len(d) for d in files.values()))
+        self.assertEqual(
+            sorted(b.name for b in container.list_blobs()),
+            sorted('backup/' + relative for relative in files))
+        self.assertEqual((synced.transferred, synced.skipped), (0, 3))
+        self.assertEqual(downloaded.failures, {})
+        self.assertEqual(downloaded.transferred, 3)
+        for relative, data in files.items():
+            with open(os.path.join(destination, *relative.split('/')), 'rb') as stream:
+                self.assertEqual(stream.read(), data)
+        self.assertEqual((unchanged.transferred, unchanged.skipped), (0, 3))
+
+    def test_download_directory_paths_stay_under_destination(self):
+        destination = os.path.join(tempfile.gettempdir(), 'destination')
+        root = os.path.join(os.path.abspath(destination), '')
+
+        # Act
+        path = local_path_for_blob(destination, 'backup/', 'backup/sub/a.txt')
+
+        # Assert
+        self.assertEqual(path, os.path.join(destination, 'sub', 'a.txt'))
+        for name in ('backup/../evil', 'backup/sub/../../evil', 'backup/./a', 'backup/sub//a'):
+            with self.assertRaises(ValueError):
+                local_path_for_blob(destination, 'backup/', name)
+        # backslashes and drives only separate paths on Windows, where the names are rejected
+        for name in ('backup/..\\evil', 'backup/sub\\..\\..\\evil', 'backup/C:\\evil', 'backup/C:evil'):
+            try:
+                path = local_path_for_blob(destination, 'backup/', name)
+            except ValueError:
+                continue
+            self.assertTrue(os.path.abspath(path).startswith(root))
+
 #------------------------------------------------------------------------------
 if __name__ == '__main__':
     import unittest
@@ -1339,6 +1339,34 @@ class StorageContainerTestAsync(StorageTestCase):
         loop.run_until_complete(self._test_web_container_normal_operations_working())
 
 
+    async def _test_delete_blobs_batch(self):
+        # batch sub-requests are signed with the current time, so this test runs live only
+        if TestMode.need_recording_file(self.test_mode):
+            return
+
+        # Arrange
+        container = await self._create_container()
+        names = ['blob{}'.format(i) for i in range(300)]
+        for name in names:
+            await container.upload_blob(name, b'hello world')
+
+        # Act
+        results = await container.delete_blobs(*(names + ['missing']), max_connections=2)
+
+        # Assert
+        self.assertEqual([r.name for r in results], names + ['missing'])
+        self.assertTrue(all(r.succeeded for r in results[:-1]))
+        self.assertEqual(results[-1].status_code, 404)
+        self.assertEqual(results[-1].error_code, StorageErrorCode.blob_not_found)
+        remaining = []
+        async for blob in container.list_blobs():
+            remaining.append(blob)
+        self.assertEqual(remaining, [])
+
+    def test_delete_blobs_batch(self):
+        loop = asyncio.get_event_loop()
+        loop.run_until_complete(self._test_delete_blobs_batch())
+
 #------------------------------------------------------------------------------
 if __name__ == '__main__':
     unittest.main()
@@ -8,6 +8,7 @@
 import pytest
 import base64
 import os
+import struct
 import unittest
 
 from azure.core.exceptions import HttpResponseError
@@ -17,8 +18,10 @@ from azure.storage.blob import (
     ContainerClient,
     BlobClient,
     StorageErrorCode,
-    BlobProperties
+    BlobProperties,
+    TransferTuner
 )
+from azure.storage.blob._shared.validation import crc64
 from testcase import (
     StorageTestCase,
     TestMode,
@@ -347,6 +350,102 @@ class StorageGetBlobTest(StorageTestCase):
             self.config.max_single_get_size,
             progress)
 
+    def test_download_blob_to_file(self):
+        # parallel tests introduce random order of requests, can only run live
+        if TestMode.need_recording_file(self.test_mode):
+            return
+
+        # Arrange
+        blob = self.bsc.get_blob_client(self.container_name, self.byte_blob)
+
+        # Act
+        properties = blob.download_to_file(FILE_PATH, max_connections=4)
+
+        # Assert
+        self.assertIsInstance(properties, BlobProperties)
+        self.assertFalse(os.path.isfile(FILE_PATH + '.download'))
+        with open(FILE_PATH, 'rb') as stream:
+            actual = stream.read()
+            self.assertEqual(self.byte_data, actual)
+
+    def test_download_blob_to_file_resume(self):
+        # parallel tests introduce random order of requests, can only run live
+        if TestMode.need_recording_file(self.test_mode):
+            return
+
+        # Arrange
+        blob = self.bsc.get_blob_client(self.container_name, self.byte_blob)
+
+        def fail_after_first_chunk(response):
+            if response.context['download_stream_current'] > self.config.max_single_get_size:
+                raise ValueError("Interrupted")
+
+        with self.assertRaises(ValueError):
+            blob.download_to_file(FILE_PATH, max_connections=1, raw_response_hook=fail_after_first_chunk)
+        self.assertTrue(os.path.isfile(FILE_PATH + '.download'))
+
+        # Act
+        properties = blob.download_to_file(FILE_PATH, max_connections=4, resume=True)
+
+        # Assert
+        self.assertIsInstance(properties, BlobProperties)
+        self.assertFalse(os.path.isfile(FILE_PATH + '.download'))
+        with open(FILE_PATH, 'rb') as stream:
+            actual = stream.read()
+            self.assertEqual(self.byte_data, actual)
+
+    def test_get_blob_to_stream_autotune(self):
+        # parallel tests introduce random order of requests, can only run live
+        if TestMode.need_recording_file(self.test_mode):
+            return
+
+        # Arrange
+        blob = self.bsc.get_blob_client(self.container_name, self.byte_blob)
+        tuner = TransferTuner()
+
+        # Act
+        with open(FILE_PATH, 'wb') as stream:
+            properties = blob.download_blob().download_to_stream(stream, max_connections=4, autotune=tuner)
+
+        # Assert
+        self.assertIsInstance(properties, BlobProperties)
+        self.assertLessEqual(tuner.chunk_size, self.config.max_chunk_get_size)
+        with open(FILE_PATH, 'rb') as stream:
+            actual = stream.read()
+            self.assertEqual(self.byte_data, actual)
+
+    def test_get_blob_chunks_parallel(self):
+        # parallel tests introduce random order of requests, can only run live
+        if TestMode.need_recording_file(self.test_mode):
+            return
+
+        # Arrange
+        blob = self.bsc.get_blob_client(self.container_name, self.byte_blob)
+
+        # Act
+        downloader = blob.download_blob()
+        content = b"".join(downloader.chunks(max_connections=4, max_buffered_chunks=6))
+
+        # Assert
+        self.assertEqual(self.byte_data, content)
+
+    def test_get_blob_chunks_parallel_stop_early(self):
+        # parallel tests introduce random order of requests, can only run live
+        if TestMode.need_recording_file(self.test_mode):
+            return
+
+        # Arrange
+        blob = self.bsc.get_blob_client(self.container_name, self.byte_blob)
+
+        # Act
+        chunks = blob.download_blob().chunks(max_connections=2)
+        first = next(chunks)
+        second = next(chunks)
+        chunks.close()
+
+        # Assert
+        self.assertEqual(self.byte_data[:len(first) + len(second)], first + second)
+
     @record
     def test_get_blob_to_stream_non_parallel(self):
         # Arrange
@@ -833,6 +932,23 @@ class StorageGetBlobTest(StorageTestCase):
         # Assert
         self.assertEqual(self.byte_data, content)
 
+    def test_get_blob_with_crc64(self):
+        # parallel tests introduce random order of requests, can only run live
+        if TestMode.need_recording_file(self.test_mode):
+            return
+
+        # Arrange
+        blob = self.bsc.get_blob_client(self.container_name, self.byte_blob)
+
+        # Act
+        downloader = blob.download_blob(validate_content='crc64')
+        content = downloader.content_as_bytes(max_connections=2)
+
+        # Assert
+        self.assertEqual(self.byte_data, content)
+        self.assertEqual(
+            downloader.properties.composite_checksum, bytearray(struct.pack('<Q', crc64(self.byte_data))))
+
     def test_get_blob_range_to_stream_with_overall_md5(self):
         # parallel tests introduce random order of requests, can only run live
         if TestMode.need_recording_file(self.test_mode):
@@ -399,6 +399,28 @@ class StorageGetBlobTestAsync(StorageTestCase):
         loop = asyncio.get_event_loop()
         loop.run_until_complete(self._test_get_blob_to_stream_async())
 
+    async def _test_get_blob_chunks_parallel_async(self):
+        # parallel tests introduce random order of requests, can only run live
+        if TestMode.need_recording_file(self.test_mode):
+            return
+
+        # Arrange
+        await self._setup()
+        blob = self.bsc.get_blob_client(self.container_name, self.byte_blob)
+
+        # Act
+        downloader = await blob.download_blob()
+        content = b""
+        async for data in await downloader.chunks(max_connections=4, max_buffered_chunks=6):
+            content += data
+
+        # Assert
+        self.assertEqual(self.byte_data, content)
+
+    def test_get_blob_chunks_parallel_async(self):
+        loop = asyncio.get_event_loop()
+        loop.run_until_complete(self._test_get_blob_chunks_parallel_async())
+
     async def _test_get_blob_to_stream_with_progress_async(self):
         # parallel tests introduce random order of requests, can only run live
         if TestMode.need_recording_file(self.test_mode):
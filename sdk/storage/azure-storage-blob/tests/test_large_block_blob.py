@@ -16,7 +16,8 @@ from azure.storage.blob import (
     BlobServiceClient,
     ContainerClient,
     BlobClient,
-    ContentSettings
+    ContentSettings,
+    TransferTuner
 )
 
 if os.sys.version_info >= (3,):
@@ -181,6 +182,92 @@ class StorageLargeBlockBlobTest(StorageTestCase):
         # Assert
         self.assertBlobEqual(self.container_name, blob_name, data)
 
+    def test_create_large_blob_from_path_resumable(self):
+        # parallel tests introduce random order of requests, can only run live
+        if TestMode.need_recording_file(self.test_mode):
+            return
+
+        # Arrange
+        blob_name = self._get_blob_reference()
+        blob = self.bsc.get_blob_client(self.container_name, blob_name)
+        data = bytearray(os.urandom(LARGE_BLOB_SIZE))
+        with open(FILE_PATH, 'wb') as stream:
+            stream.write(data)
+        journal_path = FILE_PATH + '.journal'
+        staged = []
+
+        def fail_after_two_blocks(response):
+            staged.append(response)
+            if len(staged) > 2:
+                raise ValueError("Interrupted")
+
+        with open(FILE_PATH, 'rb') as stream:
+            with self.assertRaises(ValueError):
+                blob.upload_blob(
+                    stream, max_connections=1, journal_path=journal_path, raw_response_hook=fail_after_two_blocks)
+        self.assertTrue(os.path.isfile(journal_path))
+
+        # Act
+        with open(FILE_PATH, 'rb') as stream:
+            blob.upload_blob(stream, max_connections=2, journal_path=journal_path)
+
+        # Assert
+        self.assertFalse(os.path.isfile(journal_path))
+        self.assertBlobEqual(self.container_name, blob_name, data)
+
+    def test_create_large_blob_from_stream_resumable_with_changed_content(self):
+        # parallel tests introduce random order of requests, can only run live
+        if TestMode.need_recording_file(self.test_mode):
+            return
+
+        # Arrange
+        blob_name = self._get_blob_reference()
+        blob = self.bsc.get_blob_client(self.container_name, blob_name)
+        data = bytearray(os.urandom(LARGE_BLOB_SIZE))
+        journal_path = FILE_PATH + '.journal'
+        staged = []
+
+        def fail_after_two_blocks(response):
+            staged.append(response)
+            if len(staged) > 2:
+                raise ValueError("Interrupted")
+
+        with self.assertRaises(ValueError):
+            blob.upload_blob(
+                BytesIO(data), max_connections=1, journal_path=journal_path, raw_response_hook=fail_after_two_blocks)
+        self.assertTrue(os.path.isfile(journal_path))
+
+        # Act
+        # a stream without a file behind it is only described by its length, so the content of each block is checked
+        changed = bytearray(os.urandom(LARGE_BLOB_SIZE))
+        blob.upload_blob(BytesIO(changed), max_connections=2, journal_path=journal_path)
+
+        # Assert
+        self.assertFalse(os.path.isfile(journal_path))
+        self.assertBlobEqual(self.container_name, blob_name, changed)
+
+    def test_create_large_blob_from_path_autotune(self):
+        # parallel tests introduce random order of requests, can only run live
+        if TestMode.need_recording_file(self.test_mode):
+            return
+
+        # Arrange
+        blob_name = self._get_blob_reference()
+        blob = self.bsc.get_blob_client(self.container_name, blob_name)
+        data = bytearray(os.urandom(LARGE_BLOB_SIZE))
+        with open(FILE_PATH, 'wb') as stream:
+            stream.write(data)
+        tuner = TransferTuner(min_chunk_size=1024 * 1024)
+
+        # Act
+        with open(FILE_PATH, 'rb') as stream:
+            blob.upload_blob(stream, max_connections=4, autotune=tuner)
+
+        # Assert
+        self.assertBlobEqual(self.container_name, blob_name, data)
+        self.assertLessEqual(tuner.chunk_size, self.config.max_block_size)
+        self.assertLessEqual(tuner.concurrency, 4)
+
     def test_create_large_blob_from_path_with_md5(self):
         # parallel tests introduce random order of requests, can only run live
         if TestMode.need_recording_file(self.test_mode):
@@ -8,11 +8,14 @@
 
 import pytest
 
+import gzip
 import os
+import tempfile
 
+from azure.storage.blob import TransferTuner
 from azure.storage.blob._shared.uploads import SubStream
 from threading import Lock
-from io import (BytesIO, SEEK_SET)
+from io import (BytesIO, SEEK_SET, UnsupportedOperation)
 
 from testcase import (
     StorageTestCase,
@@ -21,6 +24,12 @@ from testcase import (
 # ------------------------------------------------------------------------------
 
 
+class NonSlicedStream(BytesIO):
+    # a stream whose buffer can't be sliced, which substreams read through their read buffer
+    def getbuffer(self):
+        raise UnsupportedOperation
+
+
 class StorageBlobUploadChunkingTest(StorageTestCase):
 
     # this is a white box test that's designed to make sure _Substream behaves properly
@@ -31,7 +40,7 @@ class StorageBlobUploadChunkingTest(StorageTestCase):
         # assuming the max size of the buffer is 4MB, this test needs to be updated if that has changed
         # the block size is 6MB for this test
         expected_data = data[0: 6 * 1024 * 1024]
-        wrapped_stream = BytesIO(data)  # simulate stream given by user
+        wrapped_stream = NonSlicedStream(data)  # simulate stream given by user
         lockObj = Lock()  # simulate multi-threaded environment
         substream = SubStream(wrapped_stream, stream_begin_index=0, length=6 * 1024 * 1024, lockObj=lockObj)
 
@@ -83,7 +92,7 @@ class StorageBlobUploadChunkingTest(StorageTestCase):
         # assuming the max size of the buffer is 4MB, this test needs to be updated if that has changed
         # the block size is 2MB for this test
         expected_data = data[0: 2 * 1024 * 1024]
-        wrapped_stream = BytesIO(expected_data)  # simulate stream given by user
+        wrapped_stream = NonSlicedStream(expected_data)  # simulate stream given by user
         lockObj = Lock()  # simulate multi-threaded environment
         substream = SubStream(wrapped_stream, stream_begin_index=0, length=2 * 1024 * 1024, lockObj=lockObj)
 
@@ -112,3 +121,115 @@ class StorageBlobUploadChunkingTest(StorageTestCase):
         finally:
             wrapped_stream.close()
             substream.close()
+
+    def test_sub_streams_of_memory_stream_are_slices(self):
+        data = os.urandom(6 * 1024 * 1024)
+        wrapped_stream = BytesIO(data)
+        lockObj = Lock()
+        substreams = [
+            SubStream(wrapped_stream, stream_begin_index=i, length=2 * 1024 * 1024, lockObj=lockObj)
+            for i in range(0, len(data), 2 * 1024 * 1024)]
+
+        try:
+            # reading from one substream doesn't move the others
+            data_chunk_1 = substreams[1].read(1 * 1024 * 1024)
+            data_chunk_2 = substreams[0].read(4 * 1024 * 1024)
+            self.assertIsInstance(data_chunk_1, memoryview)
+            self.assertEqual(data_chunk_1, data[2 * 1024 * 1024: 3 * 1024 * 1024])
+            self.assertEqual(data_chunk_2, data[0: 2 * 1024 * 1024])
+            self.assertEqual(0, len(substreams[0].read(1)))
+
+            # test seek and readinto
+            substreams[2].seek(1024, SEEK_SET)
+            buffer = bytearray(1024)
+            self.assertEqual(1024, substreams[2].readinto(buffer))
+            self.assertEqual(buffer, data[4 * 1024 * 1024 + 1024: 4 * 1024 * 1024 + 2048])
+            self.assertEqual(2048, substreams[2].tell())
+        finally:
+            for substream in substreams:
+                substream.close()
+
+        # closing the substreams releases the buffer of the wrapped stream, once the slices are dropped
+        del data_chunk_1, data_chunk_2
+        wrapped_stream.write(b'data')
+        wrapped_stream.close()
+
+    def test_sub_streams_of_file_use_positional_reads(self):
+        if not hasattr(os, 'pread'):
+            pytest.skip("Positional reads are not supported on this platform.")
+        data = os.urandom(6 * 1024 * 1024)
+        temp_file = tempfile.NamedTemporaryFile(delete=False)
+        try:
+            temp_file.write(data)
+            temp_file.close()
+            with open(temp_file.name, 'rb') as wrapped_stream:
+                substreams = [
+                    SubStream(wrapped_stream, stream_begin_index=i, length=4 * 1024 * 1024, lockObj=None)
+                    for i in (0, 3 * 1024 * 1024)]
+                try:
+                    # overlapping reads don't share the position of the file
+                    data_chunk_1 = substreams[1].read(2 * 1024 * 1024)
+                    data_chunk_2 = substreams[0].read(3 * 1024 * 1024)
+                    self.assertEqual(data_chunk_1, data[3 * 1024 * 1024: 5 * 1024 * 1024])
+                    self.assertEqual(data_chunk_2, data[0: 3 * 1024 * 1024])
+                    self.assertEqual(0, wrapped_stream.tell())
+
+                    # a substream reaching past the end of the file stops there
+                    self.assertEqual(substreams[1].read(4 * 1024 * 1024), data[5 * 1024 * 1024:])
+
+                    # test seek
+                    substreams[0].seek(3 * 1024 * 1024, SEEK_SET)
+                    self.assertEqual(substreams[0].read(2 * 1024 * 1024), data[3 * 1024 * 1024: 4 * 1024 * 1024])
+                finally:
+                    for substream in substreams:
+                        substream.close()
+        finally:
+            os.remove(temp_file.name)
+
+    def test_sub_streams_start_at_position_of_wrapped_stream(self):
+        if not hasattr(os, 'pread'):
+            pytest.skip("Positional reads are not supported on this platform.")
+        data = os.urandom(1024)
+        temp_file = tempfile.NamedTemporaryFile(delete=False)
+        try:
+            temp_file.write(data)
+            temp_file.close()
+            with open(temp_file.name, 'rb') as file_stream:
+                memory_stream = BytesIO(data)
+                for wrapped_stream in (file_stream, memory_stream):
+                    # the data to upload starts where the stream was left, as for the buffered reads
+                    wrapped_stream.seek(100)
+                    substream = SubStream(wrapped_stream, stream_begin_index=200, length=300, lockObj=None)
+                    try:
+                        self.assertEqual(substream.read(300), data[300:600])
+                    finally:
+                        substream.close()
+                memory_stream.close()
+        finally:
+            os.remove(temp_file.name)
+
+    def test_sub_streams_of_gzip_file_read_uncompressed_content(self):
+        data = os.urandom(256) * 1024
+        temp_file = tempfile.NamedTemporaryFile(delete=False)
+        try:
+            with gzip.GzipFile(fileobj=temp_file, mode='wb') as compressed:
+                compressed.write(data)
+            temp_file.close()
+            with gzip.open(temp_file.name, 'rb') as wrapped_stream:
+                # the descriptor of a gzip stream is the one of the compressed file, which can't be read at an offset
+                substream = SubStream(wrapped_stream, stream_begin_index=1000, length=4000, lockObj=Lock())
+                try:
+                    self.assertEqual(substream.read(4000), data[1000:5000])
+                finally:
+                    substream.close()
+        finally:
+            os.remove(temp_file.name)
+
+    def test_autotune_chunk_size_not_below_required_minimum(self):
+        # a blob of 50,000 blocks needs blocks of at least length / 50,000 bytes, which isn't a multiple of 512
+        tuner = TransferTuner(min_chunk_size=1024)
+        required = 4 * 1024 * 1024 + 100
+        tuner.configure(max_chunk_size=100 * 1024 * 1024, max_connections=4, min_chunk_size=required)
+
+        self.assertGreaterEqual(tuner.chunk_size, required)
+        self.assertEqual(tuner.chunk_size % TransferTuner.alignment, 0)
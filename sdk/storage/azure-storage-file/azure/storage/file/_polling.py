@@ -3,35 +3,68 @@
 # Licensed under the MIT License. See License.txt in the project root for
 # license information.
 # --------------------------------------------------------------------------
+import email.utils
 import logging
 import time
-from typing import Any, Callable
+from typing import Any, Callable, Optional  # pylint: disable=unused-import
 from azure.core.polling import PollingMethod
 
-from ._shared.response_handlers import process_storage_error
+from ._shared.response_handlers import process_storage_error, return_response_headers
 from ._generated.models import StorageErrorException
 
 
 logger = logging.getLogger(__name__)
 
 
+def get_retry_after(response):
+    # type: (Any) -> Optional[float]
+    """The delay requested by the Retry-After header of a response, in seconds."""
+    retry_after = response.headers.get('Retry-After')
+    if retry_after is None:
+        return None
+    try:
+        return max(float(retry_after), 0)
+    except ValueError:
+        retry_date = email.utils.parsedate_tz(retry_after)
+        if retry_date is None:
+            return None
+        return max(email.utils.mktime_tz(retry_date) - time.time(), 0)
+
+
 class CloseHandles(PollingMethod):
 
     def __init__(self, interval):
         self._command = None
         self._continuation_token = None
         self._exception = None
+        self._retry_after = None
         self.handles_closed = 0
         self.polling_interval = interval
 
+    def _return_status(self, response, deserialized, response_headers):
+        self._retry_after = get_retry_after(response)
+        return return_response_headers(response, deserialized, response_headers)
+
     def _update_status(self):
         try:
-            status = self._command(marker=self._continuation_token)
+            status = self._command(marker=self._continuation_token, cls=self._return_status)
         except StorageErrorException as error:
             process_storage_error(error)
         self._continuation_token = status.get('marker')
         self.handles_closed += status.get('number_of_handles_closed') or 0
 
+    def update_status(self):
+        # type: () -> None
+        """Closes the next batch of handles."""
+        self._update_status()
+
+    def get_polling_interval(self):
+        # type: () -> float
+        """The polling interval, or the delay requested by the service with Retry-After."""
+        if self._retry_after is not None:
+            return self._retry_after
+        return self.polling_interval
+
     def initialize(self, command, initial_status, _):  # pylint: disable=arguments-differ
         # type: (Any, Any, Callable) -> None
         self._command = command
@@ -43,7 +76,7 @@ class CloseHandles(PollingMethod):
         try:
             while not self.finished():
                 self._update_status()
-                time.sleep(self.polling_interval)
+                time.sleep(self.get_polling_interval())
         except Exception as e:
             logger.warning(str(e))
             raise
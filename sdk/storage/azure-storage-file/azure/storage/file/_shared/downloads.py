@@ -4,16 +4,22 @@
 # license information.
 # --------------------------------------------------------------------------
 
+import os
 import sys
+import json
 import threading
+from collections import deque
 from io import BytesIO
+from itertools import islice
 
 from azure.core.exceptions import HttpResponseError
 from azure.core.tracing.context import tracing_context
 
 from .request_handlers import validate_and_format_range_headers
 from .response_handlers import process_storage_error, parse_length_from_content_range
-from .encryption import decrypt_blob
+from .encryption import decrypt_blob, get_blob_region_info, get_encrypted_region_info
+from .tuning import get_tuner
+from .validation import get_range_validation_options, get_transfer_checksum
 
 
 def process_range_and_offset(start_range, end_range, length, encryption):
@@ -39,10 +45,86 @@ def process_range_and_offset(start_range, end_range, length, encryption):
     return (start_range, end_range), (start_offset, end_offset)
 
 
-def process_content(data, start_offset, end_offset, encryption):
+def process_region_range(start_range, end_range, region_info):
+    """Returns the range of the encrypted regions holding the bytes of a blob from start_range
+    to end_range inclusive, and the range of the bytes to keep once they are decrypted."""
+    first_region = start_range // region_info.data_length
+    last_region = end_range // region_info.data_length
+    region_range = (first_region * region_info.region_length, (last_region + 1) * region_info.region_length - 1)
+    return region_range, (start_range, end_range)
+
+
+def is_encrypted(encryption):
+    return encryption.get("key") is not None or encryption.get("resolver") is not None
+
+
+def get_initial_range(downloader, region_info=None):
+    """Returns the range of the first request of a download, and the offsets of the requested bytes in it.
+
+    It is requested before it is known how the blob is encrypted, so the range is mapped
+    to the regions of the given layout, if any, or aligned to the blocks of AES-CBC.
+    """
+    start, end = downloader.requested_range
+    downloader.encryption_options["regions"] = region_info
+    if region_info:
+        return process_region_range(start, end, region_info)
+    return process_range_and_offset(start, end, downloader.length, downloader.encryption_options)
+
+
+def process_encrypted_regions(downloader, response):
+    """Moves a download to the offsets of the plaintext, if the blob is encrypted in regions.
+
+    The whole regions at the start of the first response are kept. Returns whether
+    the first range must be requested again, because it was mapped for the wrong
+    encryption protocol, or doesn't start with the region of the first byte.
+    """
+    region_info = get_encrypted_region_info(response.response.headers) if downloader.download_size else None
+    if region_info is None:
+        if downloader.encryption_options.get("regions") is None:
+            return False
+        downloader.initial_range, downloader.initial_offset = get_initial_range(downloader)
+        return bool(downloader.download_size)
+
+    encrypted_size = downloader.file_size
+    downloader.file_size = region_info.get_plaintext_length(encrypted_size)
+    downloader.download_size = downloader.get_download_size()
+    start, end = downloader.requested_range
+    end = min(end, downloader.file_size - 1)
+
+    content_range = response.properties.content_range.split(" ")[1].split("/")[0]
+    content_start, content_end = [int(i) for i in content_range.split("-")]
+    first_region = start // region_info.data_length
+    covered_end = end
+    if content_end < encrypted_size - 1:
+        regions = (content_end + 1 - content_start) // region_info.region_length
+        covered_end = min(end, (first_region + regions) * region_info.data_length - 1)
+    if content_start != first_region * region_info.region_length or covered_end < start:
+        downloader.initial_range, downloader.initial_offset = get_initial_range(downloader, region_info)
+        return True
+    downloader.encryption_options["regions"] = region_info
+    downloader.initial_range = downloader.initial_offset = (start, covered_end)
+    return False
+
+
+
+def get_initial_end(downloader):
+    """Returns the offset of the first byte after the content kept from the first response.
+
+    The first range of a blob encrypted with AES-CBC is aligned past the requested end, and
+    the bytes past it are dropped once decrypted, so the later chunks must request them again.
+    """
+    if downloader.encryption_options.get("regions"):
+        return downloader.initial_range[1] + 1
+    return downloader.initial_range[1] - downloader.initial_offset[1] + 1
+
+def process_content(data, start_offset, end_offset, encryption, checksum=None, offset=None):
     if data is None:
         raise ValueError("Response cannot be None.")
-    content = b"".join(list(data))
+    if checksum:
+        # Checksummed as the chunks of the response are joined, not read again afterwards
+        content = checksum.read(data, None if is_encrypted(encryption) else offset)
+    else:
+        content = b"".join(list(data))
     if content and encryption.get("key") is not None or encryption.get("resolver") is not None:
         try:
             return decrypt_blob(
@@ -71,6 +153,8 @@ class _ChunkDownloader(object):
         stream=None,
         validate_content=None,
         encryption_options=None,
+        tuner=None,
+        checksum=None,
         **kwargs
     ):
 
@@ -90,12 +174,23 @@ class _ChunkDownloader(object):
 
         # encryption
         self.encryption_options = encryption_options
+        region_info = encryption_options.get("regions") if encryption_options else None
+        if region_info:
+            # Chunks of whole regions don't download the regions they share twice
+            self.chunk_size = region_info.align(chunk_size)
+
+        # chunk size and concurrency tuning, if enabled
+        self.tuner = tuner
+        self.chunk_ends = {}
 
         # parameters for each get operation
         self.validate_content = validate_content
+        self.checksum = checksum or get_transfer_checksum(validate_content)
         self.request_options = kwargs
 
     def _calculate_range(self, chunk_start):
+        if chunk_start in self.chunk_ends:
+            return chunk_start, self.chunk_ends.pop(chunk_start)
         if chunk_start + self.chunk_size > self.end_index:
             chunk_end = self.end_index
         else:
@@ -105,13 +200,25 @@ class _ChunkDownloader(object):
     def get_chunk_offsets(self):
         index = self.start_index
         while index < self.end_index:
+            if self.tuner:
+                # A tuned chunk is sized when it is scheduled
+                chunk_size = self.tuner.chunk_size
+                if self.encryption_options and self.encryption_options.get("regions"):
+                    chunk_size = self.encryption_options["regions"].align(chunk_size)
+                chunk_end = min(index + chunk_size, self.end_index)
+                self.chunk_ends[index] = chunk_end
+            else:
+                chunk_end = index + self.chunk_size
             yield index
-            index += self.chunk_size
+            index = chunk_end
 
     def process_chunk(self, chunk_start):
         chunk_start, chunk_end = self._calculate_range(chunk_start)
+        started = self.tuner.start() if self.tuner else None
         chunk_data = self._download_chunk(chunk_start, chunk_end)
         length = chunk_end - chunk_start
+        if self.tuner:
+            self.tuner.record(length, started)
         if length > 0:
             self._write_to_stream(chunk_data, chunk_start)
             self._update_progress(length)
@@ -129,26 +236,32 @@ class _ChunkDownloader(object):
         pass
 
     def _download_chunk(self, chunk_start, chunk_end):
-        download_range, offset = process_range_and_offset(
-            chunk_start, chunk_end, chunk_end, self.encryption_options
-        )
+        region_info = self.encryption_options.get("regions")
+        if region_info:
+            download_range, offset = process_region_range(chunk_start, chunk_end - 1, region_info)
+        else:
+            download_range, offset = process_range_and_offset(
+                chunk_start, chunk_end - 1, chunk_end - 1, self.encryption_options
+            )
+        # The regions are authenticated, and longer than the ranges the service returns a checksum for
+        checksum = None if region_info else self.checksum
         range_header, range_validation = validate_and_format_range_headers(
-            download_range[0], download_range[1] - 1, check_content_md5=self.validate_content
+            download_range[0], download_range[1], check_content_md5=bool(checksum)
         )
 
         try:
             _, response = self.service.download(
                 range=range_header,
-                range_get_content_md5=range_validation,
-                validate_content=self.validate_content,
                 data_stream_total=self.total_size,
                 download_stream_current=self.progress_total,
-                **self.request_options
+                **dict(self.request_options, **get_range_validation_options(
+                    checksum and checksum.mode, range_validation))
             )
         except HttpResponseError as error:
             process_storage_error(error)
 
-        chunk_data = process_content(response, offset[0], offset[1], self.encryption_options)
+        chunk_data = process_content(
+            response, offset[0], offset[1], self.encryption_options, checksum=checksum, offset=chunk_start)
 
         # This makes sure that if_match is set so that we can validate
         # that subsequent downloads are to an unmodified blob
@@ -169,6 +282,8 @@ class ParallelChunkDownloader(_ChunkDownloader):
         stream=None,
         validate_content=None,
         encryption_options=None,
+        tuner=None,
+        checksum=None,
         **kwargs
     ):
         super(ParallelChunkDownloader, self).__init__(
@@ -181,6 +296,8 @@ class ParallelChunkDownloader(_ChunkDownloader):
             stream=stream,
             validate_content=validate_content,
             encryption_options=encryption_options,
+            tuner=tuner,
+            checksum=checksum,
             **kwargs
         )
 
@@ -212,6 +329,163 @@ class SequentialChunkDownloader(_ChunkDownloader):
         self.stream.write(chunk_data)
 
 
+class FileChunkDownloader(_ChunkDownloader):
+    """Writes each chunk at its own position of a file descriptor.
+
+    Positional writes don't move a shared file offset, so the worker threads don't
+    need to take a lock to write their chunks. Where they are unavailable, the writes
+    fall back to a locked seek and write.
+    """
+
+    def __init__(self, fd=None, file_start=0, manifest=None, completed=None, **kwargs):
+        super(FileChunkDownloader, self).__init__(**kwargs)
+        self.fd = fd
+        self.file_start = file_start
+        self.manifest = manifest
+        self.completed = completed or set()
+        self.progress_lock = threading.Lock()
+        self.write_lock = None if hasattr(os, "pwrite") else threading.Lock()
+
+    def get_chunk_offsets(self):
+        for index in super(FileChunkDownloader, self).get_chunk_offsets():
+            if index not in self.completed:
+                yield index
+
+    def _update_progress(self, length):
+        with self.progress_lock:
+            self.progress_total += length
+
+    def _write_to_stream(self, chunk_data, chunk_start):
+        write_at(self.fd, chunk_data, self.file_start + (chunk_start - self.start_index), self.write_lock)
+        if self.manifest:
+            self.manifest.add(chunk_start)
+
+
+def write_at(fd, data, position, lock=None):
+    """Write all the data at the given position of the file descriptor.
+
+    Without positional writes, the seek and the write are done holding the lock, if any.
+    """
+    view = memoryview(data)
+    if hasattr(os, "pwrite"):
+        while view:
+            written = os.pwrite(fd, view, position)
+            view = view[written:]
+            position += written
+        return
+    if lock:
+        lock.acquire()
+    try:
+        os.lseek(fd, position, os.SEEK_SET)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        if lock:
+            lock.release()
+
+
+class DownloadManifest(object):
+    """A sidecar file recording the chunks of a download to file that are complete.
+
+    The first line describes the download, each following line is the offset of a
+    chunk written to the file. Lines are appended with single writes to a file opened
+    in append mode, so the workers don't need a lock to record their chunks.
+
+    :param str path: The path of the manifest.
+    :param dict state: The download the manifest belongs to.
+    """
+
+    SUFFIX = ".download"
+
+    def __init__(self, path, state):
+        self.path = path
+        self.state = state
+        self._fd = None
+
+    def read(self):
+        """Returns the completed offsets, or None if there is no manifest for this download."""
+        try:
+            with open(self.path, "r") as manifest:
+                lines = manifest.read().splitlines()
+        except (IOError, OSError):
+            return None
+        try:
+            if not lines or json.loads(lines[0]) != self.state:
+                return None
+            # The last line may have been cut short by an interruption
+            return set(int(line) for line in lines[1:] if line.strip().isdigit())
+        except ValueError:
+            return None
+
+    def open(self, completed):
+        flags = os.O_WRONLY | os.O_APPEND | os.O_CREAT
+        if completed is None:
+            flags |= os.O_TRUNC
+        self._fd = os.open(self.path, flags, 0o644)
+        if completed is None:
+            self._write(json.dumps(self.state, sort_keys=True))
+
+    def _write(self, line):
+        os.write(self._fd, (line + "\n").encode("utf-8"))
+
+    def add(self, offset):
+        self._write(str(offset))
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def remove(self):
+        self.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+def _process_chunks_tuned(executor, downloader, tuner):
+    """Download the chunks over the executor, keeping as many in flight as the tuner chose."""
+    import concurrent.futures
+    process_chunk = tracing_context.with_current_context(downloader.process_chunk)
+    offsets = downloader.get_chunk_offsets()
+    running = set()
+    while True:
+        for offset in islice(offsets, max(tuner.concurrency - len(running), 0)):
+            running.add(executor.submit(process_chunk, offset))
+        if not running:
+            break
+        done, running = concurrent.futures.wait(running, return_when=concurrent.futures.FIRST_COMPLETED)
+        for future in done:
+            future.result()
+
+
+def _iter_chunks_in_order(downloader, max_connections, max_buffered_chunks):
+    """Download the chunks over several threads, and yield them in order.
+
+    The futures are kept in submission order, so the ones that complete early wait
+    in the queue until the chunks before them have been consumed.
+    """
+    import concurrent.futures
+    executor = concurrent.futures.ThreadPoolExecutor(max_connections)
+    yield_chunk = tracing_context.with_current_context(downloader.yield_chunk)
+    offsets = downloader.get_chunk_offsets()
+    pending = deque()
+    try:
+        for offset in islice(offsets, max_buffered_chunks):
+            pending.append(executor.submit(yield_chunk, offset))
+        while pending:
+            chunk = pending.popleft().result()
+            for offset in islice(offsets, 1):
+                pending.append(executor.submit(yield_chunk, offset))
+            yield chunk
+    finally:
+        # The consumer may stop iterating early: don't download what won't be read.
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
 class StorageStreamDownloader(object):  # pylint: disable=too-many-instance-attributes
     """A streaming object to download from Azure Storage.
 
@@ -235,6 +509,7 @@ class StorageStreamDownloader(object):  # pylint: disable=too-many-instance-attr
         self.offset = offset
         self.length = length
         self.validate_content = validate_content
+        self.checksum = get_transfer_checksum(validate_content)
         self.encryption_options = encryption_options or {}
         self.request_options = kwargs
         self.location_mode = None
@@ -251,10 +526,13 @@ class StorageStreamDownloader(object):  # pylint: disable=too-many-instance-attr
             initial_request_end = self.length
         else:
             initial_request_end = initial_request_start + self.first_get_size - 1
+        self.requested_range = (initial_request_start, initial_request_end)
 
-        self.initial_range, self.initial_offset = process_range_and_offset(
-            initial_request_start, initial_request_end, self.length, self.encryption_options
-        )
+        # Until a response tells how the blob is encrypted, expect the protocol the client encrypts with
+        region_info = None
+        if is_encrypted(self.encryption_options):
+            region_info = get_blob_region_info(self.encryption_options.get("version"))
+        self.initial_range, self.initial_offset = get_initial_range(self, region_info)
 
         self.download_size = None
         self.file_size = None
@@ -278,20 +556,44 @@ class StorageStreamDownloader(object):  # pylint: disable=too-many-instance-attr
         # TODO: Set to the stored MD5 when the service returns this
         self.properties.content_md5 = None
 
+        # The checksum composed from the chunks is only known once they are all downloaded
+        self.properties.composite_checksum = None
+
     def __len__(self):
         return self.download_size
 
     def __iter__(self):
+        return self.chunks()
+
+    def chunks(self, max_connections=1, max_buffered_chunks=None):
+        """Iterate over the contents of this file in order, chunk by chunk.
+
+        With more than one connection, the ranges ahead of the consumer are downloaded
+        in parallel and reassembled in order, so the target doesn't need to be seekable.
+        At most "max_buffered_chunks" chunks are downloaded ahead of the consumer, which
+        bounds the memory used whatever the size of the file.
+
+        :param int max_connections:
+            The number of parallel connections with which to download.
+        :param int max_buffered_chunks:
+            The maximum number of chunks downloaded, or being downloaded, ahead of the
+            consumer. Defaults to twice the number of connections.
+        :rtype: Iterator[bytes]
+        """
+        if max_buffered_chunks is None:
+            max_buffered_chunks = 2 * max_connections
+        if max_buffered_chunks < max_connections:
+            raise ValueError("max_buffered_chunks must be at least max_connections.")
+
         if self.download_size == 0:
             content = b""
         else:
-            content = process_content(
-                self.response, self.initial_offset[0], self.initial_offset[1], self.encryption_options
-            )
+            content = self._process_initial_content()
 
         if content is not None:
             yield content
         if self._download_complete:
+            self._set_composite_checksum()
             return
 
         data_end = self.file_size
@@ -304,35 +606,63 @@ class StorageStreamDownloader(object):  # pylint: disable=too-many-instance-attr
             total_size=self.download_size,
             chunk_size=self.config.max_chunk_get_size,
             current_progress=self.first_get_size,
-            start_range=self.initial_range[1] + 1,  # start where the first download ended
+            start_range=get_initial_end(self),  # start after the content kept from the first download
             end_range=data_end,
             stream=None,
             validate_content=self.validate_content,
+            checksum=self.checksum,
             encryption_options=self.encryption_options,
             use_location=self.location_mode,
             **self.request_options
         )
 
-        for chunk in downloader.get_chunk_offsets():
-            yield downloader.yield_chunk(chunk)
+        if max_connections > 1:
+            for chunk in _iter_chunks_in_order(downloader, max_connections, max_buffered_chunks):
+                yield chunk
+        else:
+            for chunk in downloader.get_chunk_offsets():
+                yield downloader.yield_chunk(chunk)
+        self._set_composite_checksum()
 
-    def _initial_request(self):
+    def _get_range_checksum(self):
+        # The regions are authenticated, and longer than the ranges the service returns a checksum for
+        return None if self.encryption_options.get("regions") else self.checksum
+
+    def _process_initial_content(self):
+        return process_content(
+            self.response, self.initial_offset[0], self.initial_offset[1], self.encryption_options,
+            checksum=self._get_range_checksum(), offset=self.initial_range[0]
+        )
+
+    def _set_composite_checksum(self):
+        if self.checksum:
+            self.properties.composite_checksum = self.checksum.value
+
+    def get_download_size(self):
+        if self.length is not None:
+            # Use the length unless it is over the end of the file
+            return min(self.file_size, self.length - self.offset + 1)
+        if self.offset is not None:
+            return self.file_size - self.offset
+        return self.file_size
+
+    def _initial_request(self, retry=True):
+        checksum = self._get_range_checksum()
         range_header, range_validation = validate_and_format_range_headers(
             self.initial_range[0],
             self.initial_range[1],
             start_range_required=False,
             end_range_required=False,
-            check_content_md5=self.validate_content
+            check_content_md5=bool(checksum)
         )
 
         try:
             location_mode, response = self.service.download(
                 range=range_header,
-                range_get_content_md5=range_validation,
-                validate_content=self.validate_content,
                 data_stream_total=None,
                 download_stream_current=0,
-                **self.request_options
+                **dict(self.request_options, **get_range_validation_options(
+                    checksum and checksum.mode, range_validation))
             )
 
             # Check the location we read from to ensure we use the same one
@@ -342,13 +672,7 @@ class StorageStreamDownloader(object):  # pylint: disable=too-many-instance-attr
             # Parse the total file size and adjust the download size if ranges
             # were specified
             self.file_size = parse_length_from_content_range(response.properties.content_range)
-            if self.length is not None:
-                # Use the length unless it is over the end of the file
-                self.download_size = min(self.file_size, self.length - self.offset + 1)
-            elif self.offset is not None:
-                self.download_size = self.file_size - self.offset
-            else:
-                self.download_size = self.file_size
+            self.download_size = self.get_download_size()
 
         except HttpResponseError as error:
             if self.offset is None and error.response.status_code == 416:
@@ -371,9 +695,22 @@ class StorageStreamDownloader(object):  # pylint: disable=too-many-instance-attr
             else:
                 process_storage_error(error)
 
+        if is_encrypted(self.encryption_options) and process_encrypted_regions(self, response):
+            if not retry:
+                raise HttpResponseError(
+                    message="The encryption of the blob changed during the download.", response=response.response)
+            # Lock on the etag, so that the range is requested again from the same blob
+            if self.request_options.get("modified_access_conditions"):
+                if not self.request_options["modified_access_conditions"].if_match:
+                    self.request_options["modified_access_conditions"].if_match = response.properties.etag
+            return self._initial_request(retry=False)
+
         # If the file is small, the download is complete at this point.
         # If file size is large, download the rest of the file in chunks.
-        if response.properties.size != self.download_size:
+        received_size = response.properties.size
+        if self.encryption_options.get("regions"):
+            received_size = self.initial_range[1] - self.initial_range[0] + 1
+        if received_size != self.download_size:
             # Lock on the etag. This can be overriden by the user by specifying '*'
             if self.request_options.get("modified_access_conditions"):
                 if not self.request_options["modified_access_conditions"].if_match:
@@ -383,39 +720,58 @@ class StorageStreamDownloader(object):  # pylint: disable=too-many-instance-attr
 
         return response
 
-    def content_as_bytes(self, max_connections=1):
+    def content_as_bytes(self, max_connections=1, autotune=False):
         """Download the contents of this file.
 
         This operation is blocking until all data is downloaded.
 
         :param int max_connections:
             The number of parallel connections with which to download.
+        :param autotune:
+            Whether to tune the chunk size and the number of connections while downloading,
+            within the configured chunk size and `max_connections`. A TransferTuner can be
+            passed to configure the tuning or reuse the parameters chosen for a previous transfer.
+        :type autotune: bool or TransferTuner
         :rtype: bytes
         """
         stream = BytesIO()
-        self.download_to_stream(stream, max_connections=max_connections)
+        self.download_to_stream(stream, max_connections=max_connections, autotune=autotune)
         return stream.getvalue()
 
-    def content_as_text(self, max_connections=1, encoding="UTF-8"):
+    def content_as_text(self, max_connections=1, encoding="UTF-8", autotune=False):
         """Download the contents of this file, and decode as text.
 
         This operation is blocking until all data is downloaded.
 
         :param int max_connections:
             The number of parallel connections with which to download.
+        :param autotune:
+            Whether to tune the chunk size and the number of connections while downloading,
+            within the configured chunk size and `max_connections`. A TransferTuner can be
+            passed to configure the tuning or reuse the parameters chosen for a previous transfer.
+        :type autotune: bool or TransferTuner
         :rtype: str
         """
-        content = self.content_as_bytes(max_connections=max_connections)
+        content = self.content_as_bytes(max_connections=max_connections, autotune=autotune)
         return content.decode(encoding)
 
-    def download_to_stream(self, stream, max_connections=1):
+    def download_to_stream(self, stream, max_connections=1, autotune=False):
         """Download the contents of this file to a stream.
 
         :param stream:
             The stream to download to. This can be an open file-handle,
             or any writable stream. The stream must be seekable if the download
             uses more than one parallel connection.
-        :returns: The properties of the downloaded file.
+        :param int max_connections:
+            The number of parallel connections with which to download.
+        :param autotune:
+            Whether to tune the chunk size and the number of connections while downloading,
+            within the configured chunk size and `max_connections`. A TransferTuner can be
+            passed to configure the tuning or reuse the parameters chosen for a previous transfer.
+        :type autotune: bool or TransferTuner
+        :returns: The properties of the downloaded file. If the content was validated,
+            their `composite_checksum` is the checksum composed from the ones of the
+            downloaded chunks, which with CRC64 is the CRC64 of the whole content.
         :rtype: Any
         """
         # the stream must be seekable if parallel download is required
@@ -432,14 +788,13 @@ class StorageStreamDownloader(object):  # pylint: disable=too-many-instance-attr
         if self.download_size == 0:
             content = b""
         else:
-            content = process_content(
-                self.response, self.initial_offset[0], self.initial_offset[1], self.encryption_options
-            )
+            content = self._process_initial_content()
 
         # Write the content to the user stream
         if content is not None:
             stream.write(content)
         if self._download_complete:
+            self._set_composite_checksum()
             return self.properties
 
         data_end = self.file_size
@@ -447,17 +802,20 @@ class StorageStreamDownloader(object):  # pylint: disable=too-many-instance-attr
             # Use the length unless it is over the end of the file
             data_end = min(self.file_size, self.length + 1)
 
+        tuner = get_tuner(autotune, self.config.max_chunk_get_size, max_connections)
         downloader_class = ParallelChunkDownloader if max_connections > 1 else SequentialChunkDownloader
         downloader = downloader_class(
             service=self.service,
             total_size=self.download_size,
             chunk_size=self.config.max_chunk_get_size,
             current_progress=self.first_get_size,
-            start_range=self.initial_range[1] + 1,  # start where the first download ended
+            start_range=get_initial_end(self),  # start after the content kept from the first download
             end_range=data_end,
             stream=stream,
             validate_content=self.validate_content,
+            checksum=self.checksum,
             encryption_options=self.encryption_options,
+            tuner=tuner,
             use_location=self.location_mode,
             **self.request_options
         )
@@ -465,12 +823,124 @@ class StorageStreamDownloader(object):  # pylint: disable=too-many-instance-attr
         if max_connections > 1:
             import concurrent.futures
             executor = concurrent.futures.ThreadPoolExecutor(max_connections)
-            list(executor.map(
-                    tracing_context.with_current_context(downloader.process_chunk),
-                    downloader.get_chunk_offsets()
-                ))
+            if tuner:
+                _process_chunks_tuned(executor, downloader, tuner)
+            else:
+                list(executor.map(
+                        tracing_context.with_current_context(downloader.process_chunk),
+                        downloader.get_chunk_offsets()
+                    ))
         else:
             for chunk in downloader.get_chunk_offsets():
                 downloader.process_chunk(chunk)
 
+        if tuner:
+            tuner.finish()
+        self._set_composite_checksum()
+        return self.properties
+
+    def _download_state(self, data_end):
+        return {
+            "etag": self.properties.etag,
+            "offset": self.offset,
+            "length": self.length,
+            "size": self.download_size,
+            "chunk_size": self.config.max_chunk_get_size,
+            "start": get_initial_end(self),
+            "end": data_end
+        }
+
+    def download_to_file(self, file_path, max_connections=1, resume=False):
+        """Download the contents of this file to a local file.
+
+        The file is allocated to its final size, and each connection writes its chunks
+        directly at their position in the file. The chunks written so far are recorded in
+        a sidecar manifest next to the file, which is removed when the download completes.
+
+        :param str file_path:
+            The path of the file to download to.
+        :param int max_connections:
+            The number of parallel connections with which to download.
+        :param bool resume:
+            Whether to only download the chunks missing from a previous, interrupted
+            download of the same content to the same file. The download starts over if
+            the content changed since. Default value is False.
+        :returns: The properties of the downloaded file.
+        :rtype: Any
+        """
+        if self.download_size == 0:
+            content = b""
+        else:
+            content = self._process_initial_content()
+        content = content or b""
+
+        data_end = self.file_size
+        if self.length is not None:
+            # Use the length unless it is over the end of the file
+            data_end = min(self.file_size, self.length + 1)
+        start_range = get_initial_end(self)  # start after the content kept from the first download
+
+        manifest = DownloadManifest(file_path + DownloadManifest.SUFFIX, self._download_state(data_end))
+        completed = None
+        if resume and not self._download_complete and os.path.isfile(file_path):
+            completed = manifest.read()
+
+        fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o644)
+        try:
+            if completed is None:
+                os.ftruncate(fd, 0)
+            if self._download_complete:
+                write_at(fd, content, 0)
+                manifest.remove()
+                self._set_composite_checksum()
+                return self.properties
+
+            os.ftruncate(fd, len(content) + max(data_end - start_range, 0))
+            manifest.open(completed)
+            downloader = FileChunkDownloader(
+                fd=fd,
+                file_start=len(content),
+                manifest=manifest,
+                completed=completed,
+                service=self.service,
+                total_size=self.download_size,
+                chunk_size=self.config.max_chunk_get_size,
+                current_progress=self.first_get_size,
+                start_range=start_range,
+                end_range=data_end,
+                stream=None,
+                validate_content=self.validate_content,
+                checksum=self.checksum,
+                encryption_options=self.encryption_options,
+                use_location=self.location_mode,
+                **self.request_options
+            )
+            write_at(fd, content, 0)
+
+            if max_connections > 1:
+                import concurrent.futures
+                executor = concurrent.futures.ThreadPoolExecutor(max_connections)
+                process_chunk = tracing_context.with_current_context(downloader.process_chunk)
+                futures = [executor.submit(process_chunk, chunk) for chunk in downloader.get_chunk_offsets()]
+                try:
+                    for future in futures:
+                        future.result()
+                finally:
+                    # The chunks being written must be done before the file is closed
+                    for future in futures:
+                        future.cancel()
+                    executor.shutdown(wait=True)
+            else:
+                for chunk in downloader.get_chunk_offsets():
+                    downloader.process_chunk(chunk)
+        except BaseException:
+            manifest.close()
+            raise
+        finally:
+            os.close(fd)
+
+        manifest.remove()
+        if completed is None:
+            # The chunks of a previous download weren't checksummed
+            self._set_composite_checksum()
         return self.properties
@@ -4,8 +4,10 @@
 # license information.
 # --------------------------------------------------------------------------
 
+import os
 import sys
 import asyncio
+from collections import deque
 from io import BytesIO
 from itertools import islice
 
@@ -13,14 +15,21 @@ from azure.core.exceptions import HttpResponseError
 
 from .request_handlers import validate_and_format_range_headers
 from .response_handlers import process_storage_error, parse_length_from_content_range
-from .encryption import decrypt_blob
-from .downloads import process_range_and_offset
+from .encryption import decrypt_blob, get_blob_region_info
+from .tuning import get_tuner
+from .validation import get_range_validation_options, get_transfer_checksum
+from .downloads import (
+    process_range_and_offset, process_region_range, is_encrypted, get_initial_range, get_initial_end,
+    process_encrypted_regions,
+    write_at, DownloadManifest)
 
 
-async def process_content(data, start_offset, end_offset, encryption):
+async def process_content(data, start_offset, end_offset, encryption, checksum=None, offset=None):
     if data is None:
         raise ValueError("Response cannot be None.")
     content = data.response.body()
+    if checksum:
+        checksum.validate(data.response, content, None if is_encrypted(encryption) else offset)
     if encryption.get('key') is not None or encryption.get('resolver') is not None:
         try:
             return decrypt_blob(
@@ -52,6 +61,8 @@ class _AsyncChunkDownloader(object):  # pylint: disable=too-many-instance-attrib
             parallel=None,
             validate_content=None,
             encryption_options=None,
+            tuner=None,
+            checksum=None,
             **kwargs):
 
         self.service = service
@@ -76,12 +87,23 @@ class _AsyncChunkDownloader(object):  # pylint: disable=too-many-instance-attrib
 
         # encryption
         self.encryption_options = encryption_options
+        region_info = encryption_options.get('regions') if encryption_options else None
+        if region_info:
+            # Chunks of whole regions don't download the regions they share twice
+            self.chunk_size = region_info.align(chunk_size)
+
+        # chunk size and concurrency tuning, if enabled
+        self.tuner = tuner
+        self.chunk_ends = {}
 
         # parameters for each get operation
         self.validate_content = validate_content
+        self.checksum = checksum or get_transfer_checksum(validate_content)
         self.request_options = kwargs
 
     def _calculate_range(self, chunk_start):
+        if chunk_start in self.chunk_ends:
+            return chunk_start, self.chunk_ends.pop(chunk_start)
         if chunk_start + self.chunk_size > self.end_index:
             chunk_end = self.end_index
         else:
@@ -91,13 +113,25 @@ class _AsyncChunkDownloader(object):  # pylint: disable=too-many-instance-attrib
     def get_chunk_offsets(self):
         index = self.start_index
         while index < self.end_index:
+            if self.tuner:
+                # A tuned chunk is sized when it is scheduled
+                chunk_size = self.tuner.chunk_size
+                if self.encryption_options and self.encryption_options.get('regions'):
+                    chunk_size = self.encryption_options['regions'].align(chunk_size)
+                chunk_end = min(index + chunk_size, self.end_index)
+                self.chunk_ends[index] = chunk_end
+            else:
+                chunk_end = index + self.chunk_size
             yield index
-            index += self.chunk_size
+            index = chunk_end
 
     async def process_chunk(self, chunk_start):
         chunk_start, chunk_end = self._calculate_range(chunk_start)
+        started = self.tuner.start() if self.tuner else None
         chunk_data = await self._download_chunk(chunk_start, chunk_end)
         length = chunk_end - chunk_start
+        if self.tuner:
+            self.tuner.record(length, started)
         if length > 0:
             await self._write_to_stream(chunk_data, chunk_start)
             await self._update_progress(length)
@@ -122,25 +156,31 @@ class _AsyncChunkDownloader(object):  # pylint: disable=too-many-instance-attrib
             self.stream.write(chunk_data)
 
     async def _download_chunk(self, chunk_start, chunk_end):
-        download_range, offset = process_range_and_offset(
-            chunk_start, chunk_end, chunk_end, self.encryption_options)
+        region_info = self.encryption_options.get('regions')
+        if region_info:
+            download_range, offset = process_region_range(chunk_start, chunk_end - 1, region_info)
+        else:
+            download_range, offset = process_range_and_offset(
+                chunk_start, chunk_end - 1, chunk_end - 1, self.encryption_options)
+        # The regions are authenticated, and longer than the ranges the service returns a checksum for
+        checksum = None if region_info else self.checksum
         range_header, range_validation = validate_and_format_range_headers(
             download_range[0],
-            download_range[1] - 1,
-            check_content_md5=self.validate_content)
+            download_range[1],
+            check_content_md5=bool(checksum))
 
         try:
             _, response = await self.service.download(
                 range=range_header,
-                range_get_content_md5=range_validation,
-                validate_content=self.validate_content,
                 data_stream_total=self.total_size,
                 download_stream_current=self.progress_total,
-                **self.request_options)
+                **dict(self.request_options, **get_range_validation_options(
+                    checksum and checksum.mode, range_validation)))
         except HttpResponseError as error:
             process_storage_error(error)
 
-        chunk_data = await process_content(response, offset[0], offset[1], self.encryption_options)
+        chunk_data = await process_content(
+            response, offset[0], offset[1], self.encryption_options, checksum=checksum, offset=chunk_start)
 
         # This makes sure that if_match is set so that we can validate
         # that subsequent downloads are to an unmodified blob
@@ -149,6 +189,95 @@ class _AsyncChunkDownloader(object):  # pylint: disable=too-many-instance-attrib
 
         return chunk_data
 
+class _AsyncFileChunkDownloader(_AsyncChunkDownloader):
+    """Writes each chunk at its own position of a file descriptor."""
+
+    def __init__(self, fd=None, file_start=0, manifest=None, completed=None, **kwargs):
+        super(_AsyncFileChunkDownloader, self).__init__(**kwargs)
+        self.fd = fd
+        self.file_start = file_start
+        self.manifest = manifest
+        self.completed = completed or set()
+
+    def get_chunk_offsets(self):
+        for index in super(_AsyncFileChunkDownloader, self).get_chunk_offsets():
+            if index not in self.completed:
+                yield index
+
+    async def _write_to_stream(self, chunk_data, chunk_start):
+        # Chunks are written from the event loop thread, so the fallback needs no lock
+        write_at(self.fd, chunk_data, self.file_start + (chunk_start - self.start_index))
+        if self.manifest:
+            self.manifest.add(chunk_start)
+
+
+class _AsyncOrderedChunkIterator(object):
+    """Downloads chunks concurrently, and returns them in order.
+
+    Tasks are kept in submission order, so the ones that complete early wait in the
+    queue until the chunks before them have been consumed. A consumer that stops
+    before the end must close the iterator, or use it as an async context manager,
+    to cancel the downloads still in flight.
+    """
+
+    def __init__(self, downloader, first_content, max_connections, max_buffered_chunks, on_complete=None):
+        self._downloader = downloader
+        self._on_complete = on_complete
+        self._first_content = first_content
+        self._offsets = downloader.get_chunk_offsets() if downloader else iter(())
+        self._max_buffered_chunks = max_buffered_chunks
+        self._semaphore = asyncio.Semaphore(max_connections)
+        self._pending = deque()
+
+    def __aiter__(self):
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.aclose()
+
+    async def _download(self, offset):
+        async with self._semaphore:
+            return await self._downloader.yield_chunk(offset)
+
+    def _schedule(self):
+        for offset in islice(self._offsets, self._max_buffered_chunks - len(self._pending)):
+            self._pending.append(asyncio.ensure_future(self._download(offset)))
+
+    async def __anext__(self):
+        if self._first_content is not None:
+            content, self._first_content = self._first_content, None
+            self._schedule()
+            return content
+        self._schedule()
+        if not self._pending:
+            if self._on_complete:
+                self._on_complete()
+            raise StopAsyncIteration("Download complete")
+        try:
+            chunk = await self._pending.popleft()
+        except BaseException:
+            self.close()
+            raise
+        self._schedule()
+        return chunk
+
+    def close(self):
+        """Cancel the downloads of the chunks that haven't been consumed yet."""
+        while self._pending:
+            self._pending.popleft().cancel()
+        self._offsets = iter(())
+
+    async def aclose(self):
+        """Cancel the downloads of the chunks that haven't been consumed yet, and wait for them to stop."""
+        pending = list(self._pending)
+        self.close()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
 class StorageStreamDownloader(object):  # pylint: disable=too-many-instance-attributes
     """A streaming object to download from Azure Storage.
 
@@ -169,6 +298,7 @@ class StorageStreamDownloader(object):  # pylint: disable=too-many-instance-attr
         self.offset = offset
         self.length = length
         self.validate_content = validate_content
+        self.checksum = get_transfer_checksum(validate_content)
         self.encryption_options = encryption_options or {}
         self.request_options = kwargs
         self.location_mode = None
@@ -187,9 +317,13 @@ class StorageStreamDownloader(object):  # pylint: disable=too-many-instance-attr
             initial_request_end = self.length
         else:
             initial_request_end = initial_request_start + self.first_get_size - 1
+        self.requested_range = (initial_request_start, initial_request_end)
 
-        self.initial_range, self.initial_offset = process_range_and_offset(
-            initial_request_start, initial_request_end, self.length, self.encryption_options)
+        # Until a response tells how the blob is encrypted, expect the protocol the client encrypts with
+        region_info = None
+        if is_encrypted(self.encryption_options):
+            region_info = get_blob_region_info(self.encryption_options.get('version'))
+        self.initial_range, self.initial_offset = get_initial_range(self, region_info)
         self.download_size = None
         self.file_size = None
         self.response = None
@@ -210,8 +344,7 @@ class StorageStreamDownloader(object):  # pylint: disable=too-many-instance-attr
             if self.download_size == 0:
                 self._current_content = b""
             else:
-                self._current_content = await process_content(
-                    self.response, self.initial_offset[0], self.initial_offset[1], self.encryption_options)
+                self._current_content = await self._process_initial_content()
             if not self._download_complete:
                 data_end = self.file_size
                 if self.length is not None:
@@ -222,26 +355,82 @@ class StorageStreamDownloader(object):  # pylint: disable=too-many-instance-attr
                     total_size=self.download_size,
                     chunk_size=self.config.max_chunk_get_size,
                     current_progress=self.first_get_size,
-                    start_range=self.initial_range[1] + 1,  # start where the first download ended
+                    start_range=get_initial_end(self),  # start after the content kept from the first download
                     end_range=data_end,
                     stream=None,
                     parallel=False,
                     validate_content=self.validate_content,
+                    checksum=self.checksum,
                     encryption_options=self.encryption_options,
                     use_location=self.location_mode,
                     **self.request_options)
                 self._iter_chunks = self._iter_downloader.get_chunk_offsets()
         elif self._download_complete:
+            self._set_composite_checksum()
             raise StopAsyncIteration("Download complete")
         else:
             try:
                 chunk = next(self._iter_chunks)
             except StopIteration:
+                self._set_composite_checksum()
                 raise StopAsyncIteration("DownloadComplete")
             self._current_content = await self._iter_downloader.yield_chunk(chunk)
 
         return self._current_content
 
+    async def chunks(self, max_connections=1, max_buffered_chunks=None):
+        """Iterate over the contents of this file in order, chunk by chunk.
+
+        With more than one connection, the ranges ahead of the consumer are downloaded
+        concurrently and reassembled in order, so the target doesn't need to be seekable.
+        At most "max_buffered_chunks" chunks are downloaded ahead of the consumer, which
+        bounds the memory used whatever the size of the file.
+
+        :param int max_connections:
+            The number of parallel connections with which to download.
+        :param int max_buffered_chunks:
+            The maximum number of chunks downloaded, or being downloaded, ahead of the
+            consumer. Defaults to twice the number of connections.
+        :returns: An async iterator of bytes. To stop iterating before the end, use it
+            as an async context manager, or await its `aclose` method, so that the
+            chunks being downloaded ahead are cancelled:
+            `async with await downloader.chunks(max_connections=4) as chunks:`
+        """
+        if self._iter_downloader:
+            raise ValueError("Stream is currently being iterated.")
+        if max_buffered_chunks is None:
+            max_buffered_chunks = 2 * max_connections
+        if max_buffered_chunks < max_connections:
+            raise ValueError("max_buffered_chunks must be at least max_connections.")
+
+        if self.download_size == 0:
+            content = b""
+        else:
+            content = await self._process_initial_content()
+
+        downloader = None
+        if not self._download_complete:
+            data_end = self.file_size
+            if self.length is not None:
+                # Use the length unless it is over the end of the file
+                data_end = min(self.file_size, self.length + 1)
+            downloader = _AsyncChunkDownloader(
+                service=self.service,
+                total_size=self.download_size,
+                chunk_size=self.config.max_chunk_get_size,
+                current_progress=self.first_get_size,
+                start_range=get_initial_end(self),  # start after the content kept from the first download
+                end_range=data_end,
+                stream=None,
+                parallel=False,
+                validate_content=self.validate_content,
+                checksum=self.checksum,
+                encryption_options=self.encryption_options,
+                use_location=self.location_mode,
+                **self.request_options)
+        return _AsyncOrderedChunkIterator(
+            downloader, content, max_connections, max_buffered_chunks, on_complete=self._set_composite_checksum)
+
     async def setup(self, extra_properties=None):
         if self.response:
             raise ValueError("Download stream already initialized.")
@@ -265,22 +454,46 @@ class StorageStreamDownloader(object):  # pylint: disable=too-many-instance-attr
         # TODO: Set to the stored MD5 when the service returns this
         self.properties.content_md5 = None
 
-    async def _initial_request(self):
+        # The checksum composed from the chunks is only known once they are all downloaded
+        self.properties.composite_checksum = None
+
+    def _get_range_checksum(self):
+        # The regions are authenticated, and longer than the ranges the service returns a checksum for
+        return None if self.encryption_options.get('regions') else self.checksum
+
+    async def _process_initial_content(self):
+        return await process_content(
+            self.response, self.initial_offset[0], self.initial_offset[1], self.encryption_options,
+            checksum=self._get_range_checksum(), offset=self.initial_range[0])
+
+    def _set_composite_checksum(self):
+        if self.checksum:
+            self.properties.composite_checksum = self.checksum.value
+
+    def get_download_size(self):
+        if self.length is not None:
+            # Use the length unless it is over the end of the file
+            return min(self.file_size, self.length - self.offset + 1)
+        if self.offset is not None:
+            return self.file_size - self.offset
+        return self.file_size
+
+    async def _initial_request(self, retry=True):
+        checksum = self._get_range_checksum()
         range_header, range_validation = validate_and_format_range_headers(
             self.initial_range[0],
             self.initial_range[1],
             start_range_required=False,
             end_range_required=False,
-            check_content_md5=self.validate_content)
+            check_content_md5=bool(checksum))
 
         try:
             location_mode, response = await self.service.download(
                 range=range_header,
-                range_get_content_md5=range_validation,
-                validate_content=self.validate_content,
                 data_stream_total=None,
                 download_stream_current=0,
-                **self.request_options)
+                **dict(self.request_options, **get_range_validation_options(
+                    checksum and checksum.mode, range_validation)))
 
             # Check the location we read from to ensure we use the same one
             # for subsequent requests.
@@ -289,13 +502,7 @@ class StorageStreamDownloader(object):  # pylint: disable=too-many-instance-attr
             # Parse the total file size and adjust the download size if ranges
             # were specified
             self.file_size = parse_length_from_content_range(response.properties.content_range)
-            if self.length is not None:
-                # Use the length unless it is over the end of the file
-                self.download_size = min(self.file_size, self.length - self.offset + 1)
-            elif self.offset is not None:
-                self.download_size = self.file_size - self.offset
-            else:
-                self.download_size = self.file_size
+            self.download_size = self.get_download_size()
 
         except HttpResponseError as error:
             if self.offset is None and error.response.status_code == 416:
@@ -317,9 +524,22 @@ class StorageStreamDownloader(object):  # pylint: disable=too-many-instance-attr
             else:
                 process_storage_error(error)
 
+        if is_encrypted(self.encryption_options) and process_encrypted_regions(self, response):
+            if not retry:
+                raise HttpResponseError(
+                    message="The encryption of the blob changed during the download.", response=response.response)
+            # Lock on the etag, so that the range is requested again from the same blob
+            if self.request_options.get('modified_access_conditions'):
+                if not self.request_options['modified_access_conditions'].if_match:
+                    self.request_options['modified_access_conditions'].if_match = response.properties.etag
+            return await self._initial_request(retry=False)
+
         # If the file is small, the download is complete at this point.
         # If file size is large, download the rest of the file in chunks.
-        if response.properties.size != self.download_size:
+        received_size = response.properties.size
+        if self.encryption_options.get('regions'):
+            received_size = self.initial_range[1] - self.initial_range[0] + 1
+        if received_size != self.download_size:
             # Lock on the etag. This can be overriden by the user by specifying '*'
             if self.request_options.get('modified_access_conditions'):
                 if not self.request_options['modified_access_conditions'].if_match:
@@ -328,39 +548,58 @@ class StorageStreamDownloader(object):  # pylint: disable=too-many-instance-attr
             self._download_complete = True
         return response
 
-    async def content_as_bytes(self, max_connections=1):
+    async def content_as_bytes(self, max_connections=1, autotune=False):
         """Download the contents of this file.
 
         This operation is blocking until all data is downloaded.
 
         :param int max_connections:
             The number of parallel connections with which to download.
+        :param autotune:
+            Whether to tune the chunk size and the number of connections while downloading,
+            within the configured chunk size and `max_connections`. A TransferTuner can be
+            passed to configure the tuning or reuse the parameters chosen for a previous transfer.
+        :type autotune: bool or TransferTuner
         :rtype: bytes
         """
         stream = BytesIO()
-        await self.download_to_stream(stream, max_connections=max_connections)
+        await self.download_to_stream(stream, max_connections=max_connections, autotune=autotune)
         return stream.getvalue()
 
-    async def content_as_text(self, max_connections=1, encoding='UTF-8'):
+    async def content_as_text(self, max_connections=1, encoding='UTF-8', autotune=False):
         """Download the contents of this file, and decode as text.
 
         This operation is blocking until all data is downloaded.
 
         :param int max_connections:
             The number of parallel connections with which to download.
+        :param autotune:
+            Whether to tune the chunk size and the number of connections while downloading,
+            within the configured chunk size and `max_connections`. A TransferTuner can be
+            passed to configure the tuning or reuse the parameters chosen for a previous transfer.
+        :type autotune: bool or TransferTuner
         :rtype: str
         """
-        content = await self.content_as_bytes(max_connections=max_connections)
+        content = await self.content_as_bytes(max_connections=max_connections, autotune=autotune)
         return content.decode(encoding)
 
-    async def download_to_stream(self, stream, max_connections=1):
+    async def download_to_stream(self, stream, max_connections=1, autotune=False):
         """Download the contents of this file to a stream.
 
         :param stream:
             The stream to download to. This can be an open file-handle,
             or any writable stream. The stream must be seekable if the download
             uses more than one parallel connection.
-        :returns: The properties of the downloaded file.
+        :param int max_connections:
+            The number of parallel connections with which to download.
+        :param autotune:
+            Whether to tune the chunk size and the number of connections while downloading,
+            within the configured chunk size and `max_connections`. A TransferTuner can be
+            passed to configure the tuning or reuse the parameters chosen for a previous transfer.
+        :type autotune: bool or TransferTuner
+        :returns: The properties of the downloaded file. If the content was validated,
+            their `composite_checksum` is the checksum composed from the ones of the
+            downloaded chunks, which with CRC64 is the CRC64 of the whole content.
         :rtype: Any
         """
         if self._iter_downloader:
@@ -381,13 +620,13 @@ class StorageStreamDownloader(object):  # pylint: disable=too-many-instance-attr
         if self.download_size == 0:
             content = b""
         else:
-            content = await process_content(
-                self.response, self.initial_offset[0], self.initial_offset[1], self.encryption_options)
+            content = await self._process_initial_content()
 
         # Write the content to the user stream
         if content is not None:
             stream.write(content)
         if self._download_complete:
+            self._set_composite_checksum()
             return self.properties
 
         data_end = self.file_size
@@ -395,37 +634,160 @@ class StorageStreamDownloader(object):  # pylint: disable=too-many-instance-attr
             # Use the length unless it is over the end of the file
             data_end = min(self.file_size, self.length + 1)
 
+        tuner = get_tuner(autotune, self.config.max_chunk_get_size, max_connections)
         downloader = _AsyncChunkDownloader(
             service=self.service,
             total_size=self.download_size,
             chunk_size=self.config.max_chunk_get_size,
             current_progress=self.first_get_size,
-            start_range=self.initial_range[1] + 1,  # start where the first download ended
+            start_range=get_initial_end(self),  # start after the content kept from the first download
             end_range=data_end,
             stream=stream,
             parallel=parallel,
             validate_content=self.validate_content,
+            checksum=self.checksum,
             encryption_options=self.encryption_options,
+            tuner=tuner,
             use_location=self.location_mode,
             **self.request_options)
 
         dl_tasks = downloader.get_chunk_offsets()
         running_futures = [
             asyncio.ensure_future(downloader.process_chunk(d))
-            for d in islice(dl_tasks, 0, max_connections)
+            for d in islice(dl_tasks, 0, tuner.concurrency if tuner else max_connections)
         ]
         while running_futures:
             # Wait for some download to finish before adding a new one
-            _done, running_futures = await asyncio.wait(
+            done, running_futures = await asyncio.wait(
                 running_futures, return_when=asyncio.FIRST_COMPLETED)
-            try:
-                next_chunk = next(dl_tasks)
-            except StopIteration:
+            # A chunk that failed, e.g. one that didn't match its checksum, fails the download
+            for task in done:
+                task.result()
+            # A tuned download keeps as many chunks in flight as the tuner chose
+            count = max(tuner.concurrency - len(running_futures), 0) if tuner else 1
+            next_chunks = list(islice(dl_tasks, count))
+            if not next_chunks and (count or not running_futures):
                 break
-            else:
+            for next_chunk in next_chunks:
                 running_futures.add(asyncio.ensure_future(downloader.process_chunk(next_chunk)))
 
         if running_futures:
             # Wait for the remaining downloads to finish
-            await asyncio.wait(running_futures)
+            done, _running = await asyncio.wait(running_futures)
+            for task in done:
+                task.result()
+        if tuner:
+            tuner.finish()
+        self._set_composite_checksum()
+        return self.properties
+
+    def _download_state(self, data_end):
+        return {
+            "etag": self.properties.etag,
+            "offset": self.offset,
+            "length": self.length,
+            "size": self.download_size,
+            "chunk_size": self.config.max_chunk_get_size,
+            "start": get_initial_end(self),
+            "end": data_end
+        }
+
+    async def download_to_file(self, file_path, max_connections=1, resume=False):
+        """Download the contents of this file to a local file.
+
+        The file is allocated to its final size, and each connection writes its chunks
+        directly at their position in the file. The chunks written so far are recorded in
+        a sidecar manifest next to the file, which is removed when the download completes.
+
+        :param str file_path:
+            The path of the file to download to.
+        :param int max_connections:
+            The number of parallel connections with which to download.
+        :param bool resume:
+            Whether to only download the chunks missing from a previous, interrupted
+            download of the same content to the same file. The download starts over if
+            the content changed since. Default value is False.
+        :returns: The properties of the downloaded file.
+        :rtype: Any
+        """
+        if self._iter_downloader:
+            raise ValueError("Stream is currently being iterated.")
+
+        if self.download_size == 0:
+            content = b""
+        else:
+            content = await self._process_initial_content()
+        content = content or b""
+
+        data_end = self.file_size
+        if self.length is not None:
+            # Use the length unless it is over the end of the file
+            data_end = min(self.file_size, self.length + 1)
+        start_range = get_initial_end(self)  # start after the content kept from the first download
+
+        manifest = DownloadManifest(file_path + DownloadManifest.SUFFIX, self._download_state(data_end))
+        completed = None
+        if resume and not self._download_complete and os.path.isfile(file_path):
+            completed = manifest.read()
+
+        fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o644)
+        running_futures = set()
+        try:
+            if completed is None:
+                os.ftruncate(fd, 0)
+            if self._download_complete:
+                write_at(fd, content, 0)
+                manifest.remove()
+                self._set_composite_checksum()
+                return self.properties
+
+            os.ftruncate(fd, len(content) + max(data_end - start_range, 0))
+            manifest.open(completed)
+            downloader = _AsyncFileChunkDownloader(
+                fd=fd,
+                file_start=len(content),
+                manifest=manifest,
+                completed=completed,
+                service=self.service,
+                total_size=self.download_size,
+                chunk_size=self.config.max_chunk_get_size,
+                current_progress=self.first_get_size,
+                start_range=start_range,
+                end_range=data_end,
+                stream=None,
+                parallel=False,
+                validate_content=self.validate_content,
+                checksum=self.checksum,
+                encryption_options=self.encryption_options,
+                use_location=self.location_mode,
+                **self.request_options)
+            write_at(fd, content, 0)
+
+            dl_tasks = downloader.get_chunk_offsets()
+            running_futures = set(
+                asyncio.ensure_future(downloader.process_chunk(d))
+                for d in islice(dl_tasks, 0, max_connections))
+            while running_futures:
+                # Wait for some download to finish before adding a new one
+                done, running_futures = await asyncio.wait(
+                    running_futures, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    task.result()
+                for next_chunk in islice(dl_tasks, len(done)):
+                    running_futures.add(asyncio.ensure_future(downloader.process_chunk(next_chunk)))
+        except BaseException:
+            for task in running_futures:
+                task.cancel()
+            if running_futures:
+                # Don't write to the file once it is closed
+                await asyncio.wait(running_futures)
+            manifest.close()
+            raise
+        finally:
+            os.close(fd)
+
+        manifest.remove()
+        if completed is None:
+            # The chunks of a previous download weren't checksummed
+            self._set_composite_checksum()
         return self.properties
@@ -5,14 +5,11 @@
 # --------------------------------------------------------------------------
 
 import base64
-import hashlib
-import re
 import random
 from time import time
 from io import SEEK_SET, UnsupportedOperation
 import logging
 import uuid
-import types
 import platform
 from typing import Any, TYPE_CHECKING
 from wsgiref.handlers import format_date_time
@@ -41,6 +38,7 @@ from azure.core.exceptions import AzureError, ServiceRequestError, ServiceRespon
 
 from ..version import VERSION
 from .models import LocationMode
+from .validation import MD5, new_hash, get_validation_mode, get_checksum_header, check_checksum
 
 try:
     _unicode_type = unicode # type: ignore
@@ -53,6 +51,8 @@ if TYPE_CHECKING:
 
 _LOGGER = logging.getLogger(__name__)
 
+_CHECKSUM_READ_SIZE = 4 * 1024 * 1024
+
 
 def encode_base64(data):
     if isinstance(data, _unicode_type):
@@ -166,80 +166,31 @@ class StorageHosts(SansIOHTTPPolicy):
 class StorageLoggingPolicy(NetworkTraceLoggingPolicy):
     """A policy that logs HTTP request and response to the DEBUG logger.
 
-    This accepts both global configuration, and per-request level with "enable_http_logger"
+    This accepts both global configuration, and per-request level with "enable_http_logger".
+    The SAS signature of the request URL and of the copy source are scrubbed off.
     """
 
-    def on_request(self, request):
-        # type: (PipelineRequest, Any) -> None
-        http_request = request.http_request
-        options = request.context.options
-        if options.pop("logging_enable", self.enable_http_logger):
-            request.context["logging_enable"] = True
-            if not _LOGGER.isEnabledFor(logging.DEBUG):
-                return
+    @property
+    def _logger(self):
+        return _LOGGER
 
-            try:
-                log_url = http_request.url
-                query_params = http_request.query
-                if 'sig' in query_params:
-                    log_url = log_url.replace(query_params['sig'], "sig=*****")
-                _LOGGER.debug("Request URL: %r", log_url)
-                _LOGGER.debug("Request method: %r", http_request.method)
-                _LOGGER.debug("Request headers:")
-                for header, value in http_request.headers.items():
-                    if header.lower() == 'authorization':
-                        value = '*****'
-                    elif header.lower() == 'x-ms-copy-source' and 'sig' in value:
-                        # take the url apart and scrub away the signed signature
-                        scheme, netloc, path, params, query, fragment = urlparse(value)
-                        parsed_qs = dict(parse_qsl(query))
-                        parsed_qs['sig'] = '*****'
-
-                        # the SAS needs to be put back together
-                        value = urlunparse((scheme, netloc, path, params, urlencode(parsed_qs), fragment))
-
-                    _LOGGER.debug("    %r: %r", header, value)
-                _LOGGER.debug("Request body:")
-
-                # We don't want to log the binary data of a file upload.
-                if isinstance(http_request.body, types.GeneratorType):
-                    _LOGGER.debug("File upload")
-                else:
-                    _LOGGER.debug(str(http_request.body))
-            except Exception as err:  # pylint: disable=broad-except
-                _LOGGER.debug("Failed to log request: %r", err)
+    def _redact_url(self, http_request):
+        log_url = http_request.url
+        query_params = http_request.query
+        if 'sig' in query_params:
+            log_url = log_url.replace(query_params['sig'], "sig=*****")
+        return log_url
 
-    def on_response(self, request, response):
-        # type: (PipelineRequest, PipelineResponse, Any) -> None
-        if response.context.pop("logging_enable", self.enable_http_logger):
-            if not _LOGGER.isEnabledFor(logging.DEBUG):
-                return
+    def _redact_header(self, header, value):
+        if header.lower() == 'x-ms-copy-source' and 'sig' in value:
+            # take the url apart and scrub away the signed signature
+            scheme, netloc, path, params, query, fragment = urlparse(value)
+            parsed_qs = dict(parse_qsl(query))
+            parsed_qs['sig'] = '*****'
 
-            try:
-                _LOGGER.debug("Response status: %r", response.http_response.status_code)
-                _LOGGER.debug("Response headers:")
-                for res_header, value in response.http_response.headers.items():
-                    _LOGGER.debug("    %r: %r", res_header, value)
-
-                # We don't want to log binary data if the response is a file.
-                _LOGGER.debug("Response content:")
-                pattern = re.compile(r'attachment; ?filename=["\w.]+', re.IGNORECASE)
-                header = response.http_response.headers.get('content-disposition')
-
-                if header and pattern.match(header):
-                    filename = header.partition('=')[2]
-                    _LOGGER.debug("File attachments: %s", filename)
-                elif response.http_response.headers.get("content-type", "").endswith("octet-stream"):
-                    _LOGGER.debug("Body contains binary data.")
-                elif response.http_response.headers.get("content-type", "").startswith("image"):
-                    _LOGGER.debug("Body contains image data.")
-                else:
-                    if response.context.options.get('stream', False):
-                        _LOGGER.debug("Body is streamable")
-                    else:
-                        _LOGGER.debug(response.http_response.text())
-            except Exception as err:  # pylint: disable=broad-except
-                _LOGGER.debug("Failed to log response: %s", repr(err))
+            # the SAS needs to be put back together
+            return urlunparse((scheme, netloc, path, params, urlencode(parsed_qs), fragment))
+        return super(StorageLoggingPolicy, self)._redact_header(header, value)
 
 
 class StorageUserAgentPolicy(SansIOHTTPPolicy):
@@ -333,17 +284,21 @@ class StorageContentValidation(SansIOHTTPPolicy):
 
     @staticmethod
     def get_content_md5(data):
-        md5 = hashlib.md5()
+        return StorageContentValidation.get_content_checksum(data, MD5)
+
+    @staticmethod
+    def get_content_checksum(data, mode):
+        checksum = new_hash(mode)
         if isinstance(data, bytes):
-            md5.update(data)
+            checksum.update(data)
         elif hasattr(data, 'read'):
             pos = 0
             try:
                 pos = data.tell()
             except:  # pylint: disable=bare-except
                 pass
-            for chunk in iter(lambda: data.read(4096), b""):
-                md5.update(chunk)
+            for chunk in iter(lambda: data.read(_CHECKSUM_READ_SIZE), b""):
+                checksum.update(chunk)
             try:
                 data.seek(pos, SEEK_SET)
             except (AttributeError, IOError):
@@ -351,27 +306,28 @@ class StorageContentValidation(SansIOHTTPPolicy):
         else:
             raise ValueError("Data should be bytes or a seekable file-like object.")
 
-        return md5.digest()
+        return checksum.digest()
 
     def on_request(self, request):
         # type: (PipelineRequest, Any) -> None
-        validate_content = request.context.options.pop('validate_content', False)
+        validate_content = get_validation_mode(request.context.options.pop('validate_content', False))
         if validate_content and request.http_request.method != 'GET':
-            computed_md5 = encode_base64(StorageContentValidation.get_content_md5(request.http_request.data))
-            request.http_request.headers[self.header_name] = computed_md5
-            request.context['validate_content_md5'] = computed_md5
+            header_name = get_checksum_header(validate_content)
+            # The chunkers send the checksum they computed as they read the chunk
+            computed = request.http_request.headers.get(header_name)
+            if not computed:
+                computed = encode_base64(StorageContentValidation.get_content_checksum(
+                    request.http_request.data, validate_content))
+                request.http_request.headers[header_name] = computed
+            request.context['validate_content_checksum'] = computed
         request.context['validate_content'] = validate_content
 
     def on_response(self, request, response):
-        if response.context.get('validate_content', False) and response.http_response.headers.get('content-md5'):
-            computed_md5 = request.context.get('validate_content_md5') or \
-                encode_base64(StorageContentValidation.get_content_md5(response.http_response.body()))
-            if response.http_response.headers['content-md5'] != computed_md5:
-                raise AzureError(
-                    'MD5 mismatch. Expected value is \'{0}\', computed value is \'{1}\'.'.format(
-                        response.http_response.headers['content-md5'], computed_md5),
-                    response=response.http_response
-                )
+        validate_content = response.context.get('validate_content', False)
+        if validate_content and response.http_response.headers.get(get_checksum_header(validate_content)):
+            computed = request.context.get('validate_content_checksum') or encode_base64(
+                StorageContentValidation.get_content_checksum(response.http_response.body(), validate_content))
+            check_checksum(response.http_response, validate_content, computed)
 
 
 class StorageRetryPolicy(HTTPPolicy):
@@ -0,0 +1,277 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import logging
+import struct
+import hashlib
+import threading
+
+from azure.core.exceptions import AzureError
+
+try:
+    import crcmod
+except ImportError:
+    crcmod = None
+
+from . import encode_base64
+
+_LOGGER = logging.getLogger(__name__)
+
+MD5 = 'md5'
+CRC64 = 'crc64'
+
+_CHECKSUM_HEADERS = {MD5: 'Content-MD5', CRC64: 'x-ms-content-crc64'}
+
+# The CRC64 of the service: the polynomial 0xAD93D23594C93659, reflected, with
+# the register starting from and finally XORed with all ones.
+_CRC64_POLYNOMIAL = 0x9A6C9329AC4BC9B5
+_CRC64_MASK = 0xFFFFFFFFFFFFFFFF
+
+
+def _crc64_table():
+    table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ _CRC64_POLYNOMIAL if crc & 1 else crc >> 1
+        table.append(crc)
+    return table
+
+
+_CRC64_TABLE = _crc64_table()
+
+# crcmod takes the polynomial unreflected, with its x^64 term, and the initial
+# register XORed with the final XOR value.
+_crc64_ext = crcmod.mkCrcFun(0x1AD93D23594C93659, initCrc=0, rev=True, xorOut=_CRC64_MASK) if crcmod else None
+# Without its C extension, crcmod computes the CRC64 in Python too
+_warn_crc64_in_python = not getattr(getattr(crcmod, 'crcmod', None), '_usingExtension', False)
+
+
+def crc64(data, crc=0):
+    """Returns the CRC64 of the data, as the service computes it.
+
+    Passing the CRC64 of the data before it continues the computation, so that
+    the CRC64 of a stream can be computed as its bytes pass by. Computed with
+    crcmod if it is installed, in pure Python otherwise. A warning is logged the
+    first time it runs without the C extension of crcmod.
+
+    :param bytes data: The data.
+    :param int crc: The CRC64 of the data before it, if any.
+    :rtype: int
+    """
+    global _warn_crc64_in_python  # pylint: disable=global-statement
+    if _warn_crc64_in_python:
+        _warn_crc64_in_python = False
+        _LOGGER.warning(
+            "The CRC64 of the content is computed in pure Python, which is slow. Install the "
+            "'crc64' extra of the package to compute it with the C extension of crcmod.")
+    if _crc64_ext:
+        return _crc64_ext(data, crc)
+    crc ^= _CRC64_MASK
+    table = _CRC64_TABLE
+    for byte in bytearray(data):
+        crc = table[(crc ^ byte) & 0xFF] ^ (crc >> 8)
+    return crc ^ _CRC64_MASK
+
+
+def _multiply_mod_polynomial(a, b):
+    # Multiplies two reflected polynomials modulo the CRC64 polynomial
+    product = 0
+    bit = 1 << 63
+    while a:
+        if a & bit:
+            product ^= b
+            a ^= bit
+        bit >>= 1
+        b = (b >> 1) ^ _CRC64_POLYNOMIAL if b & 1 else b >> 1
+    return product
+
+
+def _shift_operator(length):
+    # x^(8 * length) modulo the CRC64 polynomial, by squaring
+    operator = 1 << 63
+    power = 1 << 62  # x^1
+    for _ in range(3):
+        power = _multiply_mod_polynomial(power, power)
+    while length:
+        if length & 1:
+            operator = _multiply_mod_polynomial(power, operator)
+        power = _multiply_mod_polynomial(power, power)
+        length >>= 1
+    return operator
+
+
+def crc64_combine(crc1, crc2, length2):
+    """Returns the CRC64 of two pieces of data laid end to end, from their own CRC64s.
+
+    This lets chunks transferred in parallel be checksummed separately, and still
+    give the CRC64 of the whole content without reading it again.
+
+    :param int crc1: The CRC64 of the first piece.
+    :param int crc2: The CRC64 of the second piece.
+    :param int length2: The length of the second piece.
+    :rtype: int
+    """
+    return _multiply_mod_polynomial(_shift_operator(length2), crc1) ^ crc2
+
+
+class Crc64Hash(object):
+    """Computes a CRC64 incrementally, with the interface of the hashlib objects."""
+
+    digest_size = 8
+
+    def __init__(self, data=None):
+        self.crc = 0
+        if data:
+            self.update(data)
+
+    def update(self, data):
+        self.crc = crc64(data, self.crc)
+
+    def digest(self):
+        # The service encodes the CRC64 in little-endian order
+        return struct.pack('<Q', self.crc)
+
+
+def get_validation_mode(validate_content):
+    """Returns the checksum a validate_content option asks for, or None if content isn't validated.
+
+    True asks for an MD5, as it did before CRC64 was supported.
+    """
+    if not validate_content:
+        return None
+    if validate_content is True:
+        return MD5
+    mode = str(validate_content).lower()
+    if mode not in _CHECKSUM_HEADERS:
+        raise ValueError("validate_content must be True, '{}' or '{}'.".format(MD5, CRC64))
+    return mode
+
+
+def get_checksum_header(mode):
+    return _CHECKSUM_HEADERS[mode]
+
+
+def new_hash(mode):
+    return Crc64Hash() if mode == CRC64 else hashlib.md5()
+
+
+def check_checksum(response, mode, computed):
+    """Raises if the service returned a checksum of the content that doesn't match the one computed.
+
+    :param response: The HTTP response holding the checksum of the service.
+    :param str mode: The checksum, 'md5' or 'crc64'.
+    :param str computed: The base64 encoded checksum computed for the content.
+    """
+    expected = response.headers.get(get_checksum_header(mode))
+    if expected and expected != computed:
+        raise AzureError(
+            '{0} mismatch. Expected value is \'{1}\', computed value is \'{2}\'.'.format(
+                mode.upper(), expected, computed),
+            response=response
+        )
+
+
+def get_range_validation_options(mode, range_validation):
+    """Returns the options of a ranged download asking the service for the checksum of the range."""
+    if mode == CRC64:
+        return {'range_get_content_crc64': range_validation}
+    return {'range_get_content_md5': range_validation}
+
+
+def get_transfer_checksum(validate_content):
+    mode = get_validation_mode(validate_content)
+    return TransferChecksum(mode) if mode else None
+
+
+class TransferChecksum(object):
+    """The checksums of the chunks of a transfer, and the checksum they compose.
+
+    Each chunk is checksummed once, from the bytes the chunker already holds: its
+    checksum is sent with the chunk on uploads, and checked against the one the
+    service returns with it on downloads. The chunks can be recorded from several
+    threads, in any order.
+
+    The composite checksum is computed from the checksums of the chunks, in the
+    order of their offsets. With CRC64, it is the CRC64 of the whole content, which
+    can be compared to a CRC64 computed anywhere else. With MD5, it is the MD5 of the
+    MD5s of the chunks laid end to end, or the MD5 of the content if it is a single chunk.
+
+    :param str mode: The checksum to compute, 'md5' or 'crc64'.
+    """
+
+    def __init__(self, mode):
+        self.mode = mode
+        self._chunks = {}
+        self._lock = threading.Lock()
+
+    def add(self, offset, data):
+        """Checksums a chunk, and records it at its offset unless the offset is None.
+
+        :returns: The checksum of the chunk.
+        :rtype: bytes
+        """
+        digest = new_hash(self.mode)
+        digest.update(data)
+        digest = digest.digest()
+        self.record(offset, len(data), digest)
+        return digest
+
+    def record(self, offset, length, digest):
+        if offset is not None:
+            with self._lock:
+                self._chunks[offset] = (length, digest)
+
+    def read(self, response, offset=None):
+        """Joins the chunks of a response, checksumming them as they come, and checks
+        the checksum against the one the service returned for them.
+
+        :param response: The iterator of the content of a response.
+        :param int offset: The offset to record the content at, if any.
+        :rtype: bytes
+        """
+        digest = new_hash(self.mode)
+        chunks = []
+        for chunk in response:
+            digest.update(chunk)
+            chunks.append(chunk)
+        content = b"".join(chunks)
+        self.validate(response.response, content, offset, digest.digest())
+        return content
+
+    def validate(self, response, content, offset=None, digest=None):
+        """Checks the content of a response against the checksum the service returned for it."""
+        if digest is None:
+            digest = new_hash(self.mode)
+            digest.update(content)
+            digest = digest.digest()
+        check_checksum(response, self.mode, encode_base64(digest))
+        self.record(offset, len(content), digest)
+
+    def get_request_options(self, digest):
+        """Returns the options sending the checksum of a chunk with it."""
+        if self.mode == CRC64:
+            return {'transactional_content_crc64': bytearray(digest)}
+        return {'transactional_content_md5': bytearray(digest)}
+
+    @property
+    def value(self):
+        """The composite checksum of the recorded chunks, or None if none was recorded.
+
+        :rtype: bytearray
+        """
+        with self._lock:
+            chunks = [self._chunks[offset] for offset in sorted(self._chunks)]
+        if not chunks:
+            return None
+        if self.mode == CRC64:
+            crc = 0
+            for length, digest in chunks:
+                crc = crc64_combine(crc, struct.unpack('<Q', digest)[0], length)
+            return bytearray(struct.pack('<Q', crc))
+        if len(chunks) == 1:
+            return bytearray(chunks[0][1])
+        return bytearray(hashlib.md5(b"".join(digest for _, digest in chunks)).digest())
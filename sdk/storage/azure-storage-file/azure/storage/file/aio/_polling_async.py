@@ -9,8 +9,9 @@ import logging
 from typing import Any, Callable
 from azure.core.polling import AsyncPollingMethod
 
-from .._shared.response_handlers import process_storage_error
+from .._shared.response_handlers import process_storage_error, return_response_headers
 from .._generated.models import StorageErrorException
+from .._polling import get_retry_after
 
 
 logger = logging.getLogger(__name__)
@@ -22,17 +23,32 @@ class CloseHandlesAsync(AsyncPollingMethod):
         self._command = None
         self._continuation_token = None
         self._exception = None
+        self._retry_after = None
         self.handles_closed = 0
         self.polling_interval = interval
 
+    def _return_status(self, response, deserialized, response_headers):
+        self._retry_after = get_retry_after(response)
+        return return_response_headers(response, deserialized, response_headers)
+
     async def _update_status(self):
         try:
-            status = await self._command(marker=self._continuation_token)
+            status = await self._command(marker=self._continuation_token, cls=self._return_status)
         except StorageErrorException as error:
             process_storage_error(error)
         self._continuation_token = status.get('marker')
         self.handles_closed += status.get('number_of_handles_closed') or 0
 
+    async def update_status(self):
+        """Closes the next batch of handles."""
+        await self._update_status()
+
+    def get_polling_interval(self):
+        """The polling interval, or the delay requested by the service with Retry-After."""
+        if self._retry_after is not None:
+            return self._retry_after
+        return self.polling_interval
+
     def initialize(self, command, initial_status, _):  # pylint: disable=arguments-differ
         # type: (Any, Any, Callable) -> None
         self._command = command
@@ -44,7 +60,7 @@ class CloseHandlesAsync(AsyncPollingMethod):
         try:
             while not self.finished():
                 await self._update_status()
-                await asyncio.sleep(self.polling_interval)
+                await asyncio.sleep(self.get_polling_interval())
         except Exception as e:
             logger.warning(str(e))
             raise
@@ -478,6 +478,52 @@ class FileClient(AsyncStorageAccountHostsMixin, FileClientBase):
         )
         return downloader
 
+    @distributed_trace_async
+    async def download_to_file(
+        self,
+        file_path,  # type: str
+        max_connections=1,  # type: int
+        resume=False,  # type: bool
+        offset=None,  # type: Optional[int]
+        length=None,  # type: Optional[int]
+        validate_content=False,  # type: bool
+        **kwargs
+    ):
+        # type: (...) -> FileProperties
+        """Downloads the file to a local file, with each connection writing its own ranges.
+
+        The file is allocated up front and the chunks are written at their position in
+        the file without locking, which is faster than :func:`~download_file` followed
+        by `download_to_stream` when downloading large files over many connections.
+        The chunks written so far are recorded in a `<file_path>.download` manifest, so
+        an interrupted download can be resumed.
+
+        :param str file_path:
+            The path of the file to download to.
+        :param int max_connections:
+            The number of parallel connections with which to download.
+        :param bool resume:
+            Whether to only download the ranges missing from a previous, interrupted download
+            of the same file to the same file. The download starts over if the file changed
+            since. Default value is False.
+        :param int offset:
+            Start of byte range to use for downloading a section of the file.
+            Must be set if length is provided.
+        :param int length:
+            Number of bytes to read from the stream. This is optional, but
+            should be supplied for optimal performance.
+        :param bool validate_content:
+            If true, calculates an MD5 hash for each chunk of the file.
+        :returns: The properties of the downloaded file.
+        :rtype: ~azure.storage.file.models.FileProperties
+        """
+        downloader = await self.download_file(
+            offset=offset,
+            length=length,
+            validate_content=validate_content,
+            **kwargs)
+        return await downloader.download_to_file(file_path, max_connections=max_connections, resume=resume)
+
     @distributed_trace_async
     async def delete_file(self, timeout=None, **kwargs):
         # type: (Optional[int], Optional[Any]) -> None
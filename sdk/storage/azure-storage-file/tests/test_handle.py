@@ -5,9 +5,15 @@
 # Licensed under the MIT License. See License.txt in the project root for
 # license information.
 # --------------------------------------------------------------------------
+import time
 import unittest
 import pytest
 
+try:
+    from unittest.mock import Mock
+except ImportError:
+    from mock import Mock
+
 from azure.core.exceptions import (
     HttpResponseError,
     ResourceNotFoundError,
@@ -212,6 +218,36 @@ class StorageHandleTest(FileTestCase):
         self.assertTrue(total_num_handle_closed > 1)
 
 
+class CloseHandlesPollingTest(unittest.TestCase):
+    def test_close_handles_polling_interval_respects_retry_after(self):
+        # Arrange
+        from azure.core.polling import LROPollerManager
+        from azure.storage.file._polling import CloseHandles
+        pages = [('second', None), ('third', '60'), (None, None)]
+
+        def command(marker=None, cls=None):
+            next_marker, retry_after = pages.pop(0)
+            response = Mock(headers={'Retry-After': retry_after} if retry_after else {})
+            return cls(response, None, {'x-ms-marker': next_marker, 'x-ms-number-of-handles-closed': 2})
+
+        method = CloseHandles(0.01)
+
+        # Act
+        with LROPollerManager(polling_interval=30) as manager:
+            poller = manager.add(command, {'marker': 'first', 'number_of_handles_closed': 1}, None, method)
+            for _ in range(100):
+                if len(pages) == 1:
+                    break
+                time.sleep(0.01)
+            time.sleep(0.2)
+
+            # Assert the manager waits for the 60s asked by the service before the last page
+            self.assertEqual(len(pages), 1)
+            self.assertEqual(method.get_polling_interval(), 60)
+            self.assertEqual(method.handles_closed, 5)
+            self.assertFalse(poller.done())
+            poller.cancel()
+
 # ------------------------------------------------------------------------------
 if __name__ == '__main__':
     unittest.main()
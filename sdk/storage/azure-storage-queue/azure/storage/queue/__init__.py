@@ -7,6 +7,7 @@
 from .version import VERSION
 from .queue_client import QueueClient
 from .queue_service_client import QueueServiceClient
+from ._processor import QueueProcessor
 from ._shared.policies import ExponentialRetry, LinearRetry, NoRetry
 from ._shared.models import(
     LocationMode,
@@ -35,6 +36,7 @@ from .models import (
     CorsRule,
     RetentionPolicy,
     MessagesPaged,
+    QueueProcessorMetrics,
 )
 
 __version__ = VERSION
@@ -67,4 +69,6 @@ __all__ = [
     'CorsRule',
     'RetentionPolicy',
     'MessagesPaged',
+    'QueueProcessor',
+    'QueueProcessorMetrics',
 ]
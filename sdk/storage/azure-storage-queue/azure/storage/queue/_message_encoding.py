@@ -5,7 +5,8 @@
 # --------------------------------------------------------------------------
 # pylint: disable=unused-argument
 
-from base64 import b64encode, b64decode
+import copy
+from binascii import a2b_base64, b2a_base64, Error as Base64Error
 from xml.sax.saxutils import escape as xml_escape
 from xml.sax.saxutils import unescape as xml_unescape
 
@@ -15,6 +16,22 @@ from azure.core.exceptions import DecodeError
 from ._shared.encryption import decrypt_queue_message, encrypt_queue_message
 
 
+def _is_configured(policy, require_encryption, key_encryption_key, resolver):
+    return (policy.require_encryption == require_encryption and
+            policy.key_encryption_key is key_encryption_key and
+            policy.resolver is resolver)
+
+
+def _b64decode(content):
+    # Decodes the ASCII text of a message straight from the string, without the
+    # checks and the copy to bytes of base64.b64decode
+    return a2b_base64(content)
+
+
+def _b64encode(content):
+    return b2a_base64(content)[:-1].decode('ascii')
+
+
 class MessageEncodePolicy(object):
 
     def __init__(self):
@@ -36,6 +53,21 @@ class MessageEncodePolicy(object):
         if self.require_encryption and not self.key_encryption_key:
             raise ValueError("Encryption required but no key was provided.")
 
+    def bind(self, require_encryption, key_encryption_key, resolver):
+        """Returns the policy configured for a call, without changing this one.
+
+        The policy of a client is shared by all the threads using the client, so each call
+        encodes with a copy configured with the encryption settings of the client at that
+        time. The policy itself is returned if it is already configured with them.
+        """
+        if _is_configured(self, require_encryption, key_encryption_key, resolver):
+            if self.require_encryption and not self.key_encryption_key:
+                raise ValueError("Encryption required but no key was provided.")
+            return self
+        policy = copy.copy(self)
+        policy.configure(require_encryption, key_encryption_key, resolver)
+        return policy
+
     def encode(self, content):
         raise NotImplementedError("Must be implemented by child class.")
 
@@ -48,17 +80,21 @@ class MessageDecodePolicy(object):
         self.resolver = None
 
     def __call__(self, response, obj, headers):
+        decode = self.decode
+        if (self.key_encryption_key is None) and (self.resolver is None):
+            for message in obj:
+                if message.message_text:
+                    message.message_text = decode(message.message_text, response)
+            return obj
         for message in obj:
-            if message.message_text in [None, "", b""]:
+            if not message.message_text:
                 continue
-            content = message.message_text
-            if (self.key_encryption_key is not None) or (self.resolver is not None):
-                content = decrypt_queue_message(
-                    content, response,
-                    self.require_encryption,
-                    self.key_encryption_key,
-                    self.resolver)
-            message.message_text = self.decode(content, response)
+            content = decrypt_queue_message(
+                message.message_text, response,
+                self.require_encryption,
+                self.key_encryption_key,
+                self.resolver)
+            message.message_text = decode(content, response)
         return obj
 
     def configure(self, require_encryption, key_encryption_key, resolver):
@@ -66,6 +102,18 @@ class MessageDecodePolicy(object):
         self.key_encryption_key = key_encryption_key
         self.resolver = resolver
 
+    def bind(self, require_encryption, key_encryption_key, resolver):
+        """Returns the policy configured for a call, without changing this one.
+
+        The policy is returned itself if it is already configured with the settings,
+        and copied otherwise, as it is shared by all the threads using the client.
+        """
+        if _is_configured(self, require_encryption, key_encryption_key, resolver):
+            return self
+        policy = copy.copy(self)
+        policy.configure(require_encryption, key_encryption_key, resolver)
+        return policy
+
     def decode(self, content, response):
         raise NotImplementedError("Must be implemented by child class.")
 
@@ -80,7 +128,7 @@ class TextBase64EncodePolicy(MessageEncodePolicy):
     def encode(self, content):
         if not isinstance(content, six.text_type):
             raise TypeError("Message content must be text for base 64 encoding.")
-        return b64encode(content.encode('utf-8')).decode('utf-8')
+        return _b64encode(content.encode('utf-8'))
 
 
 class TextBase64DecodePolicy(MessageDecodePolicy):
@@ -93,8 +141,8 @@ class TextBase64DecodePolicy(MessageDecodePolicy):
 
     def decode(self, content, response):
         try:
-            return b64decode(content.encode('utf-8')).decode('utf-8')
-        except (ValueError, TypeError) as error:
+            return _b64decode(content).decode('utf-8')
+        except (Base64Error, ValueError, TypeError) as error:
             # ValueError for Python 3, TypeError for Python 2
             raise DecodeError(
                 message="Message content is not valid base 64.",
@@ -112,7 +160,7 @@ class BinaryBase64EncodePolicy(MessageEncodePolicy):
     def encode(self, content):
         if not isinstance(content, six.binary_type):
             raise TypeError("Message content must be bytes for base 64 encoding.")
-        return b64encode(content).decode('utf-8')
+        return _b64encode(content)
 
 
 class BinaryBase64DecodePolicy(MessageDecodePolicy):
@@ -124,8 +172,8 @@ class BinaryBase64DecodePolicy(MessageDecodePolicy):
 
     def decode(self, content, response):
         try:
-            return b64decode(content.encode('utf-8'))
-        except (ValueError, TypeError) as error:
+            return _b64decode(content)
+        except (Base64Error, ValueError, TypeError) as error:
             # ValueError for Python 3, TypeError for Python 2
             raise DecodeError(
                 message="Message content is not valid base 64.",
@@ -143,7 +191,10 @@ class TextXMLEncodePolicy(MessageEncodePolicy):
     def encode(self, content):
         if not isinstance(content, six.text_type):
             raise TypeError("Message content must be text for XML encoding.")
-        return xml_escape(content)
+        # Most messages have nothing to escape, and are returned without scanning them three times
+        if '&' in content or '<' in content or '>' in content:
+            return xml_escape(content)
+        return content
 
 
 class TextXMLDecodePolicy(MessageDecodePolicy):
@@ -153,7 +204,9 @@ class TextXMLDecodePolicy(MessageDecodePolicy):
     """
 
     def decode(self, content, response):
-        return xml_unescape(content)
+        if '&' in content:
+            return xml_unescape(content)
+        return content
 
 
 class NoEncodePolicy(MessageEncodePolicy):
@@ -0,0 +1,384 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import time
+import calendar
+import threading
+from concurrent import futures
+from typing import Any, Callable, Optional, TYPE_CHECKING  # pylint: disable=unused-import
+
+from azure.core.tracing.context import tracing_context
+
+from .models import QueueProcessorMetrics
+
+if TYPE_CHECKING:
+    from .queue_client import QueueClient
+    from .models import QueueMessage
+
+_MAX_MESSAGES_PER_PAGE = 32
+
+
+def get_lag(message, now):
+    """The time the message waited in the queue before it was received, in seconds."""
+    if message.insertion_time is None:
+        return 0.0
+    return max(now - calendar.timegm(message.insertion_time.utctimetuple()), 0.0)
+
+
+class PollBackoff(object):
+    """The interval to wait before polling a queue again after it was found empty.
+
+    The interval doubles with each empty poll from `min_interval` up to `max_interval`,
+    and is reset once messages are received, so that an idle queue costs few requests
+    while a busy one is polled again right away.
+    """
+
+    def __init__(self, min_interval, max_interval):
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval, min_interval)
+        self._interval = None
+
+    def next(self):
+        if self._interval is None:
+            self._interval = self.min_interval
+        else:
+            self._interval = min(self._interval * 2, self.max_interval)
+        return self._interval
+
+    def reset(self):
+        self._interval = None
+
+
+class MessageLease(object):
+    """A received message being handled, and when its visibility timeout must be extended.
+
+    The lock serializes the renewals of the message with its deletion, which must use
+    the pop receipt of the latest renewal.
+    """
+
+    def __init__(self, message, visibility_timeout, now):
+        self.message = message
+        self.visibility_timeout = visibility_timeout
+        self.lock = threading.Lock()
+        self.done = False
+        self.renewing = False
+        self.renew_at = now + visibility_timeout / 2.0
+
+    def renewed(self, updated, now):
+        self.message.pop_receipt = updated.pop_receipt
+        self.message.time_next_visible = updated.time_next_visible
+        self.renew_at = now + self.visibility_timeout / 2.0
+
+
+class ProcessorState(object):
+    """Shared state of a queue processor: the received messages in flight and the metrics."""
+
+    def __init__(self, max_concurrency):
+        self.max_concurrency = max(max_concurrency, 1)
+        self.leases = {}
+        self._metrics = QueueProcessorMetrics()
+        self._lag_total = 0.0
+        self._lock = threading.Lock()
+        self._started = None
+
+    def start(self):
+        self._started = time.time()
+
+    def add_received(self, leases, now):
+        with self._lock:
+            for lease in leases:
+                self.leases[id(lease)] = lease
+                lag = get_lag(lease.message, now)
+                self._lag_total += lag
+                self._metrics.max_lag = max(self._metrics.max_lag, lag)
+            self._metrics.received += len(leases)
+
+    def remove(self, lease):
+        with self._lock:
+            self.leases.pop(id(lease), None)
+
+    def due_renewals(self, now):
+        with self._lock:
+            leases = list(self.leases.values())
+        return [l for l in leases if not l.done and not l.renewing and l.renew_at <= now]
+
+    def add(self, counter, count=1):
+        with self._lock:
+            setattr(self._metrics, counter, getattr(self._metrics, counter) + count)
+
+    @property
+    def metrics(self):
+        with self._lock:
+            metrics = QueueProcessorMetrics()
+            metrics.update(vars(self._metrics))
+            metrics.in_flight = len(self.leases)
+            metrics.average_lag = self._lag_total / metrics.received if metrics.received else 0.0
+        metrics.elapsed = time.time() - self._started if self._started else 0.0
+        return metrics
+
+
+class QueueProcessor(object):
+    """Consumes the messages of a queue, handling them concurrently on a pool of workers.
+
+    Each receiver loop dequeues up to `messages_per_page` messages at a time, but
+    never more than there are idle workers, so that no received message waits for
+    a worker while its visibility timeout runs out. When the queue is found empty,
+    the receiver waits before polling again, doubling the wait up to
+    `max_poll_interval` until messages show up.
+
+    A message is deleted once its handler returns, on a separate pool of
+    `max_delete_connections` connections, so that the workers don't wait for the
+    deletes. A message whose handler raises is left in the queue, and becomes
+    visible again when its visibility timeout expires. The visibility of a message
+    still being handled is extended by `visibility_timeout` whenever half of it has
+    elapsed, so slow handlers don't lose their messages to other consumers.
+
+    Use :func:`~azure.storage.queue.QueueClient.get_message_processor` to create a processor.
+
+    :param queue: The client of the queue to consume.
+    :type queue: ~azure.storage.queue.QueueClient
+    :param callable handler:
+        The function handling a message, called with the
+        :class:`~azure.storage.queue.models.QueueMessage`. The pop receipt of the
+        message is kept up to date as its visibility is extended.
+    :param int max_concurrency:
+        The number of messages handled at once. Defaults to 16.
+    :param int receivers:
+        The number of loops dequeuing messages concurrently. Defaults to 1.
+    :param int messages_per_page:
+        The maximum number of messages dequeued by a request, up to 32. Defaults to 32.
+    :param int visibility_timeout:
+        The visibility timeout of the received messages, in seconds. Defaults to 30.
+    :param float min_poll_interval:
+        The wait before polling the queue again after it was found empty, in seconds.
+        Defaults to 0.5.
+    :param float max_poll_interval:
+        The maximum wait between polls of an empty queue, in seconds. Defaults to 30.
+    :param int max_delete_connections:
+        The number of connections used to delete handled messages and extend the
+        visibility of messages in flight. Defaults to 4.
+    :param callable on_error:
+        Called with the message and the exception when a handler raises.
+    """
+
+    def __init__(
+            self, queue,  # type: QueueClient
+            handler,  # type: Callable[[QueueMessage], Any]
+            max_concurrency=16,  # type: int
+            receivers=1,  # type: int
+            messages_per_page=_MAX_MESSAGES_PER_PAGE,  # type: int
+            visibility_timeout=30,  # type: int
+            min_poll_interval=0.5,  # type: float
+            max_poll_interval=30,  # type: float
+            max_delete_connections=4,  # type: int
+            on_error=None,  # type: Optional[Callable[[QueueMessage, Exception], None]]
+            **kwargs
+        ):
+        # type: (...) -> None
+        if not 1 <= messages_per_page <= _MAX_MESSAGES_PER_PAGE:
+            raise ValueError("messages_per_page should be between 1 and 32.")
+        if visibility_timeout < 1:
+            raise ValueError("visibility_timeout should be at least 1 second.")
+        self.queue = queue
+        self.handler = handler
+        self.receivers = max(receivers, 1)
+        self.messages_per_page = messages_per_page
+        self.visibility_timeout = visibility_timeout
+        self.min_poll_interval = min_poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.max_delete_connections = max(max_delete_connections, 1)
+        self.on_error = on_error
+        self._kwargs = kwargs
+        self._state = ProcessorState(max_concurrency)
+        self._idle_workers = self._state.max_concurrency
+        self._workers_changed = threading.Condition()
+        self._stopping = threading.Event()
+        self._closed = threading.Event()
+        self._until_empty = False
+        self._threads = []
+        self._workers = None
+        self._connections = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    @property
+    def metrics(self):
+        """A snapshot of the throughput and lag of the processor.
+
+        :rtype: ~azure.storage.queue.models.QueueProcessorMetrics
+        """
+        return self._state.metrics
+
+    def start(self):
+        """Starts the receivers in the background."""
+        if self._threads:
+            raise ValueError("The processor was already started.")
+        self._state.start()
+        self._workers = futures.ThreadPoolExecutor(self._state.max_concurrency)
+        self._connections = futures.ThreadPoolExecutor(self.max_delete_connections)
+        self._threads = [threading.Thread(target=tracing_context.with_current_context(self._receive))
+                         for _ in range(self.receivers)]
+        self._threads.append(threading.Thread(target=tracing_context.with_current_context(self._renew_leases)))
+        for thread in self._threads:
+            thread.daemon = True
+            thread.start()
+
+    def stop(self):
+        """Stops receiving messages, and waits for the messages in flight to be handled and deleted.
+
+        :returns: The metrics of the processor.
+        :rtype: ~azure.storage.queue.models.QueueProcessorMetrics
+        """
+        self._stopping.set()
+        with self._workers_changed:
+            self._workers_changed.notify_all()
+        for thread in self._threads[:-1]:
+            thread.join()
+        if self._workers:
+            # The visibility of the messages is still extended while their handlers complete
+            self._workers.shutdown(wait=True)
+        self._closed.set()
+        if self._threads:
+            self._threads[-1].join()
+        if self._connections:
+            self._connections.shutdown(wait=True)
+        return self.metrics
+
+    def run(self, duration=None, until_empty=False):
+        """Processes messages until the duration elapses, or until the queue is empty.
+
+        :param float duration:
+            How long to process messages for, in seconds. By default, messages
+            are processed until the queue is found empty with `until_empty`, or
+            until :func:`stop` is called from another thread.
+        :param bool until_empty:
+            Whether to stop once a receiver finds the queue empty with no message
+            in flight.
+        :returns: The metrics of the processor.
+        :rtype: ~azure.storage.queue.models.QueueProcessorMetrics
+        """
+        self._until_empty = until_empty
+        self.start()
+        try:
+            self._stopping.wait(duration)
+        finally:
+            metrics = self.stop()
+        return metrics
+
+    def _reserve_workers(self):
+        # Blocks until some workers are idle, and reserves as many as a page can hold
+        with self._workers_changed:
+            while not self._idle_workers and not self._stopping.is_set():
+                self._workers_changed.wait()
+            if self._stopping.is_set():
+                return 0
+            count = min(self._idle_workers, self.messages_per_page)
+            self._idle_workers -= count
+            return count
+
+    def _release_workers(self, count):
+        if count:
+            with self._workers_changed:
+                self._idle_workers += count
+                self._workers_changed.notify_all()
+
+    def _receive_page(self, count):
+        pages = self.queue.receive_messages(
+            messages_per_page=count,
+            visibility_timeout=self.visibility_timeout,
+            **self._kwargs).by_page()
+        try:
+            return list(next(pages))
+        except StopIteration:
+            return []
+
+    def _receive(self):
+        backoff = PollBackoff(self.min_poll_interval, self.max_poll_interval)
+        while True:
+            count = self._reserve_workers()
+            if not count:
+                return
+            try:
+                messages = self._receive_page(count)
+            except Exception:  # pylint: disable=broad-except
+                self._release_workers(count)
+                self._state.add('receive_failures')
+                self._stopping.wait(backoff.next())
+                continue
+            self._release_workers(count - len(messages))
+            if not messages:
+                self._state.add('empty_polls')
+                if self._until_empty and not self._state.leases:
+                    self._stopping.set()
+                    with self._workers_changed:
+                        self._workers_changed.notify_all()
+                    return
+                self._stopping.wait(backoff.next())
+                continue
+            backoff.reset()
+            now = time.time()
+            leases = [MessageLease(m, self.visibility_timeout, now) for m in messages]
+            self._state.add_received(leases, now)
+            for lease in leases:
+                self._workers.submit(tracing_context.with_current_context(self._handle), lease)
+
+    def _handle(self, lease):
+        try:
+            self.handler(lease.message)
+        except Exception as error:  # pylint: disable=broad-except
+            with lease.lock:
+                lease.done = True
+            self._state.remove(lease)
+            self._state.add('failed')
+            if self.on_error:
+                self.on_error(lease.message, error)
+        else:
+            self._state.add('processed')
+            self._connections.submit(tracing_context.with_current_context(self._delete), lease)
+        finally:
+            self._release_workers(1)
+
+    def _delete(self, lease):
+        with lease.lock:
+            lease.done = True
+        try:
+            self.queue.delete_message(lease.message, **self._kwargs)
+            self._state.add('deleted')
+        except Exception:  # pylint: disable=broad-except
+            self._state.add('delete_failures')
+        finally:
+            self._state.remove(lease)
+
+    def _renew(self, lease):
+        try:
+            with lease.lock:
+                if lease.done:
+                    return
+                updated = self.queue.update_message(
+                    lease.message.id,
+                    pop_receipt=lease.message.pop_receipt,
+                    visibility_timeout=lease.visibility_timeout,
+                    **self._kwargs)
+                lease.renewed(updated, time.time())
+            self._state.add('renewed')
+        except Exception:  # pylint: disable=broad-except
+            # The message can't be renewed anymore, and will be handled by another consumer
+            lease.renew_at = float('inf')
+            self._state.add('renewal_failures')
+        finally:
+            lease.renewing = False
+
+    def _renew_leases(self):
+        check_interval = min(self.visibility_timeout / 4.0, 1.0)
+        while not self._closed.wait(check_interval):
+            for lease in self._state.due_renewals(time.time()):
+                lease.renewing = True
+                self._connections.submit(tracing_context.with_current_context(self._renew), lease)
@@ -0,0 +1,177 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import logging
+import threading
+import time
+
+
+_LOGGER = logging.getLogger(__name__)
+
+_DEFAULT_START_CHUNK_SIZE = 4 * 1024 * 1024
+
+
+class TransferTuner(object):
+    """Tunes the chunk size and the number of connections of a transfer while it runs.
+
+    The duration of every chunk is measured. The chunk size is doubled while chunks
+    complete much faster than the target duration, so that the round trips stop
+    dominating, and halved while they are much slower. The number of connections
+    climbs one at a time while the aggregate throughput keeps improving, and turns
+    back when it degrades. Both stay within the caps of the transfer.
+
+    Pass the same tuner to several transfers to start each one from the parameters
+    chosen for the previous one. After a transfer, `chunk_size`, `concurrency` and
+    `throughput` report the chosen parameters; they are also logged at INFO level.
+
+    :param int max_chunk_size:
+        The largest chunk size to use. Defaults to the chunk size configured on the client.
+    :param int max_connections:
+        The largest number of parallel connections to use. Defaults to the number of
+        connections requested for the transfer.
+    :param int min_chunk_size:
+        The smallest chunk size to use. Default value is 1MB.
+    :param float target_chunk_duration:
+        The time, in seconds, a chunk should take to transfer. Default value is 2.
+    """
+
+    #: The chunk sizes are kept multiples of this, as page blobs require.
+    alignment = 512
+
+    def __init__(self, max_chunk_size=None, max_connections=None, min_chunk_size=1024 * 1024,
+                 target_chunk_duration=2.0):
+        self.max_chunk_size = max_chunk_size
+        self.max_connections = max_connections
+        self.min_chunk_size = min_chunk_size
+        self.target_chunk_duration = target_chunk_duration
+        self.chunk_size = None
+        self.concurrency = None
+        self.throughput = None
+        self._fixed_chunk_size = False
+        self._lock = threading.Lock()
+        self._reset_window()
+        self._best_throughput = None
+        self._direction = 1
+
+    def configure(self, max_chunk_size, max_connections, min_chunk_size=None, fixed_chunk_size=False):
+        """Applies the caps of a transfer, before it starts.
+
+        :param int max_chunk_size: The chunk size configured for the transfer.
+        :param int max_connections: The number of connections requested for the transfer.
+        :param int min_chunk_size: A lower bound the transfer itself requires, if any.
+        :param bool fixed_chunk_size: Whether the transfer needs every chunk to have the same size.
+        :returns: The tuner.
+        """
+        with self._lock:
+            chunk_cap = min(self.max_chunk_size or max_chunk_size, max_chunk_size)
+            connection_cap = max(min(self.max_connections or max_connections, max_connections), 1)
+            chunk_floor = min(max(self.min_chunk_size, min_chunk_size or 0), chunk_cap)
+            # The floor is rounded up, so that no chunk is smaller than the transfer requires
+            aligned_cap = self._align(chunk_cap)
+            aligned_floor = min(-(-chunk_floor // self.alignment) * self.alignment, aligned_cap)
+            self._caps = (max(aligned_floor, self.alignment), aligned_cap, connection_cap)
+            self._fixed_chunk_size = fixed_chunk_size
+            if fixed_chunk_size:
+                self.chunk_size = max_chunk_size
+            else:
+                self.chunk_size = self._clamp_chunk_size(self.chunk_size or _DEFAULT_START_CHUNK_SIZE)
+            self.concurrency = min(self.concurrency or min(2, connection_cap), connection_cap)
+            self._reset_window()
+        return self
+
+    def _align(self, size):
+        return max(size - size % self.alignment, self.alignment)
+
+    def _clamp_chunk_size(self, size):
+        return min(max(self._align(size), self._caps[0]), self._caps[1])
+
+    def _reset_window(self):
+        self._window_start = None
+        self._window_bytes = 0
+        self._window_durations = []
+
+    def start(self):
+        """Marks the start of a chunk transfer, returning a token for :func:`record`."""
+        now = time.time()
+        with self._lock:
+            if self._window_start is None:
+                self._window_start = now
+        return now
+
+    def record(self, length, started):
+        """Records that a chunk of the given length, started at `started`, completed.
+
+        :param int length: The number of bytes transferred.
+        :param float started: The value returned by :func:`start`.
+        """
+        now = time.time()
+        with self._lock:
+            self._window_bytes += length
+            self._window_durations.append(now - started)
+            # Every connection contributes to a window, so that it measures the aggregate throughput
+            if len(self._window_durations) < max(self.concurrency, 2):
+                return
+            elapsed = now - self._window_start
+            if elapsed <= 0:
+                return
+            self.throughput = self._window_bytes / elapsed
+            mean_duration = sum(self._window_durations) / len(self._window_durations)
+            if not self._tune_chunk_size(mean_duration):
+                self._tune_concurrency(self.throughput)
+            self._reset_window()
+
+    def _tune_chunk_size(self, mean_duration):
+        if self._fixed_chunk_size:
+            return False
+        size = self.chunk_size
+        if mean_duration < self.target_chunk_duration / 2:
+            size = self._clamp_chunk_size(size * 2)
+        elif mean_duration > self.target_chunk_duration * 2:
+            size = self._clamp_chunk_size(size // 2)
+        if size == self.chunk_size:
+            return False
+        self.chunk_size = size
+        # The throughput measured with the previous chunk size isn't comparable anymore
+        self._best_throughput = None
+        return True
+
+    def _tune_concurrency(self, throughput):
+        if self._best_throughput is None or throughput > self._best_throughput * 1.05:
+            self._best_throughput = throughput
+        elif throughput < self._best_throughput * 0.95:
+            self._direction = -self._direction
+            self._best_throughput = throughput
+        else:
+            return
+        self.concurrency = min(max(self.concurrency + self._direction, 1), self._caps[2])
+
+    def report(self):
+        """Returns the parameters chosen so far.
+
+        :rtype: dict
+        """
+        return {
+            'chunk_size': self.chunk_size,
+            'concurrency': self.concurrency,
+            'throughput': self.throughput
+        }
+
+    def finish(self):
+        """Logs the parameters chosen for the transfer."""
+        _LOGGER.info(
+            "Transfer tuned to %s byte chunks over %s connections (%s bytes/s).",
+            self.chunk_size, self.concurrency, int(self.throughput) if self.throughput else None)
+
+
+def get_tuner(autotune, max_chunk_size, max_connections, **kwargs):
+    """Returns the tuner to use for a transfer, or None if it isn't tuned.
+
+    :param autotune: True, or a TransferTuner to reuse.
+    """
+    if not autotune:
+        return None
+    tuner = autotune if isinstance(autotune, TransferTuner) else TransferTuner()
+    return tuner.configure(max_chunk_size, max_connections, **kwargs)
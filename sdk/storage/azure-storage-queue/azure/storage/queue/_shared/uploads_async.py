@@ -7,35 +7,37 @@
 
 import asyncio
 from asyncio import Lock
+from io import SEEK_CUR
 from itertools import islice
 import threading
 
-from math import ceil
-
 import six
 
 from . import encode_base64, url_quote
 from .request_handlers import get_length
 from .response_handlers import return_response_headers
-from .encryption import get_blob_encryptor_and_padder
-from .uploads import SubStream, IterStreamer  # pylint: disable=unused-import
+from .encryption import get_blob_encryptor_and_padder, get_blob_region_encryptor
+from .validation import MD5, get_transfer_checksum
+from .uploads import (  # pylint: disable=unused-import
+    SubStream, IterStreamer, UploadJournal, get_block_digest, reads_at_offset)
 
 
 _LARGE_BLOB_UPLOAD_MAX_READ_BUFFER_SIZE = 4 * 1024 * 1024
 _ERROR_VALUE_SHOULD_BE_SEEKABLE_STREAM = '{0} should be a seekable file-like/io.IOBase type stream object.'
 
 
-async def _parallel_uploads(uploader, pending, running):
+async def _parallel_uploads(uploader, pending, running, tuner=None):
     range_ids = []
     while True:
         # Wait for some download to finish before adding a new one
         done, running = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
         range_ids.extend([chunk.result() for chunk in done])
-        try:
-            next_chunk = next(pending)
-        except StopIteration:
+        # A tuned upload keeps as many chunks in flight as the tuner chose
+        count = max(tuner.concurrency - len(running), 0) if tuner else 1
+        next_chunks = list(islice(pending, count))
+        if not next_chunks and (count or not running):
             break
-        else:
+        for next_chunk in next_chunks:
             running.add(asyncio.ensure_future(uploader(next_chunk)))
 
     # Wait for the remaining uploads to finish
@@ -53,6 +55,8 @@ async def upload_data_chunks(
         max_connections=None,
         stream=None,
         encryption_options=None,
+        tuner=None,
+        checksum=None,
         **kwargs):
 
     if encryption_options:
@@ -62,6 +66,12 @@ async def upload_data_chunks(
             uploader_class is not PageBlobChunkUploader)
         kwargs['encryptor'] = encryptor
         kwargs['padder'] = padder
+        if uploader_class is not PageBlobChunkUploader:
+            # Regions don't chain the chunks, which are then encrypted by the workers in parallel.
+            # Pages are encrypted with protocol 1.0, as they can't hold the tags of the regions.
+            kwargs['region_encryptor'] = get_blob_region_encryptor(
+                encryption_options.get('cek'),
+                encryption_options.get('version'))
 
     parallel = max_connections > 1
     if parallel and 'modified_access_conditions' in kwargs:
@@ -74,20 +84,24 @@ async def upload_data_chunks(
         chunk_size=chunk_size,
         stream=stream,
         parallel=parallel,
+        tuner=tuner,
+        checksum=checksum or get_transfer_checksum(kwargs.get('validate_content')),
         **kwargs)
 
     if parallel:
         upload_tasks = uploader.get_chunk_streams()
         running_futures = [
             asyncio.ensure_future(uploader.process_chunk(u))
-            for u in islice(upload_tasks, 0, max_connections)
+            for u in islice(upload_tasks, 0, tuner.concurrency if tuner else max_connections)
         ]
-        range_ids = await _parallel_uploads(uploader.process_chunk, upload_tasks, running_futures)
+        range_ids = await _parallel_uploads(uploader.process_chunk, upload_tasks, running_futures, tuner)
     else:
         range_ids = []
         for chunk in uploader.get_chunk_streams():
             range_ids.append(await uploader.process_chunk(chunk))
 
+    if tuner:
+        tuner.finish()
     if any(range_ids):
         return [r[1] for r in sorted(range_ids, key=lambda r: r[0])]
     return uploader.response_headers
@@ -100,6 +114,8 @@ async def upload_substream_blocks(
         chunk_size=None,
         max_connections=None,
         stream=None,
+        journal=None,
+        tuner=None,
         **kwargs):
     parallel = max_connections > 1
     if parallel and 'modified_access_conditions' in kwargs:
@@ -111,25 +127,36 @@ async def upload_substream_blocks(
         chunk_size=chunk_size,
         stream=stream,
         parallel=parallel,
+        journal=journal,
+        tuner=tuner,
         **kwargs)
 
     if parallel:
         upload_tasks = uploader.get_substream_blocks()
         running_futures = [
             asyncio.ensure_future(uploader.process_substream_block(u))
-            for u in islice(upload_tasks, 0, max_connections)
+            for u in islice(upload_tasks, 0, tuner.concurrency if tuner else max_connections)
         ]
-        range_ids = await _parallel_uploads(uploader.process_substream_block, upload_tasks, running_futures)
+        range_ids = await _parallel_uploads(
+            uploader.process_substream_block, upload_tasks, running_futures, tuner)
     else:
         range_ids = []
         for block in uploader.get_substream_blocks():
             range_ids.append(await uploader.process_substream_block(block))
+    if tuner:
+        tuner.finish()
+    if journal:
+        # The blocks staged before an interruption are committed along with the new ones
+        range_ids.extend(journal.staged)
     return sorted(range_ids)
 
 
 class _ChunkUploader(object):  # pylint: disable=too-many-instance-attributes
 
-    def __init__(self, service, total_size, chunk_size, stream, parallel, encryptor=None, padder=None, **kwargs):
+    def __init__(
+            self, service, total_size, chunk_size, stream, parallel,
+            encryptor=None, padder=None, region_encryptor=None, journal=None, tuner=None, checksum=None,
+            **kwargs):
         self.service = service
         self.total_size = total_size
         self.chunk_size = chunk_size
@@ -147,6 +174,16 @@ class _ChunkUploader(object):  # pylint: disable=too-many-instance-attributes
         # Encryption
         self.encryptor = encryptor
         self.padder = padder
+        self.region_encryptor = region_encryptor
+
+        # Record of the staged blocks, for resumable uploads
+        self.journal = journal
+
+        # Chunk size and concurrency tuning, if enabled
+        self.tuner = tuner
+
+        # Checksums of the chunks, if content is validated
+        self.checksum = checksum
         self.response_headers = None
         self.etag = None
         self.last_modified = None
@@ -156,12 +193,15 @@ class _ChunkUploader(object):  # pylint: disable=too-many-instance-attributes
         index = 0
         while True:
             data = b''
-            read_size = self.chunk_size
+            chunk_size = self.tuner.chunk_size if self.tuner else self.chunk_size
+            if self.region_encryptor:
+                chunk_size = self.region_encryptor.region_info.align(chunk_size)
+            read_size = chunk_size
 
             # Buffer until we either reach the end of the stream or get a whole chunk.
             while True:
                 if self.total_size:
-                    read_size = min(self.chunk_size - len(data), self.total_size - (index + len(data)))
+                    read_size = min(chunk_size - len(data), self.total_size - (index + len(data)))
                 temp = self.stream.read(read_size)
                 if not isinstance(temp, six.binary_type):
                     raise TypeError('Blob data should be of type bytes.')
@@ -169,10 +209,10 @@ class _ChunkUploader(object):  # pylint: disable=too-many-instance-attributes
 
                 # We have read an empty string and so are at the end
                 # of the buffer or we have read a full chunk.
-                if temp == b'' or len(data) == self.chunk_size:
+                if temp == b'' or len(data) == chunk_size:
                     break
 
-            if len(data) == self.chunk_size:
+            if len(data) == chunk_size:
                 if self.padder:
                     data = self.padder.update(data)
                 if self.encryptor:
@@ -200,11 +240,21 @@ class _ChunkUploader(object):  # pylint: disable=too-many-instance-attributes
         else:
             self.progress_total += length
 
-    async def _upload_chunk(self, chunk_offset, chunk_data):
+    async def _upload_chunk(self, chunk_offset, chunk_data, digest=None):
         raise NotImplementedError("Must be implemented by child class.")
 
+    def _get_checksum_options(self, digest):
+        return self.checksum.get_request_options(digest) if digest else {}
+
     async def _upload_chunk_with_progress(self, chunk_offset, chunk_data):
-        range_id = await self._upload_chunk(chunk_offset, chunk_data)
+        started = self.tuner.start() if self.tuner else None
+        if self.region_encryptor:
+            chunk_data = self.region_encryptor.encrypt(chunk_data)
+        # The chunk is checksummed once, from the bytes in hand, rather than by the pipeline on every request
+        digest = self.checksum.add(chunk_offset, chunk_data) if self.checksum else None
+        range_id = await self._upload_chunk(chunk_offset, chunk_data, digest)
+        if self.tuner:
+            self.tuner.record(len(chunk_data), started)
         await self._update_progress(len(chunk_data))
         return range_id
 
@@ -218,13 +268,37 @@ class _ChunkUploader(object):  # pylint: disable=too-many-instance-attributes
             if blob_length is None:
                 raise ValueError("Unable to determine content length of upload data.")
 
-        blocks = int(ceil(blob_length / (self.chunk_size * 1.0)))
-        last_block_size = self.chunk_size if blob_length % self.chunk_size == 0 else blob_length % self.chunk_size
+        # Substreams read one after the other through their buffer read on from where the stream is,
+        # so it is moved past the blocks staged before an interruption
+        seek_past_staged = lock is None and self.journal is not None and not reads_at_offset(self.stream)
 
-        for i in range(blocks):
-            index = i * self.chunk_size
-            length = last_block_size if i == blocks - 1 else self.chunk_size
-            yield ('BlockId{}'.format("%05d" % i), SubStream(self.stream, index, length, lock))
+        index = 0
+        block_count = 0
+        while index < blob_length:
+            # The size of a tuned block is only decided once the blocks before it are scheduled
+            chunk_size = self.tuner.chunk_size if self.tuner else self.chunk_size
+            length = min(chunk_size, blob_length - index)
+            block_id = 'BlockId{}'.format("%05d" % block_count)
+            if not self.journal or block_id not in self.journal.staged:
+                yield (block_id, SubStream(self.stream, index, length, lock))
+            elif seek_past_staged:
+                self.stream.seek(length, SEEK_CUR)
+            index += length
+            block_count += 1
+
+    def _digest_substream_block(self, block_stream):
+        offset, length = block_stream._stream_begin_index, len(block_stream)  # pylint: disable=protected-access
+        if self.stream_lock is not None:
+            digest = get_block_digest(block_stream, length)
+            block_stream.seek(0)
+            return digest, block_stream
+        # Substreams read one after the other read on from where the stream is,
+        # so the block is read again from a new substream
+        position = self.stream.tell()
+        digest = get_block_digest(block_stream, length)
+        block_stream.close()
+        self.stream.seek(position)
+        return digest, SubStream(self.stream, offset, length, None)
 
     async def process_substream_block(self, block_data):
         return await self._upload_substream_block_with_progress(block_data[0], block_data[1])
@@ -233,8 +307,18 @@ class _ChunkUploader(object):  # pylint: disable=too-many-instance-attributes
         raise NotImplementedError("Must be implemented by child class.")
 
     async def _upload_substream_block_with_progress(self, block_id, block_stream):
+        offset, length = block_stream._stream_begin_index, len(block_stream)  # pylint: disable=protected-access
+        digest = None
+        if self.journal:
+            # A resumed upload only skips the blocks whose content is unchanged
+            digest, block_stream = self._digest_substream_block(block_stream)
+        started = self.tuner.start() if self.tuner else None
         range_id = await self._upload_substream_block(block_id, block_stream)
-        await self._update_progress(len(block_stream))
+        if self.tuner:
+            self.tuner.record(length, started)
+        if self.journal:
+            self.journal.add(block_id, offset, length, digest)
+        await self._update_progress(length)
         return range_id
 
     def set_response_properties(self, resp):
@@ -249,7 +333,7 @@ class BlockBlobChunkUploader(_ChunkUploader):
         super(BlockBlobChunkUploader, self).__init__(*args, **kwargs)
         self.current_length = None
 
-    async def _upload_chunk(self, chunk_offset, chunk_data):
+    async def _upload_chunk(self, chunk_offset, chunk_data, digest=None):
         # TODO: This is incorrect, but works with recording.
         index = '{0:032d}'.format(chunk_offset)
         block_id = encode_base64(url_quote(encode_base64(index)))
@@ -259,7 +343,7 @@ class BlockBlobChunkUploader(_ChunkUploader):
             chunk_data,
             data_stream_total=self.total_size,
             upload_stream_current=self.progress_total,
-            **self.request_options)
+            **dict(self.request_options, **self._get_checksum_options(digest)))
         return index, block_id
 
     async def _upload_substream_block(self, block_id, block_stream):
@@ -286,21 +370,19 @@ class PageBlobChunkUploader(_ChunkUploader):  # pylint: disable=abstract-method
                 return False
         return True
 
-    async def _upload_chunk(self, chunk_offset, chunk_data):
+    async def _upload_chunk(self, chunk_offset, chunk_data, digest=None):
         # avoid uploading the empty pages
         if not self._is_chunk_empty(chunk_data):
             chunk_end = chunk_offset + len(chunk_data) - 1
             content_range = 'bytes={0}-{1}'.format(chunk_offset, chunk_end)
-            computed_md5 = None
             self.response_headers = await self.service.upload_pages(
                 chunk_data,
                 content_length=len(chunk_data),
-                transactional_content_md5=computed_md5,
                 range=content_range,
                 cls=return_response_headers,
                 data_stream_total=self.total_size,
                 upload_stream_current=self.progress_total,
-                **self.request_options)
+                **dict(self.request_options, **self._get_checksum_options(digest)))
 
             if not self.parallel and self.request_options.get('modified_access_conditions'):
                 self.request_options['modified_access_conditions'].if_match = self.response_headers['etag']
@@ -312,7 +394,7 @@ class AppendBlobChunkUploader(_ChunkUploader):  # pylint: disable=abstract-metho
         super(AppendBlobChunkUploader, self).__init__(*args, **kwargs)
         self.current_length = None
 
-    async def _upload_chunk(self, chunk_offset, chunk_data):
+    async def _upload_chunk(self, chunk_offset, chunk_data, digest=None):
         if self.current_length is None:
             self.response_headers = await self.service.append_block(
                 chunk_data,
@@ -320,7 +402,7 @@ class AppendBlobChunkUploader(_ChunkUploader):  # pylint: disable=abstract-metho
                 cls=return_response_headers,
                 data_stream_total=self.total_size,
                 upload_stream_current=self.progress_total,
-                **self.request_options)
+                **dict(self.request_options, **self._get_checksum_options(digest)))
             self.current_length = int(self.response_headers['blob_append_offset'])
         else:
             self.request_options['append_position_access_conditions'].append_position = \
@@ -331,12 +413,18 @@ class AppendBlobChunkUploader(_ChunkUploader):  # pylint: disable=abstract-metho
                 cls=return_response_headers,
                 data_stream_total=self.total_size,
                 upload_stream_current=self.progress_total,
-                **self.request_options)
+                **dict(self.request_options, **self._get_checksum_options(digest)))
 
 
 class FileChunkUploader(_ChunkUploader):  # pylint: disable=abstract-method
 
-    async def _upload_chunk(self, chunk_offset, chunk_data):
+    def _get_checksum_options(self, digest):
+        # The ranges of a file only carry an MD5
+        if digest and self.checksum.mode == MD5:
+            return {'content_md5': bytearray(digest)}
+        return {}
+
+    async def _upload_chunk(self, chunk_offset, chunk_data, digest=None):
         chunk_end = chunk_offset + len(chunk_data) - 1
         response = await self.service.upload_range(
             chunk_data,
@@ -344,7 +432,7 @@ class FileChunkUploader(_ChunkUploader):  # pylint: disable=abstract-method
             chunk_end,
             data_stream_total=self.total_size,
             upload_stream_current=self.progress_total,
-            **self.request_options
+            **dict(self.request_options, **self._get_checksum_options(digest))
         )
         range_id = 'bytes={0}-{1}'.format(chunk_offset, chunk_end)
         return range_id, response
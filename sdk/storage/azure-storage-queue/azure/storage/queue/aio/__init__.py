@@ -7,10 +7,11 @@
 from azure.storage.queue.version import VERSION
 from .queue_client_async import QueueClient
 from .queue_service_client_async import QueueServiceClient
+from ._processor import QueueProcessor
 from .models import MessagesPaged, QueuePropertiesPaged
 from ..models import (
     Logging, Metrics, RetentionPolicy, CorsRule, AccessPolicy,
-    QueueMessage, QueuePermissions, QueueProperties)
+    QueueMessage, QueuePermissions, QueueProperties, QueueProcessorMetrics)
 
 __version__ = VERSION
 
@@ -26,5 +27,7 @@ __all__ = [
     'MessagesPaged',
     'QueuePermissions',
     'QueueProperties',
-    'QueuePropertiesPaged'
+    'QueuePropertiesPaged',
+    'QueueProcessor',
+    'QueueProcessorMetrics',
 ]
@@ -0,0 +1,266 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import time
+import asyncio
+import inspect
+
+from .._processor import (
+    MessageLease,
+    PollBackoff,
+    QueueProcessor as QueueProcessorBase)
+
+
+class AsyncMessageLease(MessageLease):
+
+    def __init__(self, *args):
+        super(AsyncMessageLease, self).__init__(*args)
+        self.lock = asyncio.Lock()
+
+
+class QueueProcessor(QueueProcessorBase):
+    """Consumes the messages of a queue, handling them concurrently as tasks.
+
+    Each receiver loop dequeues up to `messages_per_page` messages at a time, but
+    never more than `max_concurrency` messages are in flight, so that no received
+    message waits for a worker while its visibility timeout runs out. When the queue
+    is found empty, the receiver waits before polling again, doubling the wait up to
+    `max_poll_interval` until messages show up.
+
+    A message is deleted once its handler returns, with at most `max_delete_connections`
+    deletes in flight, so that the handlers don't wait for the deletes. A message whose
+    handler raises is left in the queue, and becomes visible again when its visibility
+    timeout expires. The visibility of a message still being handled is extended by
+    `visibility_timeout` whenever half of it has elapsed.
+
+    Use :func:`~azure.storage.queue.aio.QueueClient.get_message_processor` to create a processor.
+
+    :param queue: The client of the queue to consume.
+    :type queue: ~azure.storage.queue.aio.QueueClient
+    :param callable handler:
+        The function or coroutine function handling a message, called with the
+        :class:`~azure.storage.queue.models.QueueMessage`. The pop receipt of the
+        message is kept up to date as its visibility is extended.
+    :param int max_concurrency:
+        The number of messages handled at once. Defaults to 16.
+    :param int receivers:
+        The number of loops dequeuing messages concurrently. Defaults to 1.
+    :param int messages_per_page:
+        The maximum number of messages dequeued by a request, up to 32. Defaults to 32.
+    :param int visibility_timeout:
+        The visibility timeout of the received messages, in seconds. Defaults to 30.
+    :param float min_poll_interval:
+        The wait before polling the queue again after it was found empty, in seconds.
+        Defaults to 0.5.
+    :param float max_poll_interval:
+        The maximum wait between polls of an empty queue, in seconds. Defaults to 30.
+    :param int max_delete_connections:
+        The number of connections used to delete handled messages and extend the
+        visibility of messages in flight. Defaults to 4.
+    :param callable on_error:
+        Called with the message and the exception when a handler raises.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super(QueueProcessor, self).__init__(*args, **kwargs)
+        self._tasks = []
+        self._handlers = set()
+        self._requests = set()
+        self._connections = None
+        self._workers_changed = None
+        self._stopping = None
+        self._closed = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args):
+        await self.stop()
+
+    async def start(self):
+        """Starts the receivers as tasks."""
+        if self._tasks:
+            raise ValueError("The processor was already started.")
+        self._state.start()
+        self._connections = asyncio.Semaphore(self.max_delete_connections)
+        self._workers_changed = asyncio.Condition()
+        self._stopping = asyncio.Event()
+        self._closed = asyncio.Event()
+        self._tasks = [asyncio.ensure_future(self._receive()) for _ in range(self.receivers)]
+        self._tasks.append(asyncio.ensure_future(self._renew_leases()))
+
+    async def stop(self):
+        """Stops receiving messages, and waits for the messages in flight to be handled and deleted.
+
+        :returns: The metrics of the processor.
+        :rtype: ~azure.storage.queue.models.QueueProcessorMetrics
+        """
+        if not self._tasks:
+            return self.metrics
+        await self._set_stopping()
+        await asyncio.gather(*self._tasks[:-1])
+        if self._handlers:
+            # The visibility of the messages is still extended while their handlers complete
+            await asyncio.wait(self._handlers)
+        self._closed.set()
+        await self._tasks[-1]
+        if self._requests:
+            await asyncio.wait(self._requests)
+        return self.metrics
+
+    async def run(self, duration=None, until_empty=False):
+        """Processes messages until the duration elapses, or until the queue is empty.
+
+        :param float duration:
+            How long to process messages for, in seconds. By default, messages
+            are processed until the queue is found empty with `until_empty`, or
+            until :func:`stop` is called from another task.
+        :param bool until_empty:
+            Whether to stop once a receiver finds the queue empty with no message
+            in flight.
+        :returns: The metrics of the processor.
+        :rtype: ~azure.storage.queue.models.QueueProcessorMetrics
+        """
+        self._until_empty = until_empty
+        await self.start()
+        try:
+            await self._wait(self._stopping, duration)
+        finally:
+            metrics = await self.stop()
+        return metrics
+
+    @staticmethod
+    async def _wait(event, timeout):
+        # Returns whether the event was set before the timeout
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def _set_stopping(self):
+        self._stopping.set()
+        async with self._workers_changed:
+            self._workers_changed.notify_all()
+
+    async def _reserve_workers(self):
+        async with self._workers_changed:
+            while not self._idle_workers and not self._stopping.is_set():
+                await self._workers_changed.wait()
+            if self._stopping.is_set():
+                return 0
+            count = min(self._idle_workers, self.messages_per_page)
+            self._idle_workers -= count
+            return count
+
+    async def _release_workers(self, count):
+        if count:
+            async with self._workers_changed:
+                self._idle_workers += count
+                self._workers_changed.notify_all()
+
+    async def _receive_page(self, count):
+        pages = self.queue.receive_messages(
+            messages_per_page=count,
+            visibility_timeout=self.visibility_timeout,
+            **self._kwargs).by_page()
+        messages = []
+        async for page in pages:
+            async for message in page:
+                messages.append(message)
+            break
+        return messages
+
+    def _track(self, tasks, coroutine):
+        task = asyncio.ensure_future(coroutine)
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+    async def _receive(self):
+        backoff = PollBackoff(self.min_poll_interval, self.max_poll_interval)
+        while True:
+            count = await self._reserve_workers()
+            if not count:
+                return
+            try:
+                messages = await self._receive_page(count)
+            except Exception:  # pylint: disable=broad-except
+                await self._release_workers(count)
+                self._state.add('receive_failures')
+                await self._wait(self._stopping, backoff.next())
+                continue
+            await self._release_workers(count - len(messages))
+            if not messages:
+                self._state.add('empty_polls')
+                if self._until_empty and not self._state.leases:
+                    await self._set_stopping()
+                    return
+                await self._wait(self._stopping, backoff.next())
+                continue
+            backoff.reset()
+            now = time.time()
+            leases = [AsyncMessageLease(m, self.visibility_timeout, now) for m in messages]
+            self._state.add_received(leases, now)
+            for lease in leases:
+                self._track(self._handlers, self._handle(lease))
+
+    async def _handle(self, lease):
+        try:
+            result = self.handler(lease.message)
+            if inspect.isawaitable(result):
+                await result
+        except Exception as error:  # pylint: disable=broad-except
+            async with lease.lock:
+                lease.done = True
+            self._state.remove(lease)
+            self._state.add('failed')
+            if self.on_error:
+                self.on_error(lease.message, error)
+        else:
+            self._state.add('processed')
+            self._track(self._requests, self._delete(lease))
+        finally:
+            await self._release_workers(1)
+
+    async def _delete(self, lease):
+        async with lease.lock:
+            lease.done = True
+        try:
+            async with self._connections:
+                await self.queue.delete_message(lease.message, **self._kwargs)
+            self._state.add('deleted')
+        except Exception:  # pylint: disable=broad-except
+            self._state.add('delete_failures')
+        finally:
+            self._state.remove(lease)
+
+    async def _renew(self, lease):
+        try:
+            async with lease.lock:
+                if lease.done:
+                    return
+                async with self._connections:
+                    updated = await self.queue.update_message(
+                        lease.message.id,
+                        pop_receipt=lease.message.pop_receipt,
+                        visibility_timeout=lease.visibility_timeout,
+                        **self._kwargs)
+                lease.renewed(updated, time.time())
+            self._state.add('renewed')
+        except Exception:  # pylint: disable=broad-except
+            # The message can't be renewed anymore, and will be handled by another consumer
+            lease.renew_at = float('inf')
+            self._state.add('renewal_failures')
+        finally:
+            lease.renewing = False
+
+    async def _renew_leases(self):
+        check_interval = min(self.visibility_timeout / 4.0, 1.0)
+        while not await self._wait(self._closed, check_interval):
+            for lease in self._state.due_renewals(time.time()):
+                lease.renewing = True
+                self._track(self._requests, self._renew(lease))
@@ -15,6 +15,7 @@ from typing import (  # pylint: disable=unused-import
     Dict,
     List,
     Tuple,
+    Callable,
     TYPE_CHECKING,
 )
 
@@ -43,6 +44,7 @@ from azure.storage.queue._generated.models import QueueMessage as GenQueueMessag
 
 from azure.storage.queue.models import QueueMessage, AccessPolicy
 from azure.storage.queue.aio.models import MessagesPaged
+from ._processor import QueueProcessor
 from .._shared.policies_async import ExponentialRetry
 from ..queue_client import QueueClient as QueueClientBase
 
@@ -364,12 +366,12 @@ class QueueClient(AsyncStorageAccountHostsMixin, QueueClientBase):
                 :dedent: 12
                 :caption: Enqueue messages.
         """
-        self._config.message_encode_policy.configure(
+        encode_policy = self._config.message_encode_policy.bind(
             require_encryption=self.require_encryption,
             key_encryption_key=self.key_encryption_key,
             resolver=self.key_resolver_function
         )
-        content = self._config.message_encode_policy(content)
+        content = encode_policy(content)
         new_message = GenQueueMessage(message_text=content)
 
         try:
@@ -430,7 +432,7 @@ class QueueClient(AsyncStorageAccountHostsMixin, QueueClientBase):
                 :dedent: 12
                 :caption: Receive messages from the queue.
         """
-        self._config.message_decode_policy.configure(
+        decode_policy = self._config.message_decode_policy.bind(
             require_encryption=self.require_encryption,
             key_encryption_key=self.key_encryption_key,
             resolver=self.key_resolver_function
@@ -440,7 +442,7 @@ class QueueClient(AsyncStorageAccountHostsMixin, QueueClientBase):
                 self._client.messages.dequeue,
                 visibilitytimeout=visibility_timeout,
                 timeout=timeout,
-                cls=self._config.message_decode_policy,
+                cls=decode_policy,
                 **kwargs
             )
             return AsyncItemPaged(command, results_per_page=messages_per_page, page_iterator_class=MessagesPaged)
@@ -520,10 +522,10 @@ class QueueClient(AsyncStorageAccountHostsMixin, QueueClientBase):
         if receipt is None:
             raise ValueError("pop_receipt must be present")
         if message_text is not None:
-            self._config.message_encode_policy.configure(
+            encode_policy = self._config.message_encode_policy.bind(
                 self.require_encryption, self.key_encryption_key, self.key_resolver_function
             )
-            message_text = self._config.message_encode_policy(message_text)
+            message_text = encode_policy(message_text)
             updated = GenQueueMessage(message_text=message_text)
         else:
             updated = None  # type: ignore
@@ -587,14 +589,14 @@ class QueueClient(AsyncStorageAccountHostsMixin, QueueClientBase):
         """
         if max_messages and not 1 <= max_messages <= 32:
             raise ValueError("Number of messages to peek should be between 1 and 32")
-        self._config.message_decode_policy.configure(
+        decode_policy = self._config.message_decode_policy.bind(
             require_encryption=self.require_encryption,
             key_encryption_key=self.key_encryption_key,
             resolver=self.key_resolver_function
         )
         try:
             messages = await self._client.messages.peek(
-                number_of_messages=max_messages, timeout=timeout, cls=self._config.message_decode_policy, **kwargs
+                number_of_messages=max_messages, timeout=timeout, cls=decode_policy, **kwargs
             )
             wrapped_messages = []
             for peeked in messages:
@@ -670,3 +672,43 @@ class QueueClient(AsyncStorageAccountHostsMixin, QueueClientBase):
             )
         except StorageErrorException as error:
             process_storage_error(error)
+
+    def get_message_processor(self, handler, **kwargs):
+        # type: (Callable[[QueueMessage], Any], Any) -> QueueProcessor
+        """Returns a processor consuming the messages of the queue with concurrent tasks.
+
+        The processor receives messages on concurrent loops, as long as fewer than
+        `max_concurrency` messages are in flight, and backs off polling while the queue
+        is empty. Each message is passed to the handler in its own task, and deleted
+        once the handler returns; the visibility timeout of messages whose handler
+        takes long is extended automatically.
+
+        :param callable handler:
+            The function or coroutine function handling a message, called with the
+            :class:`~azure.storage.queue.models.QueueMessage`. A message whose handler
+            raises is left in the queue.
+        :param int max_concurrency:
+            The number of messages handled at once. Defaults to 16.
+        :param int receivers:
+            The number of loops dequeuing messages concurrently. Defaults to 1.
+        :param int messages_per_page:
+            The maximum number of messages dequeued by a request, up to 32. Defaults to 32.
+        :param int visibility_timeout:
+            The visibility timeout of the received messages, in seconds. It is
+            extended whenever half of it has elapsed while the message is handled.
+            Defaults to 30.
+        :param float min_poll_interval:
+            The wait before polling the queue again after it was found empty, in seconds.
+            Defaults to 0.5.
+        :param float max_poll_interval:
+            The maximum wait between polls of an empty queue, in seconds. Defaults to 30.
+        :param int max_delete_connections:
+            The number of connections used to delete handled messages and extend the
+            visibility of messages in flight. Defaults to 4.
+        :param callable on_error:
+            Called with the message and the exception when a handler raises.
+        :returns: A processor, to run with :func:`~azure.storage.queue.aio.QueueProcessor.run`,
+            or to start and stop around other work.
+        :rtype: ~azure.storage.queue.aio.QueueProcessor
+        """
+        return QueueProcessor(self, handler, **kwargs)
@@ -389,3 +389,59 @@ QueuePermissions.READ = QueuePermissions(read=True)
 QueuePermissions.ADD = QueuePermissions(add=True)
 QueuePermissions.UPDATE = QueuePermissions(update=True)
 QueuePermissions.PROCESS = QueuePermissions(process=True)
+
+
+class QueueProcessorMetrics(DictMixin):
+    """The throughput and lag of a queue processor.
+
+    :ivar int received:
+        The number of messages received.
+    :ivar int processed:
+        The number of messages handled successfully.
+    :ivar int failed:
+        The number of messages whose handler raised. They are left in the queue.
+    :ivar int deleted:
+        The number of handled messages deleted from the queue.
+    :ivar int delete_failures:
+        The number of handled messages that couldn't be deleted, typically because
+        their visibility timeout expired before and they were received again.
+    :ivar int renewed:
+        The number of times the visibility timeout of a message was extended.
+    :ivar int renewal_failures:
+        The number of messages whose visibility timeout couldn't be extended.
+    :ivar int receive_failures:
+        The number of requests receiving messages that failed.
+    :ivar int empty_polls:
+        The number of times the queue was found empty.
+    :ivar int in_flight:
+        The number of received messages not yet handled and deleted.
+    :ivar float average_lag:
+        The average time the received messages waited in the queue, in seconds.
+    :ivar float max_lag:
+        The longest time a received message waited in the queue, in seconds.
+    :ivar float elapsed:
+        The time the processor has been running, in seconds.
+    """
+
+    def __init__(self):
+        self.received = 0
+        self.processed = 0
+        self.failed = 0
+        self.deleted = 0
+        self.delete_failures = 0
+        self.renewed = 0
+        self.renewal_failures = 0
+        self.receive_failures = 0
+        self.empty_polls = 0
+        self.in_flight = 0
+        self.average_lag = 0.0
+        self.max_lag = 0.0
+        self.elapsed = 0.0
+
+    @property
+    def throughput(self):
+        """The number of messages handled successfully per second.
+
+        :rtype: float
+        """
+        return self.processed / self.elapsed if self.elapsed else 0.0
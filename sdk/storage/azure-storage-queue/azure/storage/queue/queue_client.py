@@ -6,7 +6,7 @@
 
 import functools
 from typing import (  # pylint: disable=unused-import
-    Union, Optional, Any, IO, Iterable, AnyStr, Dict, List, Tuple,
+    Union, Optional, Any, IO, Iterable, AnyStr, Dict, List, Tuple, Callable,
     TYPE_CHECKING)
 try:
     from urllib.parse import urlparse, quote, unquote
@@ -26,6 +26,7 @@ from ._shared.response_handlers import (
     return_headers_and_deserialized)
 from ._message_encoding import TextXMLEncodePolicy, TextXMLDecodePolicy
 from ._deserialize import deserialize_queue_properties, deserialize_queue_creation
+from ._processor import QueueProcessor
 from ._generated import AzureQueueStorage
 from ._generated.models import StorageErrorException, SignedIdentifier
 from ._generated.models import QueueMessage as GenQueueMessage
@@ -489,11 +490,11 @@ class QueueClient(StorageAccountHostsMixin):
                 :dedent: 12
                 :caption: Enqueue messages.
         """
-        self._config.message_encode_policy.configure(
+        encode_policy = self._config.message_encode_policy.bind(
             require_encryption=self.require_encryption,
             key_encryption_key=self.key_encryption_key,
             resolver=self.key_resolver_function)
-        content = self._config.message_encode_policy(content)
+        content = encode_policy(content)
         new_message = GenQueueMessage(message_text=content)
 
         try:
@@ -553,7 +554,7 @@ class QueueClient(StorageAccountHostsMixin):
                 :dedent: 12
                 :caption: Receive messages from the queue.
         """
-        self._config.message_decode_policy.configure(
+        decode_policy = self._config.message_decode_policy.bind(
             require_encryption=self.require_encryption,
             key_encryption_key=self.key_encryption_key,
             resolver=self.key_resolver_function)
@@ -562,7 +563,7 @@ class QueueClient(StorageAccountHostsMixin):
                 self._client.messages.dequeue,
                 visibilitytimeout=visibility_timeout,
                 timeout=timeout,
-                cls=self._config.message_decode_policy,
+                cls=decode_policy,
                 **kwargs
             )
             return ItemPaged(command, results_per_page=messages_per_page, page_iterator_class=MessagesPaged)
@@ -635,11 +636,11 @@ class QueueClient(StorageAccountHostsMixin):
         if receipt is None:
             raise ValueError("pop_receipt must be present")
         if message_text is not None:
-            self._config.message_encode_policy.configure(
+            encode_policy = self._config.message_encode_policy.bind(
                 self.require_encryption,
                 self.key_encryption_key,
                 self.key_resolver_function)
-            message_text = self._config.message_encode_policy(message_text)
+            message_text = encode_policy(message_text)
             updated = GenQueueMessage(message_text=message_text)
         else:
             updated = None # type: ignore
@@ -702,7 +703,7 @@ class QueueClient(StorageAccountHostsMixin):
         """
         if max_messages and not 1 <= max_messages <= 32:
             raise ValueError("Number of messages to peek should be between 1 and 32")
-        self._config.message_decode_policy.configure(
+        decode_policy = self._config.message_decode_policy.bind(
             require_encryption=self.require_encryption,
             key_encryption_key=self.key_encryption_key,
             resolver=self.key_resolver_function)
@@ -710,7 +711,7 @@ class QueueClient(StorageAccountHostsMixin):
             messages = self._client.messages.peek(
                 number_of_messages=max_messages,
                 timeout=timeout,
-                cls=self._config.message_decode_policy,
+                cls=decode_policy,
                 **kwargs)
             wrapped_messages = []
             for peeked in messages:
@@ -789,3 +790,42 @@ class QueueClient(StorageAccountHostsMixin):
             )
         except StorageErrorException as error:
             process_storage_error(error)
+
+    def get_message_processor(self, handler, **kwargs):
+        # type: (Callable[[QueueMessage], Any], Any) -> QueueProcessor
+        """Returns a processor consuming the messages of the queue with a pool of workers.
+
+        The processor receives messages on concurrent loops, as long as workers are
+        idle, and backs off polling while the queue is empty. Each message is passed to
+        the handler on a worker, and deleted once the handler returns; the visibility
+        timeout of messages whose handler takes long is extended automatically.
+
+        :param callable handler:
+            The function handling a message, called with the
+            :class:`~azure.storage.queue.models.QueueMessage`. A message whose handler
+            raises is left in the queue.
+        :param int max_concurrency:
+            The number of messages handled at once. Defaults to 16.
+        :param int receivers:
+            The number of loops dequeuing messages concurrently. Defaults to 1.
+        :param int messages_per_page:
+            The maximum number of messages dequeued by a request, up to 32. Defaults to 32.
+        :param int visibility_timeout:
+            The visibility timeout of the received messages, in seconds. It is
+            extended whenever half of it has elapsed while the message is handled.
+            Defaults to 30.
+        :param float min_poll_interval:
+            The wait before polling the queue again after it was found empty, in seconds.
+            Defaults to 0.5.
+        :param float max_poll_interval:
+            The maximum wait between polls of an empty queue, in seconds. Defaults to 30.
+        :param int max_delete_connections:
+            The number of connections used to delete handled messages and extend the
+            visibility of messages in flight. Defaults to 4.
+        :param callable on_error:
+            Called with the message and the exception when a handler raises.
+        :returns: A processor, to run with :func:`~azure.storage.queue.QueueProcessor.run`,
+            or to start and stop around other work.
+        :rtype: ~azure.storage.queue.QueueProcessor
+        """
+        return QueueProcessor(self, handler, **kwargs)
@@ -963,6 +963,42 @@ class StorageQueueTest(QueueTestCase):
         self.assertIsInstance(message.expiration_time, datetime)
         self.assertIsInstance(message.time_next_visible, datetime)
 
+    @ResourceGroupPreparer()
+    @StorageAccountPreparer(name_prefix='pyacrstorage')
+    def test_message_processor(self, resource_group, location, storage_account, storage_account_key):
+        # the processor polls with timing dependent concurrency, so this test runs live only
+        if not self.is_live:
+            return
+
+        # Arrange
+        qsc = QueueServiceClient(self._account_url(storage_account.name), storage_account_key)
+        queue_client = self._get_queue_reference(qsc)
+        queue_client.create_queue()
+        for i in range(40):
+            queue_client.enqueue_message(u'message{}'.format(i))
+        handled = []
+        errors = []
+
+        def handler(message):
+            if message.content == u'message7':
+                raise ValueError(message.content)
+            handled.append(message.content)
+
+        # Act
+        processor = queue_client.get_message_processor(
+            handler, max_concurrency=8, receivers=2, min_poll_interval=0.1,
+            on_error=lambda message, error: errors.append(error))
+        metrics = processor.run(until_empty=True)
+
+        # Asserts
+        self.assertEqual(39, len(handled))
+        self.assertEqual(1, len(errors))
+        self.assertEqual(39, metrics.deleted)
+        self.assertEqual(1, metrics.failed)
+        self.assertEqual(0, metrics.in_flight)
+        remaining = queue_client.peek_messages(max_messages=32)
+        self.assertEqual(0, len(remaining))
+
 
 # ------------------------------------------------------------------------------
 if __name__ == '__main__':
@@ -190,6 +190,27 @@ class StorageQueueEncodingTest(QueueTestCase):
         # Asserts
         self.assertNotEqual(-1, str(e.exception).find('Message content is not valid base 64'))
 
+    def test_message_policy_bound_per_call(self):
+        # Arrange
+        encode_policy = TextXMLEncodePolicy()
+        decode_policy = TextXMLDecodePolicy()
+        key_encryption_key = object()
+
+        # Action.
+        bound_encode_policy = encode_policy.bind(True, key_encryption_key, None)
+        bound_decode_policy = decode_policy.bind(True, key_encryption_key, None)
+
+        # Asserts
+        self.assertIs(encode_policy, encode_policy.bind(False, None, None))
+        self.assertIs(decode_policy, decode_policy.bind(False, None, None))
+        self.assertIs(key_encryption_key, bound_encode_policy.key_encryption_key)
+        self.assertIs(key_encryption_key, bound_decode_policy.key_encryption_key)
+        self.assertIsNone(encode_policy.key_encryption_key)
+        self.assertIsNone(decode_policy.key_encryption_key)
+        self.assertFalse(decode_policy.require_encryption)
+        with self.assertRaises(ValueError):
+            encode_policy.bind(True, None, None)
+
 
 # ------------------------------------------------------------------------------
 if __name__ == '__main__':